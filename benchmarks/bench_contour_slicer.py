@@ -0,0 +1,97 @@
+"""Benchmark: batch ``slice_patches`` vs. the per-patch ``contour_specs_for_polygon_slice`` loop.
+
+Takes the plane patches of the OES Precision Approach and Departure
+surfaces (12-15 km long) and of a triangulated Transitional pentagon
+pair, repeats them along the runway to mimic a multi-runway aerodrome,
+and contours them at 10 m and 1 m. The reference slices each patch at
+each level in pure Python — what the Transitional builder used to do —
+and must find the same number of segments.
+
+Run from the repository root::
+
+    python benchmarks/bench_contour_slicer.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qols.engine import (  # noqa: E402
+    NewOlsOesDepartureBuilder,
+    NewOlsOesDepartureParams,
+    NewOlsOesPrecisionApproachBuilder,
+    NewOlsOesPrecisionApproachParams,
+    RunwayGeometry,
+    TransitionalBuilder,
+    TransitionalParams,
+)
+from qols.engine.patches import KIND_PLANE  # noqa: E402
+from qols.scripts._contour_utils import (  # noqa: E402
+    contour_elevations,
+    contour_specs_for_polygon_slice,
+    slice_patches,
+    slice_segments,
+)
+
+COPIES = 8
+
+
+def make_patches():
+    """Sloped plane patches as 3D rings, one list of rings per patch."""
+    patches = []
+    for copy in range(COPIES):
+        start = (500000.0, 4000000.0 + 2000.0 * copy)
+        end = (503200.0, 4000400.0 + 2000.0 * copy)
+        runway = RunwayGeometry(centerline=[start, end], thresholds=[(*start, 10.0), (*end, 12.0)],
+                                arp_points=[start], length=3225.0)
+        for builder, params in (
+            (NewOlsOesPrecisionApproachBuilder(), NewOlsOesPrecisionApproachParams()),
+            (NewOlsOesDepartureBuilder(), NewOlsOesDepartureParams()),
+            (TransitionalBuilder(), TransitionalParams()),
+        ):
+            table = builder.build(params, runway).patch_table()
+            for i in np.flatnonzero(table.kinds == KIND_PLANE):
+                a, b, c = table.coeffs[i, :3]
+                if a == 0 and b == 0:
+                    continue
+                patches.append([np.column_stack([r[:, :2], a * r[:, 0] + b * r[:, 1] + c]) for r in table.rings[i]])
+    return patches
+
+
+def reference_count(patches, elevations):
+    count = 0
+    for rings in patches:
+        count += len(contour_specs_for_polygon_slice([tuple(v) for v in rings[0].tolist()], elevations))
+    return count
+
+
+def main():
+    patches = make_patches()
+    z = np.concatenate([r[:, 2] for rings in patches for r in rings])
+    print(f"{len(patches)} sloped patches, {z.min():.1f}-{z.max():.1f} m")
+    print(f"{'interval':>9} {'levels':>7} {'lines':>7} {'batch s':>9} {'loop s':>9} {'speedup':>9}")
+    for interval in (10, 1):
+        elevations = contour_elevations(float(z.min()), float(z.max()), interval)
+
+        t0 = time.perf_counter()
+        lines = slice_patches(patches, elevations)
+        t_batch = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        expected = reference_count(patches, elevations)
+        t_loop = time.perf_counter() - t0
+
+        found = len(slice_segments(patches, elevations)[0])
+        if found != expected:
+            raise SystemExit(f"interval {interval}: batch found {found} segments, loop {expected}")
+        print(f"{interval:>9} {len(elevations):>7} {len(lines):>7} {t_batch:>9.3f} {t_loop:>9.3f} "
+              f"{t_loop / t_batch:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
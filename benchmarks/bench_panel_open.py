@@ -0,0 +1,81 @@
+"""Benchmark: opening the QOLS and New OLS panels.
+
+The first open of a panel imports its module (which compiles the
+Designer ``.ui`` once via ``uic.loadUiType``) and constructs the dock.
+Construction now seeds only the visible tab's defaults; every other tab
+is seeded by its ``TwoRowTabSelector`` page initializer on first
+activation. Measured per panel, in a fresh interpreter with a QGIS
+application running:
+
+* ``import``   — module import, including the ``.ui`` compile;
+* ``lazy``     — dock construction as the plugin does it (median of
+  :data:`REPEAT`);
+* ``eager``    — construction plus seeding every remaining tab, i.e. what
+  construction cost before tabs were seeded lazily.
+
+Needs QGIS (``qgis.testing`` provides the application and a mocked
+``iface``). Run from the repository root::
+
+    python benchmarks/bench_panel_open.py
+"""
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+REPEAT = 5
+
+PANELS = (
+    ("QOLS", "qols.ui.dockwidget", "QolsDockWidget", "scriptTabWidget"),
+    ("New OLS", "qols.ui.new_ols_dockwidget", "NewOlsDockWidget", "oesSubTabWidget"),
+)
+
+
+def _open(dock_class, iface, selector_name, eager):
+    t0 = time.perf_counter()
+    dock = dock_class(iface)
+    if eager:
+        selector = getattr(dock, selector_name)
+        for index in range(selector.count()):
+            selector.ensure_page(index)
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    dock.close()
+    dock.deleteLater()
+    return elapsed_ms
+
+
+def main() -> int:
+    try:
+        from qgis.testing import start_app
+        from qgis.testing.mocked import get_iface
+    except ImportError:
+        print("QGIS not available: nothing to measure")
+        return 0
+
+    import importlib
+
+    app = start_app()
+    iface = get_iface()
+
+    print(f"{'panel':>8} {'import':>9} {'lazy':>9} {'eager':>9} {'saved':>7}")
+    for label, module_name, class_name, selector_name in PANELS:
+        t0 = time.perf_counter()
+        module = importlib.import_module(module_name)
+        import_ms = (time.perf_counter() - t0) * 1000.0
+        dock_class = getattr(module, class_name)
+
+        _open(dock_class, iface, selector_name, eager=True)  # warm-up
+        lazy = statistics.median(_open(dock_class, iface, selector_name, False) for _ in range(REPEAT))
+        eager = statistics.median(_open(dock_class, iface, selector_name, True) for _ in range(REPEAT))
+        app.processEvents()
+        saved = (1.0 - lazy / eager) * 100.0 if eager else 0.0
+        print(f"{label:>8} {import_ms:>7.1f}ms {lazy:>7.1f}ms {eager:>7.1f}ms {saved:>6.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
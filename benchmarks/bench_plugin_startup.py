@@ -0,0 +1,93 @@
+"""Benchmark: plugin startup cost — ``classFactory`` + ``initGui``.
+
+QGIS loads the plugin at every startup, so this is paid by every session,
+including the ones that never open a panel. Measures, in a fresh
+interpreter with a QGIS application already running:
+
+* wall time of ``import qols`` + ``classFactory(iface)`` + ``initGui()``,
+* the number of modules that imported (in total and under ``qols``),
+
+and fails (exit status 1) when the time exceeds :data:`BUDGET_MS`, the
+``qols`` module count exceeds :data:`MAX_QOLS_MODULES`, or any module in
+:data:`DEFERRED` got imported — those are only needed once a panel, the
+KML export or a calculation is used. The rule files are read on a
+background thread, and their watcher is started from the event loop once
+that is done, so neither is part of the measurement.
+
+The same budgets are asserted by ``tests/test_plugin_startup.py``.
+
+Needs QGIS (``qgis.testing`` provides the application and a mocked
+``iface``). Run from the repository root::
+
+    python benchmarks/bench_plugin_startup.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BUDGET_MS = 150.0
+MAX_QOLS_MODULES = 12
+
+# Modules startup must not pull in.
+DEFERRED = (
+    "qols.ui.dockwidget",
+    "qols.ui.new_ols_dockwidget",
+    "qols.ui.settings_dialog",
+    "qols.parameters_inspector",
+    "qols.kml_export",
+    "qols.surface_cache",
+    "qols.surface_task",
+    "qols.pipeline",
+    "qols.engine",
+    "processing",
+    "qgis.PyQt.QtWebEngineWidgets",
+)
+
+
+def main() -> int:
+    try:
+        from qgis.testing import start_app
+        from qgis.testing.mocked import get_iface
+    except ImportError:
+        print("QGIS not available: nothing to measure")
+        return 0
+
+    start_app()
+    iface = get_iface()
+
+    before = set(sys.modules)
+    t0 = time.perf_counter()
+    import qols
+
+    plugin = qols.classFactory(iface)
+    plugin.initGui()
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    loaded = set(sys.modules) - before
+
+    qols_modules = sorted(name for name in loaded if name == "qols" or name.startswith("qols."))
+    deferred = sorted(name for name in loaded if name in DEFERRED or name.startswith(tuple(f"{d}." for d in DEFERRED)))
+    print(f"classFactory + initGui: {elapsed_ms:.1f} ms (budget {BUDGET_MS:.0f} ms)")
+    print(f"modules imported: {len(loaded)} total, {len(qols_modules)} qols (max {MAX_QOLS_MODULES})")
+    for name in qols_modules:
+        print(f"  {name}")
+
+    failures = []
+    if elapsed_ms > BUDGET_MS:
+        failures.append(f"startup took {elapsed_ms:.1f} ms > {BUDGET_MS:.0f} ms")
+    if len(qols_modules) > MAX_QOLS_MODULES:
+        failures.append(f"{len(qols_modules)} qols modules imported > {MAX_QOLS_MODULES}")
+    if deferred:
+        failures.append(f"deferred modules imported at startup: {', '.join(deferred)}")
+    plugin.unload()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
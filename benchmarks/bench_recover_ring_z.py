@@ -0,0 +1,99 @@
+"""Benchmark: grid-indexed ``recover_ring_z`` vs. the original O(V·E) scan.
+
+Builds a "Merged Transitional Surface"-like input — many overlapping
+sloped rings, as piled up by repeated runs — and recovers Z for a merged
+boundary made of exact source vertices and points part-way along source
+edges. The brute-force reference (the pre-index implementation, rebuilt
+from the same private helpers) is timed on a sample of the query points
+and extrapolated; its answers on that sample must match the indexed
+version exactly. The same comparison on small randomized input runs in
+``tests/test_geometry_merge.py``.
+
+Run from the repository root::
+
+    python benchmarks/bench_recover_ring_z.py
+"""
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qols.geometry_merge import (  # noqa: E402
+    _interpolate_nearest_edge_z,
+    _iter_edges,
+    _match_exact_vertex_z,
+    recover_ring_z,
+)
+
+BRUTE_FORCE_SAMPLE = 200
+
+
+def brute_force_recover_ring_z(merged_xy, source_rings_xyz, exact_match_tol=1e-6):
+    """The pre-index implementation: every vertex, then every edge."""
+    all_vertices = [v for ring in source_rings_xyz for v in ring]
+    all_edges = [e for ring in source_rings_xyz for e in _iter_edges(ring)]
+    result = []
+    for pt in merged_xy:
+        z = _match_exact_vertex_z(pt, all_vertices, exact_match_tol)
+        if z is None:
+            z = _interpolate_nearest_edge_z(pt, all_edges)
+        result.append((pt[0], pt[1], z))
+    return result
+
+
+def make_inputs(total_vertices, rings=20, seed=1):
+    """``rings`` wobbly sloped loops around a common runway, offset from one
+    another like successive transitional runs, ``total_vertices`` in all."""
+    rng = random.Random(seed)
+    per_ring = total_vertices // rings
+    source = []
+    for r in range(rings):
+        cx, cy = 500000.0 + rng.uniform(-300, 300), 4000000.0 + rng.uniform(-300, 300)
+        base = 2000.0 + 50 * r
+        ring = []
+        for i in range(per_ring):
+            a = 2 * math.pi * i / per_ring
+            rad = base * (1 + 0.05 * math.sin(7 * a + r))
+            x, y = cx + rad * math.sin(a), cy + rad * math.cos(a)
+            ring.append((x, y, 2548.0 + 45.0 * (1 + math.sin(a + r))))
+        source.append(ring)
+
+    merged = []
+    for ring in source:
+        for i, (a, b) in enumerate(zip(ring, ring[1:] + ring[:1])):
+            if i % 2:
+                merged.append((a[0], a[1]))
+            else:
+                t = rng.random()
+                merged.append((a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1])))
+    return merged, source
+
+
+def main():
+    print(f"{'vertices':>9} {'indexed s':>10} {'brute s (est.)':>15} {'speedup':>9}")
+    for total in (10_000, 30_000, 100_000):
+        merged, source = make_inputs(total)
+
+        t0 = time.perf_counter()
+        indexed = recover_ring_z(merged, source)
+        t_indexed = time.perf_counter() - t0
+
+        sample = merged[::max(1, len(merged) // BRUTE_FORCE_SAMPLE)]
+        t0 = time.perf_counter()
+        reference = brute_force_recover_ring_z(sample, source)
+        t_brute = (time.perf_counter() - t0) * len(merged) / len(sample)
+
+        by_xy = {(x, y): z for x, y, z in indexed}
+        mismatches = sum(1 for x, y, z in reference if by_xy[(x, y)] != z)
+        if mismatches:
+            raise SystemExit(f"{mismatches} of {len(reference)} sampled vertices differ from the brute-force scan")
+        print(f"{total:>9} {t_indexed:>10.3f} {t_brute:>15.1f} {t_brute / t_indexed:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: recalculating a surface with unchanged inputs.
+
+A Calculate / Calculate All build task asks the surface cache
+(:class:`qols.surface_cache.SurfaceCache`) before building. Measured per
+surface, as the worker thread does it:
+
+* ``cold``   — engine build plus ``prepare_geometries`` (the ``QgsGeometry``
+  conversion, cutout differences included);
+* ``memory`` — a hit in the in-memory LRU;
+* ``disk``   — a hit in the SQLite store from a fresh session: the payload
+  is read, its rings unpacked and the geometries parsed from stored WKB;
+
+plus the stored payload size. Layer creation is the same in all three
+cases and is not included.
+
+Needs QGIS (``QgsGeometry`` for the conversion and WKB parsing). Run from
+the repository root::
+
+    python benchmarks/bench_surface_cache.py
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+REPEAT = 10
+CRS = "EPSG:32633"
+
+
+def make_runway():
+    from qols.engine import RunwayGeometry
+
+    start, end = (500000.0, 4000000.0), (503200.0, 4000400.0)
+    return RunwayGeometry(centerline=[start, end], thresholds=[start, end], arp_points=[start], length=3225.0)
+
+
+def _median_ms(fn):
+    samples = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    try:
+        from qgis.testing import start_app
+    except ImportError:
+        print("QGIS not available: nothing to measure")
+        return 0
+
+    start_app()
+    from qols.engine import (
+        ApproachBuilder,
+        ApproachParams,
+        ConicalBuilder,
+        ConicalParams,
+        InnerConicalBuilder,
+        InnerConicalParams,
+        TransitionalBuilder,
+        TransitionalParams,
+        build_surface,
+    )
+    from qols.engine.qgis_adapter import prepare_geometries
+    from qols.surface_cache import SurfaceCache, encode_result
+
+    cases = (
+        ("Approach", ApproachBuilder(), ApproachParams()),
+        ("Transitional", TransitionalBuilder(), TransitionalParams()),
+        ("Conical", ConicalBuilder(), ConicalParams(contour_interval_m=1)),
+        ("Inner+Conical", InnerConicalBuilder(), InnerConicalParams()),
+    )
+    runway = make_runway()
+
+    def cold(builder, params):
+        result = build_surface(builder, params, runway)
+        prepare_geometries(result)
+        return result
+
+    print(f"{'surface':>14} {'cold':>9} {'memory':>9} {'disk':>9} {'payload':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "surface_cache.sqlite")
+        for label, builder, params in cases:
+            cache = SurfaceCache(path)
+            key = cache.key(builder, params, runway, CRS)
+            result = cold(builder, params)
+            cache.put(key, result)
+            cold_ms = _median_ms(lambda: cold(builder, params))
+            memory_ms = _median_ms(lambda: cache.get(key))
+            disk_ms = _median_ms(lambda: SurfaceCache(path).get(key))
+            size_kb = len(encode_result(result)) / 1024.0
+            print(f"{label:>14} {cold_ms:>7.2f}ms {memory_ms:>7.3f}ms {disk_ms:>7.2f}ms {size_kb:>7.0f}kB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Benchmark: ``SurfaceHeightIndex.z_at`` vs. a per-obstacle, per-patch loop.
+
+Builds a current-OLS surface set headless (Approach, Transitional,
+Take-off Climb, Inner Horizontal & Conical, Outer Horizontal, OES
+Precision Approach) with the engine builders, merges their patch tables,
+scatters obstacles over the aerodrome and queries the index. The
+reference walks every obstacle through every patch in pure Python — the
+shape of the per-feature ``contains`` loop this replaces — on a sample,
+extrapolated; its answers on that sample must match.
+
+Run from the repository root::
+
+    python benchmarks/bench_obstacle_evaluation.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qols.engine import (  # noqa: E402
+    ApproachBuilder,
+    ApproachParams,
+    InnerConicalBuilder,
+    InnerConicalParams,
+    NewOlsOesPrecisionApproachBuilder,
+    NewOlsOesPrecisionApproachParams,
+    OuterHorizontalBuilder,
+    OuterHorizontalParams,
+    PatchTable,
+    RunwayGeometry,
+    TakeoffBuilder,
+    TakeoffParams,
+    TransitionalBuilder,
+    TransitionalParams,
+)
+from qols.evaluation import SurfaceHeightIndex  # noqa: E402
+
+REFERENCE_SAMPLE = 2_000
+
+
+def make_table():
+    start, end = (500000.0, 4000000.0), (503200.0, 4000400.0)
+    runway = RunwayGeometry(centerline=[start, end], thresholds=[start, end], arp_points=[start], length=3225.0)
+    builds = [
+        (ApproachBuilder(), ApproachParams()),
+        (TransitionalBuilder(), TransitionalParams()),
+        (TakeoffBuilder(), TakeoffParams()),
+        (InnerConicalBuilder(), InnerConicalParams()),
+        (OuterHorizontalBuilder(), OuterHorizontalParams()),
+        (NewOlsOesPrecisionApproachBuilder(), NewOlsOesPrecisionApproachParams()),
+    ]
+    table = PatchTable()
+    offset = 0
+    for builder, params in builds:
+        result = builder.build(params, runway)
+        results = [result, *result.related]
+        for part in results:
+            table.extend(part.patch_table(), surface_offset=offset)
+            offset += len(part.features)
+    return table
+
+
+def reference_evaluate(x, y, table):
+    """Per-point, per-patch loop: bbox check, then the patch's own test."""
+    out = []
+    bboxes = table.bboxes.tolist()
+    for px, py in zip(x.tolist(), y.tolist()):
+        best, owner = None, -1
+        for i, (min_x, min_y, max_x, max_y) in enumerate(bboxes):
+            if not (min_x <= px <= max_x and min_y <= py <= max_y):
+                continue
+            inside, z = table.evaluate(i, np.array([px]), np.array([py]))
+            if inside[0] and (best is None or z[0] < best):
+                best, owner = float(z[0]), int(table.surfaces[i])
+        out.append((best, owner))
+    return out
+
+
+def main():
+    table = make_table()
+    t0 = time.perf_counter()
+    index = SurfaceHeightIndex(table)
+    print(f"{len(table)} patches, index built in {time.perf_counter() - t0:.3f} s")
+    print(f"{'obstacles':>10} {'indexed s':>10} {'points/s':>10} {'loop s (est.)':>14} {'speedup':>9}")
+    rng = np.random.default_rng(1)
+    for n in (10_000, 100_000, 1_000_000):
+        x = rng.uniform(485000.0, 518000.0, n)
+        y = rng.uniform(3992000.0, 4008000.0, n)
+
+        t0 = time.perf_counter()
+        surface_z, surface = index.z_at(x, y)
+        t_indexed = time.perf_counter() - t0
+
+        step = max(1, n // REFERENCE_SAMPLE)
+        t0 = time.perf_counter()
+        reference = reference_evaluate(x[::step], y[::step], table)
+        t_loop = (time.perf_counter() - t0) * n / len(reference)
+
+        for i, (z, owner) in zip(range(0, n, step), reference):
+            if owner != surface[i] or (z is not None and not np.isclose(z, surface_z[i])):
+                raise SystemExit(f"obstacle {i}: indexed ({surface_z[i]}, {surface[i]}) != loop ({z}, {owner})")
+        print(f"{n:>10} {t_indexed:>10.3f} {n / t_indexed:>10.2e} {t_loop:>14.1f} {t_loop / t_indexed:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: one live-preview refresh per surface against its frame budget.
+
+A preview refresh (:class:`qols.surface_preview.SurfacePreview`) is one
+engine build from the cached runway coordinates plus the WKB the rubber
+bands are drawn from — every plain polygon in one MultiPolygonZ, every
+contour in one MultiLineStringZ. This times that work for the surfaces
+users tweak most, against the budgets the preview has to meet: one 60 Hz
+frame for Approach / Transitional / OFZ, ~100 ms for Conical with its
+contours.
+
+Without a QGIS session the ``fromWkb`` parse and the rubber-band paint
+are not included; both are C++ and small next to the build.
+
+Run from the repository root::
+
+    python benchmarks/bench_surface_preview.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qols.engine import (  # noqa: E402
+    ApproachBuilder,
+    ApproachParams,
+    ConicalBuilder,
+    ConicalParams,
+    OfzBuilder,
+    OfzParams,
+    RunwayGeometry,
+    TransitionalBuilder,
+    TransitionalParams,
+    build_surface,
+)
+from qols.engine.wkb import multilinestring_z_wkb, multipolygon_z_wkb  # noqa: E402
+
+REPEAT = 50
+FRAME_MS = 1000.0 / 60.0
+
+CASES = (
+    ("Approach", ApproachBuilder, ApproachParams(), FRAME_MS),
+    ("Transitional", TransitionalBuilder, TransitionalParams(), FRAME_MS),
+    ("OFZ", OfzBuilder, OfzParams(), FRAME_MS),
+    ("Conical", ConicalBuilder, ConicalParams(contour_interval_m=1), 100.0),
+)
+
+
+def make_runway():
+    start, end = (500000.0, 4000000.0), (503200.0, 4000400.0)
+    return RunwayGeometry(centerline=[start, end], thresholds=[start, end], arp_points=[start], length=3225.0)
+
+
+def refresh(builder, params, runway):
+    result = build_surface(builder, params, runway)
+    parts = (*result.related, result)
+    records = [record for part in parts for record in part.features]
+    wkb = [multipolygon_z_wkb([record.rings for record in records if not record.cutouts])]
+    lines = [line.points for part in parts for line in part.contours]
+    if lines:
+        wkb.append(multilinestring_z_wkb(lines))
+    return result, wkb
+
+
+def main():
+    runway = make_runway()
+    print(f"{'surface':>12} {'features':>8} {'contours':>8} {'ms/refresh':>11} {'budget':>8}")
+    for label, builder_class, params, budget_ms in CASES:
+        builder = builder_class()
+        result, _wkb = refresh(builder, params, runway)  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            refresh(builder, params, runway)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0 / REPEAT
+        verdict = "ok" if elapsed_ms <= budget_ms else "OVER"
+        print(f"{label:>12} {len(result.features):>8} {len(result.contours):>8} "
+              f"{elapsed_ms:>11.2f} {budget_ms:>6.1f} {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark: contour geometries from packed WKB vs. vertex-by-vertex.
+
+Builds the Conical contour rings of a default run at a 1 m interval,
+repeated as for a multi-runway aerodrome (thousands of rings, hundreds of
+vertices each), and times turning them into geometries:
+
+* ``wkb``     — :func:`qols.engine.wkb.linestring_z_wkb` (+ ``fromWkb``),
+* ``columns`` — ``QgsLineString`` from three ``tolist()`` columns,
+* ``points``  — one ``QgsPoint`` per vertex, as the old scripts did.
+
+Without a QGIS session only the Python-side work is timed: WKB packing
+against the per-vertex tuples the ``points`` path has to create.
+
+Run from the repository root::
+
+    python benchmarks/bench_wkb_features.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qols.engine import ConicalBuilder, ConicalParams, RunwayGeometry  # noqa: E402
+from qols.engine.wkb import linestring_z_wkb  # noqa: E402
+
+RUNWAYS = 40
+
+
+def make_lines():
+    start, end = (500000.0, 4000000.0), (503200.0, 4000400.0)
+    runway = RunwayGeometry(centerline=[start, end], thresholds=[start, end], arp_points=[start], length=3225.0)
+    return ConicalBuilder().build(ConicalParams(contour_interval_m=1), runway).contours * RUNWAYS
+
+
+def timed(label, func, lines, baseline=None):
+    t0 = time.perf_counter()
+    for line in lines:
+        func(line.points)
+    elapsed = time.perf_counter() - t0
+    speedup = f"{baseline / elapsed:>8.1f}x" if baseline else f"{'':>9}"
+    print(f"{label:>8} {elapsed:>9.3f} s {speedup}")
+    return elapsed
+
+
+def main():
+    lines = make_lines()
+    vertices = sum(len(line.points) for line in lines)
+    print(f"{len(lines)} contour rings, {vertices} vertices")
+    try:
+        from qgis.core import QgsGeometry, QgsLineString, QgsPoint
+    except ImportError:
+        print("QGIS not available: timing the Python-side work only")
+        slow = timed("tuples", lambda pts: [(x, y, z) for x, y, z in pts.tolist()], lines)
+        timed("wkb", linestring_z_wkb, lines, slow)
+        return
+
+    def from_wkb(pts):
+        geom = QgsGeometry()
+        geom.fromWkb(linestring_z_wkb(pts))
+        return geom
+
+    slow = timed("points", lambda pts: QgsGeometry(QgsLineString([QgsPoint(*p) for p in pts.tolist()])), lines)
+    timed("columns", lambda pts: QgsGeometry(QgsLineString(*(c.tolist() for c in pts.T))), lines, slow)
+    timed("wkb", from_wkb, lines, slow)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,40 @@
 """
 Custom icons manager for qOLS plugin
 Provides intuitive icons for different layer types instead of default gray cubes
+
+Rendered pixmaps are cached per (icon, size, devicePixelRatio), so an SVG
+is rasterised once per session and screen scale rather than on every call;
+:func:`clear_icon_cache` drops them (plugin unload).
 """
 
 import os
-from qgis.PyQt.QtGui import QIcon, QPixmap, QPainter
+from qgis.PyQt.QtGui import QGuiApplication, QIcon, QPixmap, QPainter
 from qgis.PyQt.QtCore import QSize
 from qgis.PyQt.QtSvg import QSvgRenderer
 from ..compat import COLOR_LIGHT_GRAY, COLOR_DARK_GRAY, RENDER_ANTIALIAS
 
+# (svg path or '<layer>', logical size, devicePixelRatio) -> QPixmap
+_pixmap_cache: dict = {}
+
+
+def clear_icon_cache():
+    """Drop every cached icon pixmap."""
+    _pixmap_cache.clear()
+
+
+def _device_pixel_ratio():
+    """devicePixelRatio of the primary screen (1.0 without one)."""
+    screen = QGuiApplication.primaryScreen() if QGuiApplication.instance() is not None else None
+    return float(screen.devicePixelRatio()) if screen is not None else 1.0
+
+
+def _blank_pixmap(size, dpr):
+    """Transparent pixmap of logical ``size`` backed by size * dpr pixels."""
+    pixmap = QPixmap(QSize(round(size * dpr), round(size * dpr)))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(0x00000000)  # Transparent background
+    return pixmap
+
 
 class QolsIconManager:
     """Manager for custom qOLS icons"""
@@ -34,8 +60,12 @@ class QolsIconManager:
         return self._create_layer_icon(size)
 
     def _create_icon_from_svg(self, svg_filename, size):
-        """Create QIcon from SVG file"""
+        """Create QIcon from SVG file (rendered once per size and screen scale)"""
         svg_path = os.path.join(self.icons_dir, svg_filename)
+        dpr = _device_pixel_ratio()
+        pixmap = _pixmap_cache.get((svg_path, size, dpr))
+        if pixmap is not None:
+            return QIcon(pixmap)
 
         if not os.path.exists(svg_path):
             # Return default icon if SVG doesn't exist
@@ -44,13 +74,13 @@ class QolsIconManager:
         try:
             # Load SVG and render to pixmap
             svg_renderer = QSvgRenderer(svg_path)
-            pixmap = QPixmap(QSize(size, size))
-            pixmap.fill(0x00000000)  # Transparent background
+            pixmap = _blank_pixmap(size, dpr)
 
             painter = QPainter(pixmap)
             svg_renderer.render(painter)
             painter.end()
 
+            _pixmap_cache[(svg_path, size, dpr)] = pixmap
             return QIcon(pixmap)
 
         except Exception as e:
@@ -59,8 +89,11 @@ class QolsIconManager:
 
     def _create_layer_icon(self, size):
         """Create a simple, better layer icon than default gray cube"""
-        pixmap = QPixmap(QSize(size, size))
-        pixmap.fill(0x00000000)  # Transparent background
+        dpr = _device_pixel_ratio()
+        pixmap = _pixmap_cache.get(('<layer>', size, dpr))
+        if pixmap is not None:
+            return QIcon(pixmap)
+        pixmap = _blank_pixmap(size, dpr)
 
         painter = QPainter(pixmap)
         painter.setRenderHint(RENDER_ANTIALIAS)
@@ -80,6 +113,7 @@ class QolsIconManager:
             painter.drawLine(4, y, size-4, y)
 
         painter.end()
+        _pixmap_cache[('<layer>', size, dpr)] = pixmap
         return QIcon(pixmap)
 
 
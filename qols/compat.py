@@ -15,7 +15,10 @@ will flag these lines; that's expected and not a bug.
 from qgis.PyQt.QtCore import Qt, QEvent
 from qgis.PyQt.QtGui import QPainter
 from qgis.PyQt.QtWidgets import QDialog, QDialogButtonBox, QMessageBox
-from qgis.core import Qgis, QgsWkbTypes, QgsAction, QgsMapLayerProxyModel, QgsVectorFileWriter, QgsUnitTypes
+from qgis.core import (
+    Qgis, QgsWkbTypes, QgsAction, QgsFieldProxyModel, QgsMapLayerProxyModel, QgsTask, QgsVectorFileWriter,
+    QgsUnitTypes,
+)
 
 # ---------------------------------------------------------------------------
 # Dock-widget area constants
@@ -179,6 +182,35 @@ try:
 except AttributeError:
     FILTER_VECTOR_LAYER = QgsMapLayerProxyModel.VectorLayer  # type: ignore[attr-defined]
 
+try:
+    FILTER_POINT_LAYER = QgsMapLayerProxyModel.Filter.PointLayer
+except AttributeError:
+    FILTER_POINT_LAYER = QgsMapLayerProxyModel.PointLayer  # type: ignore[attr-defined]
+
+try:
+    FILTER_RASTER_LAYER = QgsMapLayerProxyModel.Filter.RasterLayer
+except AttributeError:
+    FILTER_RASTER_LAYER = QgsMapLayerProxyModel.RasterLayer  # type: ignore[attr-defined]
+
+try:
+    FIELD_FILTER_NUMERIC = QgsFieldProxyModel.Filter.Numeric
+except AttributeError:
+    FIELD_FILTER_NUMERIC = QgsFieldProxyModel.Numeric  # type: ignore[attr-defined]
+
+# ---------------------------------------------------------------------------
+# Checkable list items (obstacle evaluation surface list)
+# Qt5 (PyQt5):  Qt.ItemIsUserCheckable / Qt.Checked
+# Qt6 (PyQt6):  Qt.ItemFlag.ItemIsUserCheckable / Qt.CheckState.Checked
+# ---------------------------------------------------------------------------
+try:
+    ITEM_IS_USER_CHECKABLE = Qt.ItemFlag.ItemIsUserCheckable
+    CHECK_CHECKED = Qt.CheckState.Checked
+    CHECK_UNCHECKED = Qt.CheckState.Unchecked
+except AttributeError:
+    ITEM_IS_USER_CHECKABLE = Qt.ItemIsUserCheckable  # type: ignore[attr-defined]
+    CHECK_CHECKED = Qt.Checked                       # type: ignore[attr-defined]
+    CHECK_UNCHECKED = Qt.Unchecked                   # type: ignore[attr-defined]
+
 # ---------------------------------------------------------------------------
 # QgsVectorFileWriter / QgsUnitTypes constants (KML export, #153)
 # Qt5 (PyQt5):  flat attributes on each class
@@ -214,6 +246,26 @@ try:
 except AttributeError:
     ACTION_TYPE_GENERIC_PYTHON = QgsAction.GenericPython  # type: ignore[attr-defined]
 
+# ---------------------------------------------------------------------------
+# QgsTask flags (background surface builds)
+# Qt5 (PyQt5):  QgsTask.CanCancel
+# Qt6 (PyQt6):  QgsTask.Flag.CanCancel
+# ---------------------------------------------------------------------------
+try:
+    TASK_CAN_CANCEL = QgsTask.Flag.CanCancel
+except AttributeError:
+    TASK_CAN_CANCEL = QgsTask.CanCancel  # type: ignore[attr-defined]
+
+# ---------------------------------------------------------------------------
+# Signal connection types (rule-set warm-up thread -> GUI thread)
+# Qt5 (PyQt5):  Qt.QueuedConnection
+# Qt6 (PyQt6):  Qt.ConnectionType.QueuedConnection
+# ---------------------------------------------------------------------------
+try:
+    QUEUED_CONNECTION = Qt.ConnectionType.QueuedConnection
+except AttributeError:
+    QUEUED_CONNECTION = Qt.QueuedConnection  # type: ignore[attr-defined]
+
 __all__ = [
     "DOCK_RIGHT", "DOCK_LEFT",
     "BTN_SAVE", "BTN_CANCEL", "BTN_OK", "BTN_ROLE_ACTION",
@@ -225,8 +277,11 @@ __all__ = [
     "EVENT_MOUSE_MOVE",
     "GEOM_TYPE_POLYGON", "GEOM_TYPE_POINT", "GEOM_TYPE_LINE",
     "WKB_LINE_STRING", "WKB_MULTI_LINE_STRING",
-    "FILTER_VECTOR_LAYER",
+    "FILTER_VECTOR_LAYER", "FILTER_POINT_LAYER", "FILTER_RASTER_LAYER", "FIELD_FILTER_NUMERIC",
+    "ITEM_IS_USER_CHECKABLE", "CHECK_CHECKED", "CHECK_UNCHECKED",
     "SYMBOLOGY_NO_SYMBOLOGY", "FILE_ACTION_CREATE_OR_OVERWRITE",
     "DISTANCE_UNIT_DEGREES", "WRITER_NO_ERROR",
     "ACTION_TYPE_GENERIC_PYTHON",
+    "TASK_CAN_CANCEL",
+    "QUEUED_CONNECTION",
 ]
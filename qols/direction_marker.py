@@ -6,33 +6,36 @@ Mirrors qpansopy's OMNI SID DER marker: a small triangle, tip pointing the
 way the surface will extend, sized in screen pixels so it stays visible at
 any zoom. The triangle/azimuth math is pure Python (no QGIS dependency) so
 it can be unit tested directly; ``build_marker_geometry`` is the thin
-QGIS-aware wrapper the dockwidgets call.
+QGIS-aware wrapper the dockwidgets call. It takes the runway ends and
+anchor threshold from :mod:`qols.runway_context`, and keeps the resulting
+(tip, azimuth) per (layers, selection mode, direction) until either layer
+changes — only the triangle's size depends on the canvas scale, so a zoom
+step just re-runs ``triangle_marker_vertices``.
 
 The direction formula mirrors the ``s``-index convention ported from the
 legacy ``TransitionalSurface_UTM.py`` into the New OLS scripts (see #113):
 ``s = direction; near_end_pt = line_pts[s]; far_end_pt = line_pts[-1 - s]``.
-
-The threshold-anchoring shortcut (``resolve_anchor_feature``) mirrors
-#132's fix in ``new-ols-ofs-approach-UTM.py``: with exactly one
-threshold candidate, use it directly instead of re-deriving it by
-distance to ``near_end_pt`` — otherwise the marker jumps to the
-opposite threshold every time direction is toggled, since
-``near_end_pt`` itself flips between the runway's two endpoints. #132
-fixed this for the real OFS Approach calculation but the fix was never
-propagated to this shared preview module, discovered while testing
-#161's Take-off Climb subtab.
 """
 from __future__ import annotations
 
 import math
+from typing import Optional
+
+from .layer_access import add_invalidation_listener, revalidate_layer, watch_layer
 
 __all__ = [
     "resolve_direction_azimuth",
     "triangle_marker_vertices",
-    "resolve_anchor_feature",
+    "marker_anchor",
     "build_marker_geometry",
+    "clear_marker_cache",
 ]
 
+# (runway layer id, threshold layer id, direction, use_runway_selected,
+#  use_threshold_selected) -> (tip, azimuth_deg), or None when the inputs
+# don't resolve. Selection changes arrive through the layers' signals.
+_anchors: dict = {}
+
 
 # ---------------------------------------------------------------------------
 # Pure geometry helpers (no QGIS dependency — operate on plain (x, y) tuples)
@@ -86,58 +89,35 @@ def triangle_marker_vertices(
 # QGIS-aware wrapper
 # ---------------------------------------------------------------------------
 
-def _resolve_features(layer, use_selected_feature):
-    if use_selected_feature:
-        return list(layer.selectedFeatures())
-    return list(layer.selectedFeatures()) or list(layer.getFeatures())
-
-
-def _normalize_polyline_points(geometry) -> list[tuple[float, float]]:
-    """Returns the runway centerline as a list of (x, y) tuples, picking the
-    longest part for a MultiLineString. Returns [] on anything unusable —
-    this feeds a live preview, so it must never raise."""
-    if geometry is None or geometry.isEmpty():
-        return []
-    if geometry.isMultipart():
-        parts = geometry.asMultiPolyline()
-        if not parts:
-            return []
-
-        def part_len(pts):
-            if not pts or len(pts) < 2:
-                return 0.0
-            total = 0.0
-            for i in range(1, len(pts)):
-                total += math.hypot(pts[i].x() - pts[i - 1].x(), pts[i].y() - pts[i - 1].y())
-            return total
-
-        longest = max(parts, key=part_len)
-        return [(p.x(), p.y()) for p in longest]
-    poly = geometry.asPolyline()
-    if poly and len(poly) >= 2:
-        return [(p.x(), p.y()) for p in poly]
-    return []
-
-
-def _closest_feature(features, pt: tuple[float, float]):
-    return min(
-        features,
-        key=lambda f: math.hypot(f.geometry().asPoint().x() - pt[0], f.geometry().asPoint().y() - pt[1]),
-    )
-
-
-def resolve_anchor_feature(candidates, near_end_pt, closest_fn=_closest_feature):
-    """Mirrors #132's fix (``new-ols-ofs-approach-UTM.py``): with exactly
-    one candidate, use it directly rather than re-deriving it by distance
-    to ``near_end_pt``. A single selection isn't ambiguous, and
-    ``near_end_pt`` — which flips between the runway's two endpoints when
-    direction toggles — shouldn't be able to make the marker jump away
-    from the one feature the user actually selected. #132 fixed this for
-    the real OFS Approach calculation but never propagated the fix here,
-    so the preview marker kept jumping between thresholds on every tab."""
-    if len(candidates) == 1:
-        return candidates[0]
-    return closest_fn(candidates, near_end_pt)
+def marker_anchor(
+    runway_layer, threshold_layer, direction: int, use_runway_selected: bool, use_threshold_selected: bool,
+) -> Optional[tuple[tuple[float, float], float]]:
+    """``(tip, azimuth_deg)`` of the marker — the anchor threshold and the
+    far-to-near runway bearing — or None when the inputs don't resolve.
+    Cached until either layer's geometry, features or selection change."""
+    revalidate_layer(runway_layer)
+    revalidate_layer(threshold_layer)
+    key = (runway_layer.id(), threshold_layer.id(), int(direction),
+           bool(use_runway_selected), bool(use_threshold_selected))
+    if key in _anchors:
+        return _anchors[key]
+
+    from .runway_context import runway_context
+
+    # Watch both layers even when resolving fails (e.g. nothing selected
+    # yet), so the cached None is dropped once they change.
+    watch_layer(runway_layer)
+    watch_layer(threshold_layer)
+    try:
+        context = runway_context(
+            runway_layer, threshold_layer, direction, use_runway_selected, use_threshold_selected)
+    except Exception:
+        context = None  # no selection, degenerate centerline, ...
+    anchor = None
+    if context is not None and context.anchor_threshold is not None:
+        anchor = (context.anchor_threshold, context.azimuth)
+    _anchors[key] = anchor
+    return anchor
 
 
 def build_marker_geometry(
@@ -159,25 +139,12 @@ def build_marker_geometry(
     if runway_layer is None or threshold_layer is None or not map_units_per_pixel:
         return None
 
-    from qgis.core import QgsGeometry, QgsLineString, QgsPoint, QgsPolygon
-
-    runway_sel = _resolve_features(runway_layer, use_runway_selected)
-    threshold_sel = _resolve_features(threshold_layer, use_threshold_selected)
-    if not runway_sel or not threshold_sel:
-        return None
-
-    line_pts = _normalize_polyline_points(runway_sel[0].geometry())
-    if len(line_pts) < 2:
-        return None
-
-    try:
-        near_end_pt, _far_end_pt, azimuth_deg = resolve_direction_azimuth(line_pts, direction)
-    except IndexError:
+    anchor = marker_anchor(runway_layer, threshold_layer, direction, use_runway_selected, use_threshold_selected)
+    if anchor is None:
         return None
+    tip, azimuth_deg = anchor
 
-    near_thr_feat = resolve_anchor_feature(threshold_sel, near_end_pt)
-    thr_pt = near_thr_feat.geometry().asPoint()
-    tip = (thr_pt.x(), thr_pt.y())
+    from qgis.core import QgsGeometry, QgsLineString, QgsPoint, QgsPolygon
 
     length_m = length_px * map_units_per_pixel
     half_width_m = half_width_px * map_units_per_pixel
@@ -185,3 +152,16 @@ def build_marker_geometry(
 
     ring = [QgsPoint(*tip_xy), QgsPoint(*base_left), QgsPoint(*base_right)]
     return QgsGeometry(QgsPolygon(QgsLineString(ring)))
+
+
+def _invalidate_anchors(layer_id: str) -> None:
+    for key in [key for key in _anchors if layer_id in (key[0], key[1])]:
+        del _anchors[key]
+
+
+def clear_marker_cache() -> None:
+    """Drop every cached anchor (plugin unload)."""
+    _anchors.clear()
+
+
+add_invalidation_listener(_invalidate_anchors)
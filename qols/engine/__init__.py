@@ -0,0 +1,132 @@
+"""qols/engine — headless surface builders.
+
+Pure-Python surface geometry: parameter dataclasses in, plain 3D rings and
+attribute records out. Nothing here imports ``qgis`` at module level, so
+the builders run (and can be scripted or batch-evaluated) without a QGIS
+session; :mod:`qols.engine.qgis_adapter` turns a
+:class:`~qols.engine.records.SurfaceResult` into memory layers.
+"""
+
+from .approach import ApproachBuilder, ApproachParams
+from .base import (
+    BuildCanceled,
+    SurfaceBuilder,
+    SurfaceParams,
+    build_feedback,
+    build_hook,
+    build_memo,
+    build_surface,
+    memoized_build,
+    param,
+    progress_span,
+)
+from .horizontal import (
+    ConicalBuilder,
+    ConicalParams,
+    InnerConicalBuilder,
+    InnerConicalParams,
+    InnerHorizontalBuilder,
+    InnerHorizontalParams,
+    OuterHorizontalBuilder,
+    OuterHorizontalParams,
+)
+from .new_ols_approach import NewOlsOfsApproachBuilder, NewOlsOfsApproachParams
+from .new_ols_departure import NewOlsOesDepartureBuilder, NewOlsOesDepartureParams
+from .new_ols_horizontal import NewOlsOesHorizontalBuilder, NewOlsOesHorizontalParams
+from .new_ols_precision_approach import NewOlsOesPrecisionApproachBuilder, NewOlsOesPrecisionApproachParams
+from .new_ols_straight_in_approach import NewOlsOesStraightInApproachBuilder, NewOlsOesStraightInApproachParams
+from .new_ols_takeoff_climb import NewOlsOesTakeoffClimbBuilder, NewOlsOesTakeoffClimbParams
+from .new_ols_transitional import NewOlsOesTransitionalBuilder, NewOlsOesTransitionalParams
+from .ofz import OfzBuilder, OfzParams
+from .patches import PatchTable
+from .records import CONTOUR_FIELDS, ContourLine, SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+from .takeoff import TakeoffBuilder, TakeoffParams
+from .transitional import TransitionalBuilder, TransitionalParams
+
+# SurfaceType value -> builder class, one per surface the dockwidget offers.
+BUILDERS = {
+    cls.surface_type: cls
+    for cls in (
+        ApproachBuilder,
+        ConicalBuilder,
+        InnerHorizontalBuilder,
+        InnerConicalBuilder,
+        OfzBuilder,
+        OuterHorizontalBuilder,
+        TakeoffBuilder,
+        TransitionalBuilder,
+        NewOlsOfsApproachBuilder,
+        NewOlsOesTransitionalBuilder,
+        NewOlsOesHorizontalBuilder,
+        NewOlsOesDepartureBuilder,
+        NewOlsOesPrecisionApproachBuilder,
+        NewOlsOesStraightInApproachBuilder,
+        NewOlsOesTakeoffClimbBuilder,
+    )
+}
+
+
+def get_builder(surface_type: str) -> SurfaceBuilder:
+    """Return a builder instance for a ``SurfaceType`` value.
+
+    Raises:
+        KeyError: if no builder is registered for ``surface_type``.
+    """
+    return BUILDERS[surface_type]()
+
+
+__all__ = [
+    # base / records
+    "param",
+    "SurfaceParams",
+    "SurfaceBuilder",
+    "BuildCanceled",
+    "build_surface",
+    "build_hook",
+    "build_feedback",
+    "progress_span",
+    "build_memo",
+    "memoized_build",
+    "RunwayGeometry",
+    "SurfaceFeature",
+    "ContourLine",
+    "SurfaceResult",
+    "CONTOUR_FIELDS",
+    "PatchTable",
+    # registry
+    "BUILDERS",
+    "get_builder",
+    # current OLS
+    "ApproachParams",
+    "ApproachBuilder",
+    "ConicalParams",
+    "ConicalBuilder",
+    "InnerHorizontalParams",
+    "InnerHorizontalBuilder",
+    "InnerConicalParams",
+    "InnerConicalBuilder",
+    "OfzParams",
+    "OfzBuilder",
+    "OuterHorizontalParams",
+    "OuterHorizontalBuilder",
+    "TakeoffParams",
+    "TakeoffBuilder",
+    "TransitionalParams",
+    "TransitionalBuilder",
+    # new OLS
+    "NewOlsOfsApproachParams",
+    "NewOlsOfsApproachBuilder",
+    "NewOlsOesTransitionalParams",
+    "NewOlsOesTransitionalBuilder",
+    "NewOlsOesHorizontalParams",
+    "NewOlsOesHorizontalBuilder",
+    "NewOlsOesDepartureParams",
+    "NewOlsOesDepartureBuilder",
+    "NewOlsOesPrecisionApproachParams",
+    "NewOlsOesPrecisionApproachBuilder",
+    "NewOlsOesStraightInApproachParams",
+    "NewOlsOesStraightInApproachBuilder",
+    "NewOlsOesTakeoffClimbParams",
+    "NewOlsOesTakeoffClimbBuilder",
+]
@@ -0,0 +1,162 @@
+"""qols/engine/approach.py — Approach Surface (first / second / horizontal
+sections), the engine half of ``approach-surface-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..scripts import _contour_utils as cu
+from ..surface_types import SurfaceType
+from .base import SurfaceBuilder, SurfaceParams, param
+from .contours import axis_contour_lines
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable, axis_plane
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["ApproachParams", "ApproachBuilder"]
+
+APPROACH_FIELDS = (
+    ("ID", "string"),
+    ("SurfaceName", "string"),
+    ("SurfaceType", "string"),
+    ("Code", "int"),
+    ("rule_set", "string"),
+    ("surface_start_elev", "double"),
+    ("surface_end_elev", "double"),
+)
+
+
+@dataclasses.dataclass
+class ApproachParams(SurfaceParams):
+    runway_code: int = param(4, "code")
+    rwy_classification: str = param("Precision Approach CAT I", "rwyClassification")
+    approach_width_m: float = param(280.0, "widthApp")
+    start_elevation_m: float = param(21.7, "Z0")
+    end_elevation_m: float = param(21.7, "ZE")
+    arp_elevation_m: float = param(29.3, "ARPH")
+    first_section_length_m: float = param(3000.0, "L1")
+    second_section_length_m: float = param(3600.0, "L2")
+    horizontal_section_length_m: float = param(8400.0, "LH")
+    direction: int = param(0, "s")
+    first_section_slope: float = param(0.02, "slope1")
+    second_section_slope: float = param(0.025, "slope2")
+    divergence_ratio: float = param(0.15, "divergence")
+    threshold_offset_m: float = param(60.0, "thr_offset")
+    contour_interval_m: int = param(0)
+
+
+class ApproachBuilder(SurfaceBuilder):
+    """Approach Surface sections anchored on the threshold nearest the
+    direction-selected runway end (#113)."""
+
+    surface_type = SurfaceType.APPROACH
+    params_class = ApproachParams
+
+    def build(self, params: ApproachParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        near_end, far_end = runway.directed_ends(p.direction)
+        az = azimuth(far_end, near_end)
+        thr = runway.closest_threshold(near_end)
+        z0 = p.start_elevation_m
+
+        l1 = max(0.0, float(p.first_section_length_m))
+        l2 = max(0.0, float(p.second_section_length_m))
+        lh = max(0.0, float(p.horizontal_section_length_m))
+        half_w = p.approach_width_m / 2
+
+        pt_01 = with_z(project(thr, p.threshold_offset_m, az), z0)
+
+        def edge(distance, z):
+            ctr = project(pt_01, distance, az)
+            hw = half_w + distance * p.divergence_ratio
+            return with_z(project(ctr, hw, az + 90), z), with_z(project(ctr, hw, az - 90), z)
+
+        near_l, near_r = edge(0.0, z0)
+        sections = []  # (name, [farRight, farLeft, nearLeft, nearRight], z_start, z_end)
+        # Each section rises linearly along the axis from its near edge.
+        patches = PatchTable()
+
+        def add_section_patch(ring, distance, z, slope):
+            origin = with_z(project(pt_01, distance, az), z)
+            patches.add_plane([ring], axis_plane(origin, az, slope), len(sections))
+
+        dist_first_end, height_first_end = 0.0, z0
+        if l1 > 0:
+            dist_first_end = l1
+            height_first_end = z0 + l1 * p.first_section_slope
+            far_l, far_r = edge(dist_first_end, height_first_end)
+            add_section_patch([far_r, far_l, near_l, near_r], 0.0, z0, p.first_section_slope)
+            sections.append(('Approach First Section', [far_r, far_l, near_l, near_r], z0, height_first_end))
+            near_l, near_r = far_l, far_r
+
+        dist_second_end, height_second_end = dist_first_end, height_first_end
+        if l2 > 0:
+            dist_second_end = dist_first_end + l2
+            height_second_end = height_first_end + l2 * p.second_section_slope
+            far_l, far_r = edge(dist_second_end, height_second_end)
+            add_section_patch([far_r, far_l, near_l, near_r], dist_first_end, height_first_end,
+                              p.second_section_slope)
+            sections.append(('Approach Second Section', [far_r, far_l, near_l, near_r],
+                             height_first_end, height_second_end))
+            near_l, near_r = far_l, far_r
+
+        if l2 > 0 and lh > 0:
+            far_l, far_r = edge(dist_second_end + lh, height_second_end)
+            add_section_patch([far_r, far_l, near_l, near_r], dist_second_end, height_second_end, 0.0)
+            sections.append(('Approach Horizontal Section', [far_r, far_l, near_l, near_r],
+                             height_second_end, height_second_end))
+
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name=f"RWY_ApproachSurface_{p.rwy_classification}_Code{p.runway_code}",
+            fields=APPROACH_FIELDS,
+            contour_layer_name="RWY_ApproachSurface_Contours",
+            info={
+                "azimuth": az,
+                "threshold": (thr[0], thr[1], z0),
+                "zih_elevation_m": 45 + p.arp_elevation_m,
+                "first_section_length_m": l1,
+                "second_section_length_m": l2,
+                "horizontal_section_length_m": lh,
+            },
+            patches=patches,
+        )
+        for fid, (name, ring, z_start, z_end) in enumerate(sections, start=6):
+            result.features.append(SurfaceFeature(
+                rings=[close_ring(ring)],
+                attributes={
+                    "ID": fid,
+                    "SurfaceName": name,
+                    "SurfaceType": p.rwy_classification,
+                    "Code": p.runway_code,
+                    "rule_set": p.rule_set,
+                    "surface_start_elev": round(z_start, 3),
+                    "surface_end_elev": round(z_end, 3),
+                },
+            ))
+
+        interval = int(p.contour_interval_m)
+        if interval > 0:
+            specs = []
+            if l1 > 0 and p.first_section_slope > 0:
+                specs += cu.contour_specs_for_linear_section(
+                    z_section_start=z0,
+                    z_section_end=height_first_end,
+                    slope=p.first_section_slope,
+                    d_offset=0.0,
+                    near_half_width=half_w,
+                    divergence_ratio=p.divergence_ratio,
+                    elevations=cu.contour_elevations(z0, height_first_end, interval),
+                )
+            if l2 > 0 and p.second_section_slope > 0:
+                specs += cu.contour_specs_for_linear_section(
+                    z_section_start=height_first_end,
+                    z_section_end=height_second_end,
+                    slope=p.second_section_slope,
+                    d_offset=dist_first_end,
+                    near_half_width=half_w,
+                    divergence_ratio=p.divergence_ratio,
+                    elevations=cu.contour_elevations(height_first_end, height_second_end, interval),
+                )
+            result.contours = axis_contour_lines(pt_01, az, specs)
+        return result
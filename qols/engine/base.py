@@ -0,0 +1,220 @@
+"""qols/engine/base.py — builder and parameter-object base classes.
+
+Each surface gets a ``@dataclass`` parameter object (pythonic field names,
+defaults from the ICAO tables) and a :class:`SurfaceBuilder` subclass whose
+``build(params, runway)`` returns a :class:`~qols.engine.records.SurfaceResult`.
+
+``SurfaceParams.from_namespace`` reads the flat ``params`` +
+``specific_params`` mapping the dockwidget produces (the same names the
+exec() scripts saw as globals). Every field lists the keys it accepts in
+lookup order, so legacy aliases (``Z0``, ``widthApp``, ``s`` …) keep
+working exactly as each script's ``globals().get(...)`` chain did.
+
+Scripts call :func:`build_surface` rather than ``builder.build`` so the
+plugin can intercept the build (:func:`build_hook`) and run it off the
+GUI thread; inside a build, :meth:`SurfaceBuilder.report` forwards
+progress to the active :func:`build_feedback` object and raises
+:class:`BuildCanceled` once it is canceled. Builders that compose another
+surface (Inner Horizontal inside Inner + Conical) build it through
+:func:`memoized_build`, so an active :func:`build_memo` can serve it from
+the surface cache.
+"""
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import threading
+from typing import Any, Callable, ClassVar, Iterable, Mapping, Optional
+
+from .records import SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = [
+    "param",
+    "SurfaceParams",
+    "SurfaceBuilder",
+    "BuildCanceled",
+    "build_surface",
+    "build_hook",
+    "build_feedback",
+    "progress_span",
+    "build_memo",
+    "memoized_build",
+]
+
+_MISSING = object()
+
+# Per-thread build state: the interception hook (GUI thread, while a script
+# runs), the feedback object plus its progress span and the sub-build memo
+# (worker thread).
+_state = threading.local()
+
+
+class BuildCanceled(Exception):
+    """Raised inside a build when its feedback object reports cancellation."""
+
+
+def param(default: Any, *keys: str, convert: Optional[Callable[[Any], Any]] = None) -> Any:
+    """Dataclass field with namespace lookup keys.
+
+    ``keys`` are tried in order by ``from_namespace``; the field name itself
+    is always tried first. ``convert`` defaults to the type of ``default``
+    (``int``/``float``/``str``/``bool``) and is skipped for ``None``.
+    """
+    if convert is None and default is not None:
+        convert = type(default)
+    return dataclasses.field(default=default, metadata={"keys": keys, "convert": convert})
+
+
+@dataclasses.dataclass
+class SurfaceParams:
+    """Base parameter object. ``rule_set`` is the active rule-set label
+    written to every surface's ``rule_set`` attribute."""
+
+    rule_set: Optional[str] = param(None, "active_rule_set", convert=str)
+
+    @classmethod
+    def from_namespace(cls, namespace: Mapping[str, Any]) -> "SurfaceParams":
+        """Build from a flat script namespace (``params`` merged with
+        ``specific_params``). Missing keys fall back to the field default."""
+        values = {}
+        for f in dataclasses.fields(cls):
+            if not f.init:
+                continue
+            meta = f.metadata
+            keys = (f.name,) + tuple(meta.get("keys", ()))
+            raw = _MISSING
+            for key in keys:
+                if key in namespace:
+                    raw = namespace[key]
+                    break
+            if raw is _MISSING:
+                continue
+            convert = meta.get("convert")
+            if convert is not None and raw is not None:
+                raw = convert(raw)
+            values[f.name] = raw
+        return cls(**values)
+
+    def as_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+class SurfaceBuilder:
+    """Pure surface builder: parameters + runway coordinates in, plain
+    geometry and attribute records out. Subclasses set ``surface_type``,
+    ``params_class`` and implement :meth:`build`."""
+
+    surface_type: ClassVar[str]
+    params_class: ClassVar[type[SurfaceParams]] = SurfaceParams
+
+    def build(self, params: SurfaceParams, runway: RunwayGeometry) -> SurfaceResult:
+        raise NotImplementedError
+
+    def report(self, done: int, total: int) -> None:
+        """Progress hook for long loops (rings, tiers, contour levels):
+        ``done`` of ``total`` steps of the current build. A no-op unless a
+        :func:`build_feedback` is active on this thread.
+
+        Raises:
+            BuildCanceled: if the feedback object has been canceled.
+        """
+        feedback = getattr(_state, "feedback", None)
+        if feedback is None:
+            return
+        if feedback.isCanceled():
+            raise BuildCanceled()
+        low, high = getattr(_state, "span", None) or (0.0, 100.0)
+        feedback.setProgress(low + (high - low) * done / max(total, 1))
+
+    def params_from_namespace(self, namespace: Mapping[str, Any]) -> SurfaceParams:
+        return self.params_class.from_namespace(namespace)
+
+    def build_all(self, params: SurfaceParams, runways: Iterable[RunwayGeometry]) -> SurfaceResult:
+        """One layer's worth of features for several runways (the scripts
+        that loop over every selected runway feature)."""
+        runways = list(runways)
+        result = None
+        for i, runway in enumerate(runways):
+            with progress_span(i, len(runways)):
+                part = self.build(params, runway)
+            self.report(i + 1, len(runways))
+            if result is None:
+                result = part
+            else:
+                result.extend(part)
+        if result is None:
+            raise ValueError("No runway features found")
+        return result
+
+
+def build_surface(builder: SurfaceBuilder, params: SurfaceParams, runway) -> SurfaceResult:
+    """``builder.build(params, runway)`` — or ``build_all`` when ``runway``
+    is a sequence of runways — unless a :func:`build_hook` is active, in
+    which case the hook gets the call and its return value is the result."""
+    hook = getattr(_state, "hook", None)
+    if hook is not None:
+        return hook(builder, params, runway)
+    if isinstance(runway, RunwayGeometry):
+        return builder.build(params, runway)
+    return builder.build_all(params, runway)
+
+
+@contextlib.contextmanager
+def build_hook(hook: Callable[[SurfaceBuilder, SurfaceParams, Any], SurfaceResult]):
+    """Route :func:`build_surface` calls on this thread through ``hook``."""
+    previous = getattr(_state, "hook", None)
+    _state.hook = hook
+    try:
+        yield hook
+    finally:
+        _state.hook = previous
+
+
+@contextlib.contextmanager
+def build_feedback(feedback):
+    """Report builds on this thread to ``feedback`` — any object with
+    ``setProgress(percent)`` and ``isCanceled()``, e.g. a ``QgsTask``."""
+    previous = getattr(_state, "feedback", None), getattr(_state, "span", None)
+    _state.feedback, _state.span = feedback, (0.0, 100.0)
+    try:
+        yield feedback
+    finally:
+        _state.feedback, _state.span = previous
+
+
+@contextlib.contextmanager
+def progress_span(index: int, count: int):
+    """Narrow this thread's progress reports to part ``index`` of ``count``
+    of the current span — one runway of ``build_all``, one surface of a
+    batch."""
+    previous = getattr(_state, "span", None)
+    low, high = previous or (0.0, 100.0)
+    step = (high - low) / max(count, 1)
+    _state.span = (low + index * step, low + (index + 1) * step)
+    try:
+        yield
+    finally:
+        _state.span = previous
+
+
+def memoized_build(builder: SurfaceBuilder, params: SurfaceParams, runway: RunwayGeometry) -> SurfaceResult:
+    """``builder.build(params, runway)`` for a surface another builder
+    composes, through the active :func:`build_memo` if there is one. The
+    result may be shared: callers must not modify it."""
+    memo = getattr(_state, "memo", None)
+    if memo is not None:
+        return memo(builder, params, runway)
+    return builder.build(params, runway)
+
+
+@contextlib.contextmanager
+def build_memo(memo: Optional[Callable[[SurfaceBuilder, SurfaceParams, Any], SurfaceResult]]):
+    """Route :func:`memoized_build` calls on this thread through ``memo``
+    (``None`` builds them directly)."""
+    previous = getattr(_state, "memo", None)
+    _state.memo = memo
+    try:
+        yield memo
+    finally:
+        _state.memo = previous
@@ -0,0 +1,103 @@
+"""qols/engine/contours.py — turn ``_contour_utils`` specs into 3D contour
+records.
+
+``qols/scripts/_contour_utils.py`` answers "at which distance / radius /
+edge crossing does the surface reach this elevation"; these helpers place
+the resulting lines in map coordinates so builders can return them as
+:class:`~qols.engine.records.ContourLine` records.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from ..scripts._contour_utils import ContourSpec, contour_elevations, slice_patches
+from .geometry import Point2, project
+from .patches import KIND_CONE, KIND_PLANE, PatchTable
+from .racetrack import DEFAULT_CHORD_TOLERANCE, racetrack_ring, ring_with_z
+from .records import ContourLine
+
+__all__ = [
+    "axis_contour_lines",
+    "slice_contour_lines",
+    "ring_contour_line",
+    "patch_slice_contour_lines",
+    "patch_contour_lines",
+]
+
+
+def axis_contour_lines(
+    origin: Sequence[float],
+    azimuth_deg: float,
+    specs: Iterable[ContourSpec],
+) -> list[ContourLine]:
+    """Cross-axis contour lines (left point first) for surfaces whose
+    elevation grows along a single axis from ``origin`` (Approach,
+    Take-off, OFS Approach)."""
+    lines = []
+    for spec in specs:
+        ctr = project(origin[:2], spec.distance_from_origin, azimuth_deg)
+        left = project(ctr, spec.half_width, azimuth_deg + 90)
+        right = project(ctr, spec.half_width, azimuth_deg - 90)
+        lines.append(ContourLine(
+            points=[(left[0], left[1], spec.elevation), (right[0], right[1], spec.elevation)],
+            elevation=spec.elevation,
+        ))
+    return lines
+
+
+def slice_contour_lines(slices: Iterable[tuple[float, Point2, Point2]]) -> list[ContourLine]:
+    """Contour records from ``contour_specs_for_polygon_slice`` output."""
+    return [
+        ContourLine(points=[(a[0], a[1], elev), (b[0], b[1], elev)], elevation=elev)
+        for elev, a, b in slices
+    ]
+
+
+def ring_contour_line(ring: np.ndarray, elevation: float) -> ContourLine:
+    """A closed ``(N, 2)`` ring contour (Conical) lifted to ``elevation``."""
+    return ContourLine(points=ring_with_z(ring, elevation), elevation=elevation)
+
+
+def patch_slice_contour_lines(patches: Sequence[Sequence], elevations: Sequence[float]) -> list[ContourLine]:
+    """Chained contour polylines of planar 3D patches (``slice_patches``)."""
+    return [
+        ContourLine(points=ring_with_z(line, elevation), elevation=elevation)
+        for elevation, line in slice_patches(patches, elevations)
+    ]
+
+
+def patch_contour_lines(
+    table: PatchTable,
+    interval: int,
+    chord_tolerance: float = DEFAULT_CHORD_TOLERANCE,
+) -> list[ContourLine]:
+    """Contours of every sloped patch of ``table`` every ``interval``
+    metres: plane patches are sliced together in one batch, sloped cones
+    give racetrack rings. Flat patches have no contours; an interval of
+    0 disables them."""
+    if interval <= 0 or not len(table):
+        return []
+    kinds, coeffs = table.kinds, table.coeffs
+    planes = []
+    z_lo, z_hi = np.inf, -np.inf
+    for i in np.flatnonzero((kinds == KIND_PLANE) & ((coeffs[:, 0] != 0) | (coeffs[:, 1] != 0))):
+        a, b, c = coeffs[i, :3]
+        rings = []
+        for ring in table.rings[i]:
+            z = a * ring[:, 0] + b * ring[:, 1] + c
+            rings.append(np.column_stack([ring[:, :2], z]))
+            z_lo, z_hi = min(z_lo, z.min()), max(z_hi, z.max())
+        planes.append(rings)
+    lines = []
+    if planes:
+        lines = patch_slice_contour_lines(planes, contour_elevations(z_lo, z_hi, interval))
+
+    for i in np.flatnonzero((kinds == KIND_CONE) & (coeffs[:, 5] > 0)):
+        ax, ay, bx, by, z0, slope, r_in, r_out = coeffs[i]
+        for elevation in contour_elevations(z0 + slope * r_in, z0 + slope * r_out, interval):
+            radius = (elevation - z0) / slope
+            lines.append(ring_contour_line(racetrack_ring((ax, ay), (bx, by), radius, chord_tolerance), elevation))
+    lines.sort(key=lambda line: line.elevation)
+    return lines
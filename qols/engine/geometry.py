@@ -0,0 +1,92 @@
+"""qols/engine/geometry.py — planar geometry primitives shared by the surface
+builders.
+
+Everything here mirrors the ``QgsPoint`` calls the legacy exec() scripts
+made (``azimuth``, ``project``, ``QgsCircle.toPolygon``) but works on plain
+``(x, y[, z])`` tuples, so the builders in :mod:`qols.engine` never need a
+QGIS import. Racetrack rings live in :mod:`qols.engine.racetrack`.
+"""
+from __future__ import annotations
+
+import math
+from typing import Iterable, Sequence
+
+Point2 = tuple[float, float]
+Point3 = tuple[float, float, float]
+
+__all__ = [
+    "Point2",
+    "Point3",
+    "azimuth",
+    "normalize_azimuth",
+    "project",
+    "with_z",
+    "close_ring",
+    "polyline_length",
+    "longest_polyline",
+    "circle_ring",
+]
+
+
+def azimuth(p1: Sequence[float], p2: Sequence[float]) -> float:
+    """Bearing from p1 to p2 in degrees clockwise from north, in (-180, 180].
+
+    Same range as ``QgsPoint.azimuth`` so the arithmetic the scripts did on
+    top of it (``+ 180``, ``if >= 360``) keeps giving identical angles.
+    """
+    return math.degrees(math.atan2(p2[0] - p1[0], p2[1] - p1[1]))
+
+
+def normalize_azimuth(angle: float) -> float:
+    """Fold ``angle`` into [0, 360)."""
+    return angle % 360.0
+
+
+def project(pt: Sequence[float], distance: float, azimuth_deg: float) -> tuple:
+    """Mirrors ``QgsPoint.project(distance, azimuth)``: 0° = north (+y),
+    90° = east (+x). A Z (third coordinate), if present, is carried over."""
+    rad = math.radians(azimuth_deg)
+    return (pt[0] + distance * math.sin(rad), pt[1] + distance * math.cos(rad)) + tuple(pt[2:3])
+
+
+def with_z(pt: Sequence[float], z: float) -> Point3:
+    """``(x, y, z)`` from any 2D/3D point — the ``QgsPoint.setZ`` equivalent."""
+    return (pt[0], pt[1], float(z))
+
+
+def close_ring(points: Iterable[Sequence[float]]) -> list:
+    """Return ``points`` as a list whose last vertex repeats the first."""
+    ring = [tuple(p) for p in points]
+    if ring and ring[0] != ring[-1]:
+        ring.append(ring[0])
+    return ring
+
+
+def polyline_length(points: Sequence[Sequence[float]]) -> float:
+    """Planar length of a polyline."""
+    return sum(
+        math.hypot(b[0] - a[0], b[1] - a[1])
+        for a, b in zip(points, points[1:])
+    )
+
+
+def longest_polyline(parts: Sequence[Sequence[Sequence[float]]]) -> list[Point2]:
+    """Pick the longest part of a (multi)polyline, the way every script's
+    ``_normalize_polyline_points`` did for MultiLineString runways."""
+    candidates = [list(p) for p in parts if len(p) >= 2]
+    if not candidates:
+        raise ValueError("Empty MultiLineString geometry.")
+    best = max(candidates, key=polyline_length)
+    return [(float(p[0]), float(p[1])) for p in best]
+
+
+def circle_ring(center: Sequence[float], radius: float, segments: int = 360) -> list[Point2]:
+    """Closed circle ring with ``segments`` vertices, starting due north and
+    running counter-clockwise like ``QgsCircle.toPolygon(segments)``."""
+    cx, cy = center[0], center[1]
+    ring = []
+    for i in range(segments):
+        t = math.pi / 2 + 2 * math.pi * i / segments
+        ring.append((cx + radius * math.cos(t), cy + radius * math.sin(t)))
+    ring.append(ring[0])
+    return ring
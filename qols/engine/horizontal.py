@@ -0,0 +1,332 @@
+"""qols/engine/horizontal.py — the racetrack / circle surfaces: Inner
+Horizontal, Conical, the combined Inner Horizontal & Conical build (#124)
+and Outer Horizontal. Engine half of ``inner-horizontal-racetrack.py``,
+``conical.py`` and ``outer-horizontal.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..scripts import _contour_utils as cu
+from ..surface_types import SurfaceType
+from .base import SurfaceBuilder, SurfaceParams, memoized_build, param
+from .contours import ring_contour_line
+from .geometry import azimuth, circle_ring
+from .patches import PatchTable
+from .racetrack import DEFAULT_CHORD_TOLERANCE, racetrack_ring, ring_with_z
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = [
+    "InnerHorizontalParams",
+    "InnerHorizontalBuilder",
+    "ConicalParams",
+    "ConicalBuilder",
+    "InnerConicalParams",
+    "InnerConicalBuilder",
+    "OuterHorizontalParams",
+    "OuterHorizontalBuilder",
+]
+
+INNER_HORIZONTAL_FIELDS = (
+    ("surface_type", "string"),
+    ("radius_m", "double"),
+    ("height_m", "double"),
+    ("datum_elevation_m", "double"),
+    ("rule_set", "string"),
+    ("runway_start_x", "double"),
+    ("runway_start_y", "double"),
+    ("runway_end_x", "double"),
+    ("runway_end_y", "double"),
+    ("azimuth", "double"),
+    ("RWYType", "string"),
+    ("Code", "int"),
+)
+
+CONICAL_FIELDS = (
+    INNER_HORIZONTAL_FIELDS[:4]
+    + (("inner_height_m", "double"), ("slope_pct", "double"))
+    + INNER_HORIZONTAL_FIELDS[4:]
+)
+
+OUTER_HORIZONTAL_FIELDS = (
+    ("surface_type", "string"),
+    ("code", "int"),
+    ("radius_m", "double"),
+    ("height_m", "double"),
+    ("arp_elevation_m", "double"),
+    ("rule_set", "string"),
+    ("arp_x", "double"),
+    ("arp_y", "double"),
+)
+
+
+# ---------------------------------------------------------------------------
+# Inner Horizontal
+# ---------------------------------------------------------------------------
+
+@dataclasses.dataclass
+class InnerHorizontalParams(SurfaceParams):
+    radius: float = param(4000.0)
+    height: float = param(45.0)
+    datum_elevation: float = param(0.0)
+    runway_code: int = param(4, "code")
+    rwy_classification: str = param("Precision Approach CAT I", "rwyClassification")
+    direction: int = param(0)
+    chord_tolerance_m: float = param(DEFAULT_CHORD_TOLERANCE)
+
+    @property
+    def elevation(self) -> float:
+        """Flat Z of the surface: height above the shared datum (#125)."""
+        return self.datum_elevation + self.height
+
+
+class InnerHorizontalBuilder(SurfaceBuilder):
+    """Flat racetrack at datum + height around one runway. The ring is the
+    same for either ``direction``; only the reported azimuth flips."""
+
+    surface_type = SurfaceType.INNER_HORIZONTAL
+    params_class = InnerHorizontalParams
+
+    def build(self, params: InnerHorizontalParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        start, end = runway.start, runway.end
+        az = azimuth(start, end) + 180
+        if az >= 360:
+            az -= 360
+        if p.direction == -1:
+            az += 180
+            if az >= 360:
+                az -= 360
+        back = az + 180
+        if back >= 360:
+            back -= 360
+
+        z = p.elevation
+        ring = racetrack_ring(start, end, p.radius, p.chord_tolerance_m)
+        patches = PatchTable()
+        patches.add_cone(start, end, 0.0, p.radius, z, 0.0, 0)
+        return SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name=f"InnerHorizontal_{p.rwy_classification}_Code{p.runway_code}",
+            fields=INNER_HORIZONTAL_FIELDS,
+            features=[SurfaceFeature(
+                rings=[ring_with_z(ring, z)],
+                attributes={
+                    "surface_type": "Inner Horizontal",
+                    "radius_m": p.radius,
+                    "height_m": p.height,
+                    "datum_elevation_m": p.datum_elevation,
+                    "rule_set": p.rule_set,
+                    "runway_start_x": start[0],
+                    "runway_start_y": start[1],
+                    "runway_end_x": end[0],
+                    "runway_end_y": end[1],
+                    "azimuth": az,
+                    "RWYType": p.rwy_classification,
+                    "Code": int(p.runway_code),
+                },
+            )],
+            info={"azimuth": az, "back_azimuth": back, "elevation": z},
+            patches=patches,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Conical
+# ---------------------------------------------------------------------------
+
+@dataclasses.dataclass
+class ConicalParams(SurfaceParams):
+    radius: float = param(6000.0)
+    height: float = param(60.0)
+    datum_elevation: float = param(0.0)
+    inner_height: float = param(0.0)
+    slope_pct: float = param(5.0, "slope")
+    inner_radius: float = param(0.0)
+    contour_interval_m: int = param(0)
+    runway_code: int = param(4, "code")
+    rwy_classification: str = param("Precision Approach CAT I", "rwyClassification")
+    direction: int = param(0)
+    chord_tolerance_m: float = param(DEFAULT_CHORD_TOLERANCE)
+
+    @property
+    def bottom_elevation(self) -> float:
+        """Z of the inner edge: datum + Inner Horizontal height (#125)."""
+        return self.datum_elevation + self.inner_height
+
+    @property
+    def top_elevation(self) -> float:
+        return self.datum_elevation + self.inner_height + self.height
+
+    @property
+    def cone_inner_radius(self) -> float:
+        """Radius the slope starts at: ``inner_radius``, or when none is
+        given (the standalone Conical tab) the one the dock's relation
+        ``radius = height / slope + inner radius`` implies."""
+        if self.inner_radius > 0 or self.slope_pct <= 0:
+            return self.inner_radius
+        return max(0.0, self.radius - self.height / (self.slope_pct / 100.0))
+
+
+class ConicalBuilder(SurfaceBuilder):
+    """Racetrack outer edge at the conical top elevation, plus radial
+    contour rings (#126). Untrimmed — the inner hole is applied by the
+    combined build (:class:`InnerConicalBuilder`)."""
+
+    surface_type = SurfaceType.CONICAL
+    params_class = ConicalParams
+
+    def build(self, params: ConicalParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        start, end = runway.start, runway.end
+        if p.direction == -1:
+            start, end = end, start
+        angle0 = azimuth(start, end) + 180
+        back = angle0 + 180
+
+        bottom_z, z_top = p.bottom_elevation, p.top_elevation
+        ring = racetrack_ring(start, end, p.radius, p.chord_tolerance_m)
+        # The drawn polygon is flat at z_top; the table keeps the radial
+        # slope from the inner radius out (conical_contour_radius inverted).
+        patches = PatchTable()
+        patches.add_cone(start, end, p.cone_inner_radius, p.radius, bottom_z, p.slope_pct / 100.0, 0)
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name=f"Conical_{p.rwy_classification}_Code{p.runway_code}",
+            fields=CONICAL_FIELDS,
+            features=[SurfaceFeature(
+                rings=[ring_with_z(ring, z_top)],
+                attributes={
+                    "surface_type": "Conical",
+                    "radius_m": p.radius,
+                    "height_m": p.height,
+                    "datum_elevation_m": p.datum_elevation,
+                    "inner_height_m": p.inner_height,
+                    "slope_pct": p.slope_pct,
+                    "rule_set": p.rule_set,
+                    "runway_start_x": start[0],
+                    "runway_start_y": start[1],
+                    "runway_end_x": end[0],
+                    "runway_end_y": end[1],
+                    "azimuth": angle0,
+                    "RWYType": p.rwy_classification,
+                    "Code": int(p.runway_code),
+                },
+            )],
+            contour_layer_name="RWY_ConicalSurface_Contours",
+            info={"azimuth": angle0, "back_azimuth": back, "bottom_z": bottom_z, "z_top": z_top},
+            patches=patches,
+        )
+
+        interval = int(p.contour_interval_m)
+        if interval > 0 and p.slope_pct > 0:
+            slope = p.slope_pct / 100.0
+            # The outer edge is the surface's own boundary, not a contour.
+            elevs = [e for e in cu.contour_elevations(bottom_z, z_top, interval) if e < z_top - 1e-6]
+            for i, elev in enumerate(elevs, start=1):
+                radius = cu.conical_contour_radius(elev, bottom_z, p.cone_inner_radius, slope)
+                result.contours.append(
+                    ring_contour_line(racetrack_ring(start, end, radius, p.chord_tolerance_m), elev))
+                self.report(i, len(elevs))
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Inner Horizontal & Conical (#124)
+# ---------------------------------------------------------------------------
+
+@dataclasses.dataclass
+class InnerConicalParams(SurfaceParams):
+    inner_horizontal: InnerHorizontalParams = dataclasses.field(default_factory=InnerHorizontalParams)
+    conical: ConicalParams = dataclasses.field(default_factory=ConicalParams)
+
+    @classmethod
+    def from_namespace(cls, namespace):
+        """The dockwidget nests each half's values under ``inner_horizontal``
+        / ``conical``; shared keys (direction, rule set) come from the top."""
+        inner_ns = dict(namespace)
+        inner_ns.update(namespace.get("inner_horizontal") or {})
+        conical_ns = dict(namespace)
+        conical_ns.update(namespace.get("conical") or {})
+        return cls(
+            rule_set=SurfaceParams.from_namespace(namespace).rule_set,
+            inner_horizontal=InnerHorizontalParams.from_namespace(inner_ns),
+            conical=ConicalParams.from_namespace(conical_ns),
+        )
+
+
+class InnerConicalBuilder(SurfaceBuilder):
+    """Inner Horizontal plus a Conical trimmed to the ring between the two
+    racetracks: the Conical feature carries the Inner Horizontal footprint
+    as a cutout whose boundary sits at the conical bottom elevation
+    (``plugin.py::_trim_conical_to_ring`` does the same on live layers).
+    The Inner Horizontal result is returned in ``related`` (and may be a
+    cached one, see :func:`~qols.engine.base.memoized_build`)."""
+
+    surface_type = SurfaceType.INNER_CONICAL
+    params_class = InnerConicalParams
+
+    def build(self, params: InnerConicalParams, runway: RunwayGeometry) -> SurfaceResult:
+        inner = memoized_build(InnerHorizontalBuilder(), params.inner_horizontal, runway)
+        conical = ConicalBuilder().build(params.conical, runway)
+        holes = [f.exterior[:, :2] for f in inner.features]
+        for feature in conical.features:
+            feature.cutouts = holes
+            feature.cutout_z = params.conical.bottom_elevation
+        c, ih = params.conical, params.inner_horizontal
+        conical.patches = PatchTable()
+        conical.patches.add_cone(runway.start, runway.end, ih.radius, c.radius, c.bottom_elevation,
+                                 c.slope_pct / 100.0, 0)
+        conical.related = (inner,)
+        return conical
+
+
+# ---------------------------------------------------------------------------
+# Outer Horizontal
+# ---------------------------------------------------------------------------
+
+@dataclasses.dataclass
+class OuterHorizontalParams(SurfaceParams):
+    runway_code: int = param(3, "code")
+    radius: float = param(15000.0)
+    height: float = param(45.0)
+    arp_elevation: float = param(0.0)
+    segments: int = param(360)
+
+
+class OuterHorizontalBuilder(SurfaceBuilder):
+    """One flat circle per ARP point at ARP elevation + height."""
+
+    surface_type = SurfaceType.OUTER_HORIZONTAL
+    params_class = OuterHorizontalParams
+
+    def build(self, params: OuterHorizontalParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        if not runway.arp_points:
+            raise ValueError("No ARP features found")
+        z = p.arp_elevation + p.height
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="Outer Horizontal Surface",
+            fields=OUTER_HORIZONTAL_FIELDS,
+            info={"elevation": z},
+            patches=PatchTable(),
+        )
+        for arp in runway.arp_points:
+            result.patches.add_cone(arp, arp, 0.0, p.radius, z, 0.0, len(result.features))
+            ring = circle_ring(arp, p.radius, p.segments)
+            result.features.append(SurfaceFeature(
+                rings=[[(x, y, z) for x, y in ring]],
+                attributes={
+                    "surface_type": "Outer Horizontal",
+                    "code": p.runway_code,
+                    "radius_m": p.radius,
+                    "height_m": p.height,
+                    "arp_elevation_m": p.arp_elevation,
+                    "rule_set": p.rule_set,
+                    "arp_x": arp[0],
+                    "arp_y": arp[1],
+                },
+            ))
+            self.report(len(result.features), len(runway.arp_points))
+        return result
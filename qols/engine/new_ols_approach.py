@@ -0,0 +1,108 @@
+"""qols/engine/new_ols_approach.py — New OLS OFS Approach surface, the
+engine half of ``new-ols-ofs-approach-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..scripts import _contour_utils as cu
+from ..surface_types import SurfaceType
+from .base import SurfaceBuilder, SurfaceParams, param
+from .contours import axis_contour_lines
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable, axis_plane
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["NewOlsOfsApproachParams", "NewOlsOfsApproachBuilder"]
+
+OFS_APPROACH_FIELDS = (
+    ("ID", "string"),
+    ("SurfaceName", "string"),
+    ("rwy_type", "string"),
+    ("adg", "string"),
+    ("slope_pct", "double"),
+    ("surface_start_elev", "double"),
+    ("surface_end_elev", "double"),
+)
+
+
+@dataclasses.dataclass
+class NewOlsOfsApproachParams(SurfaceParams):
+    rwy_type: str = param("Instrument")
+    adg: str = param("III")
+    runway_width_m: float = param(45.0)
+    distance_from_threshold_m: float = param(60.0)
+    inner_edge_m: float = param(175.0)
+    divergence_ratio: float = param(0.10)
+    length_m: float = param(4500.0)
+    slope_pct: float = param(3.33)
+    start_elevation_m: float = param(0.0)
+    end_elevation_m: float = param(0.0)
+    arp_elevation_m: float = param(0.0)
+    direction: int = param(0)
+    contour_interval_m: int = param(0)
+
+
+class NewOlsOfsApproachBuilder(SurfaceBuilder):
+    """Single trapezoidal OFS Approach section anchored on the selected
+    threshold (#132), pointing away from the direction-selected end."""
+
+    surface_type = SurfaceType.NEW_OLS_OFS_APPROACH
+    params_class = NewOlsOfsApproachParams
+
+    def build(self, params: NewOlsOfsApproachParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        near_end, far_end = runway.directed_ends(p.direction)
+        az = azimuth(far_end, near_end)
+        thr = runway.anchor_threshold(near_end)
+        z0 = p.start_elevation_m
+        slope_ratio = p.slope_pct / 100.0
+
+        pt_inner = with_z(project(thr, p.distance_from_threshold_m, az), z0)
+        half_inner = p.inner_edge_m / 2.0
+        pt_inner_l = project(pt_inner, half_inner, az + 90)
+        pt_inner_r = project(pt_inner, half_inner, az - 90)
+
+        height_outer = z0 + p.length_m * slope_ratio
+        pt_outer = with_z(project(pt_inner, p.length_m, az), height_outer)
+        half_outer = half_inner + p.length_m * p.divergence_ratio
+        pt_outer_l = project(pt_outer, half_outer, az + 90)
+        pt_outer_r = project(pt_outer, half_outer, az - 90)
+
+        ring = [pt_inner_r, pt_inner_l, pt_outer_l, pt_outer_r]
+        patches = PatchTable()
+        patches.add_plane([ring], axis_plane(pt_inner, az, slope_ratio), 0)
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name=f"NewOLS_OFS_Approach_{p.rwy_type}_{p.adg}",
+            fields=OFS_APPROACH_FIELDS,
+            features=[SurfaceFeature(
+                rings=[close_ring(ring)],
+                attributes={
+                    "ID": '1',
+                    "SurfaceName": f'New OLS OFS Approach ({p.rwy_type} / ADG {p.adg})',
+                    "rwy_type": p.rwy_type,
+                    "adg": p.adg,
+                    "slope_pct": p.slope_pct,
+                    "surface_start_elev": round(z0, 3),
+                    "surface_end_elev": round(height_outer, 3),
+                },
+            )],
+            contour_layer_name=f"NewOLS_OFS_Approach_Contours_{p.adg}",
+            info={"azimuth": az, "threshold": (thr[0], thr[1], z0), "height_outer": height_outer},
+            patches=patches,
+        )
+
+        interval = int(p.contour_interval_m)
+        if interval > 0 and slope_ratio > 0:
+            specs = cu.contour_specs_for_linear_section(
+                z_section_start=z0,
+                z_section_end=height_outer,
+                slope=slope_ratio,
+                d_offset=0.0,
+                near_half_width=half_inner,
+                divergence_ratio=p.divergence_ratio,
+                elevations=cu.contour_elevations(z0, height_outer, interval),
+            )
+            result.contours = axis_contour_lines(pt_inner, az, specs)
+        return result
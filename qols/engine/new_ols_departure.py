@@ -0,0 +1,117 @@
+"""qols/engine/new_ols_departure.py — New OLS OES Instrument Departure
+Surface (#136, Table 4-13), the engine half of
+``new-ols-oes-departure-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..surface_types import SurfaceType
+from ..surfaces.new_ols_departure import get_departure_surface_dimensions
+from .base import SurfaceBuilder, SurfaceParams, param
+from .contours import patch_contour_lines
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable, axis_plane
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["NewOlsOesDepartureParams", "NewOlsOesDepartureBuilder"]
+
+_DEFAULTS = get_departure_surface_dimensions()
+
+OES_DEPARTURE_FIELDS = (
+    ("surface_type", "string"),
+    ("component", "string"),
+    ("slope_pct", "double"),
+    ("rule_set", "string"),
+)
+
+
+@dataclasses.dataclass
+class NewOlsOesDepartureParams(SurfaceParams):
+    start_elevation_m: float = param(0.0)
+    direction: int = param(0)
+    initial_height_above_der_m: float = param(_DEFAULTS['initial_height_above_der_m'])
+    inner_edge_m: float = param(_DEFAULTS['inner_edge_m'])
+    slope_pct: float = param(_DEFAULTS['slope_pct'])
+    s1_length_m: float = param(_DEFAULTS['section_1']['length_m'])
+    s1_divergence_pct: float = param(_DEFAULTS['section_1']['divergence_pct'])
+    s2_length_m: float = param(_DEFAULTS['section_2']['length_m'])
+    s2_divergence_pct: float = param(_DEFAULTS['section_2']['divergence_pct'])
+    contour_interval_m: int = param(0)
+
+    def dimensions(self) -> dict:
+        """Table 4-13 layout of the (possibly UI-edited) values (#159)."""
+        return {
+            'initial_height_above_der_m': self.initial_height_above_der_m,
+            'inner_edge_m': self.inner_edge_m,
+            'slope_pct': self.slope_pct,
+            'section_1': {'length_m': self.s1_length_m, 'divergence_pct': self.s1_divergence_pct},
+            'section_2': {'length_m': self.s2_length_m, 'divergence_pct': self.s2_divergence_pct},
+        }
+
+
+class NewOlsOesDepartureBuilder(SurfaceBuilder):
+    """Two splayed sections starting at the DER — the direction-selected
+    far end of the centerline — climbing in the take-off direction."""
+
+    surface_type = SurfaceType.NEW_OLS_OES_DEPARTURE
+    params_class = NewOlsOesDepartureParams
+
+    def build(self, params: NewOlsOesDepartureParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        slope = p.slope_pct / 100.0
+        near_end, far_end = runway.directed_ends(p.direction)
+        der_az = azimuth(near_end, far_end)
+        der = far_end
+        half_inner = p.inner_edge_m / 2.0
+
+        der_a = project(der, half_inner, der_az - 90)
+        der_b = project(der, half_inner, der_az + 90)
+
+        s1_height = p.s1_length_m * slope
+        s1_half_width = half_inner + p.s1_length_m * (p.s1_divergence_pct / 100.0)
+        s1_center = project(der, p.s1_length_m, der_az)
+        s1_a = project(s1_center, s1_half_width, der_az - 90)
+        s1_b = project(s1_center, s1_half_width, der_az + 90)
+
+        # Section 2 widens from section 1's own edge, so the boundary kinks.
+        s2_height = s1_height + p.s2_length_m * slope
+        s2_half_width = s1_half_width + p.s2_length_m * (p.s2_divergence_pct / 100.0)
+        s2_center = project(s1_center, p.s2_length_m, der_az)
+        s2_a = project(s2_center, s2_half_width, der_az - 90)
+        s2_b = project(s2_center, s2_half_width, der_az + 90)
+
+        z0 = p.start_elevation_m + p.initial_height_above_der_m
+        z1 = z0 + s1_height
+        z2 = z0 + s2_height
+
+        sections = (
+            ('section 1', [with_z(der_a, z0), with_z(der_b, z0), with_z(s1_b, z1), with_z(s1_a, z1)]),
+            ('section 2', [with_z(s1_a, z1), with_z(s1_b, z1), with_z(s2_b, z2), with_z(s2_a, z2)]),
+        )
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="NewOLS_OES_Departure",
+            contour_layer_name="NewOLS_OES_Departure_Contours",
+            fields=OES_DEPARTURE_FIELDS,
+            features=[
+                SurfaceFeature(
+                    rings=[close_ring(ring)],
+                    attributes={
+                        "surface_type": "Instrument Departure Surface",
+                        "component": component,
+                        "slope_pct": p.slope_pct,
+                        "rule_set": p.rule_set,
+                    },
+                )
+                for component, ring in sections
+            ],
+            info={"der_azimuth": der_az, "der": (der[0], der[1], z0)},
+            patches=PatchTable(),
+        )
+        # Both sections climb at the same slope from the DER.
+        plane = axis_plane(with_z(der, z0), der_az, slope)
+        for index, (_component, ring) in enumerate(sections):
+            result.patches.add_plane([ring], plane, index)
+        result.contours = patch_contour_lines(result.patches, int(p.contour_interval_m))
+        return result
@@ -0,0 +1,110 @@
+"""qols/engine/new_ols_horizontal.py — New OLS OES Horizontal tiers (#134,
+#159), the engine half of ``new-ols-oes-horizontal-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..surface_types import SurfaceType
+from ..surfaces.new_ols_horizontal import (
+    get_adg_tier_count,
+    get_horizontal_surface_rings,
+    get_ring_hole_pairs,
+)
+from .base import SurfaceBuilder, SurfaceParams, param
+from .geometry import azimuth
+from .patches import PatchTable
+from .racetrack import DEFAULT_CHORD_TOLERANCE, racetrack_ring, ring_with_z
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["NewOlsOesHorizontalParams", "NewOlsOesHorizontalBuilder", "oes_racetrack_azimuths"]
+
+_DEFAULT_TIERS = get_horizontal_surface_rings('V')
+
+OES_HORIZONTAL_FIELDS = (
+    ("surface_type", "string"),
+    ("adg", "string"),
+    ("radius_m", "double"),
+    ("height_m", "double"),
+    ("aerodrome_elevation_m", "double"),
+    ("rule_set", "string"),
+)
+
+
+def oes_racetrack_azimuths(runway: RunwayGeometry, direction: int) -> tuple[float, float]:
+    """``(angle0, back_angle0)`` reported for the OES racetracks
+    (Horizontal and Straight-in Approach share the Inner Horizontal
+    convention). Only informational — the rings themselves do not depend
+    on direction."""
+    angle0 = azimuth(runway.start, runway.end) + 180
+    if angle0 >= 360:
+        angle0 -= 360
+    if direction == -1:
+        angle0 = (angle0 + 180) % 360
+    return angle0, (angle0 + 180) % 360
+
+
+@dataclasses.dataclass
+class NewOlsOesHorizontalParams(SurfaceParams):
+    adg: str = param('IIC')
+    aerodrome_elevation_m: float = param(0.0)
+    direction: int = param(0)
+    tier1_radius_m: float = param(float(_DEFAULT_TIERS[0]['radius_m']))
+    tier1_height_m: float = param(float(_DEFAULT_TIERS[0]['height_m']))
+    tier2_radius_m: float = param(float(_DEFAULT_TIERS[1]['radius_m']))
+    tier2_height_m: float = param(float(_DEFAULT_TIERS[1]['height_m']))
+    tier3_radius_m: float = param(float(_DEFAULT_TIERS[2]['radius_m']))
+    tier3_height_m: float = param(float(_DEFAULT_TIERS[2]['height_m']))
+    chord_tolerance_m: float = param(DEFAULT_CHORD_TOLERANCE)
+
+    def rings(self) -> list[dict]:
+        """The UI-editable tiers, truncated to the ADG's tier count (#159)."""
+        all_tiers = [
+            {'radius_m': self.tier1_radius_m, 'height_m': self.tier1_height_m},
+            {'radius_m': self.tier2_radius_m, 'height_m': self.tier2_height_m},
+            {'radius_m': self.tier3_radius_m, 'height_m': self.tier3_height_m},
+        ]
+        return all_tiers[:get_adg_tier_count(self.adg)]
+
+
+class NewOlsOesHorizontalBuilder(SurfaceBuilder):
+    """Concentric flat racetracks: the smallest tier is a full disc, every
+    larger tier carries the next-smaller tier's footprint as a cutout at
+    its own height (#134 follow-up)."""
+
+    surface_type = SurfaceType.NEW_OLS_OES_HORIZONTAL
+    params_class = NewOlsOesHorizontalParams
+
+    def build(self, params: NewOlsOesHorizontalParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        angle0, back = oes_racetrack_azimuths(runway, p.direction)
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="NewOLS_OES_Horizontal",
+            fields=OES_HORIZONTAL_FIELDS,
+            info={"azimuth": angle0, "back_azimuth": back},
+            patches=PatchTable(),
+        )
+        prev_ring = None
+        tiers = get_ring_hole_pairs(p.rings())
+        for ring, hole_source in tiers:
+            z = p.aerodrome_elevation_m + ring['height_m']
+            disc = racetrack_ring(runway.start, runway.end, ring['radius_m'], p.chord_tolerance_m)
+            r_in = hole_source['radius_m'] if hole_source is not None else 0.0
+            result.patches.add_cone(runway.start, runway.end, r_in, ring['radius_m'], z, 0.0, len(result.features))
+            result.features.append(SurfaceFeature(
+                rings=[ring_with_z(disc, z)],
+                attributes={
+                    "surface_type": "New OLS OES Horizontal",
+                    "adg": p.adg,
+                    "radius_m": ring['radius_m'],
+                    "height_m": ring['height_m'],
+                    "aerodrome_elevation_m": p.aerodrome_elevation_m,
+                    "rule_set": p.rule_set,
+                },
+                cutouts=[prev_ring] if hole_source is not None else [],
+                cutout_z=z if hole_source is not None else None,
+            ))
+            prev_ring = disc
+            self.report(len(result.features), len(tiers))
+        return result
@@ -0,0 +1,199 @@
+"""qols/engine/new_ols_precision_approach.py — New OLS OES Surface for
+Precision Approaches (Table 4-12), the engine half of
+``new-ols-oes-precision-approach-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..surface_types import SurfaceType
+from ..surfaces.new_ols_precision_approach import get_precision_approach_dimensions
+from .base import SurfaceBuilder, SurfaceParams, param
+from .contours import patch_contour_lines
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable, axis_plane
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["NewOlsOesPrecisionApproachParams", "NewOlsOesPrecisionApproachBuilder"]
+
+_DEFAULTS = get_precision_approach_dimensions()
+_D_APPR = _DEFAULTS['approach']
+_D_MISSED = _DEFAULTS['missed_approach']
+
+OES_PRECISION_APPROACH_FIELDS = (
+    ("surface_type", "string"),
+    ("component", "string"),
+    ("slope_pct", "double"),
+    ("rule_set", "string"),
+)
+
+
+@dataclasses.dataclass
+class NewOlsOesPrecisionApproachParams(SurfaceParams):
+    start_elevation_m: float = param(0.0)
+    direction: int = param(0)
+    appr_distance_from_threshold_m: float = param(_D_APPR['distance_from_threshold_m'])
+    appr_inner_edge_m: float = param(_D_APPR['inner_edge_m'])
+    appr_s1_length_m: float = param(_D_APPR['section_1']['length_m'])
+    appr_s1_divergence_pct: float = param(_D_APPR['section_1']['divergence_pct'])
+    appr_s1_slope_pct: float = param(_D_APPR['section_1']['slope_pct'])
+    appr_s2_length_m: float = param(_D_APPR['section_2']['length_m'])
+    appr_s2_divergence_pct: float = param(_D_APPR['section_2']['divergence_pct'])
+    appr_s2_slope_pct: float = param(_D_APPR['section_2']['slope_pct'])
+    missed_distance_after_threshold_m: float = param(_D_MISSED['distance_after_threshold_m'])
+    missed_s1_length_m: float = param(_D_MISSED['section_1']['length_m'])
+    missed_s1_slope_pct: float = param(_D_MISSED['section_1']['slope_pct'])
+    missed_s2_length_m: float = param(_D_MISSED['section_2']['length_m'])
+    missed_s2_divergence_pct: float = param(_D_MISSED['section_2']['divergence_pct'])
+    missed_s2_slope_pct: float = param(_D_MISSED['section_2']['slope_pct'])
+    trans_slope_pct: float = param(_DEFAULTS['transitional']['slope_pct'])
+    contour_interval_m: int = param(0)
+
+    def dimensions(self) -> dict:
+        """Table 4-12 layout of the values actually used (#159) —
+        missed-approach inner edge / section-1 divergence are not read."""
+        return {
+            'approach': {
+                'distance_from_threshold_m': self.appr_distance_from_threshold_m,
+                'inner_edge_m': self.appr_inner_edge_m,
+                'section_1': {'length_m': self.appr_s1_length_m, 'divergence_pct': self.appr_s1_divergence_pct,
+                              'slope_pct': self.appr_s1_slope_pct},
+                'section_2': {'length_m': self.appr_s2_length_m, 'divergence_pct': self.appr_s2_divergence_pct,
+                              'slope_pct': self.appr_s2_slope_pct},
+            },
+            'missed_approach': {
+                'distance_after_threshold_m': self.missed_distance_after_threshold_m,
+                'section_1': {'length_m': self.missed_s1_length_m, 'slope_pct': self.missed_s1_slope_pct},
+                'section_2': {'length_m': self.missed_s2_length_m, 'divergence_pct': self.missed_s2_divergence_pct,
+                              'slope_pct': self.missed_s2_slope_pct},
+            },
+            'transitional': {'slope_pct': self.trans_slope_pct},
+        }
+
+
+class NewOlsOesPrecisionApproachBuilder(SurfaceBuilder):
+    """Approach sections, missed approach and the eight transitional
+    patches around the threshold nearest the direction-selected end."""
+
+    surface_type = SurfaceType.NEW_OLS_OES_PRECISION_APPROACH
+    params_class = NewOlsOesPrecisionApproachParams
+
+    def build(self, params: NewOlsOesPrecisionApproachParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        near_end, far_end = runway.directed_ends(p.direction)
+        approach_az = azimuth(far_end, near_end)
+        missed_az = (approach_az + 180.0) % 360.0
+        thr = runway.closest_threshold(near_end)
+        half_inner = p.appr_inner_edge_m / 2.0
+
+        def across(center, half_width):
+            """(a, d): right / left of the approach axis."""
+            return project(center, half_width, approach_az - 90), project(center, half_width, approach_az + 90)
+
+        gs_center = project(thr, p.appr_distance_from_threshold_m, approach_az)
+        gs_a, gs_d = across(gs_center, half_inner)
+
+        as1_len = p.appr_s1_length_m
+        as1_center = project(gs_center, as1_len, approach_az)
+        as1_a, as1_d = across(as1_center, half_inner + as1_len * (p.appr_s1_divergence_pct / 100.0))
+        as1_height = as1_len * (p.appr_s1_slope_pct / 100.0)
+
+        # Section 2 divergence is measured cumulatively from the origin.
+        as2_len = p.appr_s2_length_m
+        as2_center = project(as1_center, as2_len, approach_az)
+        as2_a, as2_d = across(as2_center, half_inner + (as1_len + as2_len) * (p.appr_s2_divergence_pct / 100.0))
+        as2_height = as1_height + as2_len * (p.appr_s2_slope_pct / 100.0)
+
+        missed_center = project(thr, p.missed_distance_after_threshold_m, missed_az)
+        missed_a, missed_f = across(missed_center, half_inner)
+
+        # Missed approach section 1 half-width comes from the transitional
+        # slope reaching this section's height, not a divergence multiply.
+        trans_slope = p.trans_slope_pct / 100.0
+        m1_len = p.missed_s1_length_m
+        m1_height = m1_len * (p.missed_s1_slope_pct / 100.0)
+        m1_half_width = half_inner + m1_height / trans_slope
+        m1_center = project(missed_center, m1_len, missed_az)
+        missed_b, missed_e = across(m1_center, m1_half_width)
+
+        m2_len = p.missed_s2_length_m
+        m2_height = m1_height + m2_len * (p.missed_s2_slope_pct / 100.0)
+        m2_half_width = m1_half_width + m2_len * (p.missed_s2_divergence_pct / 100.0)
+        missed_c, missed_d = across(project(missed_center, m1_len + m2_len, missed_az), m2_half_width)
+
+        td1 = (as2_height - as1_height) / trans_slope
+        td2 = as2_height / trans_slope
+        td3 = (as2_height - m1_height) / trans_slope
+        e1_left = project(as1_d, td1, approach_az + 90)
+        e1_right = project(as1_a, td1, approach_az - 90)
+        e2_left = project(gs_d, td2, approach_az + 90)
+        e2_right = project(gs_a, td2, approach_az - 90)
+        e3_left = project(missed_e, td3, approach_az + 90)
+        e3_right = project(missed_b, td3, approach_az - 90)
+
+        z0 = p.start_elevation_m
+        z_as1 = z0 + as1_height
+        z_as2 = z0 + as2_height
+        z_m1 = z0 + m1_height
+        z_m2 = z0 + m2_height
+        trans = p.trans_slope_pct
+
+        components = (
+            ('approach section 1', p.appr_s1_slope_pct,
+             [(as1_a, z_as1), (gs_a, z0), (gs_d, z0), (as1_d, z_as1)]),
+            ('approach section 2', p.appr_s2_slope_pct,
+             [(as2_a, z_as2), (as1_a, z_as1), (as1_d, z_as1), (as2_d, z_as2)]),
+            ('missed approach', p.missed_s1_slope_pct,
+             [(missed_a, z0), (missed_b, z_m1), (missed_c, z_m2),
+              (missed_d, z_m2), (missed_e, z_m1), (missed_f, z0)]),
+            ('transitional - left 1', trans, [(as2_d, z_as2), (as1_d, z_as1), (e1_left, z_as2)]),
+            ('transitional - left 2', trans,
+             [(as1_d, z_as1), (e1_left, z_as2), (e2_left, z_as2), (gs_d, z0)]),
+            ('transitional - left 3', trans,
+             [(e2_left, z_as2), (gs_d, z0), (missed_f, z0), (missed_e, z_m1), (e3_left, z_as2)]),
+            ('transitional - left 4', trans, [(missed_e, z_m1), (missed_d, z_m2), (e3_left, z_as2)]),
+            ('transitional - right 1', trans, [(as2_a, z_as2), (as1_a, z_as1), (e1_right, z_as2)]),
+            ('transitional - right 2', trans,
+             [(as1_a, z_as1), (e1_right, z_as2), (e2_right, z_as2), (gs_a, z0)]),
+            ('transitional - right 3', trans,
+             [(e2_right, z_as2), (e3_right, z_as2), (missed_b, z_m1), (missed_a, z0), (gs_a, z0)]),
+            ('transitional - right 4', trans, [(missed_b, z_m1), (missed_c, z_m2), (e3_right, z_as2)]),
+        )
+        # Height patches: the approach sections rise along the approach
+        # axis and the missed approach's two sections (drawn as one
+        # polygon that bends between them) along the missed axis; each
+        # transitional piece is a plane through its own vertices.
+        patches = PatchTable()
+        patches.add_plane([[as1_a, gs_a, gs_d, as1_d]],
+                          axis_plane(with_z(gs_center, z0), approach_az, p.appr_s1_slope_pct / 100.0), 0)
+        patches.add_plane([[as2_a, as1_a, as1_d, as2_d]],
+                          axis_plane(with_z(as1_center, z_as1), approach_az, p.appr_s2_slope_pct / 100.0), 1)
+        patches.add_plane([[missed_a, missed_b, missed_e, missed_f]],
+                          axis_plane(with_z(missed_center, z0), missed_az, p.missed_s1_slope_pct / 100.0), 2)
+        patches.add_plane([[missed_b, missed_c, missed_d, missed_e]],
+                          axis_plane(with_z(m1_center, z_m1), missed_az, p.missed_s2_slope_pct / 100.0), 2)
+        for index, (_component, _slope_pct, ring) in enumerate(components[3:], start=3):
+            patches.add_polygon([close_ring([with_z(pt, z) for pt, z in ring])], index)
+
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="NewOLS_OES_PrecisionApproach",
+            contour_layer_name="NewOLS_OES_PrecisionApproach_Contours",
+            fields=OES_PRECISION_APPROACH_FIELDS,
+            features=[
+                SurfaceFeature(
+                    rings=[close_ring([with_z(pt, z) for pt, z in ring])],
+                    attributes={
+                        "surface_type": "Surface for Precision Approaches",
+                        "component": component,
+                        "slope_pct": slope_pct,
+                        "rule_set": p.rule_set,
+                    },
+                )
+                for component, slope_pct, ring in components
+            ],
+            info={"approach_azimuth": approach_az, "missed_azimuth": missed_az},
+            patches=patches,
+        )
+        result.contours = patch_contour_lines(patches, int(p.contour_interval_m))
+        return result
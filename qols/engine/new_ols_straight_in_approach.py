@@ -0,0 +1,125 @@
+"""qols/engine/new_ols_straight_in_approach.py — New OLS OES Surface for
+Straight-in Instrument Approaches (Table 4-11), the engine half of
+``new-ols-oes-straight-in-approach-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..surface_types import SurfaceType
+from ..surfaces.new_ols_straight_in_approach import get_straight_in_approach_dimensions
+from .base import SurfaceBuilder, SurfaceParams, param
+from .geometry import azimuth, close_ring, project
+from .new_ols_horizontal import oes_racetrack_azimuths
+from .patches import PatchTable
+from .racetrack import DEFAULT_CHORD_TOLERANCE, racetrack_ring, ring_with_z
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["NewOlsOesStraightInApproachParams", "NewOlsOesStraightInApproachBuilder", "rectangle_ring"]
+
+_DEFAULTS = get_straight_in_approach_dimensions()
+_D_LOWER = _DEFAULTS['lower_section']
+_D_UPPER = _DEFAULTS['upper_section']
+
+OES_STRAIGHT_IN_FIELDS = (
+    ("surface_type", "string"),
+    ("component", "string"),
+    ("height_m", "double"),
+    ("aerodrome_elevation_m", "double"),
+    ("rule_set", "string"),
+)
+
+
+def rectangle_ring(start, end, half_width, extension):
+    """Closed rectangle enclosing the whole runway: ``extension`` beyond
+    each end along the runway azimuth, ``half_width`` either side. Like
+    :func:`~qols.engine.racetrack.racetrack_ring` it does not depend on
+    the direction the runway is flown."""
+    angle0 = azimuth(end, start)
+    back_angle0 = angle0 + 180
+    ext_start = project(start, extension, angle0)
+    ext_end = project(end, extension, back_angle0)
+    return close_ring([
+        project(ext_start, half_width, angle0 - 90),
+        project(ext_end, half_width, back_angle0 + 90),
+        project(ext_end, half_width, back_angle0 - 90),
+        project(ext_start, half_width, angle0 + 90),
+    ])
+
+
+@dataclasses.dataclass
+class NewOlsOesStraightInApproachParams(SurfaceParams):
+    aerodrome_elevation_m: float = param(0.0)
+    direction: int = param(0)
+    lower_height_m: float = param(_D_LOWER['height_m'])
+    lower_length_m: float = param(_D_LOWER['length_m'])
+    upper_height_m: float = param(_D_UPPER['height_m'])
+    upper_shorter_side_m: float = param(_D_UPPER['shorter_side_m'])
+    upper_longer_side_from_threshold_m: float = param(_D_UPPER['longer_side_from_threshold_m'])
+    chord_tolerance_m: float = param(DEFAULT_CHORD_TOLERANCE)
+
+    def dimensions(self) -> dict:
+        """Table 4-11 layout of the (possibly UI-edited) values (#159)."""
+        return {
+            'lower_section': {'height_m': self.lower_height_m, 'length_m': self.lower_length_m},
+            'upper_section': {
+                'height_m': self.upper_height_m,
+                'shorter_side_m': self.upper_shorter_side_m,
+                'longer_side_from_threshold_m': self.upper_longer_side_from_threshold_m,
+            },
+        }
+
+
+class NewOlsOesStraightInApproachBuilder(SurfaceBuilder):
+    """Flat lower racetrack plus the flat upper rectangle around it; the
+    upper section carries the lower footprint as a cutout."""
+
+    surface_type = SurfaceType.NEW_OLS_OES_STRAIGHT_IN_APPROACH
+    params_class = NewOlsOesStraightInApproachParams
+
+    def build(self, params: NewOlsOesStraightInApproachParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        angle0, _back = oes_racetrack_azimuths(runway, p.direction)
+        lower_z = p.aerodrome_elevation_m + p.lower_height_m
+        upper_z = p.aerodrome_elevation_m + p.upper_height_m
+
+        lower = racetrack_ring(runway.start, runway.end, p.lower_length_m, p.chord_tolerance_m)
+        upper = rectangle_ring(
+            runway.start, runway.end,
+            p.upper_shorter_side_m / 2.0, p.upper_longer_side_from_threshold_m,
+        )
+
+        # Lower racetrack as an analytic flat band; the upper rectangle is a
+        # plane with the drawn lower ring as its hole, matching the cutout.
+        patches = PatchTable()
+        patches.add_cone(runway.start, runway.end, 0.0, p.lower_length_m, lower_z, 0.0, 0)
+        patches.add_plane([upper, lower], (0.0, 0.0, upper_z), 1)
+
+        def attributes(component, height_m):
+            return {
+                "surface_type": "Surface for Straight-in Instrument Approaches",
+                "component": component,
+                "height_m": height_m,
+                "aerodrome_elevation_m": p.aerodrome_elevation_m,
+                "rule_set": p.rule_set,
+            }
+
+        return SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="NewOLS_OES_StraightInApproach",
+            fields=OES_STRAIGHT_IN_FIELDS,
+            features=[
+                SurfaceFeature(
+                    rings=[ring_with_z(lower, lower_z)],
+                    attributes=attributes('lower_section', p.lower_height_m),
+                ),
+                SurfaceFeature(
+                    rings=[[(x, y, upper_z) for x, y in upper]],
+                    attributes=attributes('upper_section', p.upper_height_m),
+                    cutouts=[lower],
+                    cutout_z=upper_z,
+                ),
+            ],
+            info={"azimuth": angle0, "lower_z": lower_z, "upper_z": upper_z},
+            patches=patches,
+        )
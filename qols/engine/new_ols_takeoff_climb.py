@@ -0,0 +1,111 @@
+"""qols/engine/new_ols_takeoff_climb.py — New OLS OES Take-off Climb
+Surface (#161, Tables 4-14/4-15), the engine half of
+``new-ols-oes-takeoff-climb-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..surface_types import SurfaceType
+from ..surfaces.new_ols_takeoff_climb import MASS_CATEGORY_LE_5700, get_takeoff_climb_surface_dimensions
+from .base import SurfaceBuilder, SurfaceParams, param
+from .contours import patch_contour_lines
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable, axis_plane
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["NewOlsOesTakeoffClimbParams", "NewOlsOesTakeoffClimbBuilder"]
+
+_DEFAULTS = get_takeoff_climb_surface_dimensions(MASS_CATEGORY_LE_5700, "I")
+
+OES_TAKEOFF_CLIMB_FIELDS = (
+    ("surface_type", "string"),
+    ("component", "string"),
+    ("slope_pct", "double"),
+    ("rule_set", "string"),
+)
+
+
+@dataclasses.dataclass
+class NewOlsOesTakeoffClimbParams(SurfaceParams):
+    start_elevation_m: float = param(0.0)
+    direction: int = param(0)
+    cwy_length_m: float = param(0.0)
+    distance_from_runway_end_m: float = param(_DEFAULTS['distance_from_runway_end_m'])
+    inner_edge_m: float = param(_DEFAULTS['inner_edge_m'])
+    divergence_pct: float = param(_DEFAULTS['divergence_pct'])
+    final_width_m: float = param(_DEFAULTS['final_width_m'])
+    length_m: float = param(_DEFAULTS['length_m'])
+    slope_pct: float = param(_DEFAULTS['slope_pct'])
+    contour_interval_m: int = param(0)
+
+    def dimensions(self) -> dict:
+        """Table 4-14/4-15 layout of the (possibly UI-edited) values (#159)."""
+        return {
+            'distance_from_runway_end_m': self.distance_from_runway_end_m,
+            'inner_edge_m': self.inner_edge_m,
+            'divergence_pct': self.divergence_pct,
+            'final_width_m': self.final_width_m,
+            'length_m': self.length_m,
+            'slope_pct': self.slope_pct,
+        }
+
+
+class NewOlsOesTakeoffClimbBuilder(SurfaceBuilder):
+    """Hexagonal climb surface beyond the direction-selected far runway
+    end, widening to the final width and then running parallel."""
+
+    surface_type = SurfaceType.NEW_OLS_OES_TAKEOFF_CLIMB
+    params_class = NewOlsOesTakeoffClimbParams
+
+    def build(self, params: NewOlsOesTakeoffClimbParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        z0 = p.start_elevation_m
+        near_end, far_end = runway.directed_ends(p.direction)
+        az = azimuth(near_end, far_end)
+        divergence_ratio = p.divergence_pct / 100.0
+        slope_ratio = p.slope_pct / 100.0
+        half_inner = p.inner_edge_m / 2.0
+        half_final = p.final_width_m / 2.0
+
+        # The CWY footnote applies identically to both tables.
+        origin = project(far_end, max(p.distance_from_runway_end_m, p.cwy_length_m), az)
+        distance_to_max_width = ((half_final - half_inner) / divergence_ratio) if divergence_ratio else 0.0
+        # Every field is independently editable, so clamp the cap point
+        # to the surface end.
+        distance_to_max_width = min(distance_to_max_width, p.length_m)
+
+        mid = project(origin, distance_to_max_width, az)
+        z_mid = z0 + distance_to_max_width * slope_ratio
+        end = project(origin, p.length_m, az)
+        # Slope runs the full surface length, independent of the divergence cap.
+        z_end = z0 + p.length_m * slope_ratio
+
+        ring = [
+            with_z(project(end, half_final, az - 90), z_end),
+            with_z(project(end, half_final, az + 90), z_end),
+            with_z(project(mid, half_final, az + 90), z_mid),
+            with_z(project(origin, half_inner, az + 90), z0),
+            with_z(project(origin, half_inner, az - 90), z0),
+            with_z(project(mid, half_final, az - 90), z_mid),
+        ]
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="NewOLS_OES_TakeoffClimb",
+            contour_layer_name="NewOLS_OES_TakeoffClimb_Contours",
+            fields=OES_TAKEOFF_CLIMB_FIELDS,
+            features=[SurfaceFeature(
+                rings=[close_ring(ring)],
+                attributes={
+                    "surface_type": "Take-off Climb Surface",
+                    "component": 'Take-off Climb Surface',
+                    "slope_pct": p.slope_pct,
+                    "rule_set": p.rule_set,
+                },
+            )],
+            info={"rwy_end_azimuth": az},
+            patches=PatchTable(),
+        )
+        result.patches.add_plane([ring], axis_plane(with_z(origin, z0), az, slope_ratio), 0)
+        result.contours = patch_contour_lines(result.patches, int(p.contour_interval_m))
+        return result
@@ -0,0 +1,143 @@
+"""qols/engine/new_ols_transitional.py — New OLS OES Transitional wings,
+the engine half of ``new-ols-oes-transitional-UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..surface_types import SurfaceType
+from .base import SurfaceBuilder, SurfaceParams, param
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["NewOlsOesTransitionalParams", "NewOlsOesTransitionalBuilder"]
+
+OES_TRANSITIONAL_FIELDS = (
+    ("ID", "int"),
+    ("SurfaceName", "string"),
+    ("side", "string"),
+    ("slope_pct", "double"),
+    ("cap_elevation_m", "double"),
+    ("d_cap_m", "double"),
+    ("lateral_near_m", "double"),
+    ("rule_set", "string"),
+)
+
+
+@dataclasses.dataclass
+class NewOlsOesTransitionalParams(SurfaceParams):
+    width_m: float = param(175.0)
+    start_elevation_m: float = param(0.0)
+    highest_thr_elev_m: float = param(0.0)
+    slope_pct: float = param(20.0)
+    cap_height_m: float = param(60.0)
+    approach_slope_pct: float = param(3.33)
+    divergence_ratio: float = param(0.10)
+    distance_from_threshold_m: float = param(60.0)
+    direction: int = param(0)
+    end_elevation_m: float = param(0.0)
+    opp_start_elevation_m: float = param(0.0)
+
+
+class NewOlsOesTransitionalBuilder(SurfaceBuilder):
+    """One pentagon per side merging the approach wing with the runway
+    strip (ICAO Figure 4-1), capped at highest threshold + cap height.
+    Falls back to the wing-only triangle when the centerline collapses to
+    a point."""
+
+    surface_type = SurfaceType.NEW_OLS_OES_TRANSITIONAL
+    params_class = NewOlsOesTransitionalParams
+
+    def build(self, params: NewOlsOesTransitionalParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        z0 = p.start_elevation_m
+        slope_ratio = p.slope_pct / 100.0
+        approach_slope = p.approach_slope_pct / 100.0
+        cap_elevation = p.highest_thr_elev_m + p.cap_height_m
+        half_inner = p.width_m / 2.0
+
+        height_to_cap = cap_elevation - z0
+        if height_to_cap <= 0 or approach_slope <= 0 or slope_ratio <= 0:
+            raise ValueError(
+                f"OES Transitional: degenerate parameters — "
+                f"height_to_cap={height_to_cap:.1f}, approach_slope={approach_slope:.4f}"
+            )
+        d_cap = height_to_cap / approach_slope
+        lateral_near = height_to_cap / slope_ratio
+        lateral_far = lateral_near
+        far_half_width = half_inner + d_cap * p.divergence_ratio
+
+        near_end, far_end = runway.directed_ends(p.direction)
+        az = azimuth(far_end, near_end)
+        thr = runway.closest_threshold(near_end)
+
+        # The far anchor is the centerline's far endpoint itself, like the
+        # legacy pt_02T — never matched against the threshold layer.
+        has_opposite = far_end != near_end
+        if has_opposite:
+            height_to_cap_far = cap_elevation - p.opp_start_elevation_m
+            if height_to_cap_far <= 0:
+                raise ValueError(
+                    f"OES Transitional: degenerate parameters — "
+                    f"height_to_cap_far={height_to_cap_far:.1f}"
+                )
+            lateral_far = height_to_cap_far / slope_ratio
+
+        pt_start = project(thr, p.distance_from_threshold_m, az)
+        pt_far_axis = project(pt_start, d_cap, az)
+
+        rings = {}
+        # Each pentagon is the approach wing (near_inner, near_outer, far)
+        # glued along near_inner-near_outer to the runway-strip piece, both
+        # planes rising at the transitional slope; see the patches below.
+        pieces = {}
+        for side, offset in (('left', 90), ('right', -90)):
+            near_inner = with_z(project(pt_start, half_inner, az + offset), z0)
+            near_outer = with_z(project(pt_start, half_inner + lateral_near, az + offset), cap_elevation)
+            far = with_z(project(pt_far_axis, far_half_width, az + offset), cap_elevation)
+            if has_opposite:
+                opp = p.opp_start_elevation_m
+                far_inner = with_z(project(far_end, half_inner, az + offset), opp)
+                far_outer = with_z(project(far_end, half_inner + lateral_far, az + offset), cap_elevation)
+                rings[side] = [far, near_outer, far_outer, far_inner, near_inner]
+                pieces[side] = ([near_inner, near_outer, far], [near_outer, far_outer, far_inner, near_inner])
+            else:
+                rings[side] = [near_inner, near_outer, far]
+                pieces[side] = ([near_inner, near_outer, far],)
+
+        patches = PatchTable()
+        for index, side in enumerate(('left', 'right')):
+            for piece in pieces[side]:
+                patches.add_polygon([close_ring(piece)], index)
+
+        return SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="NewOLS_OFS_Transitional",
+            fields=OES_TRANSITIONAL_FIELDS,
+            features=[
+                SurfaceFeature(
+                    rings=[close_ring(rings[side])],
+                    attributes={
+                        "ID": fid,
+                        "SurfaceName": 'New OLS OES Transitional',
+                        "side": side,
+                        "slope_pct": p.slope_pct,
+                        "cap_elevation_m": round(cap_elevation, 3),
+                        "d_cap_m": round(d_cap, 1),
+                        "lateral_near_m": round(lateral_near, 1),
+                        "rule_set": p.rule_set,
+                    },
+                )
+                for fid, side in ((1, 'left'), (2, 'right'))
+            ],
+            info={
+                "azimuth": az,
+                "cap_elevation": cap_elevation,
+                "d_cap": d_cap,
+                "lateral_near": lateral_near,
+                "lateral_far": lateral_far,
+                "far_half_width": far_half_width,
+            },
+            patches=patches,
+        )
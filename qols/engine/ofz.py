@@ -0,0 +1,145 @@
+"""qols/engine/ofz.py — Obstacle Free Zone (inner strip, inner approach,
+balked landing, inner transitionals), the engine half of ``OFZ_UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+from typing import Optional
+
+from ..surface_types import SurfaceType
+from .base import SurfaceBuilder, SurfaceParams, param
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable, axis_plane
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["OfzParams", "OfzBuilder"]
+
+OFZ_FIELDS = (("ID", "string"), ("SurfaceName", "string"), ("rule_set", "string"))
+
+
+@dataclasses.dataclass
+class OfzParams(SurfaceParams):
+    runway_code: int = param(4, "code")
+    rwy_classification: str = param("Precision Approach CAT I", "rwyClassification")
+    width: float = param(120.0)
+    start_elevation_m: float = param(2546.5, "Z0")
+    end_elevation_m: float = param(2548.0, "ZE")
+    arp_elevation_m: float = param(2548.0, "ARPH")
+    inner_transitional_slope: float = param(33.3 / 100, "IHSlope")
+    direction: int = param(0)
+    # Optional rule-driven dimensions; ``None`` falls back to the Annex 14 defaults.
+    ia_width: Optional[float] = param(None, "IA_width", convert=float)
+    ia_distance_from_thr: Optional[float] = param(None, "IA_distance_from_thr", convert=float)
+    ia_length: Optional[float] = param(None, "IA_length", convert=float)
+    ia_slope: Optional[float] = param(None, "IA_slope", convert=float)
+    bl_width: Optional[float] = param(None, "BL_width", convert=float)
+    bl_distance_from_thr: Optional[float] = param(None, "BL_distance_from_thr", convert=float)
+    bl_divergence: Optional[float] = param(None, "BL_divergence", convert=float)
+    bl_slope: Optional[float] = param(None, "BL_slope", convert=float)
+
+
+class OfzBuilder(SurfaceBuilder):
+    """OFZ polygons around the first threshold; direction rotates the
+    azimuth by 180° rather than moving the anchor."""
+
+    surface_type = SurfaceType.OFZ
+    params_class = OfzParams
+
+    def build(self, params: OfzParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        z0, ze = p.start_elevation_m, p.end_elevation_m
+        zih = 45 + p.arp_elevation_m
+        half_w = p.width / 2
+        ih_slope = p.inner_transitional_slope
+        rwy_length = runway.runway_length
+        rwy_slope = (z0 - ze) / rwy_length
+        zih_start = z0 - rwy_slope * 1800
+
+        az = azimuth(runway.start, runway.end)
+        if p.direction == -1:
+            az += 180
+            if az >= 360:
+                az -= 360
+        thr = runway.first_threshold()
+
+        dist_thr = p.ia_distance_from_thr if p.ia_distance_from_thr is not None else 60
+        ia_len = p.ia_length if p.ia_length is not None else 900
+        ia_slope = p.ia_slope if p.ia_slope is not None else 0.02
+        bl_dist_thr = p.bl_distance_from_thr if p.bl_distance_from_thr is not None else 1800
+        bl_slope = p.bl_slope if p.bl_slope is not None else (3.33 / 100)
+        bl_div = p.bl_divergence if p.bl_divergence is not None else 0.10
+
+        def sides(pt):
+            return project(pt, half_w, az + 90), project(pt, half_w, az - 90)
+
+        def outward(left, right, rise):
+            d = rise / ih_slope
+            return with_z(project(left, d, az + 90), zih), with_z(project(right, d, az - 90), zih)
+
+        pt_0 = (thr[0], thr[1], z0)
+        pt_0L, pt_0R = sides(pt_0)
+        pt_01 = project(pt_0, dist_thr, az)
+        pt_01L, pt_01R = sides(pt_01)
+        pt_02 = with_z(project(pt_01, ia_len, az), z0 + ia_len * ia_slope)
+        pt_02L, pt_02R = sides(pt_02)
+        pt_03 = with_z(project(pt_0, bl_dist_thr, az - 180), zih_start)
+        pt_03L, pt_03R = sides(pt_03)
+
+        pt_I0L, pt_I0R = outward(pt_0L, pt_0R, zih - z0)
+        pt_I01L, pt_I01R = outward(pt_01L, pt_01R, zih - z0)
+        pt_I02L, pt_I02R = outward(pt_02L, pt_02R, zih - (z0 + ia_len * ia_slope))
+        pt_I03L, pt_I03R = outward(pt_03L, pt_03R, zih - (z0 - rwy_slope * 1800))
+
+        d_bl = (zih - (z0 - rwy_slope * bl_dist_thr)) / bl_slope
+        pt_04 = with_z(project(pt_03, d_bl, az - 180), zih)
+        pt_04L = project(pt_04, d_bl * bl_div + dist_thr, az + 90)
+        pt_04R = project(pt_04, d_bl * bl_div + dist_thr, az - 90)
+
+        # Height patches: planes rising along the axis — the strip folds at
+        # the threshold — and, for the inner transitionals, rising outward
+        # at ih_slope from the strip and inner approach edges.
+        strip_slope = (z0 - zih_start) / bl_dist_thr if bl_dist_thr else 0.0
+        bl_rise = (zih_start - zih) / d_bl if d_bl else 0.0
+        patches = PatchTable()
+        patches.add_plane([[pt_03L, pt_0L, pt_0R, pt_03R]], axis_plane(pt_0, az, strip_slope), 0)
+        patches.add_plane([[pt_0L, pt_01L, pt_01R, pt_0R]], axis_plane(pt_0, az, 0.0), 0)
+        patches.add_plane([[pt_01L, pt_02L, pt_02R, pt_01R]], axis_plane(pt_01, az, ia_slope), 1)
+        patches.add_plane([[pt_04L, pt_03L, pt_03R, pt_04R]], axis_plane(pt_03, az, bl_rise), 2)
+        for index, cross_slope, (p04, p03, p0, p01, p02, i03, i0, i01, i02) in (
+            (3, -ih_slope, (pt_04R, pt_03R, pt_0R, pt_01R, pt_02R, pt_I03R, pt_I0R, pt_I01R, pt_I02R)),
+            (4, ih_slope, (pt_04L, pt_03L, pt_0L, pt_01L, pt_02L, pt_I03L, pt_I0L, pt_I01L, pt_I02L)),
+        ):
+            patches.add_polygon([close_ring([p04, p03, i03])], index)
+            patches.add_plane([[p03, p0, i0, i03]], axis_plane(p0, az, strip_slope, cross_slope), index)
+            patches.add_plane([[p0, p01, i01, i0]], axis_plane(p0, az, 0.0, cross_slope), index)
+            patches.add_plane([[p01, p02, i02, i01]], axis_plane(p01, az, ia_slope, cross_slope), index)
+
+        polygons = (
+            (1, 'Runway Inner Strip', [pt_03, pt_03L, pt_0L, pt_01L, pt_01, pt_01R, pt_0R, pt_03R]),
+            (2, 'Inner Approach Surface', [pt_01, pt_01L, pt_02L, pt_02, pt_02R, pt_01R]),
+            (3, 'Balked Landing Surface', [pt_04, pt_04L, pt_03L, pt_03, pt_03R, pt_04R]),
+            (4, 'Inner Transitional Surface - Right Side',
+             [pt_04R, pt_03R, pt_0R, pt_01R, pt_02R, pt_I02R, pt_I01R, pt_I0R, pt_I03R]),
+            (5, 'Inner Transitional Surface - Left Side',
+             [pt_04L, pt_03L, pt_0L, pt_01L, pt_02L, pt_I02L, pt_I01L, pt_I0L, pt_I03L]),
+        )
+        return SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="RWY_ObstacleFreeZone",
+            fields=OFZ_FIELDS,
+            features=[
+                SurfaceFeature(
+                    rings=[close_ring(ring)],
+                    attributes={"ID": fid, "SurfaceName": name, "rule_set": p.rule_set},
+                )
+                for fid, name, ring in polygons
+            ],
+            info={
+                "azimuth": az,
+                "zih": zih,
+                "zih_start": zih_start,
+                "runway_length": rwy_length,
+                "threshold": pt_0,
+            },
+            patches=patches,
+        )
@@ -0,0 +1,365 @@
+"""qols/engine/patches.py — analytic patch tables behind each surface.
+
+A builder knows the exact height function of every piece it draws; the
+PolygonZ it writes only samples it at the vertices. A :class:`PatchTable`
+keeps that function in compact arrays so heights can be queried for
+arrays of points (``qols.evaluation.SurfaceHeightIndex``) without going
+through ``QgsFeature`` objects.
+
+Each patch has a footprint and one of three height models:
+
+* ``KIND_PLANE`` — ``z = a·x + b·y + c`` over a polygon footprint
+  (exterior plus holes, 2D). Approach sections, OES patches, flat
+  rectangles and every triangle of a non-planar polygon.
+* ``KIND_CONE`` — ``z = z0 + slope·d`` where ``d`` is the distance to the
+  runway spine segment, over the analytic racetrack band
+  ``r_in ≤ d ≤ r_out``. The Conical (``slope > 0``) and every flat
+  racetrack or circle (``slope = 0``): Inner Horizontal, OES Horizontal
+  tiers, Outer Horizontal. No ring is stored; the chord tolerance of the
+  drawn ring does not apply.
+* ``KIND_BAND`` — a non-planar polygon with holes read back from a layer
+  (e.g. a trimmed Conical drawn by an older version); Z blends from the
+  nearest hole point to the nearest exterior point by relative distance.
+
+Coefficients share one ``(M, 8)`` float array:
+plane ``(a, b, c, 0, 0, 0, 0, 0)``; cone
+``(ax, ay, bx, by, z0, slope, r_in, r_out)``; band unused.
+"""
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+__all__ = [
+    "KIND_PLANE",
+    "KIND_CONE",
+    "KIND_BAND",
+    "PLANAR_TOLERANCE_M",
+    "axis_plane",
+    "PatchTable",
+]
+
+KIND_PLANE = 0
+KIND_CONE = 1
+KIND_BAND = 2
+
+# Vertices within this height of the best-fit plane count as planar.
+PLANAR_TOLERANCE_M = 1e-3
+
+_N_COEFFS = 8
+
+
+def axis_plane(origin: Sequence[float], azimuth_deg: float, slope: float,
+               cross_slope: float = 0.0) -> tuple[float, float, float]:
+    """Plane coefficients ``(a, b, c)`` through the 3D point ``origin``,
+    rising ``slope`` per metre along ``azimuth_deg`` (degrees clockwise
+    from north) and ``cross_slope`` per metre towards ``azimuth_deg + 90``
+    — the height function of a surface section laid out with
+    :func:`~.geometry.project`."""
+    rad = math.radians(azimuth_deg)
+    a = slope * math.sin(rad) + cross_slope * math.cos(rad)
+    b = slope * math.cos(rad) - cross_slope * math.sin(rad)
+    return a, b, float(origin[2]) - a * float(origin[0]) - b * float(origin[1])
+
+
+# ---------------------------------------------------------------------------
+# Ring helpers
+# ---------------------------------------------------------------------------
+
+def _open_ring(ring, dims: int) -> np.ndarray:
+    """``(N, dims)`` array of ``ring`` without the repeated closing vertex."""
+    arr = np.asarray(ring, dtype=float)
+    if arr.ndim != 2 or arr.shape[1] < dims:
+        raise ValueError(f"surface rings need {dims} coordinates per vertex")
+    arr = arr[:, :dims]
+    if len(arr) > 1 and np.array_equal(arr[0, :2], arr[-1, :2]):
+        arr = arr[:-1]
+    return arr
+
+
+def _signed_area(xy: np.ndarray) -> float:
+    x, y = xy[:, 0], xy[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _fit_plane(vertices: np.ndarray) -> Optional[tuple[float, float, float]]:
+    """``(a, b, c)`` of the least-squares plane ``z = a·x + b·y + c``
+    through ``vertices`` if every vertex lies within
+    :data:`PLANAR_TOLERANCE_M` of it, else None."""
+    z = vertices[:, 2]
+    if np.ptp(z) <= PLANAR_TOLERANCE_M:
+        return 0.0, 0.0, float(z.mean())
+    # Centre the coordinates: projected eastings/northings are large.
+    ox, oy = vertices[:, 0].mean(), vertices[:, 1].mean()
+    design = np.column_stack([vertices[:, 0] - ox, vertices[:, 1] - oy, np.ones(len(vertices))])
+    coeffs, *_ = np.linalg.lstsq(design, z, rcond=None)
+    if np.max(np.abs(design @ coeffs - z)) > PLANAR_TOLERANCE_M:
+        return None
+    a, b, c = (float(v) for v in coeffs)
+    return a, b, c - a * ox - b * oy
+
+
+def _ear_clip(xy: np.ndarray) -> list[tuple[int, int, int]]:
+    """Triangulate a simple polygon (no holes) by ear clipping; returns
+    vertex index triples. O(n²), fine for the handful of vertices a
+    non-planar surface polygon has."""
+    n = len(xy)
+    order = list(range(n))
+    if _signed_area(xy) < 0:
+        order.reverse()
+
+    def cross(o, a, b):
+        return (xy[a, 0] - xy[o, 0]) * (xy[b, 1] - xy[o, 1]) - (xy[a, 1] - xy[o, 1]) * (xy[b, 0] - xy[o, 0])
+
+    def inside(p, a, b, c):
+        return cross(a, b, p) >= 0 and cross(b, c, p) >= 0 and cross(c, a, p) >= 0
+
+    triangles = []
+    guard = 0
+    while len(order) > 3 and guard < n * n:
+        guard += 1
+        for k in range(len(order)):
+            a, b, c = order[k - 1], order[k], order[(k + 1) % len(order)]
+            if cross(a, b, c) <= 0:
+                continue  # reflex (or collinear) corner
+            if any(inside(p, a, b, c) for p in order if p not in (a, b, c)):
+                continue
+            triangles.append((a, b, c))
+            del order[k]
+            break
+        else:
+            break  # no ear found: self-intersecting input, stop rather than loop
+    if len(order) == 3:
+        triangles.append(tuple(order))
+    return triangles
+
+
+def _crossings(x: np.ndarray, y: np.ndarray, ring: np.ndarray) -> np.ndarray:
+    """Even-odd crossing parity of a +x ray from every point with ``ring``."""
+    odd = np.zeros(len(x), dtype=bool)
+    nxt = np.roll(ring, -1, axis=0)
+    for (x1, y1), (x2, y2) in zip(ring[:, :2].tolist(), nxt[:, :2].tolist()):
+        if y1 == y2:
+            continue
+        straddle = (y1 > y) != (y2 > y)
+        x_cross = x1 + (y - y1) * ((x2 - x1) / (y2 - y1))
+        odd ^= straddle & (x < x_cross)
+    return odd
+
+
+def _inside(x: np.ndarray, y: np.ndarray, rings: Sequence[np.ndarray]) -> np.ndarray:
+    inside = _crossings(x, y, rings[0])
+    for hole in rings[1:]:
+        if inside.any():
+            inside &= ~_crossings(x, y, hole)
+    return inside
+
+
+def _nearest_on_rings(x: np.ndarray, y: np.ndarray, rings: Iterable[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Distance from every point to the nearest edge of ``rings`` and the Z
+    linearly interpolated along that edge."""
+    best_d2 = np.full(len(x), np.inf)
+    best_z = np.zeros(len(x))
+    for ring in rings:
+        nxt = np.roll(ring, -1, axis=0)
+        for (x1, y1, z1), (x2, y2, z2) in zip(ring.tolist(), nxt.tolist()):
+            dx, dy = x2 - x1, y2 - y1
+            len2 = dx * dx + dy * dy
+            if len2 == 0:
+                continue
+            t = np.clip(((x - x1) * dx + (y - y1) * dy) / len2, 0.0, 1.0)
+            d2 = (x - (x1 + t * dx)) ** 2 + (y - (y1 + t * dy)) ** 2
+            closer = d2 < best_d2
+            best_d2 = np.where(closer, d2, best_d2)
+            best_z = np.where(closer, z1 + t * (z2 - z1), best_z)
+    return np.sqrt(best_d2), best_z
+
+
+def _segment_distance(x: np.ndarray, y: np.ndarray, ax: float, ay: float, bx: float, by: float) -> np.ndarray:
+    dx, dy = bx - ax, by - ay
+    len2 = dx * dx + dy * dy
+    if len2 == 0:
+        return np.hypot(x - ax, y - ay)
+    t = np.clip(((x - ax) * dx + (y - ay) * dy) / len2, 0.0, 1.0)
+    return np.hypot(x - (ax + t * dx), y - (ay + t * dy))
+
+
+# ---------------------------------------------------------------------------
+# Patch table
+# ---------------------------------------------------------------------------
+
+class PatchTable:
+    """Append-only table of surface patches.
+
+    ``surfaces[i]`` is the index of the feature patch ``i`` belongs to
+    (its position in ``SurfaceResult.features``, or any caller-chosen
+    label index). ``rings[i]`` is ``[exterior, *holes]`` — 2D for planes,
+    3D for bands, empty for cones. The array views are rebuilt lazily
+    after appends.
+    """
+
+    __slots__ = ("rings", "_kinds", "_coeffs", "_surfaces", "_bboxes", "_arrays")
+
+    def __init__(self):
+        self.rings: list[list[np.ndarray]] = []
+        self._kinds: list[int] = []
+        self._coeffs: list[tuple[float, ...]] = []
+        self._surfaces: list[int] = []
+        self._bboxes: list[tuple[float, float, float, float]] = []
+        self._arrays = None
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def __repr__(self) -> str:
+        return f"PatchTable({len(self)} patches)"
+
+    # -- arrays ------------------------------------------------------------
+
+    def _array_views(self):
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self._kinds, dtype=np.int8),
+                np.asarray(self._coeffs, dtype=float).reshape(-1, _N_COEFFS),
+                np.asarray(self._surfaces, dtype=np.int64),
+                np.asarray(self._bboxes, dtype=float).reshape(-1, 4),
+            )
+        return self._arrays
+
+    @property
+    def kinds(self) -> np.ndarray:
+        return self._array_views()[0]
+
+    @property
+    def coeffs(self) -> np.ndarray:
+        return self._array_views()[1]
+
+    @property
+    def surfaces(self) -> np.ndarray:
+        return self._array_views()[2]
+
+    @property
+    def bboxes(self) -> np.ndarray:
+        """``(M, 4)`` ``(min_x, min_y, max_x, max_y)`` per patch."""
+        return self._array_views()[3]
+
+    # -- building ----------------------------------------------------------
+
+    def _append(self, kind: int, coeffs: Sequence[float], surface: int, bbox, rings) -> None:
+        self._kinds.append(kind)
+        self._coeffs.append(tuple(float(c) for c in coeffs) + (0.0,) * (_N_COEFFS - len(coeffs)))
+        self._surfaces.append(int(surface))
+        self._bboxes.append(tuple(float(v) for v in bbox))
+        self.rings.append(rings)
+        self._arrays = None
+
+    def add_plane(self, rings: Sequence, coeffs: Sequence[float], surface: int) -> None:
+        """Plane ``z = a·x + b·y + c`` over ``rings`` (exterior first, 2D or 3D)."""
+        rings2d = [_open_ring(r, 2) for r in rings]
+        ext = rings2d[0]
+        bbox = (ext[:, 0].min(), ext[:, 1].min(), ext[:, 0].max(), ext[:, 1].max())
+        self._append(KIND_PLANE, coeffs, surface, bbox, rings2d)
+
+    def add_cone(self, start: Sequence[float], end: Sequence[float], r_in: float, r_out: float,
+                 z_in: float, slope: float, surface: int) -> None:
+        """Racetrack band ``r_in ≤ d ≤ r_out`` around the ``start``→``end``
+        spine with ``z = z_in + slope·(d - r_in)``. ``start == end`` gives
+        a circle; ``r_in = 0`` a full disc."""
+        ax, ay, bx, by = float(start[0]), float(start[1]), float(end[0]), float(end[1])
+        bbox = (min(ax, bx) - r_out, min(ay, by) - r_out, max(ax, bx) + r_out, max(ay, by) + r_out)
+        self._append(KIND_CONE, (ax, ay, bx, by, z_in - slope * r_in, slope, r_in, r_out), surface, bbox, [])
+
+    def add_band(self, rings: Sequence, surface: int) -> None:
+        """Non-planar 3D polygon with holes, interpolated between rings."""
+        rings3d = [_open_ring(r, 3) for r in rings]
+        ext = rings3d[0]
+        bbox = (ext[:, 0].min(), ext[:, 1].min(), ext[:, 0].max(), ext[:, 1].max())
+        self._append(KIND_BAND, (), surface, bbox, rings3d)
+
+    def add_polygon(self, rings: Sequence, surface: int, holes: Sequence = ()) -> int:
+        """Decompose a drawn 3D polygon (exterior first, then 3D holes) into
+        patches: one plane when planar, a band when non-planar with holes,
+        ear-clipped plane triangles otherwise. ``holes`` are extra 2D holes
+        (a feature's cutouts) for planar polygons. Returns the number of
+        patches added; degenerate polygons add none."""
+        exterior = _open_ring(rings[0], 3)
+        inner = [_open_ring(r, 3) for r in rings[1:] if len(r) >= 3]
+        if len(exterior) < 3 or _signed_area(exterior) == 0.0:
+            return 0
+
+        plane = _fit_plane(np.vstack([exterior, *inner]) if inner else exterior)
+        if plane is not None:
+            self.add_plane([exterior, *inner, *holes], plane, surface)
+            return 1
+        if inner:
+            self.add_band([exterior, *inner], surface)
+            return 1
+
+        added = 0
+        for i, j, k in _ear_clip(exterior[:, :2]):
+            tri = exterior[[i, j, k]]
+            if _signed_area(tri) == 0.0:
+                continue
+            self.add_plane([tri], _fit_plane(tri), surface)  # three points are always planar
+            added += 1
+        return added
+
+    def extend(self, other: "PatchTable", surface_offset: int = 0) -> None:
+        """Append ``other``'s patches, shifting their surface indexes."""
+        self.rings.extend(other.rings)
+        self._kinds.extend(other._kinds)
+        self._coeffs.extend(other._coeffs)
+        self._surfaces.extend(s + surface_offset for s in other._surfaces)
+        self._bboxes.extend(other._bboxes)
+        self._arrays = None
+
+    # -- evaluation --------------------------------------------------------
+
+    def evaluate(self, i: int, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """``(inside, z)`` of patch ``i`` at every point; ``z`` is only
+        meaningful where ``inside`` is True."""
+        kind = self._kinds[i]
+        if kind == KIND_CONE:
+            ax, ay, bx, by, z0, slope, r_in, r_out = self._coeffs[i]
+            d = _segment_distance(x, y, ax, ay, bx, by)
+            return (d >= r_in) & (d <= r_out), z0 + slope * d
+
+        rings = self.rings[i]
+        inside = _inside(x, y, rings)
+        if kind == KIND_PLANE:
+            a, b, c = self._coeffs[i][:3]
+            return inside, a * x + b * y + c
+
+        z = np.zeros(len(x))
+        if inside.any():
+            px, py = x[inside], y[inside]
+            d_out, z_out = _nearest_on_rings(px, py, rings[:1])
+            d_in, z_in = _nearest_on_rings(px, py, rings[1:])
+            total = d_out + d_in
+            w = np.divide(d_in, total, out=np.zeros_like(total), where=total > 0)
+            z[inside] = z_in + w * (z_out - z_in)
+        return inside, z
+
+    @classmethod
+    def from_arrays(cls, kinds: Sequence[int], coeffs, surfaces: Sequence[int], bboxes,
+                    rings: Sequence) -> "PatchTable":
+        """Rebuild a table from its :attr:`kinds`, :attr:`coeffs`,
+        :attr:`surfaces`, :attr:`bboxes` and :attr:`rings` (as stored by
+        :mod:`qols.surface_cache`)."""
+        table = cls()
+        for patch in zip(kinds, coeffs, surfaces, bboxes, rings):
+            kind, patch_coeffs, surface, bbox, patch_rings = patch
+            table._append(int(kind), patch_coeffs, surface, bbox, [np.asarray(r, dtype=float) for r in patch_rings])
+        return table
+
+    @classmethod
+    def from_features(cls, features: Iterable) -> "PatchTable":
+        """Patches decomposed from drawn :class:`~.records.SurfaceFeature`
+        rings (cutouts become holes); the fallback for builders that do
+        not emit an analytic table."""
+        table = cls()
+        for index, feature in enumerate(features):
+            table.add_polygon(feature.rings, index, holes=feature.cutouts)
+        return table
@@ -0,0 +1,236 @@
+"""qols/engine/qgis_adapter.py — QGIS-aware half of the surface engine.
+
+Converts between QGIS objects and the engine's plain records: runway /
+threshold / ARP features in, memory layers out. Every ``qgis`` import is
+deferred to call time so ``qols.engine`` itself stays importable without
+a QGIS session.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from .geometry import Point2, longest_polyline
+from .records import CONTOUR_FIELDS, ContourLine, FieldSpec, SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+from .wkb import linestring_z_wkb, polygon_z_wkb
+
+__all__ = [
+    "geometry_from_wkb",
+    "polyline_points",
+    "point_coordinates",
+    "runway_geometry",
+    "runway_geometries",
+    "surface_geometry",
+    "contour_geometry",
+    "prepare_geometries",
+    "SURFACE_KEY_PROPERTY",
+    "create_layer",
+    "create_surface_layer",
+    "add_features",
+    "add_surface_features",
+    "create_contour_layer",
+]
+
+# Layer custom property holding the surface-cache key of the build a
+# surface layer was made from (SurfaceResult.cache_key).
+SURFACE_KEY_PROPERTY = "qols/surface_key"
+
+
+# ---------------------------------------------------------------------------
+# QGIS → engine
+# ---------------------------------------------------------------------------
+
+def polyline_points(geometry, iface=None) -> list[Point2]:
+    """Runway centerline vertices as ``(x, y)`` tuples.
+
+    Accepts LineString or MultiLineString (the longest part wins, with an
+    info message when ``iface`` is given); raises on empty or non-line
+    geometries with the same messages the scripts always used.
+    """
+    if geometry is None or geometry.isEmpty():
+        raise Exception("Empty geometry provided for runway centerline.")
+    if geometry.isMultipart():
+        parts = [[(p.x(), p.y()) for p in part] for part in geometry.asMultiPolyline()]
+        if not parts:
+            raise Exception("Empty MultiLineString geometry.")
+        if iface is not None and len(parts) > 1:
+            from ..compat import MSG_INFO
+            iface.messageBar().pushMessage(
+                "QOLS Info",
+                "MultiLineString detected; using longest part as centerline.",
+                level=MSG_INFO,
+            )
+        return longest_polyline(parts)
+    poly = geometry.asPolyline()
+    if poly and len(poly) >= 2:
+        return [(p.x(), p.y()) for p in poly]
+    raise Exception("Line geometry cannot be converted to a polyline.")
+
+
+def point_coordinates(features: Iterable[Any]) -> list[Point2]:
+    """``(x, y)`` of each point feature (threshold / ARP layers); features
+    with empty geometry are skipped."""
+    points = []
+    for feat in features:
+        geom = feat.geometry()
+        if geom is None or geom.isEmpty():
+            continue
+        pt = geom.asPoint()
+        points.append((pt.x(), pt.y()))
+    return points
+
+
+def runway_geometry(feature, thresholds: Iterable[Any] = (), arps: Iterable[Any] = (), iface=None) -> RunwayGeometry:
+    """:class:`RunwayGeometry` for one runway centerline feature plus the
+    threshold / ARP point features that go with it."""
+    geometry = feature.geometry()
+    return RunwayGeometry(
+        centerline=polyline_points(geometry, iface),
+        thresholds=point_coordinates(thresholds),
+        arp_points=point_coordinates(arps),
+        length=geometry.length(),
+    )
+
+
+def runway_geometries(features: Iterable[Any], thresholds: Iterable[Any] = (), arps: Iterable[Any] = (),
+                      iface=None) -> list[RunwayGeometry]:
+    """One :class:`RunwayGeometry` per centerline feature, all sharing the
+    same threshold / ARP selection."""
+    thresholds = list(thresholds)
+    arps = list(arps)
+    return [runway_geometry(feat, thresholds, arps, iface) for feat in features]
+
+
+# ---------------------------------------------------------------------------
+# engine → QGIS
+# ---------------------------------------------------------------------------
+
+def geometry_from_wkb(wkb: bytes):
+    """``QgsGeometry`` parsed from a WKB buffer (see :mod:`.wkb`)."""
+    from qgis.core import QgsGeometry
+
+    geom = QgsGeometry()
+    geom.fromWkb(wkb)
+    return geom
+
+
+def _ring_polygon_2d(ring: Sequence[Sequence[float]]):
+    """Flat 2D polygon of one ring — the operand of a ``difference_flat``."""
+    from qgis.core import QgsGeometry, QgsLineString, QgsPolygon
+
+    coords = np.asarray(ring, dtype=float)
+    return QgsGeometry(QgsPolygon(QgsLineString(coords[:, 0].tolist(), coords[:, 1].tolist())))
+
+
+def surface_geometry(record: SurfaceFeature):
+    """PolygonZ ``QgsGeometry`` for one surface feature. A single cutout
+    nested inside a convex exterior (every annulus the builders emit) is
+    written straight as a hole via ``annulus_rings``; anything else is
+    subtracted in flat 2D via ``difference_flat``. Either way the exterior
+    keeps the feature's own (flat) Z and the holes get ``cutout_z``.
+    Geometries are built from packed WKB, not vertex by vertex."""
+    if not record.cutouts:
+        return geometry_from_wkb(polygon_z_wkb(record.rings))
+
+    from ..geometry_difference import annulus_rings, difference_flat
+
+    exterior_z = record.exterior[0][2]
+    interior_z = record.cutout_z if record.cutout_z is not None else exterior_z
+    if len(record.rings) == 1 and len(record.cutouts) == 1:
+        rings = annulus_rings(record.exterior, record.cutouts[0], exterior_z, interior_z)
+        if rings is not None:
+            return geometry_from_wkb(polygon_z_wkb(rings))
+
+    base = _ring_polygon_2d(record.exterior)
+    for cutout in record.cutouts:
+        base = difference_flat(base, _ring_polygon_2d(cutout), exterior_z=exterior_z, interior_z=interior_z)
+    return base
+
+
+def contour_geometry(line: ContourLine):
+    """LineStringZ ``QgsGeometry`` for one contour line."""
+    return geometry_from_wkb(linestring_z_wkb(line.points))
+
+
+def prepare_geometries(result: SurfaceResult) -> None:
+    """Convert every feature of ``result`` (and of its ``related``
+    results) to ``QgsGeometry`` now, cutout differences included, so
+    :func:`add_surface_features` only has to attach them. Standalone
+    geometries are thread-safe — background tasks call this after the
+    build. Parts that already hold geometries (cached results) are kept."""
+    for part in (result, *result.related):
+        if part.geometries is None:
+            part.geometries = [surface_geometry(record) for record in part.features]
+
+
+def _qgs_fields(fields: Sequence[FieldSpec]) -> list:
+    from qgis.PyQt.QtCore import QVariant
+    from qgis.core import QgsField
+
+    types = {"int": QVariant.Int, "double": QVariant.Double, "string": QVariant.String}
+    return [QgsField(name, types[kind]) for name, kind in fields]
+
+
+def create_layer(geometry_type: str, crs: str, name: str, fields: Sequence[FieldSpec]):
+    """Memory layer ``"<geometry_type>?crs=<crs>"`` with ``fields`` added."""
+    from qgis.core import QgsVectorLayer
+
+    layer = QgsVectorLayer(f"{geometry_type}?crs={crs}", name, "memory")
+    layer.dataProvider().addAttributes(_qgs_fields(fields))
+    layer.updateFields()
+    return layer
+
+
+def create_surface_layer(result: SurfaceResult, crs: str, parameters_field: bool = True):
+    """PolygonZ memory layer for ``result``, with the trailing
+    ``parameters`` field (#118) unless ``parameters_field`` is False, and
+    ``result.cache_key`` stored as :data:`SURFACE_KEY_PROPERTY`."""
+    layer = create_layer("PolygonZ", crs, result.layer_name, result.fields)
+    if result.cache_key:
+        layer.setCustomProperty(SURFACE_KEY_PROPERTY, result.cache_key)
+    if parameters_field:
+        from ..parameters_inspector import add_parameters_field
+        add_parameters_field(layer)
+    return layer
+
+
+def add_features(layer, geometries: Iterable[Any], attributes: Iterable[Sequence[Any]]) -> list:
+    """Pair ``geometries`` with attribute rows and insert them all with a
+    single ``addFeatures`` call; returns the features."""
+    from qgis.core import QgsFeature
+
+    fields = layer.fields()
+    features = []
+    for geometry, row in zip(geometries, attributes):
+        feat = QgsFeature(fields)
+        feat.setGeometry(geometry)
+        feat.setAttributes(list(row))
+        features.append(feat)
+    layer.dataProvider().addFeatures(features)
+    layer.updateExtents()
+    return features
+
+
+def add_surface_features(layer, result: SurfaceResult, extra: Sequence[Any] = ()) -> list:
+    """Write every feature of ``result`` to ``layer``; ``extra`` values
+    (the params JSON) are appended after the record's own attributes."""
+    geometries = result.geometries
+    if geometries is None or len(geometries) != len(result.features):
+        geometries = [surface_geometry(record) for record in result.features]
+    return add_features(layer, geometries, ([*record.attributes.values(), *extra] for record in result.features))
+
+
+def create_contour_layer(result: SurfaceResult, crs: str, name: Optional[str] = None):
+    """LineStringZ ``*_Contours`` layer holding ``result.contours`` (IDs
+    numbered from 1), or None when there are no contour lines."""
+    if not result.contours:
+        return None
+    layer = create_layer("LineStringZ", crs, name or result.contour_layer_name, CONTOUR_FIELDS)
+    add_features(
+        layer,
+        (contour_geometry(line) for line in result.contours),
+        ((i + 1, line.elevation) for i, line in enumerate(result.contours)),
+    )
+    return layer
@@ -0,0 +1,160 @@
+"""qols/engine/racetrack.py — planar "racetrack" (stadium) rings around a
+runway centerline.
+
+Conical, Inner Horizontal, the OES Horizontal tiers, the OES Straight-in
+lower section and every Conical contour ring are the same shape: two
+half-circles of one radius centred on the runway ends, joined by straight
+sides. The legacy scripts built each vertex through an EPSG:4326 round
+trip (an identity transform for a projected layer) and segmentized
+``QgsCircularString`` arcs at a fixed 1° step. Here both arcs are sampled
+analytically in the map CRS with NumPy, with the step chosen so that no
+chord strays more than ``chord_tolerance`` from the true arc.
+
+The ring only depends on the two runway ends and the radius, so it is the
+same whichever way the runway is flown — callers no longer pass azimuths.
+That also makes it cacheable: :func:`racetrack_ring` keeps a process-wide
+LRU of finished rings keyed on (ends, radius, tolerance), so the Inner
+Horizontal / Conical pair of a combined run, the OES Horizontal tiers and
+Conical contour rings re-run at another interval reuse the arrays they
+already built. Cached rings are shared, hence read-only.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+__all__ = [
+    "DEFAULT_CHORD_TOLERANCE",
+    "arc_segment_count",
+    "racetrack_ring",
+    "ring_with_z",
+    "RingCacheInfo",
+    "ring_cache_info",
+    "clear_ring_cache",
+]
+
+# Maximum chord-to-arc distance (sagitta) in map units. 0.1 m keeps a
+# 4 km Inner Horizontal arc at ~220 vertices — finer than the old 1° step
+# (0.15 m sagitta) — while small contour rings need far fewer.
+DEFAULT_CHORD_TOLERANCE = 0.1
+
+# Never fewer than this many chords per half-circle, however coarse the
+# tolerance relative to the radius.
+_MIN_HALF_SEGMENTS = 8
+
+# Rings kept by the LRU. A 6 km ring at 0.1 m is ~550 vertices (~9 kB),
+# so a full cache stays around 5 MB — enough for a Conical at a 1 m
+# contour interval plus its neighbours.
+RING_CACHE_SIZE = 512
+
+
+class RingCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+# (sx, sy, ex, ey, radius, chord_tolerance) -> read-only (N, 2) ring.
+# Builders run on QgsTask worker threads, hence the lock.
+_ring_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_ring_cache_lock = threading.Lock()
+_ring_cache_hits = 0
+_ring_cache_misses = 0
+
+
+def arc_segment_count(radius: float, sweep_rad: float, chord_tolerance: float = DEFAULT_CHORD_TOLERANCE) -> int:
+    """Number of equal chords needed for an arc of ``radius`` sweeping
+    ``sweep_rad`` so that each chord's sagitta ``r (1 - cos(θ/2))`` stays
+    within ``chord_tolerance``."""
+    if radius <= 0 or sweep_rad <= 0:
+        return 1
+    if chord_tolerance <= 0:
+        raise ValueError(f"chord_tolerance must be positive, got {chord_tolerance}")
+    if chord_tolerance >= radius:
+        max_step = math.pi
+    else:
+        max_step = 2.0 * math.acos(1.0 - chord_tolerance / radius)
+    return max(1, int(math.ceil(sweep_rad / max_step - 1e-9)))
+
+
+def racetrack_ring(
+    start: Sequence[float],
+    end: Sequence[float],
+    radius: float,
+    chord_tolerance: float = DEFAULT_CHORD_TOLERANCE,
+) -> np.ndarray:
+    """Closed racetrack ring around the ``start``→``end`` centerline as a
+    read-only ``(N, 2)`` array (last row repeats the first), from the ring
+    cache when the same ring was built before.
+
+    The half-circle around ``start`` bulges away from ``end`` and vice
+    versa; vertices run clockwise from the ``start`` arc, the same order
+    the ``QgsCircularString`` construction produced. A zero-length
+    centerline degenerates to a full circle.
+    """
+    global _ring_cache_hits, _ring_cache_misses
+
+    key = (float(start[0]), float(start[1]), float(end[0]), float(end[1]), float(radius), float(chord_tolerance))
+    with _ring_cache_lock:
+        ring = _ring_cache.get(key)
+        if ring is not None:
+            _ring_cache.move_to_end(key)
+            _ring_cache_hits += 1
+            return ring
+        _ring_cache_misses += 1
+
+    ring = _build_racetrack_ring(*key)
+    ring.flags.writeable = False
+    with _ring_cache_lock:
+        _ring_cache[key] = ring
+        while len(_ring_cache) > RING_CACHE_SIZE:
+            _ring_cache.popitem(last=False)
+    return ring
+
+
+def ring_cache_info() -> RingCacheInfo:
+    """Hit/miss counters and occupancy of the racetrack ring cache."""
+    with _ring_cache_lock:
+        return RingCacheInfo(_ring_cache_hits, _ring_cache_misses, len(_ring_cache), RING_CACHE_SIZE)
+
+
+def clear_ring_cache() -> None:
+    """Drop every cached ring and reset the counters."""
+    global _ring_cache_hits, _ring_cache_misses
+
+    with _ring_cache_lock:
+        _ring_cache.clear()
+        _ring_cache_hits = _ring_cache_misses = 0
+
+
+def _build_racetrack_ring(sx: float, sy: float, ex: float, ey: float, radius: float,
+                          chord_tolerance: float) -> np.ndarray:
+    # Bearing (clockwise from north) pointing away from the runway at start.
+    outward = math.atan2(sx - ex, sy - ey)
+
+    n = max(_MIN_HALF_SEGMENTS, arc_segment_count(radius, math.pi, chord_tolerance))
+    theta = outward - math.pi / 2 + np.linspace(0.0, math.pi, n + 1)
+    dx = radius * np.sin(theta)
+    dy = radius * np.cos(theta)
+
+    ring = np.empty((2 * (n + 1) + 1, 2))
+    ring[:n + 1, 0] = sx + dx
+    ring[:n + 1, 1] = sy + dy
+    # The end arc is the start arc rotated by 180°: same offsets, negated.
+    ring[n + 1:-1, 0] = ex - dx
+    ring[n + 1:-1, 1] = ey - dy
+    ring[-1] = ring[0]
+    return ring
+
+
+def ring_with_z(ring: np.ndarray, z: float) -> np.ndarray:
+    """``(N, 3)`` copy of a 2D ring with every vertex at elevation ``z``."""
+    out = np.empty((len(ring), 3))
+    out[:, :2] = ring[:, :2]
+    out[:, 2] = z
+    return out
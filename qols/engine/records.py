@@ -0,0 +1,106 @@
+"""qols/engine/records.py — the plain-data output of a surface builder.
+
+A builder never touches a canvas, project or layer: it hands back a
+:class:`SurfaceResult` describing *what* to draw (3D rings, attribute
+values, contour lines) and the thin adapters in ``qols/scripts`` turn it
+into memory layers.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .geometry import Point2, Point3
+from .patches import PatchTable
+
+__all__ = [
+    "FieldSpec",
+    "SurfaceFeature",
+    "ContourLine",
+    "SurfaceResult",
+    "CONTOUR_FIELDS",
+]
+
+# (name, type) pairs; type is one of "int", "double", "string".
+FieldSpec = tuple[str, str]
+
+# Field layout shared by every ``*_Contours`` layer.
+CONTOUR_FIELDS: tuple[FieldSpec, ...] = (("ID", "int"), ("surface_elevation", "double"))
+
+
+@dataclass
+class SurfaceFeature:
+    """One polygon of a surface.
+
+    ``rings`` holds closed 3D rings, exterior first — lists of ``(x, y, z)``
+    tuples or ``(N, 3)`` arrays (racetracks). ``cutouts`` are closed 2D
+    rings to subtract from the exterior before the feature is written (the
+    annulus / trimmed-conical cases); the adapter turns them into holes —
+    directly when the cutout provably nests inside the exterior, else by
+    a boolean difference — and gives the hole boundary ``cutout_z``.
+    ``attributes`` is ordered to match ``SurfaceResult.fields``.
+    """
+
+    rings: list[list[Point3]]
+    attributes: dict[str, Any]
+    cutouts: list[list[Point2]] = field(default_factory=list)
+    cutout_z: Optional[float] = None
+
+    @property
+    def exterior(self) -> list[Point3]:
+        return self.rings[0]
+
+
+@dataclass
+class ContourLine:
+    """A 3D contour polyline (or closed ring) at ``elevation``; ``points``
+    is a list of ``(x, y, z)`` tuples or an ``(N, 3)`` array."""
+
+    points: list[Point3]
+    elevation: float
+
+
+@dataclass
+class SurfaceResult:
+    """Everything a builder produced for one surface layer.
+
+    ``info`` carries derived values (azimuths, heights, distances) the
+    adapters print for diagnostics. ``related`` holds results of surfaces
+    built alongside this one — the Inner Horizontal half of the combined
+    Inner Horizontal & Conical build. ``patches`` is the analytic
+    :class:`~.patches.PatchTable` when the builder emits one; otherwise
+    :meth:`patch_table` derives it from the drawn rings. ``geometries``
+    holds the features' ``QgsGeometry`` when they were converted ahead of
+    time (:func:`~.qgis_adapter.prepare_geometries`, off the GUI thread).
+    ``cache_key`` is the result's key in the surface cache when it was
+    built through one; layers made from it record the key, so obstacle
+    evaluation can fetch :attr:`patches` back.
+    """
+
+    surface_type: str
+    layer_name: str
+    fields: tuple[FieldSpec, ...]
+    features: list[SurfaceFeature] = field(default_factory=list)
+    contours: list[ContourLine] = field(default_factory=list)
+    contour_layer_name: Optional[str] = None
+    info: dict[str, Any] = field(default_factory=dict)
+    related: tuple["SurfaceResult", ...] = ()
+    patches: Optional[PatchTable] = None
+    geometries: Optional[list[Any]] = field(default=None, repr=False, compare=False)
+    cache_key: Optional[str] = field(default=None, compare=False)
+
+    def extend(self, other: "SurfaceResult") -> None:
+        """Append another result's features, contours and patches (per-runway loops)."""
+        if self.patches is not None and other.patches is not None:
+            self.patches.extend(other.patches, surface_offset=len(self.features))
+        else:
+            self.patches = None
+        self.features.extend(other.features)
+        self.contours.extend(other.contours)
+        self.geometries = None
+
+    def patch_table(self) -> PatchTable:
+        """Height patches for :attr:`features`, indexed by feature position."""
+        if self.patches is None:
+            return PatchTable.from_features(self.features)
+        return self.patches
@@ -0,0 +1,110 @@
+"""qols/engine/runway.py — the runway / threshold / ARP coordinates a
+builder works from.
+
+``RunwayGeometry`` is the only input a builder needs besides its parameter
+object. It is filled from QGIS features by
+:func:`qols.engine.qgis_adapter.runway_geometry`, or directly from plain
+coordinates in headless use.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .geometry import Point2, polyline_length
+
+__all__ = ["RunwayGeometry"]
+
+
+def _xy_tuple(points: Sequence[Sequence[float]]) -> tuple[Point2, ...]:
+    return tuple((float(p[0]), float(p[1])) for p in points)
+
+
+@dataclass(frozen=True)
+class RunwayGeometry:
+    """Runway centerline plus the threshold and ARP points around it.
+
+    ``centerline`` is the (longest part of the) runway polyline in map
+    units. ``thresholds`` keeps the order the features were read in — some
+    surfaces use the first, some the last, some the closest to the chosen
+    runway end, exactly as the original scripts did. ``length`` overrides
+    the polyline length (the scripts used ``QgsGeometry.length()`` of the
+    raw feature, which differs for multipart runways).
+    """
+
+    centerline: tuple[Point2, ...] = ()
+    thresholds: tuple[Point2, ...] = ()
+    arp_points: tuple[Point2, ...] = ()
+    length: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "centerline", _xy_tuple(self.centerline))
+        object.__setattr__(self, "thresholds", _xy_tuple(self.thresholds))
+        object.__setattr__(self, "arp_points", _xy_tuple(self.arp_points))
+
+    # -- centerline ------------------------------------------------------
+    def _require_centerline(self) -> None:
+        if len(self.centerline) < 2:
+            raise ValueError("Empty geometry provided for runway centerline.")
+
+    @property
+    def start(self) -> Point2:
+        self._require_centerline()
+        return self.centerline[0]
+
+    @property
+    def end(self) -> Point2:
+        self._require_centerline()
+        return self.centerline[-1]
+
+    @property
+    def runway_length(self) -> float:
+        if self.length is not None:
+            return float(self.length)
+        return polyline_length(self.centerline)
+
+    def directed_ends(self, direction: int) -> tuple[Point2, Point2]:
+        """``(near_end, far_end)`` for ``direction`` 0 (Start→End) or -1
+        (End→Start): ``line_pts[s]`` / ``line_pts[-1 - s]`` (#113)."""
+        self._require_centerline()
+        s = int(direction)
+        return self.centerline[s], self.centerline[-1 - s]
+
+    # -- thresholds ------------------------------------------------------
+    def _require_thresholds(self) -> None:
+        if not self.thresholds:
+            raise ValueError("No threshold features found")
+
+    def first_threshold(self) -> Point2:
+        self._require_thresholds()
+        return self.thresholds[0]
+
+    def last_threshold(self) -> Point2:
+        self._require_thresholds()
+        return self.thresholds[-1]
+
+    def threshold_array(self) -> np.ndarray:
+        """``(N, 2)`` array of the thresholds, built once per instance."""
+        xy = self.__dict__.get("_threshold_xy")
+        if xy is None:
+            xy = np.array(self.thresholds, dtype=float).reshape(-1, 2)
+            xy.flags.writeable = False
+            object.__setattr__(self, "_threshold_xy", xy)
+        return xy
+
+    def closest_threshold(self, pt: Sequence[float]) -> Point2:
+        """Threshold nearest to ``pt`` (first one wins ties)."""
+        self._require_thresholds()
+        xy = self.threshold_array()
+        d2 = (xy[:, 0] - pt[0]) ** 2 + (xy[:, 1] - pt[1]) ** 2
+        return self.thresholds[int(np.argmin(d2))]
+
+    def anchor_threshold(self, near_end: Sequence[float]) -> Point2:
+        """A lone threshold is used as-is; otherwise the one closest to
+        ``near_end`` (#132 — keeps the anchor from flipping with direction)."""
+        self._require_thresholds()
+        if len(self.thresholds) == 1:
+            return self.thresholds[0]
+        return self.closest_threshold(near_end)
@@ -0,0 +1,121 @@
+"""qols/engine/takeoff.py — Take-off Climb Surface, the engine half of
+``take-off-surface_UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+from typing import Optional
+
+from ..scripts import _contour_utils as cu
+from ..surface_types import SurfaceType
+from .base import SurfaceBuilder, SurfaceParams, param
+from .contours import axis_contour_lines
+from .geometry import azimuth, close_ring, project, with_z
+from .patches import PatchTable, axis_plane
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["TakeoffParams", "TakeoffBuilder"]
+
+TAKEOFF_FIELDS = (("ID", "string"), ("SurfaceName", "string"), ("rule_set", "string"))
+
+
+@dataclasses.dataclass
+class TakeoffParams(SurfaceParams):
+    runway_code: int = param(4, "code")
+    approach_width_m: float = param(150.0, "widthApp")
+    departure_width_m: float = param(180.0, "widthDep")
+    max_departure_width_m: float = param(1800.0, "maxWidthDep")
+    clearway_length_m: float = param(0.0, "CWYLength")
+    start_elevation_m: float = param(2548.0, "Z0")
+    # Per #64 the DER elevation (Z0) is the datum unless ZE is given.
+    end_elevation_m: Optional[float] = param(None, "ZE", convert=float)
+    arp_elevation_m: float = param(2548.0, "ARPH")
+    direction: int = param(0)
+    divergence_pct: float = param(12.5, "divergencePct")
+    start_distance_m: float = param(60.0, "startDistance")
+    surface_length_m: float = param(15000.0, "surfaceLength")
+    slope_pct: float = param(2.0, "slopePct")
+    contour_interval_m: int = param(0)
+
+    @property
+    def der_elevation_m(self) -> float:
+        return self.start_elevation_m if self.end_elevation_m is None else self.end_elevation_m
+
+
+class TakeoffBuilder(SurfaceBuilder):
+    """Take-off climb trapezoid + constant-width tail, starting
+    ``max(startDistance, CWYLength)`` beyond the last threshold."""
+
+    surface_type = SurfaceType.TAKEOFF
+    params_class = TakeoffParams
+
+    def build(self, params: TakeoffParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        ze = p.der_elevation_m
+
+        az = azimuth(runway.start, runway.end)
+        if p.direction == -1:
+            az += 180
+            if az >= 360:
+                az -= 360
+        baz = az + 180
+        if baz >= 360:
+            baz -= 360
+        thr = runway.last_threshold()
+
+        d_start = max(p.start_distance_m, p.clearway_length_m)
+        divergence_ratio = float(p.divergence_pct) / 100.0
+        slope_ratio = float(p.slope_pct) / 100.0
+        half_dep = p.departure_width_m / 2
+        half_max = p.max_departure_width_m / 2
+
+        pt_01D = with_z(project(thr, d_start, baz), ze)
+        pt_01DL = project(pt_01D, half_dep, baz + 90)
+        pt_01DR = project(pt_01D, half_dep, baz - 90)
+
+        distance_to_max_width = ((half_max - half_dep) / divergence_ratio) if divergence_ratio != 0 else 0.0
+        pt_02D = with_z(project(pt_01D, distance_to_max_width, baz), ze + distance_to_max_width * slope_ratio)
+        pt_02DL = project(pt_02D, half_max, baz + 90)
+        pt_02DR = project(pt_02D, half_max, baz - 90)
+
+        z_end = ze + p.surface_length_m * slope_ratio
+        pt_03D = with_z(project(pt_01D, p.surface_length_m, baz), z_end)
+        pt_03DL = project(pt_03D, half_max, baz + 90)
+        pt_03DR = project(pt_03D, half_max, baz - 90)
+
+        patches = PatchTable()
+        patches.add_plane([[pt_03DR, pt_03DL, pt_02DL, pt_01DL, pt_01DR, pt_02DR]],
+                          axis_plane(pt_01D, baz, slope_ratio), 0)
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="RWY_TakeOffClimbSurface",
+            fields=TAKEOFF_FIELDS,
+            features=[SurfaceFeature(
+                rings=[close_ring([pt_03DR, pt_03DL, pt_02DL, pt_01DL, pt_01DR, pt_02DR])],
+                attributes={"ID": 13, "SurfaceName": 'TakeOff Climb Surface', "rule_set": p.rule_set},
+            )],
+            contour_layer_name="RWY_TakeOffSurface_Contours",
+            info={
+                "azimuth": az,
+                "back_azimuth": baz,
+                "threshold": (thr[0], thr[1], p.start_elevation_m),
+                "start_distance_m": d_start,
+                "distance_to_max_width_m": distance_to_max_width,
+            },
+            patches=patches,
+        )
+
+        interval = int(p.contour_interval_m)
+        if interval > 0:
+            specs = cu.contour_specs_for_takeoff(
+                z_start=ze,
+                slope_ratio=slope_ratio,
+                distance_to_max_width=distance_to_max_width,
+                surface_length=p.surface_length_m,
+                near_half_width=half_dep,
+                max_half_width=half_max,
+                divergence_ratio=divergence_ratio,
+                elevations=cu.contour_elevations(ze, z_end, interval),
+            )
+            result.contours = axis_contour_lines(pt_01D, baz, specs)
+        return result
@@ -0,0 +1,117 @@
+"""qols/engine/transitional.py — Left/Right Transitional Surface pentagons,
+the engine half of ``TransitionalSurface_UTM.py``."""
+from __future__ import annotations
+
+import dataclasses
+
+from ..scripts import _contour_utils as cu
+from ..surface_types import SurfaceType
+from .base import SurfaceBuilder, SurfaceParams, param
+from .contours import patch_slice_contour_lines
+from .geometry import azimuth, close_ring, normalize_azimuth, project, with_z
+from .patches import PatchTable
+from .records import SurfaceFeature, SurfaceResult
+from .runway import RunwayGeometry
+
+__all__ = ["TransitionalParams", "TransitionalBuilder", "TRANSITIONAL_FIELDS"]
+
+TRANSITIONAL_FIELDS = (("ID", "string"), ("SurfaceName", "string"), ("rule_set", "string"))
+
+
+@dataclasses.dataclass
+class TransitionalParams(SurfaceParams):
+    runway_code: int = param(4, "code")
+    rwy_classification: str = param("Precision Approach CAT I", "rwyClassification")
+    approach_width_m: float = param(280.0, "widthApp")
+    start_elevation_m: float = param(2548.0, "Z0")
+    end_elevation_m: float = param(2546.5, "ZE")
+    arp_elevation_m: float = param(2548.0, "ARPH")
+    slope: float = param(14.3 / 100, "Tslope")
+    direction: int = param(0, "s")
+    merge_transitional: bool = param(False)
+    contour_interval_m: int = param(0)
+
+
+class TransitionalBuilder(SurfaceBuilder):
+    """Left/Right pentagons rising at ``slope`` from the approach edge and
+    runway strip up to the Inner Horizontal height (ARP + 45 m)."""
+
+    surface_type = SurfaceType.TRANSITIONAL
+    params_class = TransitionalParams
+
+    def build(self, params: TransitionalParams, runway: RunwayGeometry) -> SurfaceResult:
+        p = params
+        z0, ze = p.start_elevation_m, p.end_elevation_m
+        zih = 45 + p.arp_elevation_m
+        half_w = p.approach_width_m / 2
+
+        # s = 0 looks from centerline[-1] towards centerline[0]; s = -1 the
+        # other way round — the runway itself is inverted, no +180 needed.
+        end_point, start_point = runway.directed_ends(p.direction)
+        az = normalize_azimuth(azimuth(start_point, end_point))
+        baz = normalize_azimuth(az + 180)
+        thr = runway.first_threshold()
+
+        pt_01 = with_z(project(thr, 60, az), z0)
+        pt_01AL = project(pt_01, half_w, az + 90)
+        pt_01AR = project(pt_01, half_w, az - 90)
+        pt_01TL = with_z(project(pt_01, half_w + (zih - z0) / p.slope, az + 90), zih)
+        pt_01TR = with_z(project(pt_01, half_w + (zih - z0) / p.slope, az - 90), zih)
+
+        # Where the approach first section reaches the inner horizontal height
+        d_ih = (zih - z0) / (2 / 100)
+        pt_08 = with_z(project(pt_01, d_ih, az), z0 + d_ih * 0.02)
+        pt_08L = project(pt_08, half_w + d_ih * .15, az + 90)
+        pt_08R = project(pt_08, half_w + d_ih * .15, az - 90)
+
+        pt_02T = with_z(project(start_point, 60, baz), ze)
+        pt_02L = project(pt_02T, half_w, baz - 90)
+        pt_02R = project(pt_02T, half_w, baz + 90)
+        pt_02TL = with_z(project(pt_02T, half_w + (zih - ze) / p.slope, baz - 90), zih)
+        pt_02TR = with_z(project(pt_02T, half_w + (zih - ze) / p.slope, baz + 90), zih)
+
+        result = SurfaceResult(
+            surface_type=self.surface_type,
+            layer_name="RWY_Transition Surface",
+            fields=TRANSITIONAL_FIELDS,
+            contour_layer_name="RWY_TransitionalSurface_Contours",
+            info={
+                "azimuth": az,
+                "back_azimuth": baz,
+                "zih": zih,
+                "threshold": (thr[0], thr[1], z0),
+                "start_point": start_point,
+                "end_point": end_point,
+            },
+        )
+        result.features = [
+            SurfaceFeature(
+                rings=[close_ring([pt_08L, pt_01TL, pt_02TL, pt_02L, pt_01AL])],
+                attributes={"ID": 10, "SurfaceName": 'Left Transitional Surface', "rule_set": p.rule_set},
+            ),
+            SurfaceFeature(
+                rings=[close_ring([pt_08R, pt_01TR, pt_02TR, pt_02R, pt_01AR])],
+                attributes={"ID": 11, "SurfaceName": 'Right Transitional Surface', "rule_set": p.rule_set},
+            ),
+        ]
+
+        # #155 — each pentagon is two planes (runway-strip trapezoid +
+        # approach-side fan) glued along pt_01A*-pt_01T*. The same pieces
+        # give the height patches and the contours, so the two agree.
+        sides = (
+            ((pt_01TL, pt_02TL, pt_02L, pt_01AL), (pt_01TL, pt_08L, pt_01AL)),
+            ((pt_01TR, pt_02TR, pt_02R, pt_01AR), (pt_01TR, pt_08R, pt_01AR)),
+        )
+        result.patches = PatchTable()
+        for index, pieces in enumerate(sides):
+            for piece in pieces:
+                result.patches.add_polygon([close_ring(piece)], index)
+
+        interval = int(p.contour_interval_m)
+        if interval > 0:
+            # Plateau level excluded: it is the flat top boundary, not a chord.
+            elevs = [e for e in cu.contour_elevations(min(z0, ze), zih, interval) if e < zih - 1e-6]
+            # Slice the pieces separately so each level bends at the rib;
+            # the two pieces of a level are chained into one polyline there.
+            result.contours = patch_slice_contour_lines([[piece] for pieces in sides for piece in pieces], elevs)
+        return result
@@ -0,0 +1,87 @@
+"""qols/engine/wkb.py — pack engine rings straight into ISO WKB.
+
+Building a ``QgsLineString`` from Python lists, or worse one ``QgsPoint``
+per vertex, dominates layer creation once contour intervals get fine
+(thousands of rings of hundreds of vertices each). WKB is just a header
+and a run of little-endian doubles, which NumPy can emit from the
+coordinate arrays the builders already hold; ``QgsGeometry.fromWkb``
+then parses each buffer in C++. Pure NumPy/``struct`` — no QGIS import —
+so the packing is usable and testable headless.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Iterable, Sequence
+
+import numpy as np
+
+__all__ = [
+    "WKB_LINESTRING_Z",
+    "WKB_POLYGON_Z",
+    "WKB_MULTILINESTRING_Z",
+    "WKB_MULTIPOLYGON_Z",
+    "linestring_z_wkb",
+    "polygon_z_wkb",
+    "multilinestring_z_wkb",
+    "multipolygon_z_wkb",
+]
+
+# ISO WKB type codes (2D code + 1000 for Z).
+WKB_LINESTRING_Z = 1002
+WKB_POLYGON_Z = 1003
+WKB_MULTILINESTRING_Z = 1005
+WKB_MULTIPOLYGON_Z = 1006
+
+_HEADER = struct.Struct("<BII")  # byte order (1 = little endian), type, count
+_COUNT = struct.Struct("<I")
+
+
+def _xyz(points, z: float = 0.0) -> np.ndarray:
+    """``(N, 3)`` little-endian float64 coordinates; 2D input gets ``z``."""
+    arr = np.asarray(points, dtype="<f8")
+    if arr.ndim != 2 or arr.shape[1] < 2:
+        raise ValueError("WKB coordinates need at least 2 values per vertex")
+    if arr.shape[1] >= 3:
+        return np.ascontiguousarray(arr[:, :3])
+    out = np.empty((len(arr), 3), dtype="<f8")
+    out[:, :2] = arr
+    out[:, 2] = z
+    return out
+
+
+def linestring_z_wkb(points) -> bytes:
+    """LineStringZ WKB for ``(N, 3)`` (or ``(N, 2)``, Z = 0) vertices."""
+    coords = _xyz(points)
+    return _HEADER.pack(1, WKB_LINESTRING_Z, len(coords)) + coords.tobytes()
+
+
+def _polygon_body(rings: Sequence) -> list[bytes]:
+    chunks = []
+    for ring in rings:
+        coords = _xyz(ring)
+        chunks.append(_COUNT.pack(len(coords)))
+        chunks.append(coords.tobytes())
+    return chunks
+
+
+def polygon_z_wkb(rings: Sequence) -> bytes:
+    """PolygonZ WKB for closed rings, exterior first."""
+    return b"".join([_HEADER.pack(1, WKB_POLYGON_Z, len(rings)), *_polygon_body(rings)])
+
+
+def multilinestring_z_wkb(lines: Iterable) -> bytes:
+    """MultiLineStringZ WKB, one vertex array per part."""
+    lines = list(lines)
+    chunks = [_HEADER.pack(1, WKB_MULTILINESTRING_Z, len(lines))]
+    chunks.extend(linestring_z_wkb(line) for line in lines)
+    return b"".join(chunks)
+
+
+def multipolygon_z_wkb(polygons: Iterable[Sequence]) -> bytes:
+    """MultiPolygonZ WKB, one ring list (exterior first) per part."""
+    polygons = list(polygons)
+    chunks = [_HEADER.pack(1, WKB_MULTIPOLYGON_Z, len(polygons))]
+    for rings in polygons:
+        chunks.append(_HEADER.pack(1, WKB_POLYGON_Z, len(rings)))
+        chunks.extend(_polygon_body(rings))
+    return b"".join(chunks)
@@ -0,0 +1,21 @@
+"""qols/evaluation — Bulk obstacle evaluation against generated OLS surface layers."""
+from .index import SurfaceHeightIndex
+
+__all__ = [
+    "SurfaceHeightIndex",
+    "run_obstacle_evaluation",
+    "run_penetration_raster",
+]
+
+
+def run_obstacle_evaluation(iface) -> None:
+    """Menu entry point; see :func:`.evaluator.run_obstacle_evaluation`.
+    Deferred so the NumPy height index imports without a QGIS session."""
+    from .evaluator import run_obstacle_evaluation as _run
+    _run(iface)
+
+
+def run_penetration_raster(iface) -> None:
+    """Menu entry point; see :func:`.evaluator.run_penetration_raster`."""
+    from .evaluator import run_penetration_raster as _run
+    _run(iface)
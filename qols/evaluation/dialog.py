@@ -0,0 +1,166 @@
+"""qols/evaluation/dialog.py — Obstacle evaluation and penetration raster UI.
+
+Plain modal ``QDialog`` subclasses in the style of
+``KmlExportOptionsDialog``. Both share a checkable list of polygon layers
+with the generated OLS surfaces pre-checked; the obstacle dialog adds the
+point layer and its elevation source, the raster dialog the DEM/DSM layer
+and the output GeoTIFF.
+"""
+import os
+
+from qgis.gui import QgsFieldComboBox, QgsMapLayerComboBox
+from qgis.PyQt.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
+
+from ..compat import (
+    BTN_CANCEL,
+    BTN_OK,
+    CHECK_CHECKED,
+    CHECK_UNCHECKED,
+    FIELD_FILTER_NUMERIC,
+    FILTER_POINT_LAYER,
+    FILTER_RASTER_LAYER,
+    ITEM_IS_USER_CHECKABLE,
+)
+from .evaluator import is_surface_layer
+from .raster import DEFAULT_TILE_SIZE
+
+__all__ = ["ObstacleEvaluationDialog", "PenetrationRasterDialog"]
+
+
+class _SurfaceList(QListWidget):
+    """Checkable polygon layer list; generated OLS surfaces start checked."""
+
+    def __init__(self, candidates, parent=None):
+        super().__init__(parent)
+        self._layers = list(candidates)
+        for layer in self._layers:
+            item = QListWidgetItem(layer.name())
+            item.setFlags(item.flags() | ITEM_IS_USER_CHECKABLE)
+            item.setCheckState(CHECK_CHECKED if is_surface_layer(layer) else CHECK_UNCHECKED)
+            self.addItem(item)
+
+    def checked_layers(self) -> list:
+        return [layer for i, layer in enumerate(self._layers) if self.item(i).checkState() == CHECK_CHECKED]
+
+
+class ObstacleEvaluationDialog(QDialog):
+    """Prompts for the obstacle layer, its elevation source and the
+    surface layers to evaluate against."""
+
+    def __init__(self, surface_candidates, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Obstacle Evaluation")
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Obstacle Point Layer:"))
+        self._combo_layer = QgsMapLayerComboBox()
+        self._combo_layer.setFilters(FILTER_POINT_LAYER)
+        layout.addWidget(self._combo_layer)
+
+        layout.addWidget(QLabel("Obstacle Elevation (m):"))
+        self._combo_field = QgsFieldComboBox()
+        self._combo_field.setFilters(FIELD_FILTER_NUMERIC)
+        self._combo_field.setAllowEmptyFieldName(True)
+        self._combo_field.setToolTip("Leave empty to use the obstacle geometry's Z value.")
+        self._combo_field.setLayer(self._combo_layer.currentLayer())
+        self._combo_layer.layerChanged.connect(self._combo_field.setLayer)
+        layout.addWidget(self._combo_field)
+
+        layout.addWidget(QLabel("Surface Layers:"))
+        self._list_surfaces = _SurfaceList(surface_candidates)
+        layout.addWidget(self._list_surfaces)
+
+        buttons = QDialogButtonBox(BTN_OK | BTN_CANCEL)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def obstacle_layer(self):
+        return self._combo_layer.currentLayer()
+
+    def elevation_field(self):
+        """Selected attribute name, or None for geometry Z."""
+        return self._combo_field.currentField() or None
+
+    def surface_layers(self) -> list:
+        return self._list_surfaces.checked_layers()
+
+
+class PenetrationRasterDialog(QDialog):
+    """Prompts for the DEM/DSM raster, the surface layers and the output
+    penetration GeoTIFF (the mask is written next to it)."""
+
+    def __init__(self, surface_candidates, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Penetration Raster")
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Terrain / Building-Height Raster:"))
+        self._combo_raster = QgsMapLayerComboBox()
+        self._combo_raster.setFilters(FILTER_RASTER_LAYER)
+        layout.addWidget(self._combo_raster)
+
+        layout.addWidget(QLabel("Surface Layers:"))
+        self._list_surfaces = _SurfaceList(surface_candidates)
+        layout.addWidget(self._list_surfaces)
+
+        layout.addWidget(QLabel("Penetration GeoTIFF:"))
+        path_layout = QHBoxLayout()
+        self._line_path = QLineEdit()
+        btn_browse = QPushButton("Browse...")
+        btn_browse.clicked.connect(self._select_path)
+        path_layout.addWidget(self._line_path)
+        path_layout.addWidget(btn_browse)
+        layout.addLayout(path_layout)
+
+        layout.addWidget(QLabel("Tile Size (pixels):"))
+        self._spin_tile = QSpinBox()
+        self._spin_tile.setRange(128, 8192)
+        self._spin_tile.setSingleStep(256)
+        self._spin_tile.setValue(DEFAULT_TILE_SIZE)
+        layout.addWidget(self._spin_tile)
+
+        buttons = QDialogButtonBox(BTN_OK | BTN_CANCEL)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _select_path(self):
+        chosen, _ = QFileDialog.getSaveFileName(
+            self, "Penetration GeoTIFF", self._line_path.text(), "GeoTIFF (*.tif *.tiff)")
+        if chosen:
+            if not chosen.lower().endswith((".tif", ".tiff")):
+                chosen += ".tif"
+            self._line_path.setText(chosen)
+
+    def raster_layer(self):
+        return self._combo_raster.currentLayer()
+
+    def surface_layers(self) -> list:
+        return self._list_surfaces.checked_layers()
+
+    def penetration_path(self) -> str:
+        return self._line_path.text().strip()
+
+    def mask_path(self) -> str:
+        stem, ext = os.path.splitext(self.penetration_path())
+        return f"{stem}_mask{ext or '.tif'}"
+
+    def tile_size(self) -> int:
+        return self._spin_tile.value()
@@ -0,0 +1,633 @@
+"""qols/evaluation/evaluator.py — QGIS-aware bulk obstacle evaluation.
+
+The QGIS-aware counterpart to ``patches.py``: reads the generated surface
+layers and an obstacle point layer into NumPy arrays, evaluates every
+obstacle against every surface patch in one batch, and writes the result
+to an "Obstacle Evaluation" memory layer. ``run_obstacle_evaluation(iface)``
+is the single entry point ``plugin.py`` calls; it reads the layers on the
+GUI thread and runs the height-index query in an
+:class:`ObstacleEvaluationTask`.
+
+For each obstacle the controlling surface is the lowest surface covering
+its XY; penetration is obstacle elevation minus that surface's elevation
+(positive = penetrates). Obstacles outside every surface keep NULL
+surface columns. Multipoint obstacles report their worst vertex.
+
+Surfaces are evaluated against the patch table their builder emitted:
+a layer made by a Calculate records the surface-cache key of its build
+(:data:`~qols.engine.qgis_adapter.SURFACE_KEY_PROPERTY`), and the table
+is fetched back from the cache as long as the layer still matches the
+build (same CRS, no pending edits, same feature count and bounding
+boxes). Any other layer is decomposed from its drawn PolygonZ rings,
+except the Conical: its layer is a flat polygon at the top elevation
+(trimmed or not), so each Conical feature is rebuilt from its attributes
+— runway ends, radius, height, datum, inner height and slope — as the
+builder's analytic cone patch
+(:meth:`~qols.engine.patches.PatchTable.add_cone`).
+"""
+from __future__ import annotations
+
+import traceback
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from qgis.core import QgsTask
+
+from .. import logger
+from ..compat import TASK_CAN_CANCEL
+from ..engine.horizontal import ConicalParams
+from ..engine.patches import PatchTable
+from .index import SurfaceHeightIndex
+
+__all__ = [
+    "SURFACE_LAYER_PREFIXES",
+    "EVALUATION_LAYER_NAME",
+    "EVALUATION_FIELDS",
+    "ObstacleEvaluation",
+    "is_surface_layer",
+    "surface_patches",
+    "evaluate_points",
+    "evaluate_obstacles",
+    "create_evaluation_layer",
+    "run_obstacle_evaluation",
+    "ObstacleEvaluationTask",
+    "cancel_obstacle_evaluations",
+    "PenetrationRasterTask",
+    "cancel_penetration_rasters",
+    "run_penetration_raster",
+]
+
+# Layer-name prefixes of the polygon layers the plugin generates; used to
+# preselect surfaces in the dialog.
+SURFACE_LAYER_PREFIXES = (
+    "RWY_",
+    "Conical",
+    "InnerHorizontal",
+    "Outer Horizontal",
+    "NewOLS_",
+    "Merged Transitional Surface",
+)
+
+EVALUATION_LAYER_NAME = "Obstacle Evaluation"
+
+EVALUATION_FIELDS = (
+    ("obstacle_fid", "int"),
+    ("elevation_m", "double"),
+    ("surface", "string"),
+    ("surface_elevation_m", "double"),
+    ("penetration_m", "double"),
+)
+
+# Obstacle vertices per height-index query in ObstacleEvaluationTask; each
+# chunk is one progress step and one cancellation check.
+EVALUATION_CHUNK = 50_000
+
+# Attributes that name the part of a surface a feature is, in order of
+# preference (OES/OFS ``component``, legacy ``SurfaceName`` / ``ID``).
+_LABEL_FIELDS = ("component", "SurfaceName", "ID")
+
+# Conical attributes the analytic cone is rebuilt from (ConicalBuilder);
+# ``slope_pct`` is optional — layers from before it was stored used the
+# ConicalParams default.
+_CONICAL_FIELDS = ("radius_m", "height_m", "datum_elevation_m", "inner_height_m",
+                   "runway_start_x", "runway_start_y", "runway_end_x", "runway_end_y")
+
+
+@dataclass
+class ObstacleEvaluation:
+    """Per-obstacle results as parallel arrays. ``surface`` holds labels
+    (None where no surface covers the obstacle); ``surface_z`` and
+    ``penetration`` are NaN there."""
+
+    fids: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    elevation: np.ndarray
+    surface: List[Optional[str]]
+    surface_z: np.ndarray
+    penetration: np.ndarray
+
+    @property
+    def penetrating(self) -> int:
+        return int(np.count_nonzero(self.penetration > 0))
+
+
+def is_surface_layer(layer) -> bool:
+    """True for polygon layers named like a generated OLS surface."""
+    from qgis.core import QgsVectorLayer
+
+    from ..compat import GEOM_TYPE_POLYGON
+    return (
+        isinstance(layer, QgsVectorLayer)
+        and layer.geometryType() == GEOM_TYPE_POLYGON
+        and layer.name().startswith(SURFACE_LAYER_PREFIXES)
+    )
+
+
+def _ring_array(ring) -> Optional[np.ndarray]:
+    if ring is None or ring.numPoints() < 3 or not ring.is3D():
+        return None
+    return np.column_stack([ring.xVector(), ring.yVector(), ring.zVector()]).astype(float)
+
+
+def _polygon_rings(geometry) -> List[List[np.ndarray]]:
+    """3D rings (exterior first) of each polygon part of ``geometry``;
+    parts without Z are dropped."""
+    from qgis.core import QgsMultiSurface
+
+    geom = geometry.constGet()
+    parts = [geom.geometryN(i) for i in range(geom.numGeometries())] if isinstance(geom, QgsMultiSurface) else [geom]
+    polygons = []
+    for part in parts:
+        exterior = _ring_array(part.exteriorRing())
+        if exterior is None:
+            continue
+        holes = [_ring_array(part.interiorRing(i)) for i in range(part.numInteriorRings())]
+        polygons.append([exterior, *(h for h in holes if h is not None)])
+    return polygons
+
+
+def _feature_label(layer_name: str, feature, field_names: Sequence[str]) -> str:
+    for name in _LABEL_FIELDS:
+        if name in field_names:
+            value = feature[name]
+            if value not in (None, "") and str(value) != "NULL":
+                return f"{layer_name} — {value}"
+    return layer_name
+
+
+def _request(crs):
+    from qgis.core import QgsFeatureRequest, QgsProject
+    return QgsFeatureRequest().setDestinationCrs(crs, QgsProject.instance().transformContext())
+
+
+def _conical_cone(feature, field_names: Sequence[str], transform) -> Optional[tuple]:
+    """``(start, end, r_in, r_out, z_in, slope)`` of a Conical feature's
+    cone, from its attributes, or None for any other feature. The inner
+    radius follows the dock's relation ``radius = height / slope + r_in``;
+    ``transform`` maps the runway ends into the evaluation CRS (or None)."""
+    if "surface_type" not in field_names or feature["surface_type"] != "Conical":
+        return None
+    if any(name not in field_names for name in _CONICAL_FIELDS):
+        return None
+    try:
+        values = {name: float(feature[name]) for name in _CONICAL_FIELDS}
+        slope_pct = float(feature["slope_pct"]) if "slope_pct" in field_names else ConicalParams.slope_pct
+    except (TypeError, ValueError):
+        return None  # NULL attributes: evaluate the drawn polygon
+    if slope_pct <= 0:
+        return None
+    slope = slope_pct / 100.0
+    ends = [(values["runway_start_x"], values["runway_start_y"]), (values["runway_end_x"], values["runway_end_y"])]
+    if transform is not None:
+        from qgis.core import QgsPointXY
+
+        ends = [(p.x(), p.y()) for p in (transform.transform(QgsPointXY(x, y)) for x, y in ends)]
+    r_out = values["radius_m"]
+    r_in = max(0.0, r_out - values["height_m"] / slope)
+    return ends[0], ends[1], r_in, r_out, values["datum_elevation_m"] + values["inner_height_m"], slope
+
+
+def _attribute_transform(layer, crs):
+    """Transform from ``layer``'s CRS to ``crs`` for coordinates stored in
+    attributes: None when they already match, False when ``crs`` is
+    geographic (metre radii cannot be applied there)."""
+    from qgis.core import QgsCoordinateTransform, QgsProject
+
+    if crs.isGeographic():
+        return False
+    if layer.crs() == crs:
+        return None
+    return QgsCoordinateTransform(layer.crs(), crs, QgsProject.instance())
+
+
+def _built_patches(layer, crs, features) -> Optional[PatchTable]:
+    """The patch table ``layer``'s builder emitted, from the surface
+    cache, or None when the layer has no build key, the build is no
+    longer cached, or the layer no longer matches it (other CRS, pending
+    edits, features added, removed or reshaped). Patch ``surface``
+    indexes are positions in ``features``."""
+    from ..engine.qgis_adapter import SURFACE_KEY_PROPERTY
+
+    key = layer.customProperty(SURFACE_KEY_PROPERTY)
+    if not key or layer.crs() != crs or layer.isModified():
+        return None
+    from ..surface_cache import surface_cache
+
+    result = surface_cache().get(str(key))
+    if result is None or len(result.features) != len(features):
+        return None
+    for record, feature in zip(result.features, features):
+        box = feature.geometry().boundingBox()
+        drawn = (box.xMinimum(), box.yMinimum(), box.xMaximum(), box.yMaximum())
+        exterior = np.asarray(record.exterior, dtype=float)
+        built = (exterior[:, 0].min(), exterior[:, 1].min(), exterior[:, 0].max(), exterior[:, 1].max())
+        if not np.allclose(drawn, built, rtol=0.0, atol=1e-6):
+            return None
+    return result.patch_table()
+
+
+def surface_patches(layers, crs) -> tuple[PatchTable, List[str]]:
+    """Patch table for every feature of ``layers`` (reprojected to
+    ``crs``) and the label of each patch's ``surface`` index: the
+    builder's own table where :func:`_built_patches` finds it, otherwise
+    decomposed from the drawn rings, Conical features as analytic cone
+    patches (see :func:`_conical_cone`)."""
+    patches = PatchTable()
+    labels = []
+    for layer in layers:
+        field_names = layer.fields().names()
+        features = [feature for feature in layer.getFeatures(_request(crs))
+                    if feature.geometry() is not None and not feature.geometry().isEmpty()]
+        built = _built_patches(layer, crs, features)
+        if built is not None:
+            patches.extend(built, surface_offset=len(labels))
+            labels.extend(_feature_label(layer.name(), feature, field_names) for feature in features)
+            continue
+        transform = _attribute_transform(layer, crs)
+        skipped = flat_conicals = 0
+        for feature in features:
+            geometry = feature.geometry()
+            if transform is False:
+                cone = None
+                if "surface_type" in field_names and feature["surface_type"] == "Conical":
+                    flat_conicals += 1
+            else:
+                cone = _conical_cone(feature, field_names, transform)
+            if cone is not None:
+                index = len(labels)
+                labels.append(_feature_label(layer.name(), feature, field_names))
+                patches.add_cone(*cone, index)
+                continue
+            polygons = _polygon_rings(geometry)
+            if not polygons:
+                skipped += 1
+                continue
+            index = len(labels)
+            labels.append(_feature_label(layer.name(), feature, field_names))
+            for rings in polygons:
+                patches.add_polygon(rings, index)
+        if skipped:
+            logger.warning(f"Obstacle evaluation: skipped {skipped} feature(s) without Z in '{layer.name()}'")
+        if flat_conicals:
+            logger.warning(f"Obstacle evaluation: '{layer.name()}' evaluated at its drawn (top) elevation — "
+                           f"the Conical slope needs a projected CRS, not {crs.authid()}")
+    return patches, labels
+
+
+def _obstacle_points(layer, crs, elevation_field: Optional[str]):
+    """Flattened obstacle vertices: ``(owner, fids, x, y, z)`` where
+    ``owner`` maps each vertex to its row in ``fids``."""
+    owner, fids, xs, ys, zs = [], [], [], [], []
+    for feature in layer.getFeatures(_request(crs)):
+        geometry = feature.geometry()
+        if geometry is None or geometry.isEmpty():
+            continue
+        field_z = None
+        if elevation_field:
+            value = feature[elevation_field]
+            try:
+                field_z = float(value)
+            except (TypeError, ValueError):
+                continue  # NULL / non-numeric elevation: nothing to evaluate
+        row = len(fids)
+        for vertex in geometry.vertices():
+            z = field_z if field_z is not None else vertex.z()
+            if z is None or z != z:  # NaN: 2D geometry without an elevation field
+                continue
+            owner.append(row)
+            xs.append(vertex.x())
+            ys.append(vertex.y())
+            zs.append(z)
+        if owner and owner[-1] == row:
+            fids.append(feature.id())
+    return (np.asarray(owner, dtype=np.int64), np.asarray(fids, dtype=np.int64),
+            np.asarray(xs, dtype=float), np.asarray(ys, dtype=float), np.asarray(zs, dtype=float))
+
+
+def evaluate_points(patches: PatchTable, labels: Sequence[str], points,
+                    chunk_size: int = EVALUATION_CHUNK,
+                    progress: Optional[Callable[[int, int], None]] = None,
+                    canceled: Optional[Callable[[], bool]] = None) -> Optional[ObstacleEvaluation]:
+    """Evaluate the ``(owner, fids, x, y, z)`` obstacle vertices of
+    ``_obstacle_points`` against ``patches``, ``chunk_size`` vertices per
+    height-index query. ``progress(done, total)`` is called after each
+    chunk; ``canceled()`` is checked before each one, and once it returns
+    True None is returned. Needs no QGIS objects, so it runs in
+    :class:`ObstacleEvaluationTask`."""
+    owner, fids, x, y, z = points
+    index = SurfaceHeightIndex(patches)
+    surface_z = np.full(len(x), np.nan)
+    surface = np.full(len(x), -1, dtype=np.int64)
+    starts = range(0, len(x), max(1, chunk_size))
+    for done, start in enumerate(starts, start=1):
+        if canceled is not None and canceled():
+            return None
+        stop = start + chunk_size
+        surface_z[start:stop], surface[start:stop] = index.z_at(x[start:stop], y[start:stop])
+        if progress is not None:
+            progress(done, len(starts))
+    penetration = z - surface_z
+
+    # Worst vertex per obstacle: sort by owner, then by descending
+    # penetration with uncovered (NaN) vertices last, and keep the first.
+    rank = np.where(np.isnan(penetration), np.inf, -penetration)
+    order = np.lexsort((rank, owner))
+    first = order[np.r_[True, owner[order][1:] != owner[order][:-1]]] if len(order) else order
+
+    return ObstacleEvaluation(
+        fids=fids,
+        x=x[first],
+        y=y[first],
+        elevation=z[first],
+        surface=[labels[i] if i >= 0 else None for i in surface[first].tolist()],
+        surface_z=surface_z[first],
+        penetration=penetration[first],
+    )
+
+
+def evaluate_obstacles(obstacle_layer, surface_layers, elevation_field: Optional[str] = None,
+                       crs=None) -> ObstacleEvaluation:
+    """Evaluate every obstacle of ``obstacle_layer`` against
+    ``surface_layers``. Elevations come from ``elevation_field`` or, when
+    None, from the geometry Z. Coordinates are compared in ``crs``
+    (default: the first surface layer's CRS)."""
+    surface_layers = list(surface_layers)
+    if crs is None:
+        crs = surface_layers[0].crs() if surface_layers else obstacle_layer.crs()
+
+    patches, labels = surface_patches(surface_layers, crs)
+    return evaluate_points(patches, labels, _obstacle_points(obstacle_layer, crs, elevation_field))
+
+
+def create_evaluation_layer(result: ObstacleEvaluation, crs: str):
+    """PointZ memory layer with one feature per evaluated obstacle."""
+    from qgis.core import QgsFeature, QgsGeometry, QgsPoint
+
+    from ..engine.qgis_adapter import create_layer
+
+    def _value(v):
+        return None if v != v else round(float(v), 3)
+
+    layer = create_layer("PointZ", crs, EVALUATION_LAYER_NAME, EVALUATION_FIELDS)
+    features = []
+    for i, fid in enumerate(result.fids.tolist()):
+        feat = QgsFeature()
+        feat.setGeometry(QgsGeometry(QgsPoint(float(result.x[i]), float(result.y[i]), float(result.elevation[i]))))
+        feat.setAttributes([
+            fid,
+            _value(result.elevation[i]),
+            result.surface[i],
+            _value(result.surface_z[i]),
+            _value(result.penetration[i]),
+        ])
+        features.append(feat)
+    layer.dataProvider().addFeatures(features)
+    layer.updateExtents()
+    return layer
+
+
+def _surface_candidates(iface) -> list:
+    """Polygon layers of the project, or [] after a message-bar warning."""
+    from qgis.core import QgsProject, QgsVectorLayer
+
+    from ..compat import GEOM_TYPE_POLYGON, MSG_WARNING
+
+    candidates = [
+        layer for layer in QgsProject.instance().mapLayers().values()
+        if isinstance(layer, QgsVectorLayer) and layer.geometryType() == GEOM_TYPE_POLYGON
+    ]
+    if not candidates:
+        iface.messageBar().pushMessage(
+            "QOLS", "No surface layers to evaluate against — generate surfaces first.",
+            level=MSG_WARNING, duration=5)
+    return candidates
+
+
+class ObstacleEvaluationTask(QgsTask):
+    """:func:`evaluate_points` on a worker thread, reporting progress per
+    chunk and stopping at the next chunk once canceled.
+
+    ``result`` holds the :class:`ObstacleEvaluation` once the task
+    succeeded, ``error`` the exception if the run raised.
+    ``on_finished(task, ok)`` is called on the GUI thread.
+    """
+
+    def __init__(self, patches: PatchTable, labels: Sequence[str], points, crs_authid: str,
+                 on_finished: Callable[["ObstacleEvaluationTask", bool], None]):
+        super().__init__("QOLS: Obstacle evaluation", TASK_CAN_CANCEL)
+        self.patches = patches
+        self.labels = list(labels)
+        self.points = points
+        self.crs_authid = crs_authid
+        self.result: Optional[ObstacleEvaluation] = None
+        self.error: Optional[BaseException] = None
+        self.error_traceback = ""
+        self._on_finished = on_finished
+
+    def run(self) -> bool:
+        try:
+            self.result = evaluate_points(
+                self.patches, self.labels, self.points,
+                progress=lambda done, total: self.setProgress(100.0 * done / total), canceled=self.isCanceled)
+        except Exception as e:
+            self.error = e
+            self.error_traceback = traceback.format_exc()
+            return False
+        return self.result is not None
+
+    def finished(self, ok: bool) -> None:
+        self._on_finished(self, ok)
+
+
+# Running evaluation tasks; the task manager does not keep the Python wrappers alive.
+_evaluation_tasks: set = set()
+
+
+def _obstacle_evaluation_finished(iface, task: ObstacleEvaluationTask, ok: bool) -> None:
+    """Adds the "Obstacle Evaluation" layer and reports the counts (GUI thread)."""
+    from qgis.core import QgsProject
+
+    from ..compat import MSG_CRITICAL, MSG_INFO, MSG_SUCCESS, MSG_WARNING
+
+    _evaluation_tasks.discard(task)
+    if not ok:
+        if task.error is not None:
+            logger.error(f"Obstacle evaluation failed: {task.error}\n{task.error_traceback}")
+            iface.messageBar().pushMessage(
+                "QOLS", f"Obstacle evaluation failed: {task.error}", level=MSG_CRITICAL, duration=8)
+        else:
+            iface.messageBar().pushMessage("QOLS", "Obstacle evaluation canceled.", level=MSG_INFO, duration=5)
+        return
+
+    result = task.result
+    QgsProject.instance().addMapLayer(create_evaluation_layer(result, task.crs_authid))
+
+    covered = sum(1 for label in result.surface if label is not None)
+    message = (f"Evaluated {len(result.fids)} obstacle(s): {covered} under a surface, "
+               f"{result.penetrating} penetrating.")
+    logger.info(message)
+    iface.messageBar().pushMessage(
+        "QOLS", message, level=MSG_WARNING if result.penetrating else MSG_SUCCESS, duration=8)
+
+
+def cancel_obstacle_evaluations() -> None:
+    """Cancel every running obstacle evaluation task (plugin unload)."""
+    for task in list(_evaluation_tasks):
+        task.cancel()
+
+
+def run_obstacle_evaluation(iface) -> None:
+    """Entry point: prompts for the obstacle layer, elevation source and
+    surface layers, then evaluates them in an :class:`ObstacleEvaluationTask`
+    and adds the "Obstacle Evaluation" layer when it finishes."""
+    from qgis.core import QgsApplication
+
+    from ..compat import DIALOG_ACCEPTED, MSG_WARNING
+    from .dialog import ObstacleEvaluationDialog
+
+    candidates = _surface_candidates(iface)
+    if not candidates:
+        return
+
+    dlg = ObstacleEvaluationDialog(candidates, parent=iface.mainWindow())
+    if dlg.exec() != DIALOG_ACCEPTED:
+        return
+    obstacle_layer = dlg.obstacle_layer()
+    surface_layers = dlg.surface_layers()
+    if obstacle_layer is None or not surface_layers:
+        iface.messageBar().pushMessage(
+            "QOLS", "Select an obstacle layer and at least one surface layer.",
+            level=MSG_WARNING, duration=5)
+        return
+
+    # Reading the layers stays on the GUI thread; the height-index query doesn't.
+    crs = surface_layers[0].crs()
+    patches, labels = surface_patches(surface_layers, crs)
+    points = _obstacle_points(obstacle_layer, crs, dlg.elevation_field())
+    task = ObstacleEvaluationTask(
+        patches, labels, points, crs.authid(),
+        lambda finished_task, ok: _obstacle_evaluation_finished(iface, finished_task, ok))
+    _evaluation_tasks.add(task)
+    QgsApplication.taskManager().addTask(task)
+
+
+class PenetrationRasterTask(QgsTask):
+    """:func:`~.raster.penetration_raster` on a worker thread, reporting
+    progress per tile and stopping at the next tile once canceled.
+
+    ``summary`` holds the :class:`~.raster.PenetrationSummary` once the
+    task succeeded, ``error`` the exception if the run raised.
+    ``on_finished(task, ok)`` is called on the GUI thread.
+    """
+
+    def __init__(self, dem_path: str, table: PatchTable, penetration_path: str, mask_path: str,
+                 tile_size: int, on_finished: Callable[["PenetrationRasterTask", bool], None]):
+        super().__init__("QOLS: Penetration raster", TASK_CAN_CANCEL)
+        self.dem_path = dem_path
+        self.table = table
+        self.penetration_path = penetration_path
+        self.mask_path = mask_path
+        self.tile_size = tile_size
+        self.summary = None
+        self.error: Optional[BaseException] = None
+        self.error_traceback = ""
+        self._on_finished = on_finished
+
+    def run(self) -> bool:
+        from .raster import penetration_raster
+
+        try:
+            self.summary = penetration_raster(
+                self.dem_path, self.table, self.penetration_path, self.mask_path, tile_size=self.tile_size,
+                progress=lambda done, total: self.setProgress(100.0 * done / total), canceled=self.isCanceled)
+        except Exception as e:
+            self.error = e
+            self.error_traceback = traceback.format_exc()
+            return False
+        return self.summary is not None
+
+    def finished(self, ok: bool) -> None:
+        self._on_finished(self, ok)
+
+
+# Running raster tasks; the task manager does not keep the Python wrappers alive.
+_raster_tasks: set = set()
+
+
+def _penetration_raster_finished(iface, task: PenetrationRasterTask, ok: bool) -> None:
+    """Adds the outputs and reports the summary (GUI thread)."""
+    from qgis.core import QgsProject, QgsRasterLayer
+
+    from ..compat import MSG_CRITICAL, MSG_INFO, MSG_SUCCESS, MSG_WARNING
+
+    _raster_tasks.discard(task)
+    if not ok:
+        if task.error is not None:
+            logger.error(f"Penetration raster failed: {task.error}\n{task.error_traceback}")
+            iface.messageBar().pushMessage(
+                "QOLS", f"Penetration raster failed: {task.error}", level=MSG_CRITICAL, duration=8)
+        else:
+            iface.messageBar().pushMessage("QOLS", "Penetration raster canceled.", level=MSG_INFO, duration=5)
+        return
+
+    project = QgsProject.instance()
+    project.addMapLayer(QgsRasterLayer(task.mask_path, "Penetration Mask"))
+    project.addMapLayer(QgsRasterLayer(task.penetration_path, "Penetration"))
+
+    summary = task.summary
+    message = f"Penetration raster: {summary.covered} of {summary.pixels} pixels under a surface"
+    if summary.penetrating:
+        message += f", {summary.penetrating} penetrating (max {summary.max_penetration:.2f} m)."
+    else:
+        message += ", none penetrating."
+    logger.info(message)
+    iface.messageBar().pushMessage(
+        "QOLS", message, level=MSG_WARNING if summary.penetrating else MSG_SUCCESS, duration=8)
+
+
+def cancel_penetration_rasters() -> None:
+    """Cancel every running penetration raster task (plugin unload)."""
+    for task in list(_raster_tasks):
+        task.cancel()
+
+
+def run_penetration_raster(iface) -> None:
+    """Entry point: prompts for the DEM/DSM raster, surface layers and
+    output path, then writes the penetration GeoTIFF and mask tile by tile
+    (see :mod:`.raster`) in a :class:`PenetrationRasterTask` and adds both
+    to the project when it finishes."""
+    from qgis.core import QgsApplication
+
+    from ..compat import DIALOG_ACCEPTED, MSG_WARNING
+    from .dialog import PenetrationRasterDialog
+
+    candidates = _surface_candidates(iface)
+    if not candidates:
+        return
+
+    dlg = PenetrationRasterDialog(candidates, parent=iface.mainWindow())
+    if dlg.exec() != DIALOG_ACCEPTED:
+        return
+    raster_layer = dlg.raster_layer()
+    surface_layers = dlg.surface_layers()
+    if raster_layer is None or not surface_layers or not dlg.penetration_path():
+        iface.messageBar().pushMessage(
+            "QOLS", "Select a raster, at least one surface layer and an output file.",
+            level=MSG_WARNING, duration=5)
+        return
+    if raster_layer.providerType() != "gdal":
+        iface.messageBar().pushMessage(
+            "QOLS", f"'{raster_layer.name()}' is not a file-based (GDAL) raster.",
+            level=MSG_WARNING, duration=5)
+        return
+
+    # Surfaces are reprojected into the raster's CRS so pixels are never
+    # warped. Reading the layers stays on the GUI thread; the tiles don't.
+    table, _labels = surface_patches(surface_layers, raster_layer.crs())
+    task = PenetrationRasterTask(
+        raster_layer.source(), table, dlg.penetration_path(), dlg.mask_path(), dlg.tile_size(),
+        lambda finished_task, ok: _penetration_raster_finished(iface, finished_task, ok))
+    _raster_tasks.add(task)
+    QgsApplication.taskManager().addTask(task)
@@ -0,0 +1,132 @@
+"""qols/evaluation/index.py — "lowest OLS elevation at (x, y)" queries.
+
+:class:`SurfaceHeightIndex` puts a uniform grid over the bounding boxes
+of a :class:`~qols.engine.patches.PatchTable`. Batch queries bucket the
+points by grid cell once (one argsort); every patch then reads the points
+of the cells its bounding box spans as one contiguous slice per grid row
+and evaluates its height model on them in NumPy. Single-point queries
+(map tips) look up the patches registered in the point's cell.
+
+Pure NumPy, no QGIS dependency.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from ..engine.patches import PatchTable
+
+__all__ = ["SurfaceHeightIndex"]
+
+# Grid cells along the longer side of the patches' combined extent.
+_DEFAULT_GRID_CELLS = 128
+
+
+class SurfaceHeightIndex:
+    """Grid index over a patch table answering the lowest surface Z.
+
+    ``z_at`` returns ``(z, surface)`` where ``surface`` is the controlling
+    patch's ``surfaces`` entry; uncovered points get NaN and -1.
+    """
+
+    __slots__ = ("table", "_x0", "_y0", "_x1", "_y1", "_cell", "_nx", "_ny", "_patch_cells", "_cell_ptr",
+                 "_cell_patches")
+
+    def __init__(self, table: PatchTable, grid_cells: int = _DEFAULT_GRID_CELLS):
+        self.table = table
+        bboxes = table.bboxes
+        if len(bboxes):
+            self._x0, self._y0 = float(bboxes[:, 0].min()), float(bboxes[:, 1].min())
+            self._x1, self._y1 = float(bboxes[:, 2].max()), float(bboxes[:, 3].max())
+        else:
+            self._x0 = self._y0 = self._x1 = self._y1 = 0.0
+        width, height = self._x1 - self._x0, self._y1 - self._y0
+        self._cell = max(width, height, 1.0) / grid_cells
+        self._nx = max(1, int(math.ceil(width / self._cell)))
+        self._ny = max(1, int(math.ceil(height / self._cell)))
+
+        # (ix0, iy0, ix1, iy1) inclusive cell span of every patch.
+        cells = np.empty((len(bboxes), 4), dtype=np.int64)
+        cells[:, 0] = self._clip_x(np.floor((bboxes[:, 0] - self._x0) / self._cell))
+        cells[:, 1] = self._clip_y(np.floor((bboxes[:, 1] - self._y0) / self._cell))
+        cells[:, 2] = self._clip_x(np.floor((bboxes[:, 2] - self._x0) / self._cell))
+        cells[:, 3] = self._clip_y(np.floor((bboxes[:, 3] - self._y0) / self._cell))
+        self._patch_cells = cells
+
+        # CSR cell -> patches, for single-point lookups.
+        owners = [[] for _ in range(self._nx * self._ny)]
+        for i, (ix0, iy0, ix1, iy1) in enumerate(cells.tolist()):
+            for iy in range(iy0, iy1 + 1):
+                row = iy * self._nx
+                for ix in range(ix0, ix1 + 1):
+                    owners[row + ix].append(i)
+        self._cell_ptr = np.cumsum([0] + [len(o) for o in owners])
+        self._cell_patches = np.asarray([i for o in owners for i in o], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _clip_x(self, values):
+        return np.clip(values, 0, self._nx - 1).astype(np.int64)
+
+    def _clip_y(self, values):
+        return np.clip(values, 0, self._ny - 1).astype(np.int64)
+
+    def z_at(self, x, y) -> tuple[np.ndarray, np.ndarray]:
+        """Lowest surface Z and controlling surface index at every point."""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        z_best = np.full(len(x), np.inf)
+        surface = np.full(len(x), -1, dtype=np.int64)
+        if len(x) == 0 or len(self.table) == 0:
+            return np.full(len(x), np.nan), surface
+
+        # Bounds on the coordinates, then clamp: a point on the max edge
+        # of the extent belongs to the last cell, not past it.
+        in_grid = np.flatnonzero((x >= self._x0) & (x <= self._x1) & (y >= self._y0) & (y <= self._y1))
+        fx = self._clip_x(np.floor((x[in_grid] - self._x0) / self._cell))
+        fy = self._clip_y(np.floor((y[in_grid] - self._y0) / self._cell))
+        cell_ids = fy * self._nx + fx
+        order = np.argsort(cell_ids, kind="stable")
+        points = in_grid[order]
+        starts = np.searchsorted(cell_ids[order], np.arange(self._nx * self._ny + 1))
+
+        bboxes = self.table.bboxes
+        surfaces = self.table.surfaces
+        for i, (ix0, iy0, ix1, iy1) in enumerate(self._patch_cells.tolist()):
+            slices = [
+                points[starts[iy * self._nx + ix0]:starts[iy * self._nx + ix1 + 1]]
+                for iy in range(iy0, iy1 + 1)
+            ]
+            idx = slices[0] if len(slices) == 1 else np.concatenate(slices)
+            if len(idx) == 0:
+                continue
+            min_x, min_y, max_x, max_y = bboxes[i]
+            px, py = x[idx], y[idx]
+            keep = (px >= min_x) & (px <= max_x) & (py >= min_y) & (py <= max_y)
+            if not keep.all():
+                idx, px, py = idx[keep], px[keep], py[keep]
+            inside, z = self.table.evaluate(i, px, py)
+            lower = inside & (z < z_best[idx])
+            z_best[idx[lower]] = z[lower]
+            surface[idx[lower]] = surfaces[i]
+
+        z_best[surface < 0] = np.nan
+        return z_best, surface
+
+    def z_at_point(self, x: float, y: float) -> tuple[float, int]:
+        """Scalar :meth:`z_at` that only touches the patches registered in
+        the point's cell — for per-cursor map-tip queries."""
+        if not (self._x0 <= x <= self._x1 and self._y0 <= y <= self._y1) or len(self.table) == 0:
+            return math.nan, -1
+        fx = min(math.floor((x - self._x0) / self._cell), self._nx - 1)
+        fy = min(math.floor((y - self._y0) / self._cell), self._ny - 1)
+        cell = fy * self._nx + fx
+        px, py = np.array([x], dtype=float), np.array([y], dtype=float)
+        best, owner = math.inf, -1
+        for i in self._cell_patches[self._cell_ptr[cell]:self._cell_ptr[cell + 1]].tolist():
+            inside, z = self.table.evaluate(i, px, py)
+            if inside[0] and z[0] < best:
+                best, owner = float(z[0]), int(self.table.surfaces[i])
+        return (best, owner) if owner >= 0 else (math.nan, -1)
@@ -0,0 +1,272 @@
+"""qols/evaluation/raster.py — tiled DEM/DSM penetration rasters.
+
+Drapes the OLS over a terrain or building-height raster: for every pixel
+centre the lowest surface elevation comes from a
+:class:`~.index.SurfaceHeightIndex`, and the raster value minus that
+elevation is written to a Float32 penetration GeoTIFF plus a Byte mask
+(1 = penetrates, 0 = clear, 255 = no surface / no data).
+
+The input is streamed in windows aligned to its GDAL block size, read
+through GDAL's virtual memory mapping when the driver supports it
+(uncompressed GeoTIFF and other raw layouts) and through ``ReadAsArray``
+otherwise, and both outputs are written window by window — memory stays
+bounded by the tile size whatever the raster size. Windows can be
+computed in a process pool (``workers > 0``); each worker opens the input
+itself and rebuilds the index from the pickled :class:`PatchTable`, and
+only finished tiles travel back to the writer.
+
+GDAL (``osgeo``) ships with QGIS; it is imported at call time so the
+tile math stays importable without it. The pool is for headless/batch
+runs — QGIS's embedded interpreter cannot reliably spawn workers, so the
+menu tool runs in-process, in a background task that reports progress
+and can cancel between tiles.
+"""
+from __future__ import annotations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from ..engine.patches import PatchTable
+from .index import SurfaceHeightIndex
+
+__all__ = [
+    "PENETRATION_NODATA",
+    "MASK_CLEAR",
+    "MASK_PENETRATES",
+    "MASK_NODATA",
+    "DEFAULT_TILE_SIZE",
+    "RasterWindow",
+    "PenetrationSummary",
+    "tile_windows",
+    "pixel_centres",
+    "penetration_tile",
+    "penetration_raster",
+]
+
+PENETRATION_NODATA = -9999.0
+MASK_CLEAR = 0
+MASK_PENETRATES = 1
+MASK_NODATA = 255
+
+# Target window edge in pixels; rounded to a multiple of the block size.
+# 1024² Float64 work arrays keep a tile around 50 MB including temporaries.
+DEFAULT_TILE_SIZE = 1024
+
+# Tiles in flight per worker before the writer waits.
+_QUEUE_DEPTH = 2
+
+_CREATE_OPTIONS = ["TILED=YES", "COMPRESS=DEFLATE", "BIGTIFF=IF_SAFER"]
+
+
+@dataclass(frozen=True)
+class RasterWindow:
+    """Pixel window ``(xoff, yoff, xsize, ysize)`` of the input raster."""
+
+    xoff: int
+    yoff: int
+    xsize: int
+    ysize: int
+
+
+@dataclass
+class PenetrationSummary:
+    """Counts over the whole raster."""
+
+    pixels: int = 0
+    covered: int = 0
+    penetrating: int = 0
+    max_penetration: float = -math.inf
+
+
+def tile_windows(width: int, height: int, block_x: int, block_y: int,
+                 tile_size: int = DEFAULT_TILE_SIZE) -> Iterator[RasterWindow]:
+    """Row-major windows covering the raster, each a whole number of
+    ``block_x`` × ``block_y`` blocks (clipped at the edges) close to
+    ``tile_size`` pixels on a side, so every read hits whole blocks."""
+    block_x = max(1, int(block_x))
+    block_y = max(1, int(block_y))
+    step_x = block_x * max(1, tile_size // block_x)
+    # Strip-organised rasters (block = one row) get square-ish windows too.
+    step_y = block_y * max(1, tile_size // block_y)
+    for yoff in range(0, height, step_y):
+        for xoff in range(0, width, step_x):
+            yield RasterWindow(xoff, yoff, min(step_x, width - xoff), min(step_y, height - yoff))
+
+
+def pixel_centres(geotransform: Sequence[float], window: RasterWindow) -> tuple[np.ndarray, np.ndarray]:
+    """Map coordinates of the pixel centres of ``window`` as ``(ysize,
+    xsize)`` arrays; honours rotated geotransforms."""
+    gt0, gt1, gt2, gt3, gt4, gt5 = geotransform
+    cols = window.xoff + 0.5 + np.arange(window.xsize, dtype=float)
+    rows = window.yoff + 0.5 + np.arange(window.ysize, dtype=float)
+    col_grid, row_grid = np.meshgrid(cols, rows)
+    return gt0 + col_grid * gt1 + row_grid * gt2, gt3 + col_grid * gt4 + row_grid * gt5
+
+
+def penetration_tile(index: SurfaceHeightIndex, geotransform: Sequence[float], window: RasterWindow,
+                     values: np.ndarray, nodata: Optional[float] = None) -> tuple[np.ndarray, np.ndarray]:
+    """``(penetration, mask)`` for one window of raster ``values``:
+    Float32 metres above the lowest surface (``PENETRATION_NODATA`` where
+    no surface covers the pixel or the input is nodata) and the Byte mask."""
+    values = np.asarray(values, dtype=float)
+    valid = np.isfinite(values)
+    if nodata is not None:
+        valid &= values != nodata
+
+    penetration = np.full(values.shape, PENETRATION_NODATA, dtype=np.float32)
+    mask = np.full(values.shape, MASK_NODATA, dtype=np.uint8)
+    if not valid.any():
+        return penetration, mask
+
+    x, y = pixel_centres(geotransform, window)
+    surface_z, _surface = index.z_at(x[valid], y[valid])
+    covered = ~np.isnan(surface_z)
+    diff = values[valid][covered] - surface_z[covered]
+
+    rows, cols = np.nonzero(valid)
+    rows, cols = rows[covered], cols[covered]
+    penetration[rows, cols] = diff
+    mask[rows, cols] = np.where(diff > 0, MASK_PENETRATES, MASK_CLEAR)
+    return penetration, mask
+
+
+# ---------------------------------------------------------------------------
+# GDAL streaming
+# ---------------------------------------------------------------------------
+
+class _TileReader:
+    """Reads windows of band 1, through a virtual memory mapping when
+    GDAL can provide one for this driver/layout."""
+
+    def __init__(self, path: str):
+        from osgeo import gdal
+
+        self.dataset = gdal.Open(path, gdal.GA_ReadOnly)
+        if self.dataset is None:
+            raise RuntimeError(f"Cannot open raster '{path}'")
+        self.band = self.dataset.GetRasterBand(1)
+        self.nodata = self.band.GetNoDataValue()
+        try:
+            self.mapped = self.band.GetVirtualMemAutoArray(gdal.GF_Read)
+        except (AttributeError, RuntimeError):
+            self.mapped = None  # compressed / non-raw layout, or no mmap on this platform
+
+    def read(self, window: RasterWindow) -> np.ndarray:
+        if self.mapped is not None:
+            return self.mapped[window.yoff:window.yoff + window.ysize, window.xoff:window.xoff + window.xsize]
+        return self.band.ReadAsArray(window.xoff, window.yoff, window.xsize, window.ysize)
+
+
+# Per-process state of pool workers (set by _init_worker).
+_WORKER: dict = {}
+
+
+def _init_worker(path: str, table: PatchTable) -> None:
+    _WORKER["reader"] = _TileReader(path)
+    _WORKER["index"] = SurfaceHeightIndex(table)
+    _WORKER["geotransform"] = _WORKER["reader"].dataset.GetGeoTransform()
+
+
+def _worker_tile(window: RasterWindow):
+    reader = _WORKER["reader"]
+    values = reader.read(window)
+    return (window, *penetration_tile(_WORKER["index"], _WORKER["geotransform"], window, values, reader.nodata))
+
+
+def _create_output(driver, path: str, source, data_type, nodata):
+    dataset = driver.Create(path, source.RasterXSize, source.RasterYSize, 1, data_type, options=_CREATE_OPTIONS)
+    if dataset is None:
+        raise RuntimeError(f"Cannot create '{path}'")
+    dataset.SetGeoTransform(source.GetGeoTransform())
+    dataset.SetProjection(source.GetProjection())
+    band = dataset.GetRasterBand(1)
+    band.SetNoDataValue(nodata)
+    return dataset, band
+
+
+def penetration_raster(
+    dem_path: str,
+    table: PatchTable,
+    penetration_path: str,
+    mask_path: str,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    workers: int = 0,
+    progress: Optional[Callable[[int, int], None]] = None,
+    canceled: Optional[Callable[[], bool]] = None,
+) -> Optional[PenetrationSummary]:
+    """Write the penetration GeoTIFF and mask for the raster at
+    ``dem_path`` against ``table`` (patches in the raster's CRS).
+
+    ``workers > 0`` computes tiles in a process pool of that size.
+    ``progress(done, total)`` is called after each written tile;
+    ``canceled()`` is checked before each one, and once it returns True
+    the partial outputs are deleted and None is returned.
+    """
+    from osgeo import gdal
+
+    reader = _TileReader(dem_path)
+    source = reader.dataset
+    block_x, block_y = reader.band.GetBlockSize()
+    windows = list(tile_windows(source.RasterXSize, source.RasterYSize, block_x, block_y, tile_size))
+
+    driver = gdal.GetDriverByName("GTiff")
+    out_ds, out_band = _create_output(driver, penetration_path, source, gdal.GDT_Float32, PENETRATION_NODATA)
+    mask_ds, mask_band = _create_output(driver, mask_path, source, gdal.GDT_Byte, MASK_NODATA)
+
+    summary = PenetrationSummary()
+
+    def stop() -> bool:
+        return canceled is not None and canceled()
+
+    def tiles():
+        if workers <= 0:
+            index = SurfaceHeightIndex(table)
+            geotransform = source.GetGeoTransform()
+            for window in windows:
+                if stop():
+                    return
+                yield (window, *penetration_tile(index, geotransform, window, reader.read(window), reader.nodata))
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(dem_path, table)) as pool:
+            pending = []
+            for window in windows:
+                if stop():
+                    pool.shutdown(cancel_futures=True)
+                    return
+                pending.append(pool.submit(_worker_tile, window))
+                if len(pending) >= workers * _QUEUE_DEPTH:
+                    yield pending.pop(0).result()
+            for future in pending:
+                if stop():
+                    pool.shutdown(cancel_futures=True)
+                    return
+                yield future.result()
+
+    written = 0
+    for done, (window, penetration, mask) in enumerate(tiles(), start=1):
+        written = done
+        out_band.WriteArray(penetration, window.xoff, window.yoff)
+        mask_band.WriteArray(mask, window.xoff, window.yoff)
+        summary.pixels += mask.size
+        summary.covered += int(np.count_nonzero(mask != MASK_NODATA))
+        hits = mask == MASK_PENETRATES
+        if hits.any():
+            summary.penetrating += int(np.count_nonzero(hits))
+            summary.max_penetration = max(summary.max_penetration, float(penetration[hits].max()))
+        if progress is not None:
+            progress(done, len(windows))
+
+    out_band.FlushCache()
+    mask_band.FlushCache()
+    # Dropping the last references closes the files.
+    del out_band, mask_band, out_ds, mask_ds
+    if written < len(windows):  # canceled
+        for path in (penetration_path, mask_path):
+            driver.Delete(path)
+        return None
+    return summary
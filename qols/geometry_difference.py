@@ -27,17 +27,36 @@ shared datum (inner edge = Datum + Inner Horizontal Height, outer edge
 takes the two Z values explicitly rather than auto-detecting a single
 flat Z off `base_geom`: `exterior_z` for the result's outer boundary,
 `interior_z` for the interior/hole ring left by the subtraction.
+
+Every trim the plugin actually does — Conical minus Inner Horizontal,
+each OES Horizontal tier minus the next-smaller one, the OES Straight-in
+upper section minus its lower racetrack — subtracts a shape lying wholly
+inside a convex one, so the difference is simply the outer ring with the
+inner ring as a hole. `annulus_rings()` proves that (convex exterior,
+every hole vertex strictly inside it) and builds the two flat-Z rings
+directly; `annulus_flat()` is its QGIS-aware counterpart. The GEOS
+`difference_flat()` remains the fallback whenever the proof fails.
 """
 from __future__ import annotations
 
+from typing import Optional
+
+import numpy as np
+
 Point2 = tuple[float, float]
 Point3 = tuple[float, float, float]
 
 __all__ = [
     "flatten_ring_z",
+    "annulus_rings",
+    "annulus_flat",
     "difference_flat",
 ]
 
+# Inner vertices tested against the outer ring's edges per block, bounding
+# the (block x edges) temporary for dense rings.
+_CONTAINMENT_BLOCK = 256
+
 
 # ---------------------------------------------------------------------------
 # Pure geometry helper (no QGIS dependency — operates on plain tuples)
@@ -49,8 +68,75 @@ def flatten_ring_z(ring_xy: list[Point2], z: float) -> list[Point3]:
     return [(x, y, z) for x, y in ring_xy]
 
 
+def _open_xy(ring) -> np.ndarray:
+    """``(N, 2)`` vertices of a closed ring without the closing repeat."""
+    xy = np.asarray(ring, dtype=float)[:, :2]
+    if len(xy) > 1 and np.array_equal(xy[0], xy[-1]):
+        xy = xy[:-1]
+    return xy
+
+
+def _signed_area(xy: np.ndarray) -> float:
+    x, y = xy[:, 0], xy[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _strictly_inside_convex(outer: np.ndarray, inner: np.ndarray) -> bool:
+    """True when ``outer`` is convex and every ``inner`` vertex lies
+    strictly inside it — which, by convexity, puts all of ``inner``
+    inside ``outer`` with no shared boundary."""
+    area = _signed_area(outer)
+    if len(outer) < 3 or len(inner) < 3 or area == 0.0:
+        return False
+    sign = 1.0 if area > 0 else -1.0
+    # Work relative to the outer ring's corner: projected coordinates run
+    # to millions of metres, which would swamp both the products below
+    # and a tolerance scaled by them.
+    origin = outer.min(axis=0)
+    outer = outer - origin
+    inner = inner - origin
+    edges = np.roll(outer, -1, axis=0) - outer
+    # Densely sampled arcs turn by tiny angles and the racetrack's tangent
+    # joins are collinear, so allow rounding-level negative turns.
+    scale = float(outer.max()) or 1.0
+    eps = 1e-9 * scale * scale
+    turns = sign * (edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(edges[:, 0], -1))
+    if (turns < -eps).any():
+        return False
+    for start in range(0, len(inner), _CONTAINMENT_BLOCK):
+        block = inner[start:start + _CONTAINMENT_BLOCK]
+        dx = block[:, None, 0] - outer[None, :, 0]
+        dy = block[:, None, 1] - outer[None, :, 1]
+        sides = sign * (edges[None, :, 0] * dy - edges[None, :, 1] * dx)
+        if (sides <= eps).any():
+            return False
+    return True
+
+
+def annulus_rings(outer_ring, inner_ring, exterior_z: float,
+                  interior_z: float) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """``(exterior, hole)`` closed ``(N, 3)`` rings of `outer_ring` minus
+    `inner_ring`, or None when that difference is not provably the outer
+    ring with the inner one as a hole (see `_strictly_inside_convex`).
+    The hole winds opposite to the exterior, as GEOS would return it."""
+    outer = _open_xy(outer_ring)
+    inner = _open_xy(inner_ring)
+    if not _strictly_inside_convex(outer, inner):
+        return None
+    if (_signed_area(outer) > 0) == (_signed_area(inner) > 0):
+        inner = inner[::-1]
+    rings = []
+    for xy, z in ((outer, exterior_z), (inner, interior_z)):
+        ring = np.empty((len(xy) + 1, 3))
+        ring[:-1, :2] = xy
+        ring[-1, :2] = xy[0]
+        ring[:, 2] = z
+        rings.append(ring)
+    return rings[0], rings[1]
+
+
 # ---------------------------------------------------------------------------
-# QGIS-aware wrapper
+# QGIS-aware wrappers
 # ---------------------------------------------------------------------------
 
 def _geometry_parts(geom) -> list:
@@ -66,6 +152,35 @@ def _ring_xy(ring) -> list[Point2]:
     return [(ring.pointN(i).x(), ring.pointN(i).y()) for i in range(ring.numPoints())]
 
 
+def _single_ring_polygon(geom):
+    """The exterior ring of `geom` if it is one polygon without holes,
+    else None."""
+    if geom is None or geom.isEmpty() or geom.isMultipart():
+        return None
+    abstract = geom.constGet()
+    if not hasattr(abstract, "numInteriorRings") or abstract.numInteriorRings():
+        return None
+    return abstract.exteriorRing()
+
+
+def annulus_flat(base_geom, subtract_geom, exterior_z, interior_z):
+    """`base_geom` minus `subtract_geom` built without a boolean op —
+    `base_geom`'s exterior at `exterior_z` with `subtract_geom`'s exterior
+    as a hole at `interior_z` — or None when `annulus_rings` cannot prove
+    the result is that annulus (callers then use `difference_flat`)."""
+    from .engine.qgis_adapter import geometry_from_wkb
+    from .engine.wkb import polygon_z_wkb
+
+    outer = _single_ring_polygon(base_geom)
+    inner = _single_ring_polygon(subtract_geom)
+    if outer is None or inner is None:
+        return None
+    rings = annulus_rings(_ring_xy(outer), _ring_xy(inner), exterior_z, interior_z)
+    if rings is None:
+        return None
+    return geometry_from_wkb(polygon_z_wkb(rings))
+
+
 def difference_flat(base_geom, subtract_geom, exterior_z, interior_z):
     """2D-difference `base_geom` minus `subtract_geom`, applying
     `exterior_z` to every vertex of the result's exterior ring and
@@ -78,7 +193,8 @@ def difference_flat(base_geom, subtract_geom, exterior_z, interior_z):
     empty or anything fails — a failed trim must not delete the surface
     the user just calculated.
     """
-    from qgis.core import QgsGeometry, QgsLineString, QgsMultiPolygon, QgsPoint, QgsPolygon
+    from .engine.qgis_adapter import geometry_from_wkb
+    from .engine.wkb import multipolygon_z_wkb, polygon_z_wkb
 
     try:
         base_area = base_geom.area()
@@ -101,30 +217,25 @@ def difference_flat(base_geom, subtract_geom, exterior_z, interior_z):
         for part in _geometry_parts(diff):
             abstract = part.constGet()
             ext_xyz = flatten_ring_z(_ring_xy(abstract.exteriorRing()), exterior_z)
-            ext_pts = [QgsPoint(x, y, pz) for x, y, pz in ext_xyz]
-            if len(ext_pts) < 3:
+            if len(ext_xyz) < 3:
                 continue
             interior_rings = []
             for i in range(abstract.numInteriorRings()):
                 hole_xy = _ring_xy(abstract.interiorRing(i))
                 if len(hole_xy) < 3:
                     continue
-                hole_pts = [QgsPoint(x, y, pz) for x, y, pz in flatten_ring_z(hole_xy, interior_z)]
-                interior_rings.append(QgsLineString(hole_pts))
-            print(f"difference_flat: part with {len(ext_pts)} exterior pts, {len(interior_rings)} interior ring(s)")
-            rebuilt_parts.append(QgsPolygon(QgsLineString(ext_pts), rings=interior_rings))
+                interior_rings.append(flatten_ring_z(hole_xy, interior_z))
+            print(f"difference_flat: part with {len(ext_xyz)} exterior pts, {len(interior_rings)} interior ring(s)")
+            rebuilt_parts.append([ext_xyz, *interior_rings])
 
         if not rebuilt_parts:
             print("difference_flat: no rebuilt parts, returning base_geom unchanged")
             return base_geom
 
         if len(rebuilt_parts) == 1:
-            result = QgsGeometry(rebuilt_parts[0])
+            result = geometry_from_wkb(polygon_z_wkb(rebuilt_parts[0]))
         else:
-            multi = QgsMultiPolygon()
-            for poly in rebuilt_parts:
-                multi.addGeometry(poly)
-            result = QgsGeometry(multi)
+            result = geometry_from_wkb(multipolygon_z_wkb(rebuilt_parts))
         print(f"difference_flat: returning trimmed geometry, area={result.area()}")
         return result
     except Exception as e:
@@ -3,7 +3,7 @@
 
 ``TransitionalSurface_UTM.py`` optionally maintains a separate
 "Merged Transitional Surface" layer, accumulating every run's Left/Right
-pentagons into it via a full n-way geometric union — dissolving purely by
+pentagons into it by geometric union — dissolving purely by
 spatial overlap, never by matching feature attributes/names (an earlier
 version paired features by their ``SurfaceName`` — "Left" with "Left",
 "Right" with "Right" — which silently glued together the wrong physical
@@ -24,10 +24,15 @@ thin QGIS-aware wrapper — it unions an arbitrary number of input
 geometries at once and returns one Z-recovered, ``.convertToMultiType()``-ed
 ``QgsGeometry`` per disjoint/connected part, so each part can become its
 own feature (selecting one highlights one coherent side, not several
-unrelated pieces glued together).
+unrelated pieces glued together). ``merge_geometries_into_layer`` applies
+that dissolve incrementally to the merged layer: only the parts whose
+bounding boxes touch the new geometries (found through a cached
+``QgsSpatialIndex``) are re-dissolved and rewritten, so a run costs what
+it touches, not the whole merge history.
 """
 from __future__ import annotations
 
+from math import floor, hypot
 from typing import Iterator
 
 Point2 = tuple[float, float]
@@ -37,6 +42,7 @@ Edge3 = tuple[Point3, Point3]
 __all__ = [
     "recover_ring_z",
     "dissolve_geometries_preserving_z",
+    "merge_geometries_into_layer",
 ]
 
 
@@ -103,6 +109,136 @@ def _interpolate_nearest_edge_z(pt: Point2, edges: list[Edge3]) -> float:
     return a[2] + best_t * (b[2] - a[2])
 
 
+class _SourceIndex:
+    """Uniform-grid index over the source vertices and edges of
+    :func:`recover_ring_z`.
+
+    Vertices are hashed into cells of side ``exact_match_tol`` so an exact
+    match only inspects the 3×3 block around the query. Edges are
+    registered in every cell their segment crosses, on a coarser grid
+    sized to the mean edge length; the nearest-edge search visits square
+    rings of cells outwards and stops once the best distance found is
+    strictly below the distance to the unsearched area. Candidates are
+    resolved by their original position in the flattened source list, so
+    ties go exactly where the brute-force scan sent them.
+    """
+
+    # Bounds the edge grid to ~_MAX_CELLS_PER_AXIS² cells however short
+    # the edges are relative to the overall extent.
+    _MAX_CELLS_PER_AXIS = 4096
+    # Beyond this many rings (a vertex far from every source edge) a plain
+    # scan is cheaper than walking ever larger, mostly empty squares.
+    _MAX_SEARCH_RING = 64
+
+    def __init__(self, source_rings_xyz: list[list[Point3]], exact_match_tol: float) -> None:
+        self._tol = exact_match_tol
+        self._vertex_cell = exact_match_tol if exact_match_tol > 0 else 1.0
+        self._vertices: dict[tuple[int, int], list[tuple[int, Point3]]] = {}
+        order = 0
+        for ring in source_rings_xyz:
+            for v in ring:
+                key = (floor(v[0] / self._vertex_cell), floor(v[1] / self._vertex_cell))
+                self._vertices.setdefault(key, []).append((order, v))
+                order += 1
+
+        self._edges = [e for ring in source_rings_xyz for e in _iter_edges(ring)]
+        self._edge_grid: dict[tuple[int, int], list[int]] = {}
+        if not self._edges:
+            return
+        xs = [p[0] for e in self._edges for p in e]
+        ys = [p[1] for e in self._edges for p in e]
+        self._min_x, self._min_y = min(xs), min(ys)
+        extent = max(max(xs) - self._min_x, max(ys) - self._min_y)
+        mean_len = sum(hypot(b[0] - a[0], b[1] - a[1]) for a, b in self._edges) / len(self._edges)
+        self._cell = max(mean_len, extent / self._MAX_CELLS_PER_AXIS, 1e-9)
+        for idx, (a, b) in enumerate(self._edges):
+            for key in self._segment_cells(a, b):
+                self._edge_grid.setdefault(key, []).append(idx)
+
+    def _cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return floor((x - self._min_x) / self._cell), floor((y - self._min_y) / self._cell)
+
+    def _segment_cells(self, a: Point3, b: Point3) -> Iterator[tuple[int, int]]:
+        """Every grid cell the segment a->b passes through (conservatively:
+        cells only touched at a corner or edge are included too)."""
+        if a[0] > b[0]:
+            a, b = b, a
+        c = self._cell
+        ax, ay = (a[0] - self._min_x) / c, (a[1] - self._min_y) / c
+        bx, by = (b[0] - self._min_x) / c, (b[1] - self._min_y) / c
+        i0, i1 = floor(ax), floor(bx)
+        eps = 1e-9
+        for i in range(i0, i1 + 1):
+            if i0 == i1:
+                y_lo, y_hi = ay, by
+            else:
+                # y of the segment where it enters / leaves column i
+                t0 = max(0.0, (i - ax) / (bx - ax))
+                t1 = min(1.0, (i + 1 - ax) / (bx - ax))
+                y_lo, y_hi = ay + t0 * (by - ay), ay + t1 * (by - ay)
+            if y_lo > y_hi:
+                y_lo, y_hi = y_hi, y_lo
+            for j in range(floor(y_lo - eps), floor(y_hi + eps) + 1):
+                yield i, j
+
+    def exact_z(self, pt: Point2) -> float | None:
+        """Z of the first source vertex (in source order) within the
+        tolerance of ``pt`` — :func:`_match_exact_vertex_z` on the 3×3
+        block of vertex cells around it."""
+        cx = floor(pt[0] / self._vertex_cell)
+        cy = floor(pt[1] / self._vertex_cell)
+        candidates = []
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                candidates.extend(self._vertices.get((i, j), ()))
+        if not candidates:
+            return None
+        candidates.sort(key=lambda item: item[0])
+        return _match_exact_vertex_z(pt, [v for _order, v in candidates], self._tol)
+
+    def nearest_edge_z(self, pt: Point2) -> float:
+        """:func:`_interpolate_nearest_edge_z` over only the edges in the
+        cells around ``pt``, widening ring by ring until no unvisited edge
+        can be as close as the best one found."""
+        if not self._edges:
+            raise ValueError("no edges to interpolate from")
+        cx, cy = self._cell_of(pt[0], pt[1])
+        seen: set[int] = set()
+        best = None  # (dist2, edge index, t)
+        for k in range(self._MAX_SEARCH_RING + 1):
+            for key in _square_ring(cx, cy, k):
+                for idx in self._edge_grid.get(key, ()):
+                    if idx in seen:
+                        continue
+                    seen.add(idx)
+                    t, dist2 = _project_point_on_segment(pt, *self._edges[idx])
+                    if best is None or (dist2, idx) < (best[0], best[1]):
+                        best = (dist2, idx, t)
+            # Anything outside the (2k+1)² block is at least k cells away.
+            if best is not None:
+                reach = k * self._cell
+                if best[0] < reach * reach:
+                    break
+        else:
+            return _interpolate_nearest_edge_z(pt, self._edges)
+        _dist2, idx, t = best
+        a, b = self._edges[idx]
+        return a[2] + t * (b[2] - a[2])
+
+
+def _square_ring(cx: int, cy: int, k: int) -> Iterator[tuple[int, int]]:
+    """Cells at Chebyshev distance exactly ``k`` from ``(cx, cy)``."""
+    if k == 0:
+        yield cx, cy
+        return
+    for i in range(cx - k, cx + k + 1):
+        yield i, cy - k
+        yield i, cy + k
+    for j in range(cy - k + 1, cy + k):
+        yield cx - k, j
+        yield cx + k, j
+
+
 def recover_ring_z(
     merged_xy: list[Point2],
     source_rings_xyz: list[list[Point3]],
@@ -111,16 +247,19 @@ def recover_ring_z(
     """For each 2D vertex of a unioned polygon boundary, recover a Z by
     exact-matching an original 3D vertex from either source ring, else by
     linear interpolation along the nearest original edge from either ring.
+
+    Lookups go through a uniform-grid :class:`_SourceIndex`, so the cost is
+    roughly linear in the vertex count rather than O(V·E); the result is
+    identical to scanning every source vertex and edge in order.
     """
     if not merged_xy:
         return []
-    all_vertices = [v for ring in source_rings_xyz for v in ring]
-    all_edges = [e for ring in source_rings_xyz for e in _iter_edges(ring)]
+    index = _SourceIndex(source_rings_xyz, exact_match_tol)
     result = []
     for pt in merged_xy:
-        z = _match_exact_vertex_z(pt, all_vertices, exact_match_tol)
+        z = index.exact_z(pt)
         if z is None:
-            z = _interpolate_nearest_edge_z(pt, all_edges)
+            z = index.nearest_edge_z(pt)
         result.append((pt[0], pt[1], z))
     return result
 
@@ -176,7 +315,10 @@ def dissolve_geometries_preserving_z(
     usable geometries are given or the union/Z-recovery cannot proceed —
     the caller must keep its own inputs untouched on failure, since a
     failed dissolve must not lose data."""
-    from qgis.core import QgsGeometry, QgsLineString, QgsPoint, QgsPolygon
+    from qgis.core import QgsGeometry
+
+    from .engine.qgis_adapter import geometry_from_wkb
+    from .engine.wkb import multipolygon_z_wkb
 
     try:
         usable = [g for g in geometries if g is not None and not g.isEmpty()]
@@ -205,9 +347,7 @@ def dissolve_geometries_preserving_z(
                 print(f"dissolve_geometries_preserving_z: part {_pi} has < 3 vertices ({len(part_xy)}), skipped")
                 continue
             part_xyz = recover_ring_z(part_xy, source_rings, exact_match_tol)
-            points = [QgsPoint(x, y, z) for x, y, z in part_xyz]
-            result = QgsGeometry(QgsPolygon(QgsLineString(points), rings=[]))
-            result.convertToMultiType()
+            result = geometry_from_wkb(multipolygon_z_wkb([[part_xyz]]))
             results.append(result)
 
         print(f"dissolve_geometries_preserving_z: returning {len(results)} result(s)")
@@ -217,3 +357,161 @@ def dissolve_geometries_preserving_z(
         print(f"dissolve_geometries_preserving_z: FAILED with {e!r}")
         traceback.print_exc()
         return []
+
+
+# ---------------------------------------------------------------------------
+# Incremental merge into a layer
+# ---------------------------------------------------------------------------
+
+class _MergedLayerIndex:
+    """``QgsSpatialIndex`` over one merged layer's parts plus each part's
+    bounding box (needed to delete index entries again).
+
+    Kept across script runs in ``_LAYER_INDEXES``. Writes made through
+    :func:`merge_geometries_into_layer` update it in place; any edit
+    committed through the layer's edit buffer, or a feature count that no
+    longer matches, drops it so the next run rebuilds from the layer.
+    """
+
+    def __init__(self, layer) -> None:
+        from qgis.core import QgsFeatureRequest, QgsSpatialIndex
+
+        self.index = QgsSpatialIndex()
+        self.bboxes = {}
+        for feat in layer.getFeatures(QgsFeatureRequest().setNoAttributes()):
+            geom = feat.geometry()
+            if geom is None or geom.isEmpty():
+                continue
+            self.add(feat.id(), geom.boundingBox())
+
+    def add(self, fid: int, bbox) -> None:
+        self.index.addFeature(fid, bbox)
+        self.bboxes[fid] = bbox
+
+    def remove(self, fid: int) -> None:
+        from qgis.core import QgsFeature, QgsGeometry
+
+        bbox = self.bboxes.pop(fid, None)
+        if bbox is None:
+            return
+        feat = QgsFeature(fid)
+        feat.setGeometry(QgsGeometry.fromRect(bbox))
+        self.index.deleteFeature(feat)
+
+    def touching(self, bbox) -> list[int]:
+        return [fid for fid in self.index.intersects(bbox) if fid in self.bboxes]
+
+
+_LAYER_INDEXES: dict[str, _MergedLayerIndex] = {}
+
+
+def _forget_layer_index(layer_id: str) -> None:
+    _LAYER_INDEXES.pop(layer_id, None)
+
+
+def _layer_index(layer) -> _MergedLayerIndex:
+    layer_id = layer.id()
+    cached = _LAYER_INDEXES.get(layer_id)
+    if cached is not None and len(cached.bboxes) == layer.featureCount():
+        return cached
+    if cached is None:
+        # First sighting of this layer: any edit committed outside this
+        # module, or the layer going away, invalidates the cached index.
+        def forget(*_args, _layer_id=layer_id):
+            _forget_layer_index(_layer_id)
+
+        layer.committedFeaturesAdded.connect(forget)
+        layer.committedFeaturesRemoved.connect(forget)
+        layer.committedGeometriesChanges.connect(forget)
+        layer.willBeDeleted.connect(forget)
+    index = _MergedLayerIndex(layer)
+    _LAYER_INDEXES[layer_id] = index
+    return index
+
+
+def merge_geometries_into_layer(
+    layer,
+    new_geometries: list,
+    attributes: list,
+    exact_match_tol: float = 1e-6,
+) -> tuple[int, int, int] | None:
+    """Dissolve ``new_geometries`` into the merged-parts ``layer`` in place.
+
+    Only the layer features whose bounding boxes intersect a new
+    geometry's are pulled into :func:`dissolve_geometries_preserving_z`
+    with the new geometries; every other feature is left untouched. The
+    dissolved parts overwrite the touched features
+    (``changeGeometryValues`` / ``changeAttributeValues``), extra parts
+    are appended with the next free ``ID``, and touched features left
+    over (parts that merged into one) are deleted. ``attributes`` are the
+    values after ``ID`` written to every rewritten or new feature.
+
+    Returns ``(changed, added, removed)`` feature counts, or None when the
+    dissolve fails — the layer is then left exactly as it was.
+    """
+    from qgis.core import QgsFeature, QgsFeatureRequest
+
+    # The dissolve needs >= 2 geometries in total, which the Transitional
+    # run's own Left + Right always supply.
+    usable = [g for g in new_geometries if g is not None and not g.isEmpty()]
+    if not usable:
+        return None
+    index = _layer_index(layer)
+    touched = sorted({fid for geom in usable for fid in index.touching(geom.boundingBox())})
+    print(f"merge_geometries_into_layer: {len(touched)} of {len(index.bboxes)} merged part(s) "
+          f"touched by {len(usable)} new geometrie(s)")
+
+    existing = {}
+    if touched:
+        request = QgsFeatureRequest().setFilterFids(touched).setNoAttributes()
+        existing = {f.id(): f.geometry() for f in layer.getFeatures(request)}
+    parts = dissolve_geometries_preserving_z(
+        [existing[fid] for fid in touched if fid in existing] + usable, exact_match_tol
+    )
+    if not parts:
+        return None
+
+    provider = layer.dataProvider()
+    fields = layer.fields()
+    reused = touched[:len(parts)]
+    removed = touched[len(parts):]
+
+    # Additions first: if the provider refuses them nothing has changed yet.
+    added = []
+    new_parts = parts[len(reused):]
+    if new_parts:
+        next_id = _next_id(layer, fields.indexOf('ID'))
+        for offset, part in enumerate(new_parts):
+            feat = QgsFeature(fields)
+            feat.setGeometry(part)
+            feat.setAttributes([next_id + offset, *attributes])
+            added.append(feat)
+        ok, added = provider.addFeatures(added)
+        if not ok:
+            print("merge_geometries_into_layer: provider rejected the new parts")
+            return None
+    if reused:
+        # Rewritten parts keep their feature id and ID attribute.
+        provider.changeGeometryValues(dict(zip(reused, parts)))
+        provider.changeAttributeValues({
+            fid: {i + 1: value for i, value in enumerate(attributes)} for fid in reused
+        })
+    if removed:
+        provider.deleteFeatures(removed)
+    layer.updateExtents()
+
+    for fid in removed:
+        index.remove(fid)
+    for fid, part in zip(reused, parts):
+        index.remove(fid)
+        index.add(fid, part.boundingBox())
+    for feat in added:
+        index.add(feat.id(), feat.geometry().boundingBox())
+    return len(reused), len(added), len(removed)
+
+
+def _next_id(layer, id_idx: int) -> int:
+    if id_idx < 0 or layer.featureCount() == 0:
+        return 1
+    current = layer.maximumValue(id_idx)
+    return int(current) + 1 if current is not None else 1
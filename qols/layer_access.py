@@ -0,0 +1,255 @@
+"""qols/layer_access.py — cheap reads of the input layers for counts,
+selections and validation.
+
+The dock widgets and the plugin only need to know how many features a
+layer has or has selected, and whether it is still in the project — yet
+they used to build every selected ``QgsFeature`` just to ``len()`` them,
+rebuild ``list(mapLayers().values())`` for a membership test, and call
+``featureCount()`` for every layer of three combos on each refresh, which
+stalls the UI on large or remote-provider layers. Here:
+
+* :func:`selected_count` is ``selectedFeatureCount()``;
+* :func:`feature_count` caches ``featureCount()`` per layer until the
+  layer's features change;
+* :func:`in_project` is a ``mapLayer(id)`` lookup;
+* :func:`geometry_request` is the attribute-free ``QgsFeatureRequest``
+  every geometry-only read should use;
+* :class:`ValidationRound` memoizes :func:`validate_runway_layers` for
+  one Calculate click, so a combined run validates its layers once.
+
+:func:`watch_layer` is the one place layer signals are connected; other
+caches (:mod:`qols.runway_context`) register a listener with
+:func:`add_invalidation_listener` and are told which layer changed.
+Writes straight through the data provider (``dataProvider()
+.changeGeometryValues``, as the surface scripts do) emit no layer signal,
+so every cached read first calls :func:`revalidate_layer`, which compares
+the provider's feature count and extent with the last check.
+Everything runs on the GUI thread, so no locking is needed.
+"""
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Callable, Mapping
+
+__all__ = [
+    "geometry_request",
+    "selected_count",
+    "feature_count",
+    "in_project",
+    "watch_layer",
+    "revalidate_layer",
+    "add_invalidation_listener",
+    "validate_runway_layers",
+    "ValidationRound",
+    "clear_layer_access_cache",
+]
+
+# ``dataChanged`` also covers provider reloads, which emit none of the others.
+_INVALIDATING_SIGNALS = ("geometryChanged", "selectionChanged", "featureAdded", "featureDeleted", "dataChanged")
+
+# layer id -> featureCount()
+_feature_counts: dict = {}
+# layer id -> provider (featureCount, extent) at the last revalidate_layer()
+_provider_states: dict = {}
+# layer id -> (layer, [(signal, slot), ...])
+_watched: dict = {}
+_listeners: list = []
+
+
+def geometry_request():
+    """``QgsFeatureRequest`` that fetches geometry but no attributes."""
+    from qgis.core import QgsFeatureRequest
+
+    return QgsFeatureRequest().setNoAttributes()
+
+
+def selected_count(layer) -> int:
+    """Number of selected features, without fetching any of them."""
+    return layer.selectedFeatureCount()
+
+
+def feature_count(layer) -> int:
+    """``layer.featureCount()``, cached until the layer's features change."""
+    revalidate_layer(layer)
+    layer_id = layer.id()
+    count = _feature_counts.get(layer_id)
+    if count is None:
+        count = layer.featureCount()
+        watch_layer(layer)
+        _feature_counts[layer_id] = count
+    return count
+
+
+def in_project(layer, project=None) -> bool:
+    """Whether ``layer`` itself (not just a layer with its id) is loaded in
+    ``project`` (default: the current project)."""
+    if project is None:
+        from qgis.core import QgsProject
+
+        project = QgsProject.instance()
+    return project.mapLayer(layer.id()) is layer
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+def add_invalidation_listener(listener: Callable[[str], Any]) -> None:
+    """Call ``listener(layer_id)`` whenever a watched layer changes or goes
+    away."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _invalidate(layer_id: str, *_args) -> None:
+    _feature_counts.pop(layer_id, None)
+    for listener in _listeners:
+        listener(layer_id)
+
+
+def _forget(layer_id: str, *_args) -> None:
+    _invalidate(layer_id)
+    _watched.pop(layer_id, None)
+    _provider_states.pop(layer_id, None)
+
+
+def _provider_state(layer) -> tuple:
+    provider = layer.dataProvider()
+    if provider is None:
+        return ()
+    extent = provider.extent()
+    return (provider.featureCount(), extent.xMinimum(), extent.yMinimum(), extent.xMaximum(), extent.yMaximum())
+
+
+def revalidate_layer(layer) -> None:
+    """Invalidate ``layer`` if its provider's feature count or extent
+    changed since the last call — an edit made through the provider, which
+    no layer signal reports. Call before serving a cached read."""
+    layer_id = layer.id()
+    state = _provider_state(layer)
+    previous = _provider_states.get(layer_id)
+    _provider_states[layer_id] = state
+    if previous is not None and previous != state:
+        _invalidate(layer_id)
+
+
+def watch_layer(layer) -> None:
+    """Connect ``layer``'s edit / selection signals to the invalidation
+    listeners, once per layer."""
+    layer_id = layer.id()
+    if layer_id in _watched:
+        return
+    connections = []
+    slot = partial(_invalidate, layer_id)
+    for name in _INVALIDATING_SIGNALS:
+        signal = getattr(layer, name)
+        signal.connect(slot)
+        connections.append((signal, slot))
+    provider = layer.dataProvider()
+    if provider is not None:
+        # Providers that report their own writes (reloads, some drivers).
+        provider.dataChanged.connect(slot)
+        connections.append((provider.dataChanged, slot))
+    forget = partial(_forget, layer_id)
+    layer.willBeDeleted.connect(forget)
+    connections.append((layer.willBeDeleted, forget))
+    _watched[layer_id] = (layer, connections)
+
+
+def clear_layer_access_cache() -> None:
+    """Drop the cached counts and disconnect from every watched layer
+    (plugin unload)."""
+    _feature_counts.clear()
+    _provider_states.clear()
+    for _layer, connections in _watched.values():
+        for signal, slot in connections:
+            try:
+                signal.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass  # layer already deleted
+    _watched.clear()
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+def validate_runway_layers(params: Mapping[str, Any]) -> None:
+    """Raise ``ValueError`` on the first problem with the runway / threshold
+    layers of the dock ``params``; resolving the runway context on the way
+    also warms it for the script that runs next."""
+    from qgis.core import QgsVectorLayer
+
+    from .runway_context import runway_context
+
+    runway_layer = params.get('runway_layer')
+    threshold_layer = params.get('threshold_layer')
+
+    if runway_layer is None:
+        raise ValueError("No Runway Layer Centerline in parameters. Execution aborted.")
+    if threshold_layer is None:
+        raise ValueError("No threshold layer in parameters. Execution aborted.")
+
+    if not isinstance(runway_layer, QgsVectorLayer):
+        raise ValueError(f"Runway Layer Centerline is not a valid QgsVectorLayer: {type(runway_layer)}")
+    if not isinstance(threshold_layer, QgsVectorLayer):
+        raise ValueError(f"Threshold layer is not a valid QgsVectorLayer: {type(threshold_layer)}")
+
+    if not in_project(runway_layer):
+        raise ValueError(f"Runway Layer Centerline '{runway_layer.name()}' not found in current project.")
+    if not in_project(threshold_layer):
+        raise ValueError(f"Threshold layer '{threshold_layer.name()}' not found in current project.")
+
+    if not runway_layer.isValid():
+        raise ValueError(f"Runway Layer Centerline '{runway_layer.name()}' is invalid or corrupted.")
+    if not threshold_layer.isValid():
+        raise ValueError(f"Threshold layer '{threshold_layer.name()}' is invalid or corrupted.")
+
+    if feature_count(runway_layer) == 0:
+        raise ValueError(f"Runway Layer Centerline '{runway_layer.name()}' contains no features.")
+    if feature_count(threshold_layer) == 0:
+        raise ValueError(f"Threshold layer '{threshold_layer.name()}' contains no features.")
+
+    try:
+        runway_context(
+            runway_layer, threshold_layer, params.get('direction', 0),
+            params.get('use_runway_selected', False), params.get('use_threshold_selected', False),
+        )
+    except Exception as e:
+        raise ValueError(str(e)) from e
+
+
+class ValidationRound:
+    """:func:`validate_runway_layers` results for one Calculate click.
+
+    Every script of a combined run (Inner Horizontal + Conical, OFS +
+    Transitional, ...) validates the same layers; the first call does the
+    work and the rest re-raise or pass on its result.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict = {}
+
+    @staticmethod
+    def _key(params: Mapping[str, Any]) -> tuple:
+        def layer_id(layer):
+            return layer.id() if hasattr(layer, 'id') else repr(layer)
+
+        return (
+            layer_id(params.get('runway_layer')),
+            layer_id(params.get('threshold_layer')),
+            bool(params.get('use_runway_selected', False)),
+            bool(params.get('use_threshold_selected', False)),
+            params.get('direction', 0),
+        )
+
+    def validate(self, params: Mapping[str, Any]) -> None:
+        key = self._key(params)
+        if key not in self._results:
+            try:
+                validate_runway_layers(params)
+                self._results[key] = None
+            except ValueError as e:
+                self._results[key] = str(e)
+        if self._results[key] is not None:
+            raise ValueError(self._results[key])
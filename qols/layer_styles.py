@@ -0,0 +1,151 @@
+"""qols/layer_styles.py — session-wide style templates for the layers the
+scripts create.
+
+Loading ``styles/contour_styling.qml`` with ``loadNamedStyle`` re-reads
+and re-parses the XML for every contour layer, and every surface script
+rebuilds its fill symbol from a property map. Both are built once here
+and each new layer gets a clone:
+
+* :func:`apply_contour_style` keeps the renderer and labeling parsed from
+  the QML (or the hardcoded fallback when it is missing or fails to
+  load), re-reading the file only when its modification time changes.
+  Label size overrides are cached per size as well.
+* :func:`fill_symbol` caches ``QgsFillSymbol.createSimple`` per property
+  map.
+
+Layers are created and styled on the GUI thread, so no locking is needed.
+"""
+import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from . import logger
+
+__all__ = ["CONTOUR_STYLE_PATH", "apply_contour_style", "fill_symbol", "clear_style_cache"]
+
+CONTOUR_STYLE_PATH = os.path.join(os.path.dirname(__file__), 'styles', 'contour_styling.qml')
+
+
+@dataclass
+class _ContourTemplate:
+    mtime_ns: Optional[int]
+    from_qml: bool
+    renderer: Any
+    labeling: Any
+    labels_enabled: bool
+    opacity: float
+
+
+# QML path -> template; label size overrides keyed (path, size).
+_contour_templates: dict = {}
+_sized_labelings: dict = {}
+# sorted property items -> QgsFillSymbol
+_fill_symbols: dict = {}
+
+
+def _fallback_template() -> _ContourTemplate:
+    """Red 0.5 mm line, plain ``surface_elevation`` label — the style used
+    whenever the QML is unavailable."""
+    from qgis.core import QgsLineSymbol, QgsPalLayerSettings, QgsSingleSymbolRenderer, QgsVectorLayerSimpleLabeling
+
+    pal = QgsPalLayerSettings()
+    pal.fieldName = 'surface_elevation'
+    pal.enabled = True
+    return _ContourTemplate(
+        mtime_ns=None,
+        from_qml=False,
+        renderer=QgsSingleSymbolRenderer(QgsLineSymbol.createSimple({'color': 'red', 'width': '0.5'})),
+        labeling=QgsVectorLayerSimpleLabeling(pal),
+        labels_enabled=True,
+        opacity=1.0,
+    )
+
+
+def _load_qml_template(path: str, mtime_ns: int) -> Optional[_ContourTemplate]:
+    from qgis.core import QgsVectorLayer
+
+    layer = QgsVectorLayer("LineStringZ?field=ID:integer&field=surface_elevation:double",
+                           "contour_style_template", "memory")
+    try:
+        _msg, success = layer.loadNamedStyle(path)
+    except Exception as e:
+        logger.warning(f"Could not load contour style {path}: {e}")
+        return None
+    if not success or layer.renderer() is None:
+        return None
+    labeling = layer.labeling()
+    return _ContourTemplate(
+        mtime_ns=mtime_ns,
+        from_qml=True,
+        renderer=layer.renderer().clone(),
+        labeling=labeling.clone() if labeling is not None else None,
+        labels_enabled=layer.labelsEnabled(),
+        opacity=layer.opacity(),
+    )
+
+
+def _contour_template(path: str) -> _ContourTemplate:
+    """The cached template for ``path``, reloaded when the file changed."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    cached = _contour_templates.get(path)
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached
+    template = _load_qml_template(path, mtime_ns) if mtime_ns is not None else None
+    if template is None:
+        template = _fallback_template()
+        template.mtime_ns = mtime_ns  # don't retry a broken file until it changes
+    _contour_templates[path] = template
+    for key in [key for key in _sized_labelings if key[0] == path]:
+        del _sized_labelings[key]
+    return template
+
+
+def _labeling(path: str, template: _ContourTemplate, label_font_size: Optional[float]):
+    if template.labeling is None or label_font_size is None:
+        return template.labeling
+    key = (path, float(label_font_size))
+    labeling = _sized_labelings.get(key)
+    if labeling is None:
+        from qgis.core import QgsVectorLayerSimpleLabeling
+
+        settings = template.labeling.settings()
+        text_format = settings.format()
+        text_format.setSize(label_font_size)
+        settings.setFormat(text_format)
+        labeling = _sized_labelings[key] = QgsVectorLayerSimpleLabeling(settings)
+    return labeling
+
+
+def apply_contour_style(layer, label_font_size: Optional[float] = None, path: str = CONTOUR_STYLE_PATH) -> bool:
+    """Give ``layer`` a clone of the cached contour renderer and labeling,
+    with the label size overridden when ``label_font_size`` is given.
+    Returns True if the style came from the QML file."""
+    template = _contour_template(path)
+    layer.setRenderer(template.renderer.clone())
+    labeling = _labeling(path, template, label_font_size)
+    if labeling is not None:
+        layer.setLabeling(labeling.clone())
+    layer.setLabelsEnabled(template.labels_enabled or (labeling is not None and label_font_size is not None))
+    layer.setOpacity(template.opacity)
+    layer.triggerRepaint()
+    return template.from_qml
+
+
+def fill_symbol(properties: dict):
+    """A clone of the cached ``QgsFillSymbol.createSimple(properties)``."""
+    key = tuple(sorted(properties.items()))
+    symbol = _fill_symbols.get(key)
+    if symbol is None:
+        from qgis.core import QgsFillSymbol
+        symbol = _fill_symbols[key] = QgsFillSymbol.createSimple(properties)
+    return symbol.clone()
+
+
+def clear_style_cache() -> None:
+    """Drop every cached template and symbol (plugin unload)."""
+    _contour_templates.clear()
+    _sized_labelings.clear()
+    _fill_symbols.clear()
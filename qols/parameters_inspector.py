@@ -32,6 +32,7 @@ exec() globals dict):
 from __future__ import annotations
 
 import datetime
+import functools
 import html
 import json
 import re
@@ -44,20 +45,24 @@ from qgis.PyQt.QtWidgets import (
 
 from .compat import ACTION_TYPE_GENERIC_PYTHON
 
+
 # QtWebEngineWidgets/QtWebChannel are optional, heavy Qt components (bundled
 # separately from base PyQt -- e.g. `python-pyqt6-webengine` on Arch/CachyOS)
 # that aren't guaranteed to be installed alongside QGIS. Fall back to a
 # QTextBrowser-based popup (no live JS theme toggle, but still dark by
 # default) rather than crashing every "view parameters as HTML Table" action
-# for users who lack them.
-try:
-    from qgis.PyQt.QtWebChannel import QWebChannel
-    from qgis.PyQt.QtWebEngineWidgets import QWebEngineView
-    _WEBENGINE_AVAILABLE = True
-except ImportError:
-    QWebChannel = None
-    QWebEngineView = None
-    _WEBENGINE_AVAILABLE = False
+# for users who lack them. Probed when the first popup opens, not at import:
+# every surface script imports this module, and loading QtWebEngine is slow.
+@functools.lru_cache(maxsize=None)
+def _webengine_classes():
+    """``(QWebChannel, QWebEngineView)``, or ``None`` without QtWebEngine."""
+    try:
+        from qgis.PyQt.QtWebChannel import QWebChannel
+        from qgis.PyQt.QtWebEngineWidgets import QWebEngineView
+    except ImportError:
+        return None
+    return QWebChannel, QWebEngineView
+
 
 __all__ = [
     "build_parameters_json",
@@ -353,12 +358,13 @@ def show_web_popup(title, sections):
     window is closed. Uses QWebEngineView when available (dark-mode-by-
     default with a live toggle), falling back to a QTextBrowser popup
     otherwise."""
-    if _WEBENGINE_AVAILABLE:
+    if _webengine_classes() is not None:
         return _show_webengine_popup(title, sections)
     return _show_textbrowser_popup(title, sections)
 
 
 def _show_webengine_popup(title, sections):
+    QWebChannel, QWebEngineView = _webengine_classes()
     page_html = _build_page_html(title, sections)
 
     view = QWebEngineView()
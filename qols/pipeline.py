@@ -0,0 +1,300 @@
+"""qols/pipeline.py — "Calculate All" for the current-OLS surfaces.
+
+One click builds every selected Annex 14 surface (Approach, Transitional,
+Inner Horizontal, Conical, OFZ, Take-Off, Outer Horizontal) from a single
+resolution of the runway / threshold / ARP layers:
+
+* :func:`resolve_runways` reads the selected (or all) features once into
+  :class:`~qols.engine.RunwayGeometry` objects shared by every surface.
+* :func:`plan_jobs` pairs each surface with its builder, the parameters
+  of its dock tab and the runway input its script would have used
+  (Inner Horizontal + Conical together become the trimmed
+  ``INNER_CONICAL`` build).
+* :class:`SurfacePipeline` builds them all in one
+  :class:`~qols.surface_task.SurfaceBuildTask`, then creates, styles and
+  adds every layer with a single ``addMapLayers`` call and zooms and
+  repaints the canvas once.
+
+The per-surface scripts stay the path for single Calculate clicks; they
+also handle the script-only extras (the merged Transitional layer, #121).
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from qgis.PyQt.QtGui import QColor
+from qgis.core import QgsApplication, QgsProject, QgsRectangle
+
+from .engine import RunwayGeometry, SurfaceBuilder, SurfaceParams, SurfaceResult, get_builder
+from .engine.qgis_adapter import (
+    add_surface_features,
+    create_contour_layer,
+    create_surface_layer,
+    runway_geometry,
+)
+from .layer_styles import fill_symbol
+from .runway_context import layer_features, point_index
+from .surface_task import SurfaceBuildTask
+from .surface_types import SurfaceType
+from . import logger
+
+__all__ = [
+    "CURRENT_OLS_SURFACES",
+    "PipelineRunways",
+    "SurfaceJob",
+    "resolve_runways",
+    "plan_jobs",
+    "create_job_layers",
+    "SurfacePipeline",
+]
+
+# Surfaces offered by Calculate All, in build/layer order.
+CURRENT_OLS_SURFACES = (
+    SurfaceType.APPROACH,
+    SurfaceType.TRANSITIONAL,
+    SurfaceType.INNER_HORIZONTAL,
+    SurfaceType.CONICAL,
+    SurfaceType.OFZ,
+    SurfaceType.TAKEOFF,
+    SurfaceType.OUTER_HORIZONTAL,
+)
+
+# ``calculation_type`` of the parameters JSON (#118), as each script writes it.
+_CALCULATION_TYPES = {
+    SurfaceType.APPROACH: 'Approach Surface',
+    SurfaceType.TRANSITIONAL: 'Transitional Surface',
+    SurfaceType.INNER_HORIZONTAL: 'Inner Horizontal Surface',
+    SurfaceType.CONICAL: 'Conical Surface',
+    SurfaceType.OFZ: 'Obstacle Free Zone',
+    SurfaceType.TAKEOFF: 'Take-Off Climb Surface',
+    SurfaceType.OUTER_HORIZONTAL: 'Outer Horizontal Surface',
+}
+
+# Fill styles, matching the scripts: a recoloured default symbol at 40 %
+# opacity, or a QgsFillSymbol.createSimple() property map (cached by
+# layer_styles.fill_symbol).
+_SYMBOL_COLORS = {
+    SurfaceType.APPROACH: "green",
+    SurfaceType.TRANSITIONAL: "magenta",
+    SurfaceType.OFZ: "blue",
+    SurfaceType.TAKEOFF: "orange",
+}
+_SIMPLE_FILLS = {
+    SurfaceType.INNER_HORIZONTAL: {
+        'color': '255,0,255,100', 'style': 'solid',
+        'outline_color': '255,0,255,255', 'outline_style': 'solid', 'outline_width': '0.7',
+    },
+    SurfaceType.CONICAL: {
+        'color': '255,165,0,100', 'style': 'solid',
+        'outline_color': '255,165,0,255', 'outline_style': 'solid', 'outline_width': '0.7',
+    },
+    SurfaceType.OUTER_HORIZONTAL: {
+        'color': '0,100,255,100', 'style': 'solid',
+        'outline_color': '0,100,255,255', 'outline_style': 'solid', 'outline_width': '0.5',
+    },
+}
+
+# Surfaces whose scripts build one layer over every selected runway.
+_ALL_RUNWAY_SURFACES = (
+    SurfaceType.INNER_HORIZONTAL,
+    SurfaceType.NEW_OLS_OES_HORIZONTAL,
+    SurfaceType.NEW_OLS_OES_STRAIGHT_IN_APPROACH,
+)
+
+# Contour label size overrides (Conical's rings sit close together, #126).
+_CONTOUR_LABEL_SIZES = {SurfaceType.CONICAL: 16}
+
+
+@dataclass
+class PipelineRunways:
+    """Runway, threshold and ARP coordinates resolved once for a whole run.
+
+    ``runways`` holds one :class:`RunwayGeometry` per runway centerline
+    feature, all carrying the same thresholds and ARP points.
+    """
+
+    runways: list[RunwayGeometry]
+    arp_points: tuple = ()
+
+    def runway_for(self, surface_type: SurfaceType) -> Any:
+        """The ``build_surface`` runway argument each surface's script
+        passes: every centerline for Inner Horizontal and the New OLS OES
+        Horizontal / Straight-in surfaces, the last one for Conical, ARPs
+        only for Outer Horizontal, else the first."""
+        if surface_type == SurfaceType.OUTER_HORIZONTAL:
+            return RunwayGeometry(arp_points=self.arp_points)
+        if surface_type in _ALL_RUNWAY_SURFACES:
+            return self.runways
+        if surface_type in (SurfaceType.CONICAL, SurfaceType.INNER_CONICAL):
+            return self.runways[-1]
+        return self.runways[0]
+
+
+@dataclass
+class SurfaceJob:
+    """One surface build of a Calculate All run."""
+
+    surface_type: SurfaceType
+    builder: SurfaceBuilder
+    params: SurfaceParams
+    runway: Any
+    result: Optional[SurfaceResult] = field(default=None, repr=False)
+
+    def part_params(self) -> dict:
+        """Parameters per result part — the combined Inner Horizontal &
+        Conical build yields one result per surface."""
+        if self.surface_type == SurfaceType.INNER_CONICAL:
+            return {
+                SurfaceType.INNER_HORIZONTAL: self.params.inner_horizontal,
+                SurfaceType.CONICAL: self.params.conical,
+            }
+        return {self.surface_type: self.params}
+
+
+def resolve_runways(params: Mapping[str, Any], iface=None, with_arps: bool = False) -> PipelineRunways:
+    """Read the runway / threshold (and, with ``with_arps``, ARP) layers of
+    the dock ``params`` once."""
+    runway_features = layer_features(
+        params.get('runway_layer'), params.get('use_runway_selected', False), "Runway Layer Centerline")
+    threshold_points = point_index(
+        params.get('threshold_layer'), params.get('use_threshold_selected', False), "threshold layer").points()
+    arp_points = ()
+    if with_arps:
+        arp_points = tuple(point_index(
+            params.get('arp_layer'), params.get('use_arp_selected', False), "ARP layer").points())
+    runways = []
+    for feature in runway_features:
+        runway = runway_geometry(feature, iface=iface)
+        runways.append(RunwayGeometry(
+            centerline=runway.centerline,
+            thresholds=threshold_points,
+            arp_points=arp_points,
+            length=runway.length,
+        ))
+    return PipelineRunways(runways, arp_points)
+
+
+def plan_jobs(surface_types: Iterable[SurfaceType], namespace_for: Callable[[SurfaceType], Mapping[str, Any]],
+              runways: PipelineRunways) -> list[SurfaceJob]:
+    """One :class:`SurfaceJob` per surface. ``namespace_for(surface_type)``
+    returns the flat parameter namespace of that surface's tab (``params``
+    merged with ``specific_params``). Inner Horizontal and Conical together
+    are built as ``INNER_CONICAL``, so Conical comes out trimmed (#124)."""
+    types = list(dict.fromkeys(surface_types))
+    if SurfaceType.INNER_HORIZONTAL in types and SurfaceType.CONICAL in types:
+        types[types.index(SurfaceType.INNER_HORIZONTAL)] = SurfaceType.INNER_CONICAL
+        types.remove(SurfaceType.CONICAL)
+    jobs = []
+    for surface_type in types:
+        builder = get_builder(surface_type)
+        params = builder.params_from_namespace(namespace_for(surface_type))
+        jobs.append(SurfaceJob(surface_type, builder, params, runways.runway_for(surface_type)))
+    return jobs
+
+
+def _style_surface_layer(layer, surface_type: SurfaceType) -> None:
+    if surface_type in _SIMPLE_FILLS:
+        layer.renderer().setSymbol(fill_symbol(_SIMPLE_FILLS[surface_type]))
+    elif surface_type in _SYMBOL_COLORS:
+        layer.renderer().symbol().setColor(QColor(_SYMBOL_COLORS[surface_type]))
+        layer.renderer().symbol().setOpacity(0.4)
+
+
+def create_job_layers(job: SurfaceJob, crs: str) -> list:
+    """Styled surface (and contour) layers for a finished job, not yet
+    added to the project."""
+    from .parameters_inspector import build_parameters_json, register_parameters_action
+    from .scripts import _contour_utils
+
+    part_params = job.part_params()
+    layers = []
+    for part in (*job.result.related, job.result):
+        surface_type = SurfaceType(part.surface_type)
+        params = part_params.get(surface_type, job.params)
+        layer = create_surface_layer(part, crs)
+        add_surface_features(layer, part, [build_parameters_json(
+            _CALCULATION_TYPES.get(surface_type, surface_type.value), params.as_dict())])
+        register_parameters_action(layer)
+        _style_surface_layer(layer, surface_type)
+        layers.append(layer)
+
+        contour_layer = create_contour_layer(part, crs)
+        if contour_layer is not None:
+            _contour_utils.apply_contour_style(
+                contour_layer, _contour_utils.__file__, label_font_size=_CONTOUR_LABEL_SIZES.get(surface_type))
+            layers.append(contour_layer)
+    return layers
+
+
+class SurfacePipeline:
+    """Runs planned jobs in one background task and publishes every
+    resulting layer at once.
+
+    Same protocol as :class:`~qols.surface_task.SurfaceCalculation`
+    (``start``, ``cancel``, ``running``); ``on_done(error, canceled)`` is
+    called on the GUI thread, with the new layers in :attr:`layers`.
+    ``cache`` (a :class:`~qols.surface_cache.SurfaceCache`) serves and
+    stores the builds, keyed with ``crs``.
+    """
+
+    def __init__(self, jobs: list[SurfaceJob], crs: str, iface,
+                 on_done: Callable[[Optional[BaseException], bool], None], cache=None):
+        self.jobs = jobs
+        self.crs = crs
+        self.iface = iface
+        self.cache = cache
+        self.layers: list = []
+        self._on_done = on_done
+        self._task: Optional[SurfaceBuildTask] = None
+        self._canceled = False
+        self.running = False
+
+    def start(self) -> None:
+        self.running = True
+        self._task = SurfaceBuildTask(
+            "QOLS: Calculate All", [(job.builder, job.params, job.runway) for job in self.jobs], self._task_finished,
+            self.cache, self.crs)
+        QgsApplication.taskManager().addTask(self._task)
+
+    def cancel(self) -> None:
+        self._canceled = True
+        if self._task is not None:
+            self._task.cancel()
+
+    def _task_finished(self, task: SurfaceBuildTask, ok: bool) -> None:
+        self._task = None
+        if not ok:
+            if task.error is not None:
+                logger.error(f"Calculate All build failed: {task.error}\n{task.error_traceback}")
+            self._finish(task.error, task.error is None)
+            return
+        try:
+            for job, result in zip(self.jobs, task.results):
+                job.result = result
+                self.layers.extend(create_job_layers(job, self.crs))
+            self._publish()
+        except Exception as e:
+            self._finish(e, False)
+            return
+        self._finish(None, False)
+
+    def _publish(self) -> None:
+        """Add every layer in one call, then zoom to their combined extent
+        and repaint once."""
+        QgsProject.instance().addMapLayers(self.layers)
+        extent = None
+        for layer in self.layers:
+            layer.updateExtents()
+            if extent is None:
+                extent = QgsRectangle(layer.extent())
+            else:
+                extent.combineExtentWith(layer.extent())
+        canvas = self.iface.mapCanvas()
+        if extent is not None and not extent.isEmpty():
+            extent.scale(1.05)
+            canvas.setExtent(extent)
+        canvas.refresh()
+        logger.info(f"Calculate All: {len(self.jobs)} surfaces, {len(self.layers)} layers added")
+
+    def _finish(self, error: Optional[BaseException], canceled: bool) -> None:
+        self.running = False
+        self._on_done(error, canceled or self._canceled)
@@ -4,17 +4,27 @@ Defines the :class:`QOLS` class that QGIS instantiates via
 ``classFactory(iface)`` when the plugin is loaded.  Owns the toolbar
 action, manages the dock widget lifecycle, and dispatches script
 execution requests.
+
+QGIS loads the plugin at every startup, but most sessions never open a
+panel, so only what ``initGui`` needs is imported here: the dock widgets
+(and the parameters inspector they pull in), the settings dialog, the
+background-task machinery (and with it the engine), the KML exporter
+(``processing``) are imported on first use, and the rule files are read
+on a background thread (:func:`_warm_rule_sets`) instead of in
+``__init__``. The watcher for rule-file edits is started once that
+thread is done, back on the GUI thread.
 """
 import os
 import sys
 import math
+import threading
 import traceback
 from .compat import (
     DOCK_RIGHT, MSG_INFO, MSG_WARNING, MSG_CRITICAL, MSG_SUCCESS,
     GEOM_TYPE_LINE, GEOM_TYPE_POLYGON, WKB_LINE_STRING, WKB_MULTI_LINE_STRING,
-    DIALOG_ACCEPTED,
+    DIALOG_ACCEPTED, QUEUED_CONNECTION,
 )
-from qgis.PyQt.QtCore import QCoreApplication, QVariant
+from qgis.PyQt.QtCore import QCoreApplication, QObject, QVariant, pyqtSignal
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtWidgets import QAction, QInputDialog
 from qgis.core import (QgsProject, Qgis, QgsVectorLayer,
@@ -23,13 +33,57 @@ from qgis.core import (QgsProject, Qgis, QgsVectorLayer,
                        QgsVectorFileWriter, QgsCoordinateTransform,
                        QgsCoordinateReferenceSystem)
 
-from .ui.dockwidget import QolsDockWidget
-from .ui.new_ols_dockwidget import NewOlsDockWidget
-from .ui.settings_dialog import RulesSettingsDialog
 from .surface_types import SurfaceType
-from .rules import manager as rule_mgr
+from .layer_access import ValidationRound
 from . import logger  # CR-01
 
+# Session caches dropped on unload, as (module, function). A module that
+# was never imported this session holds nothing and is not imported just
+# to be cleared.
+_SESSION_CACHES = (
+    ('layer_styles', 'clear_style_cache'),
+    ('runway_context', 'clear_runway_contexts'),
+    ('direction_marker', 'clear_marker_cache'),
+    ('layer_access', 'clear_layer_access_cache'),
+    ('assets.icon_manager', 'clear_icon_cache'),
+    ('surface_cache', 'clear_surface_cache'),
+)
+
+
+def _warm_rule_sets():
+    """Read the rule-file headers and the active set's body off the GUI
+    thread, so the first panel open finds them loaded."""
+    try:
+        from .rules import manager as rule_mgr
+
+        rule_mgr.list_rule_sets()
+        active = rule_mgr.get_active_rule_set_name()
+        if active:
+            rule_mgr.get_rule_set(active)
+    except Exception as e:
+        logger.warning(f"Could not warm rule-set cache at startup: {e}")
+
+
+class _RuleSetWarmer(QObject):
+    """Runs :func:`_warm_rule_sets` on a daemon thread and emits
+    ``warmed`` when it returns, whether or not the rule files loaded."""
+
+    warmed = pyqtSignal()
+
+    def start(self):
+        threading.Thread(target=self._run, name="qols-rule-sets", daemon=True).start()
+
+    def _run(self):
+        _warm_rule_sets()
+        self.warmed.emit()
+
+
+def _clear_session_caches():
+    for module_name, function_name in _SESSION_CACHES:
+        module = sys.modules.get(f"{__package__}.{module_name}")
+        if module is not None:
+            getattr(module, function_name)()
+
 
 class QOLS:
     """QGIS Plugin Implementation."""
@@ -42,10 +96,18 @@ class QOLS:
         self.first_start = True
         self.panel = None
         self.panel_new_ols = None
-        try:
-            _ = rule_mgr.list_rule_sets()
-        except Exception as e:
-            logger.warning(f"Could not warm rule-set cache at startup: {e}")
+        # the Calculate run in progress, if any; see _start_calculation()
+        self._calculation = None
+        # layer validation memo of the current Calculate click
+        self._validation_round = ValidationRound()
+        # script path -> ((mtime_ns, size), code object); see _compile_script()
+        self._script_code_cache = {}
+        self._script_cache_hits = 0
+        self._script_cache_misses = 0
+        # reads the rule files off the GUI thread; see _on_rule_sets_warmed()
+        self._rule_warmer = _RuleSetWarmer()
+        self._rule_warmer.warmed.connect(self._on_rule_sets_warmed, QUEUED_CONNECTION)
+        self._rule_warmer.start()
 
     def tr(self, message):
         return QCoreApplication.translate('QOLS', message)
@@ -103,6 +165,16 @@ class QOLS:
                 parent=self.iface.mainWindow())
             self.first_start = True
 
+            evaluate_action = QAction(self.tr('Obstacle Evaluation…'), self.iface.mainWindow())
+            evaluate_action.triggered.connect(self.on_evaluate_obstacles)
+            self.iface.addPluginToMenu(self.menu, evaluate_action)
+            self.actions.append(evaluate_action)
+
+            raster_action = QAction(self.tr('Penetration Raster…'), self.iface.mainWindow())
+            raster_action.triggered.connect(self.on_penetration_raster)
+            self.iface.addPluginToMenu(self.menu, raster_action)
+            self.actions.append(raster_action)
+
             rules_action = QAction(self.tr('Select Rule Set…'), self.iface.mainWindow())
             rules_action.triggered.connect(self.on_select_rule_set)
             self.iface.addPluginToMenu(self.menu, rules_action)
@@ -122,6 +194,16 @@ class QOLS:
             logger.error(f"Error in initGui: {e}\n{traceback.format_exc()}")
 
     def unload(self):
+        if self._calculation is not None:
+            self._calculation.cancel()
+        if self._rule_warmer is not None:
+            # still warming: the queued signal must not start a watcher
+            self._rule_warmer.warmed.disconnect(self._on_rule_sets_warmed)
+            self._rule_warmer = None
+        evaluator = sys.modules.get(f"{__package__}.evaluation.evaluator")
+        if evaluator is not None:
+            evaluator.cancel_obstacle_evaluations()
+            evaluator.cancel_penetration_rasters()
         for action in self.actions:
             self.iface.removePluginMenu(self.menu, action)
             self.iface.removeToolBarIcon(action)
@@ -131,6 +213,10 @@ class QOLS:
         if self.panel_new_ols:
             self.panel_new_ols.close()
             self.panel_new_ols = None
+        rules_manager = sys.modules.get(f"{__package__}.rules.manager")
+        if rules_manager is not None:
+            rules_manager.unwatch_rule_files()
+        _clear_session_caches()
 
     def show_panel(self):
         """Toggle the QOLS dockwidget panel (show/hide)."""
@@ -142,10 +228,14 @@ class QOLS:
                 return
 
             if not self.panel:
+                from .ui.dockwidget import QolsDockWidget
+
                 self.panel = QolsDockWidget(self.iface)
                 self.iface.addDockWidget(DOCK_RIGHT, self.panel)
                 self.panel.closingPlugin.connect(self.on_close_panel)
                 self.panel.calculateClicked.connect(self.on_calculate)
+                self.panel.calculateAllClicked.connect(self.on_calculate_all)
+                self.panel.cancelCalculationClicked.connect(self.on_cancel_calculation)
                 self.panel.closeClicked.connect(self.on_close_panel)
 
             self.panel.show()
@@ -172,10 +262,13 @@ class QOLS:
                     "New OLS", "Panel closed!", level=MSG_INFO, duration=2)
                 return
             if self.panel_new_ols is None:
+                from .ui.new_ols_dockwidget import NewOlsDockWidget
+
                 self.panel_new_ols = NewOlsDockWidget(self.iface)
                 self.iface.addDockWidget(DOCK_RIGHT, self.panel_new_ols)
                 self.panel_new_ols.closingPlugin.connect(self.on_close_new_ols_panel)
                 self.panel_new_ols.calculateClicked.connect(self.on_calculate_new_ols)
+                self.panel_new_ols.cancelCalculationClicked.connect(self.on_cancel_calculation)
                 self.panel_new_ols.closeClicked.connect(self.on_close_new_ols_panel)
             self.panel_new_ols.show()
             self.panel_new_ols.raise_()
@@ -192,8 +285,15 @@ class QOLS:
             self.panel_new_ols.hide()
 
     def on_calculate_new_ols(self):
-        """Execute the selected New OLS surface calculation script with parameters."""
+        """Run the selected New OLS surface calculation script with parameters
+        (geometry in a background task, see :meth:`_start_calculation`)."""
+        if self._calculation_busy():
+            return
+        self._validation_round = ValidationRound()
         try:
+            from .surface_cache import surface_cache
+            from .surface_task import SurfaceCalculation
+
             params = self.panel_new_ols.get_parameters()
             if not params:
                 self.iface.messageBar().pushMessage(
@@ -206,6 +306,11 @@ class QOLS:
                     "New OLS", "Please select a surface type", level=MSG_WARNING)
                 return
 
+            self._calculation = SurfaceCalculation(
+                "New OLS", self.execute_script,
+                lambda error, canceled: self._on_calculation_done(
+                    self.panel_new_ols, "New OLS", st, params, error, canceled),
+                cache=surface_cache())
             if st == SurfaceType.NEW_OLS_OFS_APPROACH:
                 self.execute_new_ols_ofs_approach(params)
             elif st == SurfaceType.NEW_OLS_OES_HORIZONTAL:
@@ -224,15 +329,10 @@ class QOLS:
             else:
                 raise ValueError(f"Unhandled New OLS surface type: {st!r}")
 
-            if params.get('_script_success', False):
-                self.iface.messageBar().pushMessage(
-                    "New OLS Success",
-                    f"{st} calculation completed successfully",
-                    level=MSG_SUCCESS)
-            else:
-                logger.warning(f"{st} completed but script did not set _script_success=True")
+            self._start_calculation(self.panel_new_ols)
 
         except Exception as e:
+            self._calculation = None
             logger.error(f"Error in on_calculate_new_ols: {e}\n{traceback.format_exc()}")
             self.iface.messageBar().pushMessage(
                 "New OLS Error", f"Error calculating surface: {str(e)}", level=MSG_CRITICAL)
@@ -246,9 +346,34 @@ class QOLS:
             except Exception as e:
                 logger.warning(f"Error refreshing panel defaults: {e}")
 
+    def _on_rule_sets_warmed(self):
+        """The rule files are loaded: watch them for edits. Queued from the
+        warm-up thread, so this runs on the GUI thread that owns the
+        watcher."""
+        if self._rule_warmer is None:
+            return  # unloaded meanwhile
+        self._rule_warmer = None
+        try:
+            from .rules import manager as rule_mgr
+
+            rule_mgr.watch_rule_files(self._on_rule_files_changed)
+        except Exception as e:
+            logger.warning(f"Could not watch rule files: {e}")
+
+    def _on_rule_files_changed(self, names):
+        """A rule file changed on disk: refresh the panel when it is the
+        active set's."""
+        from .rules import manager as rule_mgr
+
+        if rule_mgr.get_active_rule_set_name() in names:
+            logger.info(f"Active rule set '{rule_mgr.get_active_rule_set_name()}' changed on disk")
+            self._refresh_panel_defaults()
+
     def on_select_rule_set(self):
         """Show a dialog to select the active rule set and persist the choice."""
         try:
+            from .rules import manager as rule_mgr
+
             registry = rule_mgr.list_rule_sets()
             names = sorted(list(registry.keys()))
             if not names:
@@ -276,6 +401,8 @@ class QOLS:
     def on_reload_rule_files(self):
         """Force reload of rule JSON files and refresh panel defaults."""
         try:
+            from .rules import manager as rule_mgr
+
             rule_mgr.reload_rules()
             self.iface.messageBar().pushMessage(
                 "QOLS", "Rule files reloaded", level=MSG_INFO, duration=3)
@@ -286,6 +413,9 @@ class QOLS:
     def on_open_settings(self):
         """Open the QOLS Settings dialog."""
         try:
+            from .rules import manager as rule_mgr
+            from .ui.settings_dialog import RulesSettingsDialog
+
             dlg = RulesSettingsDialog(self.iface.mainWindow())
             if dlg.exec() == DIALOG_ACCEPTED:
                 name = dlg.selected_rule_set()
@@ -307,9 +437,36 @@ class QOLS:
             self.iface.messageBar().pushMessage(
                 "QOLS", f"KML export failed: {e}", level=MSG_CRITICAL, duration=8)
 
+    def on_evaluate_obstacles(self):
+        """Evaluate an obstacle point layer against the generated surface layers."""
+        try:
+            from .evaluation import run_obstacle_evaluation
+            run_obstacle_evaluation(self.iface)
+        except Exception as e:
+            logger.error(f"Error evaluating obstacles: {e}\n{traceback.format_exc()}")
+            self.iface.messageBar().pushMessage(
+                "QOLS", f"Obstacle evaluation failed: {e}", level=MSG_CRITICAL, duration=8)
+
+    def on_penetration_raster(self):
+        """Write a tiled penetration GeoTIFF of a DEM/DSM against the generated surfaces."""
+        try:
+            from .evaluation import run_penetration_raster
+            run_penetration_raster(self.iface)
+        except Exception as e:
+            logger.error(f"Error writing penetration raster: {e}\n{traceback.format_exc()}")
+            self.iface.messageBar().pushMessage(
+                "QOLS", f"Penetration raster failed: {e}", level=MSG_CRITICAL, duration=8)
+
     def on_calculate(self):
-        """Execute the selected surface calculation script with parameters."""
+        """Run the selected surface calculation script with parameters
+        (geometry in a background task, see :meth:`_start_calculation`)."""
+        if self._calculation_busy():
+            return
+        self._validation_round = ValidationRound()
         try:
+            from .surface_cache import surface_cache
+            from .surface_task import SurfaceCalculation
+
             params = self.panel.get_parameters()
             if params is None:
                 return
@@ -320,6 +477,12 @@ class QOLS:
                     "QOLS", "Please select a surface type", level=MSG_WARNING)
                 return
 
+            self._calculation = SurfaceCalculation(
+                "QOLS", self.execute_script,
+                lambda error, canceled: self._on_calculation_done(
+                    self.panel, "QOLS", st, params, error, canceled),
+                cache=surface_cache())
+
             if st == SurfaceType.APPROACH:
                 self.execute_approach_surface(params)
             elif st == SurfaceType.CONICAL:
@@ -343,55 +506,170 @@ class QOLS:
             else:
                 raise ValueError(f"Unhandled surface type: {st!r}")
 
-            # CR-08: only show success when the script confirmed it
-            if params.get('_script_success', False):
-                self.iface.messageBar().pushMessage(
-                    "QOLS Success",
-                    f"{st} calculation completed successfully",
-                    level=MSG_SUCCESS)
-            else:
-                logger.warning(
-                    f"{st} completed but script did not set _script_success=True")
+            self._start_calculation(self.panel)
 
         except Exception as e:
+            self._calculation = None
             logger.error(f"Error in on_calculate: {e}\n{traceback.format_exc()}")
             self.iface.messageBar().pushMessage(
                 "QOLS Error", f"Error calculating surface: {str(e)}", level=MSG_CRITICAL)
 
+    def on_calculate_all(self):
+        """Calculate All (qols/pipeline.py): build every checked current-OLS
+        surface from one runway/threshold/ARP resolution and publish all
+        layers at once."""
+        if self._calculation_busy():
+            return
+        self._validation_round = ValidationRound()
+        try:
+            from .pipeline import SurfacePipeline, plan_jobs, resolve_runways
+            from .rules import manager as rule_mgr
+            from .surface_cache import surface_cache
+            from .ui.calculate_all_dialog import CalculateAllDialog
+
+            dialog = CalculateAllDialog(self.iface.mainWindow())
+            if dialog.exec() != DIALOG_ACCEPTED:
+                return
+            surface_types = dialog.selected_surface_types()
+            if not surface_types:
+                return
+
+            base_params = self.panel.get_parameters(surface_types[0])
+            if base_params is None:
+                return
+            self._validate_layers_for_execution(base_params)
+            runways = resolve_runways(
+                base_params, self.iface, with_arps=SurfaceType.OUTER_HORIZONTAL in surface_types)
+
+            active_rule_set = rule_mgr.get_active_rule_set_name()
+
+            def namespace_for(surface_type):
+                params = self.panel.get_parameters(surface_type)
+                if params is None:
+                    raise ValueError(f"Could not read the {surface_type.value} parameters")
+                namespace = {'active_rule_set': active_rule_set}
+                namespace.update(params)
+                namespace.update(params.get('specific_params', {}))
+                return namespace
+
+            jobs = plan_jobs(surface_types, namespace_for, runways)
+            crs = self.iface.mapCanvas().mapSettings().destinationCrs().authid()
+            self._calculation = SurfacePipeline(
+                jobs, crs, self.iface,
+                lambda error, canceled: self._on_calculate_all_done(error, canceled),
+                cache=surface_cache())
+            logger.info(f"Calculate All: {', '.join(job.surface_type.value for job in jobs)}")
+            self._start_calculation(self.panel)
+
+        except Exception as e:
+            self._calculation = None
+            logger.error(f"Error in on_calculate_all: {e}\n{traceback.format_exc()}")
+            self.iface.messageBar().pushMessage(
+                "QOLS Error", f"Error calculating surfaces: {str(e)}", level=MSG_CRITICAL)
+
+    def _on_calculate_all_done(self, error, canceled):
+        """Completion callback of a Calculate All run (GUI thread)."""
+        pipeline, self._calculation = self._calculation, None
+        if self.panel is not None:
+            self.panel.set_calculation_running(False)
+        if canceled:
+            self.iface.messageBar().pushMessage(
+                "QOLS", "Calculate All canceled", level=MSG_INFO, duration=3)
+        elif error is not None:
+            logger.error(f"Error in Calculate All: {error}")
+            self.iface.messageBar().pushMessage(
+                "QOLS Error", f"Error calculating surfaces: {str(error)}", level=MSG_CRITICAL)
+        else:
+            self.iface.messageBar().pushMessage(
+                "QOLS Success",
+                f"{len(pipeline.jobs)} surfaces calculated ({len(pipeline.layers)} layers)",
+                level=MSG_SUCCESS)
+
+    # ------------------------------------------------------------------
+    # Background Calculate runs (qols/surface_task.py)
+    # ------------------------------------------------------------------
+
+    def _calculation_busy(self):
+        """True (after telling the user) while a Calculate run is in progress."""
+        if self._calculation is None or not self._calculation.running:
+            return False
+        self.iface.messageBar().pushMessage(
+            "QOLS", "A calculation is already running", level=MSG_WARNING, duration=3)
+        return True
+
+    def _queue_script(self, script_path, params):
+        """Add a script to the Calculate run being assembled; it executes
+        once :meth:`_start_calculation` starts the run."""
+        self._calculation.add_script(script_path, params)
+
+    def _start_calculation(self, panel):
+        """Start the assembled run: each script's surface geometry is built
+        in a ``QgsTask`` (progress in the task manager) and its layers are
+        created back on the GUI thread; ``panel``'s Cancel button stops it."""
+        panel.set_calculation_running(True)
+        self._calculation.start()
+
+    def _on_calculation_done(self, panel, title, st, params, error, canceled):
+        """Completion callback of a Calculate run (GUI thread)."""
+        self._calculation = None
+        if panel is not None:
+            panel.set_calculation_running(False)
+        if canceled:
+            self.iface.messageBar().pushMessage(
+                title, f"{st} calculation canceled", level=MSG_INFO, duration=3)
+        elif error is not None:
+            logger.error(f"Error calculating {st}: {error}")
+            self.iface.messageBar().pushMessage(
+                f"{title} Error", f"Error calculating surface: {str(error)}", level=MSG_CRITICAL)
+        # CR-08: only show success when the script confirmed it
+        elif params.get('_script_success', False):
+            self.iface.messageBar().pushMessage(
+                f"{title} Success",
+                f"{st} calculation completed successfully",
+                level=MSG_SUCCESS)
+        else:
+            logger.warning(
+                f"{st} completed but script did not set _script_success=True")
+
+    def on_cancel_calculation(self):
+        """Cancel the running Calculate (dock widget Cancel button)."""
+        if self._calculation is not None:
+            self._calculation.cancel()
+
     def execute_approach_surface(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'approach-surface-UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_conical_surface(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'conical.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_inner_horizontal_surface(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'inner-horizontal-racetrack.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_ofz_surface(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'OFZ_UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_outer_horizontal_surface(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'outer-horizontal.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_takeoff_surface(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'take-off-surface_UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_transitional_surface(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'TransitionalSurface_UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_new_ols_ofs_approach(self, params):
         approach_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-ofs-approach-UTM.py')
         trans_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-oes-transitional-UTM.py')
 
         # Run approach from the selected threshold only (one direction per user choice)
-        self.execute_script(approach_path, params)
+        self._queue_script(approach_path, params)
         ofs = params.get('specific_params', {})
 
         # Run transitional ONCE — approach wings + rectangular strips in a single layer.
@@ -414,18 +692,18 @@ class QOLS:
             'direction': ofs.get('direction', 0),
             'opp_start_elevation_m': ofs.get('end_elevation_m', 0.0),
         }
-        self.execute_script(trans_path, trans_params)
+        self._queue_script(trans_path, trans_params)
 
     def execute_new_ols_oes_transitional(self, params):
         script_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-oes-transitional-UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_new_ols_oes_horizontal(self, params):
         """Horizontal Surface (#134) — its own OES subtab (#159), triggered
         individually; get_parameters() already shapes specific_params as
         adg/aerodrome_elevation_m/direction, no remapping needed."""
         script_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-oes-horizontal-UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_new_ols_oes_departure(self, params):
         """Instrument Departure Surface (#136) — its own OES subtab (#159),
@@ -433,7 +711,7 @@ class QOLS:
         specific_params as start_elevation_m/direction, no remapping
         needed (Table 4-13 needs no ADG)."""
         script_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-oes-departure-UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_new_ols_oes_precision_approach(self, params):
         """Surface for Precision Approaches (#135) — its own OES subtab
@@ -442,7 +720,7 @@ class QOLS:
         needed (Table 4-12 needs no ADG; runway_layer/threshold_layer
         are already shared at the top level of params)."""
         script_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-oes-precision-approach-UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_new_ols_oes_straight_in_approach(self, params):
         """Surface for Straight-in Instrument Approaches (#137) — its own
@@ -450,7 +728,7 @@ class QOLS:
         shapes specific_params as aerodrome_elevation_m/direction/lower_*/
         upper_*, no remapping needed (Table 4-11 needs no ADG)."""
         script_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-oes-straight-in-approach-UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_new_ols_oes_takeoff_climb(self, params):
         """Take-off Climb Surface (#161) — its own OES subtab, triggered
@@ -458,11 +736,11 @@ class QOLS:
         start_elevation_m/cwy_length_m/direction/Table-4-14-4-15 fields,
         no remapping needed."""
         script_path = os.path.join(self.plugin_dir, 'scripts', 'new-ols-oes-takeoff-climb-UTM.py')
-        self.execute_script(script_path, params)
+        self._queue_script(script_path, params)
 
     def execute_combined_inner_conical_surface(self, params):
-        """Execute Inner Horizontal then Conical using per-surface parameters,
-        then trim Conical's footprint down to the ring beyond Inner
+        """Queue Inner Horizontal then Conical using per-surface parameters,
+        then the trim of Conical's footprint down to the ring beyond Inner
         Horizontal (#124) — both are concentric racetracks (same runway
         spine/azimuth, Conical's radius >= Inner Horizontal's by
         construction), so Conical would otherwise fully cover it."""
@@ -479,14 +757,14 @@ class QOLS:
             inner_full_params = params.copy()
             inner_full_params['specific_params'] = inner_params
             inner_script_path = os.path.join(self.plugin_dir, 'scripts', 'inner-horizontal-racetrack.py')
-            self.execute_script(inner_script_path, inner_full_params)
+            self._queue_script(inner_script_path, inner_full_params)
 
             conical_full_params = params.copy()
             conical_full_params['specific_params'] = conical_params
             conical_script_path = os.path.join(self.plugin_dir, 'scripts', 'conical.py')
-            self.execute_script(conical_script_path, conical_full_params)
+            self._queue_script(conical_script_path, conical_full_params)
 
-            self._trim_conical_to_ring(inner_params, conical_params)
+            self._calculation.add_step(lambda: self._trim_conical_to_ring(inner_params, conical_params))
 
         except Exception as e:
             logger.error(f"Error in combined Inner Horizontal & Conical execution: {e}\n{traceback.format_exc()}")
@@ -506,7 +784,11 @@ class QOLS:
         script itself builds (``f"InnerHorizontal_{classification}_Code{code}"``
         / ``f"Conical_{classification}_Code{code}"``), mirroring the
         name-based lookup convention #121 already established for the
-        "Merged Transitional Surface" layer.
+        "Merged Transitional Surface" layer. Only Conical is looked up:
+        the hole is Inner Horizontal's ``racetrack_ring`` rebuilt from the
+        runway spine on the Conical feature (a ring-cache hit after the
+        Inner Horizontal build); reading Inner Horizontal's layer back is
+        the fallback when that ring can't be built or isn't a clean hole.
 
         Defensive: leaves Conical's original geometry untouched (per
         feature) if either layer can't be found unambiguously or a
@@ -521,7 +803,10 @@ class QOLS:
         Z with, guaranteeing the two surfaces meet at the same elevation
         by construction.
         """
-        from .geometry_difference import difference_flat
+        from .engine.qgis_adapter import geometry_from_wkb
+        from .engine.racetrack import DEFAULT_CHORD_TOLERANCE, racetrack_ring, ring_with_z
+        from .engine.wkb import polygon_z_wkb
+        from .geometry_difference import annulus_flat, difference_flat
 
         def _first_vertex_z(geom):
             """Diagnostic-only: exterior ring's first vertex Z, or None."""
@@ -556,50 +841,87 @@ class QOLS:
             f"Z, so the two surfaces meet as a single line), top_z={top_z}"
         )
 
-        inner_name = (
-            f"InnerHorizontal_{inner_params.get('rwyClassification', 'Precision Approach CAT I')}"
-            f"_Code{inner_params.get('code', 4)}"
-        )
         conical_name = (
             f"Conical_{conical_params.get('rwyClassification', 'Precision Approach CAT I')}"
             f"_Code{conical_params.get('code', 4)}"
         )
-        inner_matches = QgsProject.instance().mapLayersByName(inner_name)
         conical_matches = QgsProject.instance().mapLayersByName(conical_name)
-        logger.info(
-            f"_trim_conical_to_ring: '{inner_name}' -> {len(inner_matches)} match(es), "
-            f"'{conical_name}' -> {len(conical_matches)} match(es)"
-        )
-        if len(inner_matches) != 1 or len(conical_matches) != 1:
+        logger.info(f"_trim_conical_to_ring: '{conical_name}' -> {len(conical_matches)} match(es)")
+        if len(conical_matches) != 1:
             logger.warning(
-                "Could not trim Conical to a ring — expected exactly one Inner Horizontal and one "
-                "Conical layer by name; delete older same-named layers and recalculate if this persists."
+                "Could not trim Conical to a ring — expected exactly one Conical layer by name; "
+                "delete older same-named layers and recalculate if this persists."
             )
             return
-        inner_layer = inner_matches[0]
         conical_layer = conical_matches[0]
 
-        inner_geoms = [f.geometry() for f in inner_layer.getFeatures() if not f.geometry().isEmpty()]
-        logger.info(f"_trim_conical_to_ring: {len(inner_geoms)} Inner Horizontal geometrie(s) found")
-        if not inner_geoms:
-            logger.warning("_trim_conical_to_ring: no Inner Horizontal geometries, skipping trim")
-            return
-        logger.info(
-            f"_trim_conical_to_ring: Inner Horizontal's own vertex Z (read from layer, "
-            f"should equal bottom_z={bottom_z}) = {_first_vertex_z(inner_geoms[0])}"
-        )
-        inner_union = QgsGeometry.unaryUnion(inner_geoms)
-        logger.info(
-            f"_trim_conical_to_ring: inner_union area={inner_union.area() if inner_union else None}, "
-            f"isEmpty={inner_union.isEmpty() if inner_union else None}"
-        )
+        # The hole is Inner Horizontal's racetrack, rebuilt from the runway
+        # spine the Conical feature carries — the same ring_cache key the
+        # Inner Horizontal build used, so no layer read-back.
+        inner_radius = inner_params.get('radius')
+        chord_tolerance = inner_params.get('chord_tolerance_m', DEFAULT_CHORD_TOLERANCE)
+        fallback_union = []
+
+        def _hole_from_ring(feat):
+            try:
+                start = (float(feat['runway_start_x']), float(feat['runway_start_y']))
+                end = (float(feat['runway_end_x']), float(feat['runway_end_y']))
+                ring = racetrack_ring(start, end, float(inner_radius), float(chord_tolerance))
+            except (KeyError, TypeError, ValueError):
+                return None
+            return geometry_from_wkb(polygon_z_wkb([ring_with_z(ring, bottom_z)]))
+
+        def _hole_from_layer():
+            """Fallback: Inner Horizontal's footprint read back from its layer."""
+            if fallback_union:
+                return fallback_union[0]
+            fallback_union.append(None)
+            inner_name = (
+                f"InnerHorizontal_{inner_params.get('rwyClassification', 'Precision Approach CAT I')}"
+                f"_Code{inner_params.get('code', 4)}"
+            )
+            inner_matches = QgsProject.instance().mapLayersByName(inner_name)
+            logger.info(f"_trim_conical_to_ring: '{inner_name}' -> {len(inner_matches)} match(es)")
+            if len(inner_matches) != 1:
+                logger.warning(
+                    "Could not trim Conical to a ring — expected exactly one Inner Horizontal layer by "
+                    "name; delete older same-named layers and recalculate if this persists."
+                )
+                return None
+            inner_geoms = [f.geometry() for f in inner_matches[0].getFeatures() if not f.geometry().isEmpty()]
+            logger.info(f"_trim_conical_to_ring: {len(inner_geoms)} Inner Horizontal geometrie(s) found")
+            if not inner_geoms:
+                logger.warning("_trim_conical_to_ring: no Inner Horizontal geometries, skipping trim")
+                return None
+            logger.info(
+                f"_trim_conical_to_ring: Inner Horizontal's own vertex Z (read from layer, "
+                f"should equal bottom_z={bottom_z}) = {_first_vertex_z(inner_geoms[0])}"
+            )
+            fallback_union[0] = inner_geoms[0] if len(inner_geoms) == 1 else QgsGeometry.unaryUnion(inner_geoms)
+            return fallback_union[0]
 
         pr = conical_layer.dataProvider()
         geometry_changes = {}
         conical_feature_count = 0
         for feat in conical_layer.getFeatures():
             conical_feature_count += 1
-            trimmed = difference_flat(feat.geometry(), inner_union, exterior_z=top_z, interior_z=bottom_z)
+            # Concentric racetracks: the ring is Conical's exterior with Inner
+            # Horizontal's as a hole, no boolean op needed.
+            trimmed = None
+            hole = _hole_from_ring(feat) if inner_radius else None
+            if hole is not None:
+                trimmed = annulus_flat(feat.geometry(), hole, exterior_z=top_z, interior_z=bottom_z)
+            if trimmed is None:
+                logger.info(
+                    f"_trim_conical_to_ring: feature {feat.id()} — cached ring unusable, "
+                    "falling back to the Inner Horizontal layer"
+                )
+                inner_union = _hole_from_layer()
+                if inner_union is None:
+                    continue
+                trimmed = annulus_flat(feat.geometry(), inner_union, exterior_z=top_z, interior_z=bottom_z)
+                if trimmed is None:
+                    trimmed = difference_flat(feat.geometry(), inner_union, exterior_z=top_z, interior_z=bottom_z)
             if trimmed is not None and not trimmed.isEmpty():
                 geometry_changes[feat.id()] = trimmed
                 logger.info(
@@ -632,42 +954,44 @@ class QOLS:
 
         Raises:
             ValueError: With a human-readable message on the first failing check.
+
+        Memoized per Calculate click (see :class:`~layer_access.ValidationRound`),
+        so the scripts of a combined run share one validation.
+        """
+        self._validation_round.validate(params)
+
+    def _compile_script(self, script_path):
+        """Return the compiled code object for *script_path*, compiling it
+        only when it isn't cached yet or the file changed on disk.
+
+        Keyed on the script's path and validated against its mtime/size, so
+        repeated Calculate clicks (and the two-script combined Inner+Conical
+        and OFS+Transitional paths) skip re-reading and re-compiling the
+        300-500 line scripts, while an edited script is still picked up on
+        the next run without reloading the plugin.
         """
-        runway_layer = params.get('runway_layer')
-        threshold_layer = params.get('threshold_layer')
-
-        if runway_layer is None:
-            raise ValueError("No Runway Layer Centerline in parameters. Execution aborted.")
-        if threshold_layer is None:
-            raise ValueError("No threshold layer in parameters. Execution aborted.")
-
-        if not isinstance(runway_layer, QgsVectorLayer):
-            raise ValueError(f"Runway Layer Centerline is not a valid QgsVectorLayer: {type(runway_layer)}")
-        if not isinstance(threshold_layer, QgsVectorLayer):
-            raise ValueError(f"Threshold layer is not a valid QgsVectorLayer: {type(threshold_layer)}")
-
-        project_layers = list(QgsProject.instance().mapLayers().values())
-        if runway_layer not in project_layers:
-            raise ValueError(f"Runway Layer Centerline '{runway_layer.name()}' not found in current project.")
-        if threshold_layer not in project_layers:
-            raise ValueError(f"Threshold layer '{threshold_layer.name()}' not found in current project.")
-
-        if not runway_layer.isValid():
-            raise ValueError(f"Runway Layer Centerline '{runway_layer.name()}' is invalid or corrupted.")
-        if not threshold_layer.isValid():
-            raise ValueError(f"Threshold layer '{threshold_layer.name()}' is invalid or corrupted.")
-
-        if runway_layer.featureCount() == 0:
-            raise ValueError(f"Runway Layer Centerline '{runway_layer.name()}' contains no features.")
-        if threshold_layer.featureCount() == 0:
-            raise ValueError(f"Threshold layer '{threshold_layer.name()}' contains no features.")
-
-        use_runway_selected = params.get('use_runway_selected', False)
-        use_threshold_selected = params.get('use_threshold_selected', False)
-        if use_runway_selected and len(runway_layer.selectedFeatures()) == 0:
-            raise ValueError("use_runway_selected=True but no runway features selected.")
-        if use_threshold_selected and len(threshold_layer.selectedFeatures()) == 0:
-            raise ValueError("use_threshold_selected=True but no threshold features selected.")
+        stat = os.stat(script_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._script_code_cache.get(script_path)
+        name = os.path.basename(script_path)
+        if cached is not None and cached[0] == stamp:
+            self._script_cache_hits += 1
+            logger.info(
+                f"Script cache hit: {name} "
+                f"(hits={self._script_cache_hits}, misses={self._script_cache_misses})"
+            )
+            return cached[1]
+
+        with open(script_path, 'r', encoding='utf-8') as f:
+            script_content = f.read()
+        code = compile(script_content, script_path, 'exec')
+        self._script_code_cache[script_path] = (stamp, code)
+        self._script_cache_misses += 1
+        logger.info(
+            f"Script cache {'refresh' if cached is not None else 'miss'}: {name} compiled "
+            f"(hits={self._script_cache_hits}, misses={self._script_cache_misses})"
+        )
+        return code
 
     def execute_script(self, script_path, params=None):
         """Execute a script with dynamic parameters and robust validation."""
@@ -675,6 +999,8 @@ class QOLS:
             if params is None:
                 raise ValueError("No parameters provided to script execution.")
 
+            from .rules import manager as rule_mgr
+
             self._validate_layers_for_execution(params)
 
             runway_layer = params['runway_layer']
@@ -687,8 +1013,7 @@ class QOLS:
             if not os.path.exists(script_path):
                 raise ValueError(f"Script file not found: {script_path}")
 
-            with open(script_path, 'r', encoding='utf-8') as f:
-                script_content = f.read()
+            script_code = self._compile_script(script_path)
 
             specific_params = params.get('specific_params', {})
 
@@ -732,7 +1057,7 @@ class QOLS:
             # BUG-01: success sentinel
             exec_namespace['_script_success'] = False
 
-            exec(script_content, exec_namespace)  # nosec B102 - bundled assets, not user input
+            exec(script_code, exec_namespace)  # nosec B102 - bundled assets, not user input
 
             # CR-08: propagate success flag back into params so on_calculate can read it
             params['_script_success'] = exec_namespace.get('_script_success', False)
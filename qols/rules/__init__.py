@@ -9,11 +9,14 @@ callers transparent access to the module-level helper functions.
 from .manager import (
     RuleManager,
     list_rule_sets,
+    get_rule_set,
     get_active_rule_set_name,
     set_active_rule_set_name,
     get_inner_horizontal_defaults,
     get_conical_defaults,
     reload_rules,
+    watch_rule_files,
+    unwatch_rule_files,
     get_approach_defaults,
     get_transitional_defaults,
     get_ofz_defaults,
@@ -24,11 +27,14 @@ from .manager import (
 __all__ = [
     "RuleManager",
     "list_rule_sets",
+    "get_rule_set",
     "get_active_rule_set_name",
     "set_active_rule_set_name",
     "get_inner_horizontal_defaults",
     "get_conical_defaults",
     "reload_rules",
+    "watch_rule_files",
+    "unwatch_rule_files",
     "get_approach_defaults",
     "get_transitional_defaults",
     "get_ofz_defaults",
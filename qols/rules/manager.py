@@ -15,13 +15,33 @@ JSON schema (per rule file)::
 
 The singleton :data:`_RM` is created at import time and is reset by
 calling :func:`reload_rules`.
+
+Lookups are answered from tables compiled when a rule file is loaded:
+every ``section -> key -> classification -> code`` leaf becomes one
+``(section, key, classification, code)`` entry, scalars are stored under
+``(section, key, None, None)``, and every ``*_pct`` value also gets its
+``*_ratio`` twin, so a ``get_*_defaults`` call is a handful of dict
+lookups. The active rule-set name is read from ``QSettings`` once and
+kept until it is set again or the rule files change.
+:func:`watch_rule_files` reloads just the files edited, added or removed
+on disk.
+
+The registry is two-level, so large rule-file collections stay cheap:
+listing only needs each file's header (``name`` and scalar metadata such
+as ``description``), served from a sidecar index (:data:`_INDEX_FILENAME`)
+while a file's mtime and size are unchanged. A set's body is parsed,
+normalised and compiled when it is looked up, activated or fetched with
+:func:`get_rule_set`; at most :data:`MAX_RESIDENT_RULE_SETS` bodies stay
+parsed, the least recently used inactive ones being evicted.
 """
 import os
 import json
 import logging
-from typing import Dict, Optional, Any
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Any
 
-from qgis.PyQt.QtCore import QSettings
+from qgis.PyQt.QtCore import QFileSystemWatcher, QSettings
 
 _log = logging.getLogger(__name__)
 
@@ -59,6 +79,81 @@ _CONTAINS_RULES = [
 ]
 
 
+# get_*_defaults output, per section: (table key, output key, whether the
+# value is looked up per classification / code or is a section scalar).
+_LOOKUPS: Dict[str, tuple] = {
+    'inner_horizontal': (('height_m', 'height_m', False), ('radius_m', 'radius_m', True)),
+    'conical': (
+        ('height_m', 'height_m', True), ('slope_pct', 'slope_pct', False), ('default_radius_m', 'radius_m', False),
+    ),
+    'approach': tuple((key, key, True) for key in (
+        'width_m', 'threshold_offset_m', 'divergence_ratio', 'L1_m', 'slope1_ratio', 'L2_m', 'slope2_ratio', 'LH_m',
+    )),
+    'transitional': (('slope_ratio', 'slope_ratio', True), ('slope_pct', 'slope_pct', True)),
+    'ofz': (('width_m', 'width_m', True), ('ih_slope_ratio', 'ih_slope_ratio', True),
+            ('ih_slope_pct', 'ih_slope_pct', True)),
+    'inner_approach': tuple((key, key, True) for key in (
+        'width_m', 'distance_from_threshold_m', 'length_m', 'slope_ratio', 'slope_pct',
+    )),
+    'balked_landing': tuple((key, key, True) for key in (
+        'width_m', 'distance_from_threshold_m', 'divergence_ratio', 'divergence_pct', 'slope_ratio', 'slope_pct',
+    )),
+}
+
+_UNSET = object()
+
+# Rule-set bodies kept parsed at once; the active set is never evicted.
+MAX_RESIDENT_RULE_SETS = 4
+
+# Sidecar header index, next to the rule files. Not ``*.json``, so it is
+# never listed as a rule file; safe to delete (it is rebuilt).
+_INDEX_FILENAME = '.rule_index.cache'
+_INDEX_VERSION = 1
+
+
+def _rule_set_header(data: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """``name`` plus the scalar top-level metadata of a rule file."""
+    header = {key: value for key, value in data.items() if not isinstance(value, (dict, list))}
+    header['name'] = name
+    return header
+
+
+def _compile_rule_set(data: Dict[str, Any]) -> Dict[tuple, float]:
+    """Flatten a normalised rule set into its lookup table (see module doc).
+
+    Values that are not numbers are left out, as the lookups used to
+    treat them as missing.
+    """
+    table: Dict[tuple, float] = {}
+
+    def put(section, key, classification, code, raw):
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            return
+        table[(section, key, classification, code)] = value
+        if key.endswith('_pct'):
+            table[(section, key[:-len('_pct')] + '_ratio', classification, code)] = value / 100.0
+
+    for section, entries in data.items():
+        if not isinstance(entries, dict):
+            continue
+        for key, value in entries.items():
+            if not isinstance(value, dict):
+                put(section, key, None, None, value)
+                continue
+            for classification, codes in value.items():
+                if not isinstance(codes, dict):
+                    continue
+                for code, raw in codes.items():
+                    try:
+                        code = int(code)
+                    except (TypeError, ValueError):
+                        continue
+                    put(section, key, classification, code, raw)
+    return table
+
+
 def _normalize_classification_key(raw: str) -> str:
     """Return the canonical CLASS_KEY for *raw*, or *raw* unchanged if unrecognised.
 
@@ -79,51 +174,245 @@ def _normalize_classification_key(raw: str) -> str:
 
 
 class RuleManager:
-    """Loads JSON rule sets from the qols/rules folder and provides lookups.
+    """Lists the JSON rule sets in the qols/rules folder and provides lookups.
+
+    The registry holds each set's header; bodies are parsed on demand and
+    kept in an LRU of ``max_resident`` entries (see the module docstring).
 
     Persistence: stores the active rule set name in QSettings under 'QOLS/ActiveRuleSet'.
     """
 
-    def __init__(self):
+    def __init__(self, max_resident: int = MAX_RESIDENT_RULE_SETS):
         self._rules_loaded = False
+        # rule-set name -> header / source file
         self._registry: Dict[str, Dict[str, Any]] = {}
+        self._sources: Dict[str, str] = {}
+        # file name -> {'mtime_ns', 'size', 'header'}, as in the sidecar index
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # rule-set name -> (normalised data, compiled lookup table), LRU order
+        self._bodies: OrderedDict = OrderedDict()
+        self._max_resident = max(1, int(max_resident))
+        self._active_name: Any = _UNSET
+        self._watcher: Optional[QFileSystemWatcher] = None
+        self._on_change: Optional[Callable[[set], None]] = None
         self._rules_dir = os.path.dirname(__file__)
+        # The plugin warms the registry on a background thread at startup;
+        # loads are serialised and the finished registry swapped in whole,
+        # so GUI-thread readers never see a half-filled one. Bodies have
+        # their own lock, as both threads may parse one.
+        self._load_lock = threading.Lock()
+        self._body_lock = threading.Lock()
 
     def load(self):
-        """Load all JSON rule files from the rules directory into the registry.
+        """Read the header of every JSON rule file in the rules directory.
 
         Idempotent: repeated calls are no-ops until :meth:`reload` is called.
-        Broken JSON files are silently skipped.
+        Broken JSON files are skipped (logged).
         """
         if self._rules_loaded:
             return
-        self._registry.clear()
-        if not os.path.isdir(self._rules_dir):
+        with self._load_lock:
+            if self._rules_loaded:
+                return
+            previous = self._read_index()
+            index: Dict[str, Dict[str, Any]] = {}
+            registry: Dict[str, Dict[str, Any]] = {}
+            sources: Dict[str, str] = {}
+            for fpath in self._rule_files():
+                entry = self._header_entry(fpath, previous.get(os.path.basename(fpath)))
+                if entry is None:
+                    continue
+                index[os.path.basename(fpath)] = entry
+                registry[entry['header']['name']] = entry['header']
+                sources[entry['header']['name']] = fpath
+            if index != previous:
+                self._write_index(index)
+
+            with self._body_lock:
+                self._bodies.clear()
+            self._index = index
+            self._sources = sources
+            self._registry = registry
+            self._active_name = _UNSET
             self._rules_loaded = True
-            return
 
-        for fname in os.listdir(self._rules_dir):
-            if not fname.lower().endswith('.json'):
-                continue
-            fpath = os.path.join(self._rules_dir, fname)
-            try:
-                with open(fpath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                name = data.get('name') or os.path.splitext(fname)[0]
-                # Normalize classification maps if present
-                self._normalize_classification_maps(data)
-                self._registry[name] = data
-            except Exception as e:
-                _log.warning(f"Skipping rule file {fpath!r}: {e}")
-                continue
+    def _rule_files(self) -> list:
+        """Paths of the ``*.json`` files in the rules directory."""
+        if not os.path.isdir(self._rules_dir):
+            return []
+        return [os.path.join(self._rules_dir, fname) for fname in sorted(os.listdir(self._rules_dir))
+                if fname.lower().endswith('.json')]
+
+    def _read_rule_file(self, fpath: str):
+        """``(name, normalised data)`` of one rule file, or ``None`` (logged)
+        if it cannot be read."""
+        try:
+            with open(fpath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            name = data.get('name') or os.path.splitext(os.path.basename(fpath))[0]
+            # Normalize classification maps if present
+            self._normalize_classification_maps(data)
+            return name, data
+        except Exception as e:
+            _log.warning(f"Skipping rule file {fpath!r}: {e}")
+            return None
 
-        self._rules_loaded = True
+    def _header_entry(self, fpath: str, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Index entry for ``fpath``: ``cached`` while the file's mtime and
+        size match it, else read from the file; ``None`` if unreadable."""
+        try:
+            st = os.stat(fpath)
+        except OSError as e:
+            _log.warning(f"Skipping rule file {fpath!r}: {e}")
+            return None
+        if (isinstance(cached, dict) and isinstance(cached.get('header'), dict)
+                and cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size):
+            return cached
+        loaded = self._read_rule_file(fpath)
+        if loaded is None:
+            return None
+        name, data = loaded
+        return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'header': _rule_set_header(data, name)}
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self._rules_dir, _INDEX_FILENAME), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get('version') != _INDEX_VERSION:
+            return {}
+        files = index.get('files')
+        return files if isinstance(files, dict) else {}
+
+    def _write_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        # A read-only rules folder just means headers are re-read next time.
+        path = os.path.join(self._rules_dir, _INDEX_FILENAME)
+        try:
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'version': _INDEX_VERSION, 'files': index}, f)
+            os.replace(path + '.tmp', path)
+        except (OSError, TypeError, ValueError) as e:
+            _log.debug(f"Could not write rule index {path!r}: {e}")
+
+    def _body(self, name: Optional[str]):
+        """``(normalised data, compiled table)`` of rule set ``name``,
+        parsed on first use, or ``None`` if there is no such set."""
+        self.load()
+        active = self._active_name
+        with self._body_lock:
+            body = self._bodies.get(name)
+            if body is not None:
+                self._bodies.move_to_end(name)
+                return body
+            path = self._sources.get(name)
+            loaded = self._read_rule_file(path) if path else None
+            if loaded is None:
+                return None
+            data = loaded[1]
+            body = (data, _compile_rule_set(data))
+            self._bodies[name] = body
+            # Evict the least recently used inactive bodies.
+            for resident in list(self._bodies):
+                if len(self._bodies) <= self._max_resident:
+                    break
+                if resident not in (name, active):
+                    del self._bodies[resident]
+            return body
 
     def reload(self):
         """Force a reload of rule sets from disk."""
-        self._rules_loaded = False
+        with self._load_lock:
+            self._rules_loaded = False
         self.load()
 
+    def reload_files(self, paths: Iterable[str]) -> set:
+        """Re-read only the rule files at ``paths`` — dropping the sets of
+        files that no longer exist — and return the affected rule-set
+        names."""
+        if not self._rules_loaded:
+            self.load()
+            return set(self._registry)
+        changed = set()
+        with self._load_lock:
+            index = dict(self._index)
+            registry = dict(self._registry)
+            sources = dict(self._sources)
+            for path in paths:
+                for name in [name for name, source in sources.items() if source == path]:
+                    del registry[name], sources[name]
+                    changed.add(name)
+                index.pop(os.path.basename(path), None)
+                entry = self._header_entry(path, None) if os.path.isfile(path) else None
+                if entry is not None:
+                    index[os.path.basename(path)] = entry
+                    registry[entry['header']['name']] = entry['header']
+                    sources[entry['header']['name']] = path
+                    changed.add(entry['header']['name'])
+            self._write_index(index)
+            with self._body_lock:
+                for name in changed:
+                    self._bodies.pop(name, None)
+            self._index = index
+            self._sources = sources
+            self._registry = registry
+            self._active_name = _UNSET
+        return changed
+
+    # -- file watching --------------------------------------------------
+
+    def watch(self, on_change: Optional[Callable[[set], None]] = None) -> None:
+        """Reload rule files as they are edited, added or removed on disk,
+        then call ``on_change(names)`` with the affected rule-set names.
+        Must be called on the GUI thread."""
+        self._on_change = on_change
+        if self._watcher is not None:
+            return
+        self._watcher = QFileSystemWatcher()
+        if os.path.isdir(self._rules_dir):
+            self._watcher.addPath(self._rules_dir)
+        files = self._rule_files()
+        if files:
+            self._watcher.addPaths(files)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+    def unwatch(self) -> None:
+        """Stop watching the rule files."""
+        if self._watcher is None:
+            return
+        self._watcher.fileChanged.disconnect(self._on_file_changed)
+        self._watcher.directoryChanged.disconnect(self._on_directory_changed)
+        self._watcher.deleteLater()
+        self._watcher = None
+        self._on_change = None
+
+    def _on_file_changed(self, path: str) -> None:
+        # Editors that save by replacing the file drop it from the watcher.
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+        self._notify(self.reload_files([path]))
+
+    def _on_directory_changed(self, _path: str) -> None:
+        current = set(self._rule_files())
+        watched = set(self._watcher.files())
+        added = current - watched
+        removed = (watched | set(self._sources.values())) - current
+        if added:
+            self._watcher.addPaths(sorted(added))
+        if added or removed:
+            self._notify(self.reload_files(sorted(added | removed)))
+
+    def _notify(self, names: set) -> None:
+        if not names:
+            return
+        _log.info(f"Rule sets reloaded from disk: {', '.join(sorted(names))}")
+        if self._on_change is not None:
+            try:
+                self._on_change(names)
+            except Exception as e:
+                _log.warning(f"Rule file change handler failed: {e}")
+
     def _normalize_classification_maps(self, data: Dict[str, Any]):
         # Ensure classification keys match UI texts when present
         def normalize_map(m: Dict[str, Any]) -> Dict[str, Any]:
@@ -178,30 +467,40 @@ class RuleManager:
                     bl[key] = normalize_map(bl.get(key, {}))
 
     def list_rule_sets(self) -> Dict[str, Dict[str, Any]]:
-        """Return a shallow copy of the loaded rule-set registry.
+        """Return the rule-set registry without parsing any rule-set body.
 
         Returns:
-            Mapping of rule-set name to its raw data dict.
+            Mapping of rule-set name to its header: ``name`` plus the
+            file's scalar metadata (``description``, ...).
             Empty dict if no rule files exist.
         """
         self.load()
-        return dict(self._registry)
+        return {name: dict(header) for name, header in self._registry.items()}
+
+    def get_rule_set(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the normalised body of rule set ``name`` (parsed now if it
+        is not resident), or ``None`` if there is no such set."""
+        body = self._body(name)
+        return body[0] if body is not None else None
 
     def get_active_rule_set_name(self) -> Optional[str]:
         """Return the currently active rule-set name, or ``None`` if unset.
 
-        Reads from ``QSettings`` key ``'QOLS/ActiveRuleSet'``.
-        If exactly one rule set is loaded and no preference is stored,
-        the single rule set is returned implicitly.
+        Reads from ``QSettings`` key ``'QOLS/ActiveRuleSet'`` on first use
+        and caches the answer until :meth:`set_active_rule_set_name` or a
+        rule-file reload. If exactly one rule set is loaded and no
+        preference is stored, the single rule set is returned implicitly.
         """
+        self.load()
+        if self._active_name is not _UNSET:
+            return self._active_name
         try:
             settings = QSettings()
             name = settings.value('QOLS/ActiveRuleSet', type=str)
-            if name and name in self._registry:
-                return name
             # If not set but only one rule set exists, select it implicitly
             if not name and len(self._registry) == 1:
-                return next(iter(self._registry.keys()))
+                name = next(iter(self._registry.keys()))
+            self._active_name = name
             return name
         except Exception as e:
             _log.warning(f"get_active_rule_set_name failed: {e}")
@@ -214,18 +513,34 @@ class RuleManager:
             name: Name of an existing loaded rule set to activate,
                 or ``None`` to clear the preference.
         """
+        self.load()
         settings = QSettings()
         if name and name in self._registry:
             settings.setValue('QOLS/ActiveRuleSet', name)
         else:
             settings.remove('QOLS/ActiveRuleSet')
+        self._active_name = _UNSET
+        if name and name in self._registry:
+            self._body(name)  # parse on activation, not on the first lookup
 
-    def _get_active(self) -> Optional[Dict[str, Any]]:
-        self.load()
+    def _lookup(self, section: str, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
+        """``section``'s defaults for ``rwy_classification`` / ``code`` from
+        the active rule set's compiled table, or ``None`` if it has none."""
         name = self.get_active_rule_set_name()
-        if name:
-            return self._registry.get(name)
-        return None
+        body = self._body(name) if name else None
+        table = body[1] if body is not None else None
+        if not table:
+            return None
+        try:
+            code = int(code)
+        except (TypeError, ValueError):
+            code = None
+        out: Dict[str, float] = {}
+        for key, out_key, per_class in _LOOKUPS[section]:
+            value = table.get((section, key, rwy_classification, code) if per_class else (section, key, None, None))
+            if value is not None:
+                out[out_key] = value
+        return out if out else None
 
     def get_inner_horizontal_defaults(self, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
         """Return inner horizontal surface defaults from the active rule set.
@@ -238,31 +553,7 @@ class RuleManager:
             Dict with a subset of keys ``height_m``, ``radius_m``;
             or ``None`` if no active rule set or no matching entry.
         """
-        rs = self._get_active()
-        if not rs:
-            return None
-        ih = rs.get('inner_horizontal') or {}
-        # Height may be scalar; radius is a classification->code map
-        height = ih.get('height_m')
-        try:
-            height = float(height) if height is not None else None
-        except Exception:
-            height = None
-        radius_map = ih.get('radius_m') or {}
-        class_map = radius_map.get(rwy_classification) or {}
-        radius = class_map.get(str(int(code))) or class_map.get(int(code))
-        try:
-            radius = float(radius) if radius is not None else None
-        except Exception:
-            radius = None
-        if height is None and radius is None:
-            return None
-        result: Dict[str, float] = {}
-        if height is not None:
-            result['height_m'] = height
-        if radius is not None:
-            result['radius_m'] = radius
-        return result if result else None
+        return self._lookup('inner_horizontal', rwy_classification, code)
 
     def get_conical_defaults(self, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
         """Return conical surface defaults from the active rule set.
@@ -273,153 +564,27 @@ class RuleManager:
 
         Returns:
             Dict with a subset of keys ``height_m``, ``slope_pct``,
-            ``radius_m``; or ``None`` if no active rule set or no
-            matching entry.
+            ``radius_m`` (the rule set's rarely given ``default_radius_m``;
+            otherwise the UI computes it); or ``None`` if no active rule
+            set or no matching entry.
         """
-        rs = self._get_active()
-        if not rs:
-            return None
-        con = rs.get('conical') or {}
-        # Height may be classification map; slope_pct may be scalar; radius may be default_radius_m
-        height_map = con.get('height_m') or {}
-        class_map = height_map.get(rwy_classification) or {}
-        height = class_map.get(str(int(code))) or class_map.get(int(code))
-        try:
-            height = float(height) if height is not None else None
-        except Exception:
-            height = None
-        slope_pct = con.get('slope_pct')
-        try:
-            slope_pct = float(slope_pct) if slope_pct is not None else None
-        except Exception:
-            slope_pct = None
-        # If radius explicitly provided, use it (rare); else leave for UI to compute
-        radius = con.get('default_radius_m')
-        try:
-            radius = float(radius) if radius is not None else None
-        except Exception:
-            radius = None
-        if height is None and slope_pct is None and radius is None:
-            return None
-        result: Dict[str, float] = {}
-        if height is not None:
-            result['height_m'] = height
-        if slope_pct is not None:
-            result['slope_pct'] = slope_pct
-        if radius is not None:
-            result['radius_m'] = radius
-        return result if result else None
-
-    def _class_code_lookup(self, mapping: Dict[str, Any], rwy_classification: str, code: int) -> Optional[float]:
-        try:
-            class_map = mapping.get(rwy_classification) or {}
-            # Use explicit None check — do NOT use `or` here because 0 is a
-            # valid value and would be treated as falsy, silently dropping it.
-            val = class_map.get(str(int(code)))
-            if val is None:
-                val = class_map.get(int(code))
-            return float(val) if val is not None else None
-        except Exception as e:
-            _log.warning(f"_class_code_lookup failed for {rwy_classification!r} code={code}: {e}")
-            return None
+        return self._lookup('conical', rwy_classification, code)
 
     def get_approach_defaults(self, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
-        rs = self._get_active()
-        if not rs:
-            return None
-        app = rs.get('approach') or {}
-        if not isinstance(app, dict):
-            return None
-        keys = ['width_m', 'threshold_offset_m', 'divergence_pct', 'L1_m', 'slope1_pct', 'L2_m', 'slope2_pct', 'LH_m']
-        out: Dict[str, float] = {}
-        for k in keys:
-            m = app.get(k)
-            if isinstance(m, dict):
-                v = self._class_code_lookup(m, rwy_classification, code)
-                if v is not None:
-                    # Convert percentages to ratio for divergence and slopes where applicable
-                    if k in ['divergence_pct', 'slope1_pct', 'slope2_pct']:
-                        out[k.replace('_pct', '_ratio')] = v / 100.0
-                    else:
-                        out[k] = v
-        return out if out else None
+        # Divergence and slopes come back as ratios (*_ratio), not percentages
+        return self._lookup('approach', rwy_classification, code)
 
     def get_transitional_defaults(self, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
-        rs = self._get_active()
-        if not rs:
-            return None
-        trn = rs.get('transitional') or {}
-        if not isinstance(trn, dict):
-            return None
-        slope_pct_map = trn.get('slope_pct') or {}
-        slope = self._class_code_lookup(slope_pct_map, rwy_classification, code)
-        if slope is None:
-            return None
-        return {'slope_ratio': slope / 100.0, 'slope_pct': slope}
+        return self._lookup('transitional', rwy_classification, code)
 
     def get_ofz_defaults(self, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
-        rs = self._get_active()
-        if not rs:
-            return None
-        ofz = rs.get('ofz') or {}
-        if not isinstance(ofz, dict):
-            return None
-        width = self._class_code_lookup(ofz.get('width_m', {}), rwy_classification, code)
-        ihs = self._class_code_lookup(ofz.get('ih_slope_pct', {}), rwy_classification, code)
-        out: Dict[str, float] = {}
-        if width is not None:
-            out['width_m'] = width
-        if ihs is not None:
-            out['ih_slope_ratio'] = ihs / 100.0
-            out['ih_slope_pct'] = ihs
-        return out if out else None
+        return self._lookup('ofz', rwy_classification, code)
 
     def get_inner_approach_defaults(self, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
-        rs = self._get_active()
-        if not rs:
-            return None
-        ia = rs.get('inner_approach') or {}
-        if not isinstance(ia, dict):
-            return None
-        width = self._class_code_lookup(ia.get('width_m', {}), rwy_classification, code)
-        dist = self._class_code_lookup(ia.get('distance_from_threshold_m', {}), rwy_classification, code)
-        length = self._class_code_lookup(ia.get('length_m', {}), rwy_classification, code)
-        slope = self._class_code_lookup(ia.get('slope_pct', {}), rwy_classification, code)
-        out: Dict[str, float] = {}
-        if width is not None:
-            out['width_m'] = width
-        if dist is not None:
-            out['distance_from_threshold_m'] = dist
-        if length is not None:
-            out['length_m'] = length
-        if slope is not None:
-            out['slope_ratio'] = slope / 100.0
-            out['slope_pct'] = slope
-        return out if out else None
+        return self._lookup('inner_approach', rwy_classification, code)
 
     def get_balked_landing_defaults(self, rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
-        rs = self._get_active()
-        if not rs:
-            return None
-        bl = rs.get('balked_landing') or {}
-        if not isinstance(bl, dict):
-            return None
-        width = self._class_code_lookup(bl.get('width_m', {}), rwy_classification, code)
-        dist = self._class_code_lookup(bl.get('distance_from_threshold_m', {}), rwy_classification, code)
-        div = self._class_code_lookup(bl.get('divergence_pct', {}), rwy_classification, code)
-        slope = self._class_code_lookup(bl.get('slope_pct', {}), rwy_classification, code)
-        out: Dict[str, float] = {}
-        if width is not None:
-            out['width_m'] = width
-        if dist is not None:
-            out['distance_from_threshold_m'] = dist
-        if div is not None:
-            out['divergence_ratio'] = div / 100.0
-            out['divergence_pct'] = div
-        if slope is not None:
-            out['slope_ratio'] = slope / 100.0
-            out['slope_pct'] = slope
-        return out if out else None
+        return self._lookup('balked_landing', rwy_classification, code)
 
 
 # Singleton instance
@@ -430,6 +595,10 @@ def list_rule_sets() -> Dict[str, Dict[str, Any]]:
     return _RM.list_rule_sets()
 
 
+def get_rule_set(name: str) -> Optional[Dict[str, Any]]:
+    return _RM.get_rule_set(name)
+
+
 def get_active_rule_set_name() -> Optional[str]:
     return _RM.get_active_rule_set_name()
 
@@ -450,6 +619,14 @@ def reload_rules():
     _RM.reload()
 
 
+def watch_rule_files(on_change: Optional[Callable[[set], None]] = None):
+    _RM.watch(on_change)
+
+
+def unwatch_rule_files():
+    _RM.unwatch()
+
+
 def get_approach_defaults(rwy_classification: str, code: int) -> Optional[Dict[str, float]]:
     return _RM.get_approach_defaults(rwy_classification, code)
 
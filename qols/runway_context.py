@@ -0,0 +1,292 @@
+"""qols/runway_context.py — the runway / threshold selection resolved once
+per edit.
+
+Every consumer used to walk the layers itself: each script re-read
+``selectedFeatures()`` (or ``list(getFeatures())``) and normalised the
+centerline, the dockwidget validators counted selections, and
+``direction_marker.build_marker_geometry`` did all of it again on every
+canvas zoom. This module keeps a few small caches instead:
+
+* :func:`layer_features` — the features a layer contributes (its
+  selection, or every feature when nothing is selected and a selection is
+  not required), keyed on (layer id, selected feature ids);
+* :func:`runway_context` — a :class:`RunwayContext` with the normalised
+  centerline, both ends, both azimuths and the matched threshold for one
+  (runway layer, threshold layer, selections, direction).
+
+Features are fetched geometry-only (no attributes), and the threshold
+match goes through a :class:`PointIndex` — a ``QgsSpatialIndex``
+``nearestNeighbor`` lookup over the cached points — instead of a ``min()``
+that calls ``asPoint()`` on every feature, so a national threshold layer
+of thousands of points is read and indexed once per edit rather than
+walked on every Calculate and marker update.
+
+The first time a layer is read it is handed to
+:func:`qols.layer_access.watch_layer`, whose ``geometryChanged``,
+``selectionChanged``, ``featureAdded``, ``featureDeleted`` and
+``dataChanged`` connections drop every entry that read from it, so an
+edit costs one re-resolution no matter how many scripts, validators and
+markers look at the runway afterwards. Every read first calls
+:func:`~qols.layer_access.revalidate_layer`, which catches edits made
+straight through the data provider. Layers are read and edited on the GUI
+thread, so no locking is needed.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from .direction_marker import resolve_direction_azimuth
+from .engine.geometry import Point2
+from .engine.qgis_adapter import polyline_points
+from .engine.runway import RunwayGeometry
+from .layer_access import add_invalidation_listener, geometry_request, revalidate_layer, watch_layer
+
+__all__ = [
+    "RunwayContext",
+    "PointIndex",
+    "layer_features",
+    "point_index",
+    "runway_context",
+    "invalidate_layer",
+    "clear_runway_contexts",
+]
+
+# Contexts kept; one per (selection, direction) pair the user toggles
+# between, so a handful is plenty.
+CONTEXT_CACHE_SIZE = 32
+
+# Point sets smaller than this are matched with a NumPy argmin; building a
+# QgsSpatialIndex only pays off above it.
+SPATIAL_INDEX_MIN_POINTS = 64
+
+# (layer id, selected ids or None for "every feature") -> tuple of features
+_feature_cache: dict = {}
+# same key -> PointIndex
+_point_indexes: dict = {}
+# context key -> RunwayContext
+_contexts: "OrderedDict[tuple, RunwayContext]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class RunwayContext:
+    """The runway a surface is built on, as the current selection and
+    ``direction`` (0 = Start to End, -1 = End to Start) resolve it.
+
+    ``azimuth`` points from the far end to the near end — the way the
+    surfaces extend and the direction marker points (#113);
+    ``reverse_azimuth`` is the opposite bearing. ``anchor_threshold`` is
+    the lone threshold, or the one closest to ``near_end`` (#132); it is
+    ``None`` when no threshold layer was given.
+    """
+
+    key: tuple
+    runway_features: tuple
+    threshold_features: tuple
+    runway: RunwayGeometry
+    direction: int
+    near_end: Point2
+    far_end: Point2
+    azimuth: float
+    reverse_azimuth: float
+    anchor_threshold: Optional[Point2]
+
+    @property
+    def centerline(self) -> tuple[Point2, ...]:
+        return self.runway.centerline
+
+    @property
+    def thresholds(self) -> tuple[Point2, ...]:
+        return self.runway.thresholds
+
+
+class PointIndex:
+    """Nearest-point lookup over one point layer's cached features.
+
+    ``coords`` keeps the read order of the features (empty geometries
+    skipped), so ties go to the first point, as ``RunwayGeometry`` and
+    the scripts always resolved them.
+    """
+
+    def __init__(self, features) -> None:
+        fids, coords = [], []
+        for feat in features:
+            geom = feat.geometry()
+            if geom is None or geom.isEmpty():
+                continue
+            pt = geom.asPoint()
+            fids.append(feat.id())
+            coords.append((pt.x(), pt.y()))
+        self.coords = np.array(coords, dtype=float).reshape(-1, 2)
+        self.coords.flags.writeable = False
+        self._rows = {fid: row for row, fid in enumerate(fids)}
+        self._index: Any = None
+        if len(fids) >= SPATIAL_INDEX_MIN_POINTS:
+            from qgis.core import QgsRectangle, QgsSpatialIndex
+
+            self._index = QgsSpatialIndex()
+            for fid, (x, y) in zip(fids, coords):
+                self._index.addFeature(fid, QgsRectangle(x, y, x, y))
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def points(self) -> list[Point2]:
+        return [(x, y) for x, y in self.coords.tolist()]
+
+    def nearest(self, pt) -> Optional[Point2]:
+        """The point closest to ``pt``, or ``None`` for an empty set."""
+        if not len(self.coords):
+            return None
+        if self._index is None:
+            rows = np.arange(len(self.coords))
+        else:
+            from qgis.core import QgsPointXY
+
+            # Equidistant neighbours all come back; keep the earliest.
+            rows = np.array(sorted(self._rows[fid] for fid in
+                                   self._index.nearestNeighbor(QgsPointXY(pt[0], pt[1]), 1)))
+        xy = self.coords[rows]
+        d2 = (xy[:, 0] - pt[0]) ** 2 + (xy[:, 1] - pt[1]) ** 2
+        x, y = xy[int(np.argmin(d2))]
+        return (float(x), float(y))
+
+    def anchor(self, near_end) -> Optional[Point2]:
+        """A lone point as-is, otherwise the one nearest ``near_end`` (#132)."""
+        if len(self.coords) == 1:
+            x, y = self.coords[0]
+            return (float(x), float(y))
+        return self.nearest(near_end)
+
+
+def _selection_key(layer, use_selected: bool, what: str):
+    """Selected feature ids (sorted), or ``None`` for "every feature"."""
+    selected = layer.selectedFeatureIds()
+    if selected:
+        return tuple(sorted(selected))
+    if use_selected:
+        raise Exception(f"No {what} features selected. Please select {what} features.")
+    return None
+
+
+def _read_features(layer, key, what: str) -> tuple:
+    cache_key = (layer.id(), key)
+    features = _feature_cache.get(cache_key)
+    if features is None:
+        request = geometry_request()
+        features = tuple(layer.getSelectedFeatures(request) if key is not None else layer.getFeatures(request))
+        if not features:
+            raise Exception(f"No features found in {what}.")
+        watch_layer(layer)
+        _feature_cache[cache_key] = features
+    return features
+
+
+def layer_features(layer, use_selected: bool, what: str) -> tuple:
+    """The layer's selected features, or every feature when nothing is
+    selected — unless ``use_selected`` demands a selection. Geometry only
+    (no attributes); cached until the layer's geometry, features or
+    selection change."""
+    if layer is None:
+        raise Exception(f"No {what} provided. Please select a {what} from the UI.")
+    revalidate_layer(layer)
+    return _read_features(layer, _selection_key(layer, use_selected, what), what)
+
+
+def _point_index(layer, key, what: str) -> PointIndex:
+    cache_key = (layer.id(), key)
+    index = _point_indexes.get(cache_key)
+    if index is None:
+        index = _point_indexes[cache_key] = PointIndex(_read_features(layer, key, what))
+    return index
+
+
+def point_index(layer, use_selected: bool, what: str) -> PointIndex:
+    """:class:`PointIndex` over :func:`layer_features` of a point layer
+    (thresholds, ARPs), rebuilt only when the layer changes."""
+    if layer is None:
+        raise Exception(f"No {what} provided. Please select a {what} from the UI.")
+    revalidate_layer(layer)
+    return _point_index(layer, _selection_key(layer, use_selected, what), what)
+
+
+def runway_context(runway_layer, threshold_layer, direction: int = 0, use_runway_selected: bool = False,
+                   use_threshold_selected: bool = False, iface=None) -> RunwayContext:
+    """The :class:`RunwayContext` for the first runway feature of the
+    current selection and every threshold feature, built on first use and
+    reused until either layer changes. ``threshold_layer`` may be ``None``
+    for surfaces that do not need thresholds. Raises with the scripts'
+    messages when a layer or selection is missing; ``iface`` only receives
+    the MultiLineString notice when the context is first built."""
+    if runway_layer is None:
+        raise Exception("No Runway Layer Centerline provided. Please select a Runway Layer Centerline from the UI.")
+    direction = int(direction)
+    revalidate_layer(runway_layer)
+    if threshold_layer is not None:
+        revalidate_layer(threshold_layer)
+    runway_key = _selection_key(runway_layer, use_runway_selected, "Runway Layer Centerline")
+    threshold_key = None
+    if threshold_layer is not None:
+        threshold_key = _selection_key(threshold_layer, use_threshold_selected, "threshold layer")
+    key = (
+        runway_layer.id(), runway_key,
+        threshold_layer.id() if threshold_layer is not None else None, threshold_key,
+        direction,
+    )
+    context = _contexts.get(key)
+    if context is not None:
+        _contexts.move_to_end(key)
+        return context
+
+    runway_features = _read_features(runway_layer, runway_key, "Runway Layer Centerline")
+    threshold_features = ()
+    thresholds = None
+    if threshold_layer is not None:
+        threshold_features = _read_features(threshold_layer, threshold_key, "threshold layer")
+        thresholds = _point_index(threshold_layer, threshold_key, "threshold layer")
+    geometry = runway_features[0].geometry()
+    runway = RunwayGeometry(
+        centerline=polyline_points(geometry, iface),
+        thresholds=thresholds.points() if thresholds is not None else (),
+        length=geometry.length(),
+    )
+    near_end, far_end, azimuth = resolve_direction_azimuth(list(runway.centerline), direction)
+    context = RunwayContext(
+        key=key,
+        runway_features=runway_features,
+        threshold_features=threshold_features,
+        runway=runway,
+        direction=direction,
+        near_end=near_end,
+        far_end=far_end,
+        azimuth=azimuth,
+        reverse_azimuth=(azimuth + 180.0) % 360.0,
+        anchor_threshold=thresholds.anchor(near_end) if thresholds is not None else None,
+    )
+    _contexts[key] = context
+    while len(_contexts) > CONTEXT_CACHE_SIZE:
+        _contexts.popitem(last=False)
+    return context
+
+
+def invalidate_layer(layer_id: str) -> None:
+    """Drop every cached feature list, point index and context that read
+    ``layer_id``."""
+    for cache in (_feature_cache, _point_indexes):
+        for key in [key for key in cache if key[0] == layer_id]:
+            del cache[key]
+    for key in [key for key in _contexts if layer_id in (key[0], key[2])]:
+        del _contexts[key]
+
+
+def clear_runway_contexts() -> None:
+    """Empty every cache (plugin unload)."""
+    _feature_cache.clear()
+    _point_indexes.clear()
+    _contexts.clear()
+
+
+add_invalidation_listener(invalidate_layer)
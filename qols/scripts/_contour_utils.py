@@ -2,6 +2,10 @@
 _contour_utils.py — Pure-Python contour helpers for qOLS stepped surfaces.
 
 No QGIS dependency: safe to import in unit tests without a QGIS context.
+:func:`slice_patches` is the one NumPy-backed helper: it slices any batch
+of planar patches at every level at once and chains the pieces into
+polylines, so any surface — old or New OLS — gets contours without a
+bespoke spec function.
 
 Usage inside exec()-based scripts (approach-surface-UTM.py, take-off-surface_UTM.py):
     import importlib.util as _ilu, os as _os
@@ -19,7 +23,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from math import ceil, floor
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Crossings closer than this (metres) are the same chain vertex — the
+# point where one patch's contour piece meets its neighbour's.
+CHAIN_TOLERANCE = 1e-4
 
 
 # ---------------------------------------------------------------------------
@@ -285,6 +295,192 @@ def contour_specs_for_polygon_slice(
     return specs
 
 
+# ---------------------------------------------------------------------------
+# Batch slicing of planar patches (any surface)
+# ---------------------------------------------------------------------------
+
+def _patch_edges(patches: Sequence[Sequence]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(starts, ends, patch_ids)`` of every ring edge of every patch;
+    rings may be open or closed (a repeated last vertex adds a zero-length
+    edge, which never crosses a level)."""
+    starts, ends, ids = [], [], []
+    for index, rings in enumerate(patches):
+        for ring in rings:
+            ring = np.asarray(ring, dtype=float)[:, :3]
+            if len(ring) < 3:
+                continue
+            starts.append(ring)
+            ends.append(np.roll(ring, -1, axis=0))
+            ids.append(np.full(len(ring), index))
+    if not starts:
+        empty = np.empty((0, 3))
+        return empty, empty, np.empty(0, dtype=int)
+    return np.concatenate(starts), np.concatenate(ends), np.concatenate(ids)
+
+
+def slice_segments(
+    patches: Sequence[Sequence],
+    elevations: Sequence[float],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Slice every patch at every level in one vectorised pass.
+
+    ``patches`` holds one entry per patch: its rings of ``(x, y, z)``
+    vertices (exterior first, then holes). Each patch must be planar —
+    or, like the Transitional ruled patches (#155), cross each level at
+    most twice — so that a level's crossings on one patch are collinear.
+
+    Edges follow the :func:`contour_specs_for_polygon_slice` convention:
+    an edge crosses ``level`` when ``min(za, zb) < level <= max(za, zb)``,
+    so flat edges never cross and a level landing on a shared vertex is
+    reported once. Every edge is interpolated from its lower end, so two
+    patches sharing an edge produce the same crossing point.
+
+    A patch's crossings at one level are ordered along the level line and
+    paired up (even-odd), which also handles holes; levels with an odd
+    number of crossings on a patch (a degenerate ring) are dropped.
+
+    Args:
+        patches:    Rings per patch, as described above.
+        elevations: Target levels (from :func:`contour_elevations`).
+
+    Returns:
+        ``(levels, starts, ends)``: the level index (into ``elevations``)
+        of each segment and its ``(K, 2)`` end points.
+    """
+    levels = np.asarray(elevations, dtype=float)
+    empty = (np.empty(0, dtype=int), np.empty((0, 2)), np.empty((0, 2)))
+    if levels.size == 0:
+        return empty
+    order = np.argsort(levels, kind="stable")
+    sorted_levels = levels[order]
+
+    a, b, patch_ids = _patch_edges(patches)
+    swap = a[:, 2] > b[:, 2]
+    lo = np.where(swap[:, None], b, a)
+    hi = np.where(swap[:, None], a, b)
+    sloped = lo[:, 2] < hi[:, 2]
+    lo, hi, patch_ids = lo[sloped], hi[sloped], patch_ids[sloped]
+
+    # Levels in (lo_z, hi_z] are a contiguous run of the sorted levels.
+    first = np.searchsorted(sorted_levels, lo[:, 2], side="right")
+    last = np.searchsorted(sorted_levels, hi[:, 2], side="right")
+    counts = last - first
+    total = int(counts.sum())
+    if total == 0:
+        return empty
+    edge = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    rank = first[edge] + np.arange(total) - offsets[edge]
+    level_index = order[rank]
+
+    t = (sorted_levels[rank] - lo[edge, 2]) / (hi[edge, 2] - lo[edge, 2])
+    points = lo[edge, :2] + t[:, None] * (hi[edge, :2] - lo[edge, :2])
+    patch = patch_ids[edge]
+
+    # Group crossings by (level, patch).
+    grouping = np.lexsort((patch, level_index))
+    level_index, patch, points = level_index[grouping], patch[grouping], points[grouping]
+    new_group = np.ones(total, dtype=bool)
+    new_group[1:] = (level_index[1:] != level_index[:-1]) | (patch[1:] != patch[:-1])
+    group = np.cumsum(new_group) - 1
+    group_start = np.flatnonzero(new_group)
+
+    # Order each group along its (collinear) crossings: project onto the
+    # direction from the group's first crossing to its farthest one.
+    rel = points - points[group_start[group]]
+    dist2 = (rel ** 2).sum(axis=1)
+    far = np.lexsort((-dist2, group))
+    far_first = far[np.flatnonzero(np.r_[True, group[far][1:] != group[far][:-1]])]
+    direction = rel[far_first][group]
+    along = (rel * direction).sum(axis=1)
+    ordering = np.lexsort((along, group))
+    group, level_index, points = group[ordering], level_index[ordering], points[ordering]
+
+    sizes = np.bincount(group)
+    within = np.arange(total) - group_start[group]
+    pair_start = (within % 2 == 0) & (sizes[group] % 2 == 0)
+    starts = np.flatnonzero(pair_start)
+    return level_index[starts], points[starts], points[starts + 1]
+
+
+def chain_segments(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    tolerance: float = CHAIN_TOLERANCE,
+) -> List[np.ndarray]:
+    """Join segments sharing end points (within ``tolerance``) into
+    polylines; a chain that comes back to its start is returned closed.
+
+    Args:
+        starts, ends: ``(K, 2)`` segment end points, all at one level.
+        tolerance:    Snapping distance for matching end points.
+
+    Returns:
+        List of ``(N, 2)`` vertex arrays, one per polyline.
+    """
+    if len(starts) == 0:
+        return []
+    keys_a = [tuple(k) for k in np.round(starts / tolerance).astype(np.int64).tolist()]
+    keys_b = [tuple(k) for k in np.round(ends / tolerance).astype(np.int64).tolist()]
+    at_point: dict = {}
+    for i, (ka, kb) in enumerate(zip(keys_a, keys_b)):
+        at_point.setdefault(ka, []).append(i)
+        at_point.setdefault(kb, []).append(i)
+
+    used = np.zeros(len(starts), dtype=bool)
+
+    def walk(key):
+        """Follow unused segments from ``key``; returns the vertices reached."""
+        out = []
+        while True:
+            nxt = next((j for j in at_point[key] if not used[j]), None)
+            if nxt is None:
+                return out
+            used[nxt] = True
+            if keys_a[nxt] == key:
+                out.append(ends[nxt])
+                key = keys_b[nxt]
+            else:
+                out.append(starts[nxt])
+                key = keys_a[nxt]
+
+    lines = []
+    for i in range(len(starts)):
+        if used[i]:
+            continue
+        used[i] = True
+        forward = walk(keys_b[i])
+        backward = walk(keys_a[i])
+        vertices = [*reversed(backward), starts[i], ends[i], *forward]
+        lines.append(np.asarray(vertices))
+    return lines
+
+
+def slice_patches(
+    patches: Sequence[Sequence],
+    elevations: Sequence[float],
+    tolerance: float = CHAIN_TOLERANCE,
+) -> List[Tuple[float, np.ndarray]]:
+    """Contour polylines of a batch of planar patches: :func:`slice_segments`
+    then :func:`chain_segments` per level.
+
+    Returns:
+        ``(elevation, (N, 2) vertices)`` pairs in elevation order.
+    """
+    level_index, starts, ends = slice_segments(patches, elevations)
+    contours: List[Tuple[float, np.ndarray]] = []
+    if len(level_index) == 0:
+        return contours
+    order = np.argsort(level_index, kind="stable")
+    level_index, starts, ends = level_index[order], starts[order], ends[order]
+    bounds = np.flatnonzero(np.r_[True, level_index[1:] != level_index[:-1], True])
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        elevation = float(elevations[level_index[lo]])
+        for line in chain_segments(starts[lo:hi], ends[lo:hi], tolerance):
+            contours.append((elevation, line))
+    return contours
+
+
 # ---------------------------------------------------------------------------
 # Conical Surface (#126) — radial contour helper
 # ---------------------------------------------------------------------------
@@ -342,6 +538,10 @@ def apply_contour_style(layer, script_file: str, label_font_size: float = None)
       * Red solid line, 0.5 mm
       * Plain label from the ``surface_elevation`` field
 
+    The QML is parsed once per session (again only when its modification
+    time changes) by :mod:`qols.layer_styles`; each layer gets a clone of
+    the cached renderer and labeling.
+
     Args:
         layer:            A ``QgsVectorLayer`` (LineStringZ) for the contour layer.
         script_file:      ``__file__`` of the calling script.  Used to locate the
@@ -357,48 +557,12 @@ def apply_contour_style(layer, script_file: str, label_font_size: float = None)
     """
     import os
 
+    from qols.layer_styles import apply_contour_style as _apply_cached  # noqa: PLC0415 — needs QGIS
+
     # styles/ lives at <plugin_root>/styles/ — one level above scripts/
     styles_path = os.path.join(
         os.path.dirname(os.path.dirname(script_file)),
         'styles',
         'contour_styling.qml',
     )
-
-    applied_qml = False
-    if os.path.isfile(styles_path):
-        try:
-            _msg, success = layer.loadNamedStyle(styles_path)
-            if success:
-                applied_qml = True
-        except Exception:  # nosec B110 - falls through to the hardcoded fallback style below, nothing lost
-            pass
-
-    if not applied_qml:
-        # Fallback: hardcoded style (previous behaviour, always safe)
-        from qgis.core import (  # noqa: PLC0415 — intentional late import (no QGIS at test time)
-            QgsLineSymbol,
-            QgsSingleSymbolRenderer,
-            QgsPalLayerSettings,
-            QgsVectorLayerSimpleLabeling,
-        )
-        _sym = QgsLineSymbol.createSimple({'color': 'red', 'width': '0.5'})
-        layer.setRenderer(QgsSingleSymbolRenderer(_sym))
-        _pal = QgsPalLayerSettings()
-        _pal.fieldName = 'surface_elevation'
-        _pal.enabled = True
-        layer.setLabeling(QgsVectorLayerSimpleLabeling(_pal))
-        layer.setLabelsEnabled(True)
-
-    if label_font_size is not None:
-        from qgis.core import QgsVectorLayerSimpleLabeling  # noqa: PLC0415
-        labeling = layer.labeling()
-        if labeling is not None:
-            settings = labeling.settings()
-            text_format = settings.format()
-            text_format.setSize(label_font_size)
-            settings.setFormat(text_format)
-            layer.setLabeling(QgsVectorLayerSimpleLabeling(settings))
-            layer.setLabelsEnabled(True)
-
-    layer.triggerRepaint()
-    return applied_qml
+    return _apply_cached(layer, label_font_size, path=styles_path)
@@ -11,375 +11,93 @@ from qgis.core import *
 from qgis.PyQt.QtCore import *
 from qgis.PyQt.QtGui import *
 from qgis.gui import *
-from math import sqrt, hypot
-import json
-
-
-def _normalize_polyline_points(geometry: 'QgsGeometry', iface=None):
-    """Return a list of QgsPoint representing a single polyline.
-    - Accepts LineString or MultiLineString. For MultiLineString, uses the longest part.
-    - Raises on empty or non-line geometries.
-    - Optionally posts an info message to the message bar when normalizing.
-    """
-    try:
-        if geometry is None or geometry.isEmpty():
-            raise Exception("Empty geometry provided for runway centerline.")
-
-        if geometry.isMultipart():
-            parts = geometry.asMultiPolyline()
-            if not parts:
-                raise Exception("Empty MultiLineString geometry.")
-
-            def part_length(pts):
-                if not pts or len(pts) < 2:
-                    return 0.0
-                total = 0.0
-                for i in range(1, len(pts)):
-                    dx = pts[i].x() - pts[i-1].x()
-                    dy = pts[i].y() - pts[i-1].y()
-                    total += sqrt(dx*dx + dy*dy)
-                return total
-
-            longest = max(parts, key=part_length)
-            if iface and len(parts) > 1:
-                iface.messageBar().pushMessage(
-                    "QOLS Info",
-                    "MultiLineString detected; using longest part as centerline.",
-                    level=MSG_INFO
-                )
-            return [QgsPoint(p) for p in longest]
-
-        # Single part line
-        poly = geometry.asPolyline()
-        if poly and len(poly) >= 2:
-            return [QgsPoint(p) for p in poly]
-        else:
-            # Try curves gracefully if present
-            try:
-                curve = geometry.constGet()
-                if hasattr(curve, 'points'):
-                    pts = curve.points()
-                    if pts and len(pts) >= 2:
-                        return [QgsPoint(p) for p in pts]
-            except Exception:  # nosec B110 - falls through to the raise below, nothing lost
-                pass
-            raise Exception("Line geometry cannot be converted to a polyline. Only single line or curve types are permitted.")
-    except Exception as e:
-        raise
+from qols.engine import ApproachBuilder, build_surface
+from qols.engine.qgis_adapter import add_surface_features, create_contour_layer, create_surface_layer
+from qols.runway_context import runway_context
 
 
 """Parameter extraction
-Prefers pythonic, UI-aligned names with backward-compatible fallbacks to legacy keys.
+Prefers pythonic, UI-aligned names with backward-compatible fallbacks to
+legacy keys (code, widthApp, Z0, ZE, ARPH, L1, L2, LH, s, slope1, slope2,
+divergence, thr_offset) — see ApproachParams.
 """
-try:
-    # New pythonic names (preferred), with fallbacks to legacy keys
-    runway_code = globals().get('runway_code', globals().get('code', 4))
-    rwy_classification = globals().get('rwy_classification', globals().get('rwyClassification', 'Precision Approach CAT I'))
-    approach_width_m = globals().get('approach_width_m', globals().get('widthApp', 280))
-    start_elevation_m = globals().get('start_elevation_m', globals().get('Z0', 21.7))
-    end_elevation_m = globals().get('end_elevation_m', globals().get('ZE', 21.7))
-    arp_elevation_m = globals().get('arp_elevation_m', globals().get('ARPH', 29.3))
-    first_section_length_m = globals().get('first_section_length_m', globals().get('L1', 3000))
-    second_section_length_m = globals().get('second_section_length_m', globals().get('L2', 3600))
-    horizontal_section_length_m = globals().get('horizontal_section_length_m', globals().get('LH', 8400))
-
-    # Direction parameter: 0 for start→end, -1 for end→start
-    direction = globals().get('direction', globals().get('s', 0))
-
-    # Layer parameters
-    runway_layer = globals().get('runway_layer', None)
-    threshold_layer = globals().get('threshold_layer', None)
-    use_runway_selected = globals().get('use_runway_selected', True)
-    use_threshold_selected = globals().get('use_threshold_selected', True)
-
-    print(
-        f"QOLS: Using parameters - runway_code: {runway_code}, rwy_classification: {rwy_classification}, "
-        f"approach_width_m: {approach_width_m}, start_elevation_m: {start_elevation_m}, end_elevation_m: {end_elevation_m}"
-    )
-    print(f"QOLS: Direction: {direction}, Use selected runway: {use_runway_selected}, Use selected threshold: {use_threshold_selected}")
-
-except Exception as e:
-    print(f"QOLS: Error getting parameters, using defaults: {e}")
-    # Sensible defaults
-    runway_code = 4
-    rwy_classification = 'Precision Approach CAT I'
-    approach_width_m = 280
-    start_elevation_m = 21.7
-    end_elevation_m = 21.7
-    arp_elevation_m = 29.3
-    first_section_length_m = 3000
-    second_section_length_m = 3600
-    horizontal_section_length_m = 8400
-    direction = 0
-    runway_layer = None
-    threshold_layer = None
-    use_runway_selected = True
-    use_threshold_selected = True
-
-# Calculate derived parameters
-zih_elevation_m = 45 + arp_elevation_m
-
-print(f"QOLS: Final derived - zih_elevation_m: {zih_elevation_m}")
+builder = ApproachBuilder()
+params = builder.params_from_namespace(globals())
+runway_layer = globals().get('runway_layer', None)
+threshold_layer = globals().get('threshold_layer', None)
+use_runway_selected = globals().get('use_runway_selected', True)
+use_threshold_selected = globals().get('use_threshold_selected', True)
+direction = params.direction
+
+print(
+    f"QOLS: Using parameters - runway_code: {params.runway_code}, rwy_classification: {params.rwy_classification}, "
+    f"approach_width_m: {params.approach_width_m}, start_elevation_m: {params.start_elevation_m}, "
+    f"end_elevation_m: {params.end_elevation_m}"
+)
+print(f"QOLS: Direction: {direction}, Use selected runway: {use_runway_selected}, Use selected threshold: {use_threshold_selected}")
 print(f"QOLS: Direction interpretation - direction={direction} means {'End to Start' if direction == -1 else 'Start to End'}")
 
 map_srid = iface.mapCanvas().mapSettings().destinationCrs().authid()
 
-# ENHANCED LAYER SELECTION - Use layers from UI
-try:
-    if runway_layer is not None:
-        print(f"QOLS: Using Runway Layer Centerline from UI: {runway_layer.name()}")
-
-        if use_runway_selected:
-            # Require explicit feature selection
-            selection = runway_layer.selectedFeatures()
-            if not selection:
-                raise Exception("No runway features selected. Please select runway features.")
-            print(f"QOLS: Using {len(selection)} selected runway features")
-        else:
-            # If user has a selection, prefer it even if the checkbox is off; otherwise use first feature
-            selection = runway_layer.selectedFeatures()
-            if selection:
-                print(f"QOLS: Selection detected (checkbox off) — using {len(selection)} selected runway features")
-            else:
-                selection = list(runway_layer.getFeatures())
-                if not selection:
-                    raise Exception("No features found in Runway Layer Centerline.")
-                print(f"QOLS: Using first feature from layer (selection disabled and no active selection)")
-
-        print(f"QOLS: Processing {len(selection)} runway features")
-        rwy_geom = selection[0].geometry()
-        rwy_length = rwy_geom.length()
-        rwy_slope = (start_elevation_m - end_elevation_m) / rwy_length if rwy_length > 0 else 0
-        print(f"QOLS: Runway length: {rwy_length}, slope: {rwy_slope}")
-
-    else:
-        # No fallback - require explicit Runway Layer Centerline selection
-        raise Exception("No Runway Layer Centerline provided. Please select a Runway Layer Centerline from the UI.")
-
-except Exception as e:
-    print(f"QOLS: Error with Runway Layer Centerline: {e}")
-    iface.messageBar().pushMessage("QOLS Error", f"Runway Layer Centerline error: {str(e)}", level=MSG_CRITICAL)
-    raise
-
-# Calculate ZIH at start (legacy name ZIHs)
-zih_at_start_m = (start_elevation_m - ((start_elevation_m - end_elevation_m) / rwy_length) * 1800)
-print(f"QOLS: ZIH at start (m): {zih_at_start_m}")
-
-# Get the azimuth of the line - robust to MultiLineString
-for feat in selection:
-    line_pts = _normalize_polyline_points(feat.geometry(), iface)
-    print(f"QOLS: Geometry points count (normalized): {len(line_pts)}")
-    break
-
-# Final azimuth is resolved below once the threshold layer is loaded,
-# via the direction-driven s-index convention (matches TransitionalSurface_UTM.py).
-
-# ENHANCED THRESHOLD SELECTION - Use threshold layer from UI
+# LAYER SELECTION - the runway and thresholds come from the shared runway
+# context, resolved once per edit (also used by the direction marker). An
+# active selection is honoured even when the checkbox is off.
 try:
-    if threshold_layer is not None:
-        print(f"QOLS: Using threshold layer from UI: {threshold_layer.name()}")
-
-        if use_threshold_selected:
-            # Require explicit feature selection
-            threshold_selection = threshold_layer.selectedFeatures()
-            if not threshold_selection:
-                raise Exception("No threshold features selected. Please select threshold features.")
-            print(f"QOLS: Using {len(threshold_selection)} selected threshold features")
-        else:
-            # If there is an active selection, honor it even if the checkbox is off; otherwise use first feature
-            threshold_selection = threshold_layer.selectedFeatures()
-            if threshold_selection:
-                print(f"QOLS: Selection detected (checkbox off) — using {len(threshold_selection)} selected threshold features")
-            else:
-                threshold_selection = list(threshold_layer.getFeatures())
-                if not threshold_selection:
-                    raise Exception("No features found in threshold layer.")
-                print(f"QOLS: Using first threshold feature from layer (selection disabled and no active selection)")
-
-        print(f"QOLS: Processing {len(threshold_selection)} threshold features")
-
-    else:
-        # No fallback - require explicit threshold layer selection
+    if threshold_layer is None:
         raise Exception("No threshold layer provided. Please select a threshold layer from the UI.")
+    context = runway_context(runway_layer, threshold_layer, params.direction,
+                             use_runway_selected, use_threshold_selected, iface=iface)
+    print(f"QOLS: Using {len(context.runway_features)} runway features from {runway_layer.name()}")
+    print(f"QOLS: Using {len(context.threshold_features)} threshold features from {threshold_layer.name()}")
 
 except Exception as e:
-    print(f"QOLS: Error with threshold layer: {e}")
-    iface.messageBar().pushMessage("QOLS Error", f"Threshold layer error: {str(e)}", level=MSG_CRITICAL)
+    print(f"QOLS: Error with Runway Layer Centerline / threshold layer: {e}")
+    iface.messageBar().pushMessage("QOLS Error", f"Layer selection error: {str(e)}", level=MSG_CRITICAL)
     raise
 
-# Get x,y from threshold - direction picks the runway-centerline endpoint
-# directly (0 = Start to End, -1 = End to Start), mirroring the legacy
-# TransitionalSurface_UTM.py line_pts[-1-s]/line_pts[s] convention (ported
-# here from the New OLS scripts fix in #113) — no threshold-distance
-# matching or post-hoc azimuth flip needed. The threshold anchor is
-# matched to the direction-selected endpoint within threshold_selection —
-# in "Selected Only" mode with one feature it stays pinned (re-selecting
-# to match direction is the user's call, same as legacy); with multiple
-# candidates it follows direction automatically.
-if not threshold_selection:
-    raise Exception("No threshold features found")
-
-
-def _closest_feature(features, pt):
-    return min(
-        features,
-        key=lambda f: hypot(f.geometry().asPoint().x() - pt.x(), f.geometry().asPoint().y() - pt.y()),
-    )
-
-
-s = direction
-near_end_pt = line_pts[s]
-far_end_pt = line_pts[-1 - s]
-azimuth = far_end_pt.azimuth(near_end_pt)
-
-selected_threshold = _closest_feature(threshold_selection, near_end_pt)
-threshold_geom = selected_threshold.geometry().asPoint()
-new_geom = QgsPoint(threshold_geom)
-new_geom.addZValue(start_elevation_m)
-
-print(f"QOLS: Threshold point: {new_geom.x()}, {new_geom.y()}, {new_geom.z()}")
-print(f"QOLS: UI direction toggle: {'End to Start' if direction == -1 else 'Start to End'}")
-print(f"QOLS: Final azimuth used for projection: {azimuth:.6f}°")
-
-construction_points = []
-
-"""Dynamic section geometry
-This block replaces previous hardcoded distances (3000, 6600, 15000) with UI-provided
-first_section_length_m (L1), second_section_length_m (L2), horizontal_section_length_m (LH).
-Additional dynamic parameters (with safe defaults if the UI does not yet expose them):
- - first_section_slope (default 0.02)
- - second_section_slope (default 0.025)
- - divergence_ratio (default 0.15) -> lateral growth per metre (both sides)
- - threshold_offset_m (default 60) -> distance from THR to section origin
-Sections are omitted if their length is 0. Horizontal section starts after second (or first if second omitted).
-"""
-
-first_section_slope = globals().get('first_section_slope', globals().get('slope1', 0.02))
-second_section_slope = globals().get('second_section_slope', globals().get('slope2', 0.025))
-divergence_ratio = globals().get('divergence_ratio', globals().get('divergence', 0.15))
-threshold_offset_m = globals().get('threshold_offset_m', globals().get('thr_offset', 60))
-
-print(f"QOLS: Dynamic Approach Params -> L1={first_section_length_m} L2={second_section_length_m} LH={horizontal_section_length_m} slope1={first_section_slope} slope2={second_section_slope} div={divergence_ratio} thr_off={threshold_offset_m}")
-
-# Guard against negative lengths
-first_section_length_m = max(0, float(first_section_length_m))
-second_section_length_m = max(0, float(second_section_length_m))
-horizontal_section_length_m = max(0, float(horizontal_section_length_m))
-
-# Origin (threshold point with elevation)
-pt_0 = new_geom
-
-# Point after threshold offset
-pt_01 = new_geom.project(threshold_offset_m, azimuth)
-pt_01.addZValue(start_elevation_m)
-pt_01AL = pt_01.project(approach_width_m / 2, azimuth + 90)
-pt_01AR = pt_01.project(approach_width_m / 2, azimuth - 90)
-
-construction_points.extend((pt_0, pt_01, pt_01AL, pt_01AR))
-
-features_to_create = []  # (id, name, [farRight, farLeft, nearLeft, nearRight])
-next_id = 6
-
-
-def lateral_offset(distance_from_offset: float) -> float:
-    """Compute half-width at a given distance from pt_01 considering divergence."""
-    return (approach_width_m / 2) + (distance_from_offset * divergence_ratio)
-
-
-# --- First Section (always created if L1 > 0) ---
-if first_section_length_m > 0:
-    dist_first_end = first_section_length_m
-    height_first_end = start_elevation_m + first_section_length_m * first_section_slope
-    pt_05 = pt_01.project(dist_first_end, azimuth)
-    pt_05.setZ(height_first_end)
-    half_w_first_end = lateral_offset(dist_first_end)
-    pt_05L = pt_05.project(half_w_first_end, azimuth + 90)
-    pt_05R = pt_05.project(half_w_first_end, azimuth - 90)
-    construction_points.extend((pt_05, pt_05L, pt_05R))
-    features_to_create.append((next_id, 'Approach First Section', [pt_05R, pt_05L, pt_01AL, pt_01AR], start_elevation_m, height_first_end))
-    next_id += 1
-else:
-    # If L1 = 0 treat pt_05 as the origin of later sections
-    dist_first_end = 0
-    height_first_end = start_elevation_m
-    pt_05 = pt_01  # reuse
-    pt_05L = pt_01AL
-    pt_05R = pt_01AR
-
-# --- Second Section (optional) ---
-if second_section_length_m > 0:
-    dist_second_end = dist_first_end + second_section_length_m
-    height_second_end = height_first_end + second_section_length_m * second_section_slope
-    pt_06 = pt_01.project(dist_second_end, azimuth)
-    pt_06.setZ(height_second_end)
-    half_w_second_end = lateral_offset(dist_second_end)
-    pt_06L = pt_06.project(half_w_second_end, azimuth + 90)
-    pt_06R = pt_06.project(half_w_second_end, azimuth - 90)
-    construction_points.extend((pt_06, pt_06L, pt_06R))
-    features_to_create.append((next_id, 'Approach Second Section', [pt_06R, pt_06L, pt_05L, pt_05R], height_first_end, height_second_end))
-    next_id += 1
-else:
-    # If omitted, second section end coincides with first section end for horizontal start
-    dist_second_end = dist_first_end
-    height_second_end = height_first_end
-    pt_06 = pt_05
-    pt_06L = pt_05L
-    pt_06R = pt_05R
-
-# --- Horizontal Section (optional; only if second section exists) ---
-if second_section_length_m > 0 and horizontal_section_length_m > 0:
-    dist_horizontal_end = dist_second_end + horizontal_section_length_m
-    pt_07 = pt_01.project(dist_horizontal_end, azimuth)
-    pt_07.setZ(height_second_end)  # constant height
-    half_w_horizontal_end = lateral_offset(dist_horizontal_end)
-    pt_07L = pt_07.project(half_w_horizontal_end, azimuth + 90)
-    pt_07R = pt_07.project(half_w_horizontal_end, azimuth - 90)
-    construction_points.extend((pt_07, pt_07L, pt_07R))
-    features_to_create.append((next_id, 'Approach Horizontal Section', [pt_07R, pt_07L, pt_06L, pt_06R], height_second_end, height_second_end))
-    next_id += 1
-
-print(f"QOLS: Generated {len(construction_points)} construction points; sections created: {len(features_to_create)}")
+# Direction picks the runway-centerline endpoint directly (0 = Start to
+# End, -1 = End to Start), mirroring TransitionalSurface_UTM.py (#113); the
+# threshold anchor is the one in threshold_selection nearest that endpoint.
+runway = context.runway
+rwy_length = runway.runway_length
+if rwy_length > 0:
+    print(f"QOLS: Runway length: {rwy_length}, slope: {(params.start_elevation_m - params.end_elevation_m) / rwy_length}")
+result = build_surface(builder, params, runway)
+info = result.info
+
+print(f"QOLS: Final derived - zih_elevation_m: {info['zih_elevation_m']}")
+print(f"QOLS: Threshold point: {info['threshold'][0]}, {info['threshold'][1]}, {info['threshold'][2]}")
+print(f"QOLS: Final azimuth used for projection: {info['azimuth']:.6f}°")
+print(
+    f"QOLS: Dynamic Approach Params -> L1={info['first_section_length_m']} L2={info['second_section_length_m']} "
+    f"LH={info['horizontal_section_length_m']} slope1={params.first_section_slope} "
+    f"slope2={params.second_section_slope} div={params.divergence_ratio} thr_off={params.threshold_offset_m}"
+)
+print(f"QOLS: Sections created: {len(result.features)}")
 
 # Creation of the Approach Surfaces
-# Create memory layer
-layer_name = f"RWY_ApproachSurface_{rwy_classification}_Code{runway_code}"
-approach_layer = QgsVectorLayer("PolygonZ?crs="+map_srid, layer_name, "memory")
-id_field = QgsField('ID', QVariant.String)
-name_field = QgsField('SurfaceName', QVariant.String)
-type_field = QgsField('SurfaceType', QVariant.String)
-code_field = QgsField('Code', QVariant.Int)
-rule_field = QgsField('rule_set', QVariant.String)
-start_elev_field = QgsField('surface_start_elev', QVariant.Double)
-end_elev_field = QgsField('surface_end_elev', QVariant.Double)
-approach_layer.dataProvider().addAttributes([id_field, name_field, type_field, code_field, rule_field, start_elev_field, end_elev_field])
-approach_layer.updateFields()
+layer_name = result.layer_name
+approach_layer = create_surface_layer(result, map_srid)
 
 # Store the full input parameter set as HTML-inspectable JSON (#118)
-from qols.parameters_inspector import build_parameters_json, add_parameters_field, register_parameters_action
+from qols.parameters_inspector import build_parameters_json, register_parameters_action
 
 _params_json = build_parameters_json('Approach Surface', {
-    'Z0': round(start_elevation_m, 3),
-    'ZE': round(end_elevation_m, 3),
-    'ARPH': round(arp_elevation_m, 3),
-    'L1_m': first_section_length_m,
-    'L2_m': second_section_length_m,
-    'LH_m': horizontal_section_length_m,
-    'slope1_pct': round(first_section_slope * 100, 3),
-    'slope2_pct': round(second_section_slope * 100, 3),
-    'divergence_pct': round(divergence_ratio * 100, 3),
-    'width_m': approach_width_m,
-    'rwy_classification': rwy_classification,
-    'runway_code': runway_code,
-    'rule_set': globals().get('active_rule_set', None),
+    'Z0': round(params.start_elevation_m, 3),
+    'ZE': round(params.end_elevation_m, 3),
+    'ARPH': round(params.arp_elevation_m, 3),
+    'L1_m': info['first_section_length_m'],
+    'L2_m': info['second_section_length_m'],
+    'LH_m': info['horizontal_section_length_m'],
+    'slope1_pct': round(params.first_section_slope * 100, 3),
+    'slope2_pct': round(params.second_section_slope * 100, 3),
+    'divergence_pct': round(params.divergence_ratio * 100, 3),
+    'width_m': params.approach_width_m,
+    'rwy_classification': params.rwy_classification,
+    'runway_code': params.runway_code,
+    'rule_set': params.rule_set,
 })
-add_parameters_field(approach_layer)
-
-provider = approach_layer.dataProvider()
-for fid, name, surface_area, sec_start_elev, sec_end_elev in features_to_create:
-    feature = QgsFeature()
-    feature.setGeometry(QgsPolygon(QgsLineString(surface_area), rings=[]))
-    feature.setAttributes([fid, name, rwy_classification, runway_code, globals().get('active_rule_set', None), round(sec_start_elev, 3), round(sec_end_elev, 3), _params_json])
-    provider.addFeatures([feature])
+add_surface_features(approach_layer, result, [_params_json])
 
 register_parameters_action(approach_layer)
 
@@ -416,90 +134,34 @@ canvas.zoomScale(sc)
 
 print(f"QOLS: Approach surface calculation completed successfully")
 print(f"QOLS: Created layer: {layer_name}")
-print(f"QOLS: Surface type: {rwy_classification}, Code: {runway_code}, Width: {approach_width_m}m")
+print(f"QOLS: Surface type: {params.rwy_classification}, Code: {params.runway_code}, Width: {params.approach_width_m}m")
 
 # Success message
-iface.messageBar().pushMessage("QOLS Success", f"Approach Surface ({rwy_classification}, Code {runway_code}) calculated successfully", level=MSG_SUCCESS)
+iface.messageBar().pushMessage(
+    "QOLS Success",
+    f"Approach Surface ({params.rwy_classification}, Code {params.runway_code}) calculated successfully",
+    level=MSG_SUCCESS,
+)
 
 # -----------------------------------------------------------------------
 # Contour layer (CT-08 – CT-16)
 # -----------------------------------------------------------------------
-contour_interval_m = int(globals().get('contour_interval_m', 0))
+contour_interval_m = int(params.contour_interval_m)
 if contour_interval_m > 0:
-    import importlib.util as _ilu
-    import os as _os
-    import sys as _sys
-    _utils_path = _os.path.join(_os.path.dirname(__file__), '_contour_utils.py')
-    _cu_spec = _ilu.spec_from_file_location('_contour_utils', _utils_path)
-    _cu = _ilu.module_from_spec(_cu_spec)
-    _sys.modules['_contour_utils'] = _cu          # must precede exec_module (Python 3.14+)
-    _cu_spec.loader.exec_module(_cu)
-
-    _all_specs = []
-
-    # Section 1 contours
-    if first_section_length_m > 0 and first_section_slope > 0:
-        _elevs1 = _cu.contour_elevations(start_elevation_m, height_first_end, contour_interval_m)
-        _all_specs += _cu.contour_specs_for_linear_section(
-            z_section_start=start_elevation_m,
-            z_section_end=height_first_end,
-            slope=first_section_slope,
-            d_offset=0.0,
-            near_half_width=approach_width_m / 2,
-            divergence_ratio=divergence_ratio,
-            elevations=_elevs1,
-        )
-
-    # Section 2 contours
-    if second_section_length_m > 0 and second_section_slope > 0:
-        _elevs2 = _cu.contour_elevations(height_first_end, height_second_end, contour_interval_m)
-        _all_specs += _cu.contour_specs_for_linear_section(
-            z_section_start=height_first_end,
-            z_section_end=height_second_end,
-            slope=second_section_slope,
-            d_offset=dist_first_end,
-            near_half_width=approach_width_m / 2,
-            divergence_ratio=divergence_ratio,
-            elevations=_elevs2,
-        )
-
-    if _all_specs:
-        _clayer = QgsVectorLayer(
-            "LineStringZ?crs=" + map_srid,
-            "RWY_ApproachSurface_Contours",
-            "memory",
-        )
-        _clayer.dataProvider().addAttributes([
-            QgsField('ID', QVariant.Int),
-            QgsField('surface_elevation', QVariant.Double),
-        ])
-        _clayer.updateFields()
-
-        _cfeats = []
-        for _i, _spec in enumerate(_all_specs):
-            _ctr = pt_01.project(_spec.distance_from_origin, azimuth)
-            _l2d = _ctr.project(_spec.half_width, azimuth + 90)
-            _r2d = _ctr.project(_spec.half_width, azimuth - 90)
-            _lpt = QgsPoint(_l2d.x(), _l2d.y(), _spec.elevation)
-            _rpt = QgsPoint(_r2d.x(), _r2d.y(), _spec.elevation)
-            _feat = QgsFeature()
-            _feat.setGeometry(QgsGeometry(QgsLineString([_lpt, _rpt])))
-            _feat.setAttributes([_i + 1, _spec.elevation])
-            _cfeats.append(_feat)
-        _clayer.dataProvider().addFeatures(_cfeats)
-
-        _cu.apply_contour_style(_clayer, __file__)
+    _clayer = create_contour_layer(result, map_srid)
+    if _clayer is not None:
+        from qols.scripts._contour_utils import apply_contour_style
+        apply_contour_style(_clayer, __file__)
 
         QgsProject.instance().addMapLayers([_clayer])
         _clayer.triggerRepaint()
-        print(f"QOLS: Approach contour layer added — {len(_cfeats)} lines at {contour_interval_m} m interval")
+        print(f"QOLS: Approach contour layer added — {len(result.contours)} lines at {contour_interval_m} m interval")
     else:
         print(f"QOLS: No approach contour lines — no elevation levels in range for interval {contour_interval_m} m")
 
 _script_success = True
 
 # Clean up globals
-set(globals().keys()).difference(myglobals)
 for g in set(globals().keys()).difference(myglobals):
     if g not in ('myglobals', '_script_success'):
         del globals()[g]
@@ -6,390 +6,68 @@ ENHANCED VERSION - Creates unified 3D polygon instead of separate lines
 '''
 # flake8: noqa  # exec()-dispatched script; star imports intentional (see TD-03)
 myglobals = set(globals().keys())
+
 from qgis.core import *
 from qgis.PyQt.QtCore import *
 from qgis.PyQt.QtGui import *
 from qgis.gui import *
-from math import sqrt, cos, sin, radians
-
-
-def _normalize_polyline_points(geometry: 'QgsGeometry', iface=None):
-    """Return a list of QgsPoint representing a single polyline.
-    Accepts LineString or MultiLineString; for MultiLineString picks the longest part.
-    """
-    if geometry is None or geometry.isEmpty():
-        raise Exception("Empty geometry provided for runway centerline.")
-    if geometry.isMultipart():
-        parts = geometry.asMultiPolyline()
-        if not parts:
-            raise Exception("Empty MultiLineString geometry.")
-
-        def length_of(pts):
-            if not pts or len(pts) < 2:
-                return 0.0
-            total = 0.0
-            for i in range(1, len(pts)):
-                dx = pts[i].x() - pts[i-1].x()
-                dy = pts[i].y() - pts[i-1].y()
-                total += sqrt(dx*dx + dy*dy)
-            return total
-        longest = max(parts, key=length_of)
-        if iface and len(parts) > 1:
-            iface.messageBar().pushMessage("InnerHorizontal Info", "MultiLineString detected; using longest part as centerline.", level=MSG_INFO)
-        return [QgsPoint(p) for p in longest]
-    poly = geometry.asPolyline()
-    if poly and len(poly) >= 2:
-        return [QgsPoint(p) for p in poly]
-    raise Exception("Line geometry cannot be converted to a polyline. Only single line or curve types are permitted.")
-
-
-# Parameters - FROM UI
-try:
-    # Inner horizontal surface parameters from UI
-    L = globals().get('radius', 4000)  # Distance L / Radius from UI
-    height = globals().get('height', 45.0)  # Height for 3D polygon (new parameter)
-    datum_elevation = globals().get('datum_elevation', 0.0)  # Reference elevation (#125)
-    runway_code = globals().get('code', 4)
-    rwy_classification = globals().get('rwyClassification', 'Precision Approach CAT I')
+from qols.engine import InnerHorizontalBuilder, build_surface
+from qols.engine.qgis_adapter import add_surface_features, create_surface_layer, runway_geometries
+from qols.runway_context import layer_features
 
-    # Direction parameter
-    s = globals().get('direction', 0)  # 0 for start to end, -1 for end to start
 
-    # Layer parameters
-    runway_layer = globals().get('runway_layer', None)
-    threshold_layer = globals().get('threshold_layer', None)
-    use_runway_selected = globals().get('use_runway_selected', True)
+# Parameters - FROM UI; defaults and legacy keys (code, rwyClassification)
+# live on InnerHorizontalParams.
+builder = InnerHorizontalBuilder()
+params = builder.params_from_namespace(globals())
+runway_layer = globals().get('runway_layer', None)
+use_runway_selected = globals().get('use_runway_selected', True)
+L = params.radius
+height = params.height
+s = params.direction
 
-    print(f"InnerHorizontal: Using parameters - radius: {L}m, height: {height}m, code: {runway_code}, class: {rwy_classification}")
-    print(f"InnerHorizontal: Direction parameter s: {s}, Use selected: {use_runway_selected}")
-
-except Exception as e:
-    print(f"InnerHorizontal: Error getting parameters, using defaults: {e}")
-    # Fallback to defaults if parameters not provided
-    L = 4000
-    height = 45.0
-    datum_elevation = 0.0
-    s = 0
-    runway_layer = None
-    threshold_layer = None
-    use_runway_selected = True
-    runway_code = 4
-    rwy_classification = 'Precision Approach CAT I'
-
-print(f"InnerHorizontal: Final values - radius: {L}m, height: {height}m, direction: {s}")
+print(f"InnerHorizontal: Using parameters - radius: {L}m, height: {height}m, code: {params.runway_code}, class: {params.rwy_classification}")
+print(f"InnerHorizontal: Direction parameter s: {s}, Use selected: {use_runway_selected}")
 
 # Absolute elevation above the shared datum (#125) — height is a height above
 # datum, not an absolute Z; the polygon's flat Z is the sum of both.
-z_absolute = datum_elevation + height
-print(f"InnerHorizontal: Datum elevation: {datum_elevation}m, absolute Z: {z_absolute}m")
+print(f"InnerHorizontal: Datum elevation: {params.datum_elevation}m, absolute Z: {params.elevation}m")
 
 map_srid = iface.mapCanvas().mapSettings().destinationCrs().authid()
 
-# Work exclusively in projected coordinate system - coordinate transformations
-source_crs = QgsCoordinateReferenceSystem(4326)
-dest_crs = QgsCoordinateReferenceSystem(map_srid)
-# transformto
-trto = QgsCoordinateTransform(source_crs, dest_crs, QgsProject.instance())
-# transformfrom
-trfm = QgsCoordinateTransform(dest_crs, source_crs, QgsProject.instance())
-
-# ENHANCED LAYER SELECTION - Use layers from UI
+# LAYER SELECTION - the runway features come from the shared per-edit
+# cache; an active selection is honoured even when the checkbox is off.
 try:
-    if runway_layer is not None:
-        print(f"InnerHorizontal: Using Runway Layer Centerline from UI: {runway_layer.name()}")
-
-        if use_runway_selected:
-            selection = runway_layer.selectedFeatures()
-            if not selection:
-                raise Exception("No runway features selected. Please select runway features.")
-            print(f"InnerHorizontal: Using {len(selection)} selected runway features")
-        else:
-            selection = list(runway_layer.getFeatures())
-            if not selection:
-                raise Exception("No features found in Runway Layer Centerline.")
-            print(f"InnerHorizontal: Using first feature from layer")
-
-        print(f"InnerHorizontal: Processing {len(selection)} runway features")
-
-    else:
-        raise Exception("No Runway Layer Centerline provided. Please select a Runway Layer Centerline from the UI.")
+    selection = layer_features(runway_layer, use_runway_selected, "Runway Layer Centerline")
+    print(f"InnerHorizontal: Using {len(selection)} runway features from {runway_layer.name()}")
 
 except Exception as e:
     print(f"InnerHorizontal: Error with Runway Layer Centerline: {e}")
     iface.messageBar().pushMessage("InnerHorizontal Error", f"Runway Layer Centerline error: {str(e)}", level=MSG_CRITICAL)
     raise
 
-# Create memory layer for 3D polygon (PolygonZ)
-layer_name = f"InnerHorizontal_{rwy_classification}_Code{runway_code}"
-v_layer = QgsVectorLayer(f"PolygonZ?crs={map_srid}", layer_name, "memory")
-v_layer_provider = v_layer.dataProvider()
+# One racetrack per runway feature, all in one layer.
+result = build_surface(builder, params, runway_geometries(selection, iface=iface))
 
-# Add attributes for the polygon
-v_layer_provider.addAttributes([
-    QgsField("surface_type", QVariant.String),
-    QgsField("radius_m", QVariant.Double),
-    QgsField("height_m", QVariant.Double),
-    QgsField("datum_elevation_m", QVariant.Double),
-    QgsField("rule_set", QVariant.String),
-    QgsField("runway_start_x", QVariant.Double),
-    QgsField("runway_start_y", QVariant.Double),
-    QgsField("runway_end_x", QVariant.Double),
-    QgsField("runway_end_y", QVariant.Double),
-    QgsField("azimuth", QVariant.Double),
-    QgsField("RWYType", QVariant.String),
-    QgsField("Code", QVariant.Int)
-])
-v_layer.updateFields()
+# Create memory layer for 3D polygon (PolygonZ)
+v_layer = create_surface_layer(result, map_srid)
 
 # Store the full input parameter set as HTML-inspectable JSON (#118)
-from qols.parameters_inspector import build_parameters_json, add_parameters_field, register_parameters_action
+from qols.layer_styles import fill_symbol
+from qols.parameters_inspector import build_parameters_json, register_parameters_action
 
-_active_rule_set = globals().get('active_rule_set', None)
 _params_json = build_parameters_json('Inner Horizontal Surface', {
     'radius_m': L,
     'height_m': height,
-    'datum_elevation_m': datum_elevation,
-    'rule_set': _active_rule_set,
-    'rwy_classification': rwy_classification,
-    'runway_code': int(runway_code),
+    'datum_elevation_m': params.datum_elevation,
+    'rule_set': params.rule_set,
+    'rwy_classification': params.rwy_classification,
+    'runway_code': int(params.runway_code),
 })
-add_parameters_field(v_layer)
-
-features_created = 0
-
-# Process each runway feature
-for feat in selection:
-    line_pts = _normalize_polyline_points(feat.geometry(), iface)
-    print(f"InnerHorizontal: Geometry points count (normalized): {len(line_pts)}")
-
-    # Get runway endpoints from normalized line
-    start_point = QgsPoint(line_pts[0].x(), line_pts[0].y())   # Always first point
-    end_point = QgsPoint(line_pts[-1].x(), line_pts[-1].y())   # Always last point
-    angle0 = start_point.azimuth(end_point)
-
-    print(f"InnerHorizontal: Start point: {start_point.x()}, {start_point.y()}")
-    print(f"InnerHorizontal: End point: {end_point.x()}, {end_point.y()}")
-    print(f"InnerHorizontal: Base azimuth (angle0): {angle0}")
-
-    # Calculate azimuth - corrected logic to match original
-    base_azimuth = angle0 + 180
-    if base_azimuth >= 360:
-        base_azimuth -= 360
-
-    # Apply direction change
-    if s == -1:
-        azimuth = base_azimuth + 180
-        if azimuth >= 360:
-            azimuth -= 360
-        print(f"InnerHorizontal: REVERSE direction - final azimuth: {azimuth}")
-    else:
-        azimuth = base_azimuth
-        print(f"InnerHorizontal: NORMAL direction - final azimuth: {azimuth}")
-
-    # Set angle0 for calculations (same as original code)
-    angle0 = azimuth
-
-    back_angle0 = azimuth + 180
-    if back_angle0 >= 360:
-        back_angle0 -= 360
-
-    # Calculate racetrack points using ORIGINAL LOGIC - SAME AS CONICAL SURFACE
-    print(f"InnerHorizontal: Creating racetrack polygon with radius {L}m at height {height}m")
-    print(f"InnerHorizontal: Using same successful approach as conical surface")
-
-    # Use ORIGINAL coordinate calculation methods from working script
-    # Distance and bearing calculations (same as original inner horizontal)
-    dist = L
-
-    # Original coord function - same as conical surface pattern
-    def coord(angle0, dist1, off):
-        dist = dist1
-        bearing = angle0 + off
-        angle = 90 - bearing
-        bearing = math.radians(bearing)
-        angle = math.radians(angle)
-        dist_x, dist_y = (dist * math.cos(angle), dist * math.sin(angle))
-        xfinal, yfinal = (start_point.x() + dist_x, start_point.y() + dist_y)
-
-        # Transform coordinates (same pattern as conical)
-        pro_coords = trto.transform(trfm.transform(xfinal, yfinal))
-        return pro_coords
-
-    # Original coord2 function - same as conical surface pattern
-    def coord2(angle0, dist1, off):
-        dist = dist1
-        bearing = angle0 + off
-        angle = 90 - bearing
-        bearing = math.radians(bearing)
-        angle = math.radians(angle)
-        dist_x, dist_y = (dist * math.cos(angle), dist * math.sin(angle))
-        xfinal, yfinal = (end_point.x() + dist_x, end_point.y() + dist_y)
-
-        # Transform coordinates (same pattern as conical)
-        pro_coords2 = trto.transform(trfm.transform(xfinal, yfinal))
-        return pro_coords2
-
-    # Calculate 6 key points exactly like conical surface
-    pro_coords = coord(angle0, L, -90)  # Starting point left
-    x2 = coord(angle0, L, 90)           # Starting point right
-    xc = coord(angle0, L, 0)            # Starting center point
-
-    x4 = coord2(back_angle0, L, 90)     # Ending point right
-    x5 = coord2(back_angle0, L, 0)      # Ending center point
-    x6 = coord2(back_angle0, L, -90)    # Ending point left
-
-    print(f"InnerHorizontal: Calculated 6 points using original trigonometry + transformations")
-    print(f"InnerHorizontal: pro_coords: {pro_coords}, x2: {x2}, x4: {x4}, x6: {x6}")
-
-    # SOLUTION: Use QGIS CircularString interpolation - SAME AS CONICAL SURFACE SUCCESS
-    print(f"InnerHorizontal: Using QGIS CircularString interpolation for exact arcs")
-    print(f"InnerHorizontal: CORRECTED sequence to avoid line crossings:")
-    print(f"InnerHorizontal: 1. Arc 1: pro_coords → xc → x2")
-    print(f"InnerHorizontal: 2. Line: x2 → x6 (connect arc endpoints)")
-    print(f"InnerHorizontal: 3. Arc 2: x6 → x5 → x4 (REVERSED)")
-    print(f"InnerHorizontal: 4. Line: x4 → pro_coords (close polygon)")
-
-    polygon_points = []
-
-    # First arc: Create CircularString and extract points
-    # This is exactly how the conical surface creates the first arc: [pro_coords, xc, x2]
-    cString1 = QgsCircularString()
-    cString1.setPoints([QgsPoint(pro_coords[0], pro_coords[1]),
-                        QgsPoint(xc[0], xc[1]),
-                        QgsPoint(x2[0], x2[1])])
-
-    # Convert to regular geometry and extract points with high resolution
-    geom1 = QgsGeometry(cString1)
-    # Convert to segmented curve with many points for smooth polygon
-    segmented1 = geom1.convertToType(GEOM_TYPE_LINE, True)
-    if segmented1:
-        # Handle both LineString and MultiLineString cases
-        if segmented1.wkbType() == WKB_LINE_STRING:
-            polyline1 = segmented1.asPolyline()
-            print(f"InnerHorizontal: Arc 1 interpolated to {len(polyline1)} points (LineString)")
-
-            # Add arc points with height
-            for point in polyline1:
-                polygon_points.append(QgsPoint(point.x(), point.y(), z_absolute))
-        elif segmented1.wkbType() == WKB_MULTI_LINE_STRING:
-            multiline1 = segmented1.asMultiPolyline()
-            print(f"InnerHorizontal: Arc 1 interpolated to {len(multiline1)} parts (MultiLineString)")
-
-            # Add points from all parts
-            for part in multiline1:
-                for point in part:
-                    polygon_points.append(QgsPoint(point.x(), point.y(), z_absolute))
-        else:
-            print(f"InnerHorizontal: Warning - Unexpected geometry type: {segmented1.wkbType()}")
-            # Fallback to original points
-            polygon_points.extend([
-                QgsPoint(pro_coords[0], pro_coords[1], z_absolute),
-                QgsPoint(xc[0], xc[1], z_absolute),
-                QgsPoint(x2[0], x2[1], z_absolute)
-            ])
-    else:
-        print("InnerHorizontal: Warning - Could not interpolate first arc, using original points")
-        polygon_points.extend([
-            QgsPoint(pro_coords[0], pro_coords[1], z_absolute),
-            QgsPoint(xc[0], xc[1], z_absolute),
-            QgsPoint(x2[0], x2[1], z_absolute)
-        ])
-
-    # Add straight line from x2 to x6 (connect arc endpoints, not diagonals)
-    polygon_points.append(QgsPoint(x6[0], x6[1], z_absolute))
-
-    # Second arc: Create CircularString and extract points
-    # This is exactly how the conical surface creates the second arc: [x6, x5, x4] (REVERSED)
-    cString2 = QgsCircularString()
-    cString2.setPoints([QgsPoint(x6[0], x6[1]),
-                        QgsPoint(x5[0], x5[1]),
-                        QgsPoint(x4[0], x4[1])])
-
-    # Convert to regular geometry and extract points with high resolution
-    geom2 = QgsGeometry(cString2)
-    # Convert to segmented curve with many points for smooth polygon
-    segmented2 = geom2.convertToType(GEOM_TYPE_LINE, True)
-    if segmented2:
-        # Handle both LineString and MultiLineString cases
-        if segmented2.wkbType() == WKB_LINE_STRING:
-            polyline2 = segmented2.asPolyline()
-            print(f"InnerHorizontal: Arc 2 interpolated to {len(polyline2)} points (LineString)")
-
-            # Add arc points with height (skip first point to avoid duplication with x6)
-            for i, point in enumerate(polyline2):
-                if i == 0:  # Skip first point as it's the same as x6 we just added
-                    continue
-                polygon_points.append(QgsPoint(point.x(), point.y(), z_absolute))
-        elif segmented2.wkbType() == WKB_MULTI_LINE_STRING:
-            multiline2 = segmented2.asMultiPolyline()
-            print(f"InnerHorizontal: Arc 2 interpolated to {len(multiline2)} parts (MultiLineString)")
-
-            # Add points from all parts (skip first point of first part to avoid duplication with x6)
-            for part_idx, part in enumerate(multiline2):
-                for point_idx, point in enumerate(part):
-                    if part_idx == 0 and point_idx == 0:  # Skip first point of first part (x6)
-                        continue
-                    polygon_points.append(QgsPoint(point.x(), point.y(), z_absolute))
-        else:
-            print(f"InnerHorizontal: Warning - Unexpected geometry type: {segmented2.wkbType()}")
-            # Fallback to original points (reversed order: x5, x4)
-            polygon_points.extend([
-                QgsPoint(x5[0], x5[1], z_absolute),
-                QgsPoint(x4[0], x4[1], z_absolute)
-            ])
-    else:
-        print("InnerHorizontal: Warning - Could not interpolate second arc, using original points")
-        polygon_points.extend([
-            QgsPoint(x5[0], x5[1], z_absolute),
-            QgsPoint(x4[0], x4[1], z_absolute)
-        ])
-
-    # Add straight line back to start (closing the polygon)
-    polygon_points.append(QgsPoint(pro_coords[0], pro_coords[1], z_absolute))
-
-    print(f"InnerHorizontal: Created racetrack surface with proper circular arcs using QGIS interpolation")
-    print(f"InnerHorizontal: Total points in polygon: {len(polygon_points)}")
-    print(f"InnerHorizontal: Point sequence: pro_coords → arc1 → x2 → x6 → arc2 → x4 → pro_coords")
-    print(f"InnerHorizontal: This avoids crossing diagonal lines - SAME FIX AS CONICAL SURFACE")
-
-    # Create 3D polygon geometry using WKT for proper PolygonZ
-    # Convert points to WKT format with Z coordinates
-    wkt_points = []
-    for pt in polygon_points:
-        wkt_points.append(f"{pt.x()} {pt.y()} {pt.z()}")
-
-    # Create WKT string for PolygonZ
-    wkt_polygon = f"POLYGONZ(({', '.join(wkt_points)}))"
-    polygon_geometry = QgsGeometry.fromWkt(wkt_polygon)
-
-    print(f"InnerHorizontal: Created true 3D PolygonZ geometry with Z coordinates")
-
-    # Create feature
-    feature = QgsFeature()
-    feature.setGeometry(polygon_geometry)
-    feature.setAttributes([
-        "Inner Horizontal",
-        L,
-        height,
-        datum_elevation,
-        _active_rule_set,
-        start_point.x(),
-        start_point.y(),
-        end_point.x(),
-        end_point.y(),
-        azimuth,
-        rwy_classification,
-        int(runway_code),
-        _params_json,
-    ])
-
-    # Add feature to layer
-    v_layer_provider.addFeatures([feature])
-    features_created += 1
-
-    print(f"InnerHorizontal: Created 3D racetrack polygon at height {height}m")
-
-v_layer.updateExtents()
+features_created = len(add_surface_features(v_layer, result, [_params_json]))
+for rec in result.features:
+    print(f"InnerHorizontal: Created 3D racetrack polygon at height {height}m, "
+          f"azimuth {rec.attributes['azimuth']} ({len(rec.exterior)} points)")
 print(f"InnerHorizontal: Created {features_created} inner horizontal surface(s)")
 
 register_parameters_action(v_layer)
@@ -398,7 +76,7 @@ register_parameters_action(v_layer)
 QgsProject.instance().addMapLayers([v_layer])
 
 # Style the layer for 3D polygon
-symbol = QgsFillSymbol.createSimple({
+symbol = fill_symbol({
     'color': '255,0,255,100',  # Magenta with transparency
     'style': 'solid',
     'outline_color': '255,0,255,255',
@@ -61,209 +61,60 @@ myglobals = set(globals().keys())
 from qgis.core import *
 from qgis.PyQt.QtCore import *
 from qgis.PyQt.QtGui import *
-from math import sqrt
-from qols.parameters_inspector import build_parameters_json, add_parameters_field, register_parameters_action
-from qols.surfaces.new_ols_takeoff_climb import get_takeoff_climb_surface_dimensions, MASS_CATEGORY_LE_5700
+from qols.layer_styles import fill_symbol
+from qols.parameters_inspector import build_parameters_json, register_parameters_action
+from qols.engine import NewOlsOesTakeoffClimbBuilder, build_surface
+from qols.engine.qgis_adapter import (
+    add_surface_features,
+    create_contour_layer,
+    create_surface_layer,
+)
+from qols.runway_context import runway_context
 
 _script_success = False
 
-
-def _normalize_polyline_points(geometry):
-    if geometry is None or geometry.isEmpty():
-        raise Exception("Empty geometry provided for runway centerline.")
-    if geometry.isMultipart():
-        parts = geometry.asMultiPolyline()
-        if not parts:
-            raise Exception("Empty MultiLineString geometry.")
-
-        def part_len(pts):
-            if not pts or len(pts) < 2:
-                return 0.0
-            total = 0.0
-            for i in range(1, len(pts)):
-                dx = pts[i].x() - pts[i - 1].x()
-                dy = pts[i].y() - pts[i - 1].y()
-                total += sqrt(dx * dx + dy * dy)
-            return total
-
-        return [QgsPoint(p) for p in max(parts, key=part_len)]
-    poly = geometry.asPolyline()
-    if poly and len(poly) >= 2:
-        return [QgsPoint(p) for p in poly]
-    raise Exception("Line geometry cannot be converted to a polyline.")
-
-
 # ---------------------------------------------------------------------------
-# Parameters
+# Parameters — Table 4-14 ADG I defaults live on NewOlsOesTakeoffClimbParams
 # ---------------------------------------------------------------------------
-_defaults = get_takeoff_climb_surface_dimensions(MASS_CATEGORY_LE_5700, "I")  # Table 4-14 ADG I, fallback only
-
-try:
-    start_elevation_m = globals().get('start_elevation_m', 0.0)
-    direction = globals().get('direction', 0)
-    runway_layer = globals().get('runway_layer', None)
-    use_runway_selected = globals().get('use_runway_selected', True)
-    cwy_length_m = globals().get('cwy_length_m', 0.0)
-    distance_from_runway_end_m = globals().get(
-        'distance_from_runway_end_m', _defaults['distance_from_runway_end_m'])
-    inner_edge_m = globals().get('inner_edge_m', _defaults['inner_edge_m'])
-    divergence_pct = globals().get('divergence_pct', _defaults['divergence_pct'])
-    final_width_m = globals().get('final_width_m', _defaults['final_width_m'])
-    length_m = globals().get('length_m', _defaults['length_m'])
-    slope_pct = globals().get('slope_pct', _defaults['slope_pct'])
-except Exception as e:
-    print(f"NewOLS_OES_TakeoffClimb: Error getting parameters, using defaults: {e}")
-    start_elevation_m = 0.0
-    direction = 0
-    runway_layer = None
-    use_runway_selected = True
-    cwy_length_m = 0.0
-    distance_from_runway_end_m = _defaults['distance_from_runway_end_m']
-    inner_edge_m = _defaults['inner_edge_m']
-    divergence_pct = _defaults['divergence_pct']
-    final_width_m = _defaults['final_width_m']
-    length_m = _defaults['length_m']
-    slope_pct = _defaults['slope_pct']
-
-# #159 — every Table 4-14/4-15 value above is UI-editable, defaulting to
-# the ICAO table when not overridden.
-dims = {
-    'distance_from_runway_end_m': distance_from_runway_end_m,
-    'inner_edge_m': inner_edge_m,
-    'divergence_pct': divergence_pct,
-    'final_width_m': final_width_m,
-    'length_m': length_m,
-    'slope_pct': slope_pct,
-}
+builder = NewOlsOesTakeoffClimbBuilder()
+params = builder.params_from_namespace(globals())
+runway_layer = globals().get('runway_layer', None)
+use_runway_selected = globals().get('use_runway_selected', True)
 
 map_srid = iface.mapCanvas().mapSettings().destinationCrs().authid()
 
 # ---------------------------------------------------------------------------
-# Runway layer
+# Runway layer (resolved once per edit, shared with the marker)
 # ---------------------------------------------------------------------------
 try:
-    if runway_layer is None:
-        raise Exception("No Runway Layer Centerline provided.")
-    if use_runway_selected:
-        selection = runway_layer.selectedFeatures()
-        if not selection:
-            raise Exception("No runway features selected.")
-    else:
-        selection = runway_layer.selectedFeatures() or list(runway_layer.getFeatures())
-        if not selection:
-            raise Exception("No features found in Runway Layer.")
+    context = runway_context(runway_layer, None, params.direction, use_runway_selected)
 except Exception as e:
     iface.messageBar().pushMessage("QOLS Error", str(e), level=MSG_CRITICAL)
     raise
 
-for feat in selection:
-    line_pts = _normalize_polyline_points(feat.geometry())
-    break
-
-# direction picks the runway-centerline endpoint (0 = Start to End,
-# -1 = End to Start), same convention as the other New OLS OES scripts.
-# The far endpoint is the physical runway end in the direction of takeoff.
-s = direction
-near_end_pt = line_pts[s]
-far_end_pt = line_pts[-1 - s]
-rwy_end_azimuth = near_end_pt.azimuth(far_end_pt)  # away from the runway, takeoff/climb-out direction
-
-rwy_end_point = QgsPoint(far_end_pt.x(), far_end_pt.y())
-rwy_end_point.addZValue(start_elevation_m)
-
-print(f"NewOLS_OES_TakeoffClimb: rwy_end_azimuth={rwy_end_azimuth:.2f}")
-
-# ---------------------------------------------------------------------------
-# Geometry — ported from take-off-surface_UTM.py's own hexagon/slope math.
-# ---------------------------------------------------------------------------
-divergence_ratio = dims['divergence_pct'] / 100.0
-slope_ratio = dims['slope_pct'] / 100.0
-half_inner = dims['inner_edge_m'] / 2.0
-half_final = dims['final_width_m'] / 2.0
-
-# Origin offset — the CWY footnote applies identically to both tables
-# (max(0, cwy) == cwy for Table 4-15's zero distance_from_runway_end_m).
-dD = max(dims['distance_from_runway_end_m'], cwy_length_m)
-
-origin_pt = rwy_end_point.project(dD, rwy_end_azimuth)
-origin_pt.addZValue(start_elevation_m)
-origin_l = origin_pt.project(half_inner, rwy_end_azimuth + 90)
-origin_r = origin_pt.project(half_inner, rwy_end_azimuth - 90)
-
-distance_to_max_width = ((half_final - half_inner) / divergence_ratio) if divergence_ratio else 0.0
-# Defensive clamp: every field here is independently user-editable
-# (unlike the classic panel's fixed relationship), so an inconsistent
-# combination could otherwise push the cap point past the surface end.
-distance_to_max_width = min(distance_to_max_width, dims['length_m'])
-
-
-def _pz(pt, z):
-    p = QgsPoint(pt.x(), pt.y())
-    p.addZValue(z)
-    return p
-
-
-mid_pt = origin_pt.project(distance_to_max_width, rwy_end_azimuth)
-z_mid = start_elevation_m + distance_to_max_width * slope_ratio
-mid_l = _pz(mid_pt.project(half_final, rwy_end_azimuth + 90), z_mid)
-mid_r = _pz(mid_pt.project(half_final, rwy_end_azimuth - 90), z_mid)
-
-end_pt = origin_pt.project(dims['length_m'], rwy_end_azimuth)
-# Slope runs the full surface length, independent of the divergence cap.
-z_end = start_elevation_m + dims['length_m'] * slope_ratio
-end_l = _pz(end_pt.project(half_final, rwy_end_azimuth + 90), z_end)
-end_r = _pz(end_pt.project(half_final, rwy_end_azimuth - 90), z_end)
-
-origin_l = _pz(origin_l, start_elevation_m)
-origin_r = _pz(origin_r, start_elevation_m)
+# One runway end per calculation: only the first selected centerline is used.
+result = build_surface(builder, params, context.runway)
+print(f"NewOLS_OES_TakeoffClimb: rwy_end_azimuth={result.info['rwy_end_azimuth']:.2f}")
 
 # ---------------------------------------------------------------------------
 # Memory layer
 # ---------------------------------------------------------------------------
-layer_name = "NewOLS_OES_TakeoffClimb"
-v_layer = QgsVectorLayer(f"PolygonZ?crs={map_srid}", layer_name, "memory")
-v_layer_provider = v_layer.dataProvider()
-v_layer_provider.addAttributes([
-    QgsField("surface_type", QVariant.String),
-    QgsField("component", QVariant.String),
-    QgsField("slope_pct", QVariant.Double),
-    QgsField("rule_set", QVariant.String),
-])
-v_layer.updateFields()
-
-_active_rule_set = globals().get('active_rule_set', None)
+v_layer = create_surface_layer(result, map_srid)
 _params_json = build_parameters_json('New OLS OES Take-off Climb Surface', {
-    'start_elevation_m': round(start_elevation_m, 3),
-    'direction': direction,
-    'cwy_length_m': cwy_length_m,
-    'dimensions': dims,
-    'rule_set': _active_rule_set,
+    'start_elevation_m': round(params.start_elevation_m, 3),
+    'direction': params.direction,
+    'cwy_length_m': params.cwy_length_m,
+    'dimensions': params.dimensions(),
+    'rule_set': params.rule_set,
 })
-add_parameters_field(v_layer)
-
-features = []
-
-
-def _add_feature(component, slope_pct, ring_pts_with_z):
-    f = QgsFeature()
-    f.setGeometry(QgsPolygon(QgsLineString(ring_pts_with_z)))
-    f.setAttributes(["Take-off Climb Surface", component, slope_pct, _active_rule_set, _params_json])
-    features.append(f)
-
-
-_add_feature('Take-off Climb Surface', dims['slope_pct'], [
-    end_r, end_l, mid_l, origin_l, origin_r, mid_r,
-])
-
-v_layer_provider.addFeatures(features)
-v_layer.updateExtents()
+features = add_surface_features(v_layer, result, [_params_json])
 print(f"NewOLS_OES_TakeoffClimb: Created {len(features)} feature(s)")
 
 register_parameters_action(v_layer)
 
 QgsProject.instance().addMapLayers([v_layer])
 
-symbol = QgsFillSymbol.createSimple({
+symbol = fill_symbol({
     'color': '34,139,34,90',  # forest green, transparent
     'style': 'solid',
     'outline_color': '0,100,0,220',
@@ -283,6 +134,17 @@ if features:
         sc = 50000
     canvas.zoomScale(sc)
 
+# ---------------------------------------------------------------------------
+# Contour layer (optional)
+# ---------------------------------------------------------------------------
+_clayer = create_contour_layer(result, map_srid)
+if _clayer is not None:
+    from qols.scripts._contour_utils import apply_contour_style
+    apply_contour_style(_clayer, __file__)
+    QgsProject.instance().addMapLayers([_clayer])
+    _clayer.triggerRepaint()
+    print(f"NewOLS_OES_TakeoffClimb: {len(result.contours)} contour lines at {params.contour_interval_m} m")
+
 if not use_runway_selected and runway_layer:
     runway_layer.removeSelection()
 
@@ -13,22 +13,25 @@ from qgis.core import *
 from qgis.PyQt.QtCore import *
 from qgis.PyQt.QtGui import *
 from qgis.gui import *
+from qols.engine import OuterHorizontalBuilder, RunwayGeometry, build_surface
+from qols.engine.qgis_adapter import add_surface_features, create_surface_layer
+from qols.runway_context import point_index
 # Work exclusively in projected coordinate system - no transformations needed
 map_srid = iface.mapCanvas().mapSettings().destinationCrs().authid()
 print(f"OuterHorizontal: Working in projected CRS: {map_srid}")
 
-# Get parameters from plugin
-code = globals().get('code', 3)
-radius = globals().get('radius', 15000.0)
-height = globals().get('height', 45.0)
-arp_elevation = globals().get('arp_elevation', 0.0)  # #127
+# Get parameters from plugin (defaults on OuterHorizontalParams)
+builder = OuterHorizontalBuilder()
+params = builder.params_from_namespace(globals())
+code = params.runway_code
+radius = params.radius
+height = params.height
+arp_elevation = params.arp_elevation  # #127
 
+print(f"OuterHorizontal: Code={code}, Radius={radius}m, Height={height}m")
 # Absolute elevation above the ARP (Aerodrome Reference Point) — height
 # is a height above the ARP, not an elevation itself.
-z_absolute = arp_elevation + height
-
-print(f"OuterHorizontal: Code={code}, Radius={radius}m, Height={height}m")
-print(f"OuterHorizontal: ARP elevation={arp_elevation}m, absolute Z={z_absolute}m")
+print(f"OuterHorizontal: ARP elevation={arp_elevation}m, absolute Z={arp_elevation + height}m")
 
 # Validate code number (DOC 9137 Part 6 - only for code 3 or 4)
 if code not in [3, 4]:
@@ -41,100 +44,34 @@ use_arp_selected = globals().get('use_arp_selected', False)
 if not aerodrome_reference_point_layer:
     raise Exception("No ARP (Aerodrome Reference Point) layer provided. Please select an ARP layer from the UI.")
 
-# Get ARP coordinates - use selection or all features based on UI setting
-if use_arp_selected:
-    selection = aerodrome_reference_point_layer.selectedFeatures()
-    if not selection:
-        raise Exception("No ARP (Aerodrome Reference Point) features selected. Please select ARP feature.")
-    print(f"OuterHorizontal: Using {len(selection)} selected ARP features")
-else:
-    selection = list(aerodrome_reference_point_layer.getFeatures())
-    if not selection:
-        raise Exception("No features found in ARP (Aerodrome Reference Point) layer.")
-    print(f"OuterHorizontal: Using all {len(selection)} ARP features from layer")
+# ARP coordinates from the shared per-edit point cache: the selection, or
+# every feature when nothing is selected and the checkbox is off.
+arp_points = point_index(aerodrome_reference_point_layer, use_arp_selected,
+                         "ARP (Aerodrome Reference Point)").points()
+print(f"OuterHorizontal: Using {len(arp_points)} ARP point(s)")
+
+# One flat circle (DOC 9137 compliance, 360 segments) per ARP point; the
+# surface does not depend on the runway centerline.
+result = build_surface(builder, params, RunwayGeometry(arp_points=arp_points))
 
 # Create memory layer for outer horizontal surface
-v_layer = QgsVectorLayer(f"PolygonZ?crs={map_srid}", "Outer Horizontal Surface", "memory")
-v_layer_provider = v_layer.dataProvider()
-
-# Add attributes
-v_layer_provider.addAttributes([
-    QgsField("surface_type", QVariant.String),
-    QgsField("code", QVariant.Int),
-    QgsField("radius_m", QVariant.Double),
-    QgsField("height_m", QVariant.Double),
-    QgsField("arp_elevation_m", QVariant.Double),
-    QgsField("rule_set", QVariant.String),
-    QgsField("arp_x", QVariant.Double),
-    QgsField("arp_y", QVariant.Double)
-])
-v_layer.updateFields()
+v_layer = create_surface_layer(result, map_srid)
 
 # Store the full input parameter set as HTML-inspectable JSON (#118)
-from qols.parameters_inspector import build_parameters_json, add_parameters_field, register_parameters_action
+from qols.layer_styles import fill_symbol
+from qols.parameters_inspector import build_parameters_json, register_parameters_action
 
-_active_rule_set = globals().get('active_rule_set', None)
 _params_json = build_parameters_json('Outer Horizontal Surface', {
     'code': code,
     'radius_m': radius,
     'height_m': height,
     'arp_elevation_m': arp_elevation,
-    'rule_set': _active_rule_set,
+    'rule_set': params.rule_set,
 })
-add_parameters_field(v_layer)
-
-# Process each ARP point
-features_created = 0
-for feat in selection:
-    arp_point = feat.geometry().asPoint()
-    arp_x, arp_y = arp_point.x(), arp_point.y()
-    print(f"OuterHorizontal: Creating 15,000m circle at ARP: {arp_x}, {arp_y}")
-
-    # Create circular polygon using PyQGIS native QgsCircle (as requested by client)
-    # Fix: Convert QgsPointXY to QgsPoint for QgsCircle compatibility
-    center_point = QgsPoint(arp_x, arp_y)
-
-    # Use PyQGIS native QgsCircle for precise geometry generation (DOC 9137 compliance)
-    qgs_circle = QgsCircle(center_point, radius)
-
-    # Convert circle to polygon with configurable precision
-    # Note: Consider making this configurable in plugin settings for different precision needs
-    num_segments = 360  # Increased from 72 as per client feedback
-    polygon_geometry = qgs_circle.toPolygon(num_segments)
-
-    # Convert to QgsGeometry
-    circle_geometry = QgsGeometry(polygon_geometry)
-
-    # Apply the absolute Z (#127) — QgsCircle.toPolygon() only produces
-    # 2D points, so rebuild as PolygonZ via WKT, same pattern used in
-    # inner-horizontal-racetrack.py/conical.py.
-    ring_xy = circle_geometry.asPolygon()[0]
-    wkt_points = [f"{p.x()} {p.y()} {z_absolute}" for p in ring_xy]
-    wkt_polygon = f"POLYGONZ(({', '.join(wkt_points)}))"
-    circle_geometry = QgsGeometry.fromWkt(wkt_polygon)
-
-    # Create feature with proper geometry reference
-    feature = QgsFeature()
-    feature.setGeometry(circle_geometry)
-    feature.setAttributes([
-        "Outer Horizontal",
-        code,
-        radius,
-        height,
-        arp_elevation,
-        _active_rule_set,
-        arp_x,
-        arp_y,
-        _params_json,
-    ])
-
-    # Add feature to layer
-    v_layer_provider.addFeatures([feature])
-    features_created += 1
-
-    print(f"OuterHorizontal: Created circle with radius {radius}m at ARP ({arp_x:.2f}, {arp_y:.2f})")
-
-v_layer.updateExtents()
+features_created = len(add_surface_features(v_layer, result, [_params_json]))
+for rec in result.features:
+    print(f"OuterHorizontal: Created circle with radius {radius}m at ARP "
+          f"({rec.attributes['arp_x']:.2f}, {rec.attributes['arp_y']:.2f})")
 print(f"OuterHorizontal: Created {features_created} outer horizontal surface(s)")
 
 register_parameters_action(v_layer)
@@ -143,7 +80,7 @@ register_parameters_action(v_layer)
 QgsProject.instance().addMapLayers([v_layer])
 
 # Style the layer
-symbol = QgsFillSymbol.createSimple({
+symbol = fill_symbol({
     'color': '0,100,255,100',  # Blue with transparency
     'style': 'solid',
     'outline_color': '0,100,255,255',
@@ -12,111 +12,35 @@ from qgis.PyQt.QtCore import *
 from qgis.PyQt.QtGui import *
 from qgis.gui import *
 from qgis.utils import iface
-from math import sqrt, degrees
 import traceback
+from qols.engine import TakeoffBuilder, build_surface
+from qols.engine.qgis_adapter import add_surface_features, create_contour_layer, create_surface_layer
+from qols.runway_context import runway_context
 
 
-def _normalize_polyline_points(geometry: 'QgsGeometry', iface=None):
-    """Return a list of QgsPoint representing a single polyline.
-    Accepts LineString or MultiLineString; for MultiLineString picks the longest part.
-    """
-    if geometry is None or geometry.isEmpty():
-        raise Exception("Empty geometry provided for runway centerline.")
-    if geometry.isMultipart():
-        parts = geometry.asMultiPolyline()
-        if not parts:
-            raise Exception("Empty MultiLineString geometry.")
-
-        def length_of(pts):
-            if not pts or len(pts) < 2:
-                return 0.0
-            total = 0.0
-            for i in range(1, len(pts)):
-                dx = pts[i].x() - pts[i-1].x()
-                dy = pts[i].y() - pts[i-1].y()
-                total += sqrt(dx*dx + dy*dy)
-            return total
-        longest = max(parts, key=length_of)
-        if iface and len(parts) > 1:
-            iface.messageBar().pushMessage("TakeOffSurface Info", "MultiLineString detected; using longest part as centerline.", level=MSG_INFO)
-        return [QgsPoint(p) for p in longest]
-    poly = geometry.asPolyline()
-    if poly and len(poly) >= 2:
-        return [QgsPoint(p) for p in poly]
-    raise Exception("Line geometry cannot be converted to a polyline. Only single line or curve types are permitted.")
-
-
-# UI Parameters - Get from plugin or use defaults (now driven by UI)
+# UI Parameters - Get from plugin or use defaults (now driven by UI; see TakeoffParams)
 print("TakeOffSurface: Script started - checking for UI parameters...")
 print(f"TakeOffSurface: Available globals keys: {list(globals().keys())}")
 
-try:
-    # Get parameters from plugin
-    code = globals().get('code', 4)
-    typeAPP = globals().get('typeAPP', 'CAT I')
-    widthApp = globals().get('widthApp', 150)
-    widthDep = globals().get('widthDep', 180)
-    maxWidthDep = globals().get('maxWidthDep', 1800)
-    CWYLength = globals().get('CWYLength', 0)
-    Z0 = globals().get('Z0', 2548)
-    # Per Issue #64: Use DER (Z0) as ZE by default to avoid hardcoded values and direction ambiguity
-    ZE = globals().get('ZE', Z0)
-    ARPH = globals().get('ARPH', 2548)
-    IHSlope = globals().get('IHSlope', 33.3/100)
-    L1 = globals().get('L1', 3000)
-    L2 = globals().get('L2', 3600)
-    LH = globals().get('LH', 8400)
-    s = globals().get('direction', 0)  # Use 'direction' like other scripts
-
-    # Newly exposed Take-Off parameters (percent values expected for divergence/slope)
-    divergencePct = globals().get('divergencePct', 12.5)
-    startDistance = globals().get('startDistance', 60.0)
-    surfaceLength = globals().get('surfaceLength', 15000.0)
-    slopePct = globals().get('slopePct', 2.0)
-
-    # Layer parameters from UI
-    runway_layer = globals().get('runway_layer')
-    threshold_layer = globals().get('threshold_layer')
-    use_runway_selected = globals().get('use_runway_selected', True)  # #129
-    use_threshold_selected = globals().get('use_threshold_selected', True)  # #129
-
-    print(f"TakeOffSurface: Using UI parameters - code={code}, direction={s}")
-    print(f"TakeOffSurface: Z0={Z0}, ZE={ZE}, widthDep={widthDep}, maxWidthDep={maxWidthDep}")
-    print(f"TakeOffSurface: divergencePct={divergencePct}%, startDistance={startDistance} m, surfaceLength={surfaceLength} m, slopePct={slopePct}%")
-    print(f"TakeOffSurface: runway_layer={runway_layer}, threshold_layer={threshold_layer}")
-    print(f"TakeOffSurface: Direction parameter s={s} ({'End to Start' if s == -1 else 'Start to End'})")
-
-except Exception as e:
-    print(f"TakeOffSurface: Error getting UI parameters: {e}")
-    print(f"TakeOffSurface: Traceback: {traceback.format_exc()}")
-    # Fallback to ORIGINAL defaults - Exactly as original
-    code = 4
-    typeAPP = 'CAT I'
-    widthApp = 150
-    widthDep = 180
-    maxWidthDep = 1800
-    CWYLength = 0
-    Z0 = 2548
-    ZE = Z0  # Use DER as datum in fallback as well (no hardcoded ZE)
-    ARPH = 2548
-    IHSlope = 33.3/100
-    L1 = 3000
-    L2 = 3600
-    LH = 8400
-    s = 0
-    divergencePct = 12.5
-    startDistance = 60.0
-    surfaceLength = 15000.0
-    slopePct = 2.0
-    runway_layer = None
-    threshold_layer = None
-    use_runway_selected = True
-    use_threshold_selected = True
-
-# ORIGINAL calculations - Exactly as original
-ZIH = 45 + ARPH
-
-print(f"TakeOffSurface: Direction will be applied during azimuth calculation")
+builder = TakeoffBuilder()
+params = builder.params_from_namespace(globals())
+s = params.direction  # Use 'direction' like other scripts
+Z0 = params.start_elevation_m
+# Per Issue #64: Use DER (Z0) as ZE by default to avoid hardcoded values and direction ambiguity
+ZE = params.der_elevation_m
+
+# Layer parameters from UI
+runway_layer = globals().get('runway_layer')
+threshold_layer = globals().get('threshold_layer')
+use_runway_selected = globals().get('use_runway_selected', True)  # #129
+use_threshold_selected = globals().get('use_threshold_selected', True)  # #129
+
+print(f"TakeOffSurface: Using UI parameters - code={params.runway_code}, direction={s}")
+print(f"TakeOffSurface: Z0={Z0}, ZE={ZE}, widthDep={params.departure_width_m}, maxWidthDep={params.max_departure_width_m}")
+print(f"TakeOffSurface: divergencePct={params.divergence_pct}%, startDistance={params.start_distance_m} m, "
+      f"surfaceLength={params.surface_length_m} m, slopePct={params.slope_pct}%")
+print(f"TakeOffSurface: runway_layer={runway_layer}, threshold_layer={threshold_layer}")
+print(f"TakeOffSurface: Direction parameter s={s} ({'End to Start' if s == -1 else 'Start to End'})")
 
 print(f"TakeOffSurface: Getting map CRS...")
 try:
@@ -127,216 +51,69 @@ except Exception as e:
     print(f"TakeOffSurface: CRS Traceback: {traceback.format_exc()}")
     raise
 
-# RUNWAY LAYER CENTERLINE SELECTION - Hybrid approach
+# LAYER SELECTION - Hybrid approach: the layers come from the UI, or by
+# the original name / active-layer lookup; the runway and thresholds are
+# then read through the shared runway context, resolved once per edit.
 try:
-    if runway_layer:
-        # Use layer from UI
-        print(f"TakeOffSurface: Using Runway Layer Centerline from UI: {runway_layer.name()}")
-        layer = runway_layer
-        if use_runway_selected:
-            # Require explicit feature selection (#129)
-            selection = layer.selectedFeatures()
-            if not selection:
-                raise Exception("No runway features selected. Please select runway features.")
-            print(f"TakeOffSurface: Using {len(selection)} selected runway features")
-        else:
-            selection = layer.selectedFeatures()
-            if not selection:
-                # No selection, use all features
-                selection = list(layer.getFeatures())
-                if not selection:
-                    raise Exception("No features found in Runway Layer Centerline.")
-                print(f"TakeOffSurface: No selection, using first feature from layer")
-                selection = [selection[0]]
-    else:
-        # ORIGINAL METHOD - Gets the Runway Layer Centerline based on name and selected feature
+    if not runway_layer:
+        # ORIGINAL METHOD - Gets the Runway Layer Centerline based on name
         print("TakeOffSurface: No Runway Layer Centerline from UI, searching by name")
         for layer in QgsProject.instance().mapLayers().values():
             if "runway" in layer.name():
-                layer = layer
-                selection = layer.selectedFeatures()
-                if not selection:
-                    selection = list(layer.getFeatures())
-                    if selection:
-                        selection = [selection[0]]
+                runway_layer = layer
                 break
         else:
             raise Exception("No Runway Layer Centerline found")
-
-    print(f"TakeOffSurface: Using Runway Layer Centerline: {layer.name()}")
-
-    # ORIGINAL runway calculations
-    rwy_geom = selection[0].geometry()
-    rwy_length = rwy_geom.length()
-    rwy_slope = (Z0-ZE)/rwy_length
-    print(f"TakeOffSurface: rwy_length={rwy_length}")
-
-except Exception as e:
-    print(f"TakeOffSurface: Error with Runway Layer Centerline: {e}")
-    iface.messageBar().pushMessage("TakeOffSurface Error", f"Runway Layer Centerline error: {str(e)}", level=MSG_CRITICAL)
-    raise
-
-# ORIGINAL ZIHs calculation (kept for compatibility; not used in geometry below)
-ZIHs = ((Z0 - ((Z0 - ZE) / rwy_length) * 1800))
-
-# Get the azimuth of the line - FIXED: Simplified consistent logic like other scripts
-for feat in selection:
-    line_pts = _normalize_polyline_points(feat.geometry(), iface)
-    print(f"TakeOffSurface: Geometry points count (normalized): {len(line_pts)}")
-
-    # FIXED: Always use the same points regardless of direction
-    # Direction change is handled by azimuth rotation only (like approach-surface)
-    start_point = line_pts[0]   # Always first point
-    end_point = line_pts[-1]    # Always last point
-    angle0 = start_point.azimuth(end_point)
-
-    print(f"TakeOffSurface: Using consistent points regardless of direction")
-    print(f"TakeOffSurface: start_point = first vertex of normalized line")
-    print(f"TakeOffSurface: end_point = last vertex of normalized line")
-    print(f"TakeOffSurface: Start point: {start_point.x():.2f}, {start_point.y():.2f}")
-    print(f"TakeOffSurface: End point: {end_point.x():.2f}, {end_point.y():.2f}")
-    print(f"TakeOffSurface: Base azimuth (angle0): {angle0:.2f}°")
-    break  # Use first feature
-
-# Initial true azimuth data - FIXED: Proper direction logic for real difference
-# Always use the same points but change the azimuth by exactly 180 degrees
-if s == -1:
-    # For reverse direction, use the opposite direction (180 degrees from normal)
-    azimuth = angle0 + 180
-    if azimuth >= 360:
-        azimuth -= 360
-    print(f"TakeOffSurface: REVERSE direction - using angle0 + 180 = {angle0:.2f} + 180 = {azimuth:.2f}°")
-else:
-    # For normal direction, use the forward azimuth as-is
-    azimuth = angle0
-    print(f"TakeOffSurface: NORMAL direction - using angle0 = {azimuth:.2f}°")
-
-print(f"TakeOffSurface: Using direction s={s}")
-print(f"TakeOffSurface: Base azimuth (angle0): {angle0:.2f}°")
-print(f"TakeOffSurface: Final azimuth: {azimuth:.2f}°")
-print(f"TakeOffSurface: Expected difference between directions: 180°")
-print(f"TakeOffSurface: Direction interpretation - s={s} means {'End to Start' if s == -1 else 'Start to End'}")
-
-bazimuth = azimuth + 180
-if bazimuth >= 360:
-    bazimuth -= 360
-
-print(f"TakeOffSurface: Back azimuth (bazimuth): {bazimuth:.2f}°")
-print(f"TakeOffSurface: Direction button should now work correctly!")
-
-# THRESHOLD LAYER SELECTION - Hybrid approach
-try:
-    if threshold_layer:
-        # Use layer from UI
-        print(f"TakeOffSurface: Using threshold layer from UI: {threshold_layer.name()}")
-        if use_threshold_selected:
-            # Require explicit feature selection (#129)
-            threshold_selection = threshold_layer.selectedFeatures()
-            if not threshold_selection:
-                raise Exception("No threshold features selected. Please select threshold features.")
-            print(f"TakeOffSurface: Using {len(threshold_selection)} selected threshold features")
-        else:
-            threshold_selection = threshold_layer.selectedFeatures()
-            if not threshold_selection:
-                # No selection, use all features
-                threshold_selection = list(threshold_layer.getFeatures())
-                if not threshold_selection:
-                    raise Exception("No features found in threshold layer.")
-                print(f"TakeOffSurface: No selection, using first feature from threshold layer")
-                threshold_selection = [threshold_selection[0]]
-    else:
-        # ORIGINAL METHOD - Gets the THR definition from active layer
+    if not threshold_layer:
+        # ORIGINAL METHOD - Gets the THR definition from the active layer's selection
         print("TakeOffSurface: No threshold layer from UI, using active layer")
-        layer = iface.activeLayer()
-        threshold_selection = layer.selectedFeatures()
-        if not threshold_selection:
-            raise Exception("No features selected in active layer for threshold.")
-        print(f"TakeOffSurface: Using active layer: {layer.name()}")
+        threshold_layer = iface.activeLayer()
+        use_threshold_selected = True
+        if threshold_layer is None:
+            raise Exception("No threshold layer provided. Please select a threshold layer from the UI.")
+    context = runway_context(runway_layer, threshold_layer, s,
+                             use_runway_selected, use_threshold_selected, iface=iface)
+    print(f"TakeOffSurface: Using {len(context.runway_features)} runway features from {runway_layer.name()}")
+    print(f"TakeOffSurface: Using {len(context.threshold_features)} threshold features from {threshold_layer.name()}")
+    print(f"TakeOffSurface: rwy_length={context.runway.runway_length}")
 
 except Exception as e:
-    print(f"TakeOffSurface: Error with threshold layer: {e}")
-    iface.messageBar().pushMessage("TakeOffSurface Error", f"Threshold layer error: {str(e)}", level=MSG_CRITICAL)
+    print(f"TakeOffSurface: Error with Runway Layer Centerline / threshold layer: {e}")
+    iface.messageBar().pushMessage("TakeOffSurface Error", f"Layer selection error: {str(e)}", level=MSG_CRITICAL)
     raise
 
-# Get x,y from threshold - EXACTLY as original
-for feat in threshold_selection:
-    new_geom = QgsPoint(feat.geometry().asPoint())
-    new_geom.addZValue(Z0)
-
-list_pts = []
-
-# Origin - EXACTLY as original
-pt_0D = new_geom
-
-# Distance for surface start - now uses UI parameter startDistance and CWY interaction
-# Start distance is the minimum; if CWYLength is longer, use CWYLength
-dD = max(startDistance, CWYLength)
+# Direction change is handled by azimuth rotation only (like
+# approach-surface); the surface starts max(startDistance, CWYLength)
+# beyond the last selected threshold, along the back azimuth.
+runway = context.runway
+result = build_surface(builder, params, runway)
+info = result.info
+print(f"TakeOffSurface: Final azimuth: {info['azimuth']:.2f}°")
+print(f"TakeOffSurface: Back azimuth (bazimuth): {info['back_azimuth']:.2f}°")
 
-# Convert percentages to decimal ratios for geometry calculations
-divergence_ratio = float(divergencePct) / 100.0
-slope_ratio = float(slopePct) / 100.0
-
-# ORIGINAL surface calculation - Point by point exactly as original
-pt_01D = new_geom.project(dD, bazimuth)
-pt_01D.setZ(ZE)
-pt_01DL = pt_01D.project(widthDep/2, bazimuth+90)
-pt_01DR = pt_01D.project(widthDep/2, bazimuth-90)
-
-# Distance to reach maximum width - uses divergence ratio from UI
-distance_to_max_width = ((maxWidthDep / 2.0 - widthDep / 2.0) / divergence_ratio) if divergence_ratio != 0 else 0.0
-pt_02D = pt_01D.project(distance_to_max_width, bazimuth)
-pt_02D.setZ(ZE + distance_to_max_width * slope_ratio)
-pt_02DL = pt_02D.project(maxWidthDep/2, bazimuth+90)
-pt_02DR = pt_02D.project(maxWidthDep/2, bazimuth-90)
-
-# Distance to end of TakeOff Climb Surface - uses UI surfaceLength and slope
-pt_03D = pt_01D.project(surfaceLength, bazimuth)
-pt_03D.setZ(ZE + surfaceLength * slope_ratio)
-pt_03DL = pt_03D.project(maxWidthDep/2, bazimuth+90)
-pt_03DR = pt_03D.project(maxWidthDep/2, bazimuth-90)
-
-list_pts.extend((pt_0D,pt_01D,pt_01DL,pt_01DR,pt_02D,pt_02DL,pt_02DR,pt_03D,pt_03DL,pt_03DR))
-
-# Creation of the Take Off Climb Surfaces - EXACTLY as original
-# Create memory layer
-v_layer = QgsVectorLayer("PolygonZ?crs="+map_srid, "RWY_TakeOffClimbSurface", "memory")
-IDField = QgsField( 'ID', QVariant.String)
-NameField = QgsField( 'SurfaceName', QVariant.String)
-RuleField = QgsField( 'rule_set', QVariant.String)
-v_layer.dataProvider().addAttributes([IDField])
-v_layer.dataProvider().addAttributes([NameField])
-v_layer.dataProvider().addAttributes([RuleField])
-v_layer.updateFields()
+# Creation of the Take Off Climb Surfaces
+v_layer = create_surface_layer(result, map_srid)
 
 # Store the full input parameter set as HTML-inspectable JSON (#118)
-from qols.parameters_inspector import build_parameters_json, add_parameters_field, register_parameters_action
+from qols.parameters_inspector import build_parameters_json, register_parameters_action
 
-_active_rule_set = globals().get('active_rule_set', None)
 _params_json = build_parameters_json('Take-Off Climb Surface', {
-    'code': code,
-    'widthApp': widthApp,
-    'widthDep': widthDep,
-    'maxWidthDep': maxWidthDep,
-    'CWYLength': CWYLength,
+    'code': params.runway_code,
+    'widthApp': params.approach_width_m,
+    'widthDep': params.departure_width_m,
+    'maxWidthDep': params.max_departure_width_m,
+    'CWYLength': params.clearway_length_m,
     'Z0': Z0,
     'ZE': ZE,
-    'ARPH': ARPH,
-    'divergencePct': divergencePct,
-    'startDistance': startDistance,
-    'surfaceLength': surfaceLength,
-    'slopePct': slopePct,
+    'ARPH': params.arp_elevation_m,
+    'divergencePct': params.divergence_pct,
+    'startDistance': params.start_distance_m,
+    'surfaceLength': params.surface_length_m,
+    'slopePct': params.slope_pct,
     'direction': s,
-    'rule_set': _active_rule_set,
+    'rule_set': params.rule_set,
 })
-add_parameters_field(v_layer)
-
-# Take Off Climb Surface Creation - EXACTLY as original
-SurfaceArea = [pt_03DR,pt_03DL,pt_02DL,pt_01DL,pt_01DR,pt_02DR]
-pr = v_layer.dataProvider()
-seg = QgsFeature()
-seg.setGeometry(QgsPolygon(QgsLineString(SurfaceArea), rings=[]))
-seg.setAttributes([13,'TakeOff Climb Surface', _active_rule_set, _params_json])
-pr.addFeatures( [ seg ] )
+add_surface_features(v_layer, result, [_params_json])
 
 register_parameters_action(v_layer)
 
@@ -377,60 +154,15 @@ iface.messageBar().pushMessage("QPANSOPY:", "TakeOff Climb Surface Calculation F
 # -----------------------------------------------------------------------
 # Contour layer (CT-17 – CT-21)
 # -----------------------------------------------------------------------
-contour_interval_m = int(globals().get('contour_interval_m', 0))
+contour_interval_m = params.contour_interval_m
 if contour_interval_m > 0:
-    import importlib.util as _ilu
-    import os as _os
-    import sys as _sys
-    _utils_path = _os.path.join(_os.path.dirname(__file__), '_contour_utils.py')
-    _cu_spec = _ilu.spec_from_file_location('_contour_utils', _utils_path)
-    _cu = _ilu.module_from_spec(_cu_spec)
-    _sys.modules['_contour_utils'] = _cu          # must precede exec_module (Python 3.14+)
-    _cu_spec.loader.exec_module(_cu)
-
-    _z_end = ZE + surfaceLength * slope_ratio
-    _elevs = _cu.contour_elevations(ZE, _z_end, contour_interval_m)
-    _all_specs = _cu.contour_specs_for_takeoff(
-        z_start=ZE,
-        slope_ratio=slope_ratio,
-        distance_to_max_width=distance_to_max_width,
-        surface_length=surfaceLength,
-        near_half_width=widthDep / 2,
-        max_half_width=maxWidthDep / 2,
-        divergence_ratio=divergence_ratio,
-        elevations=_elevs,
-    )
-
-    if _all_specs:
-        _clayer = QgsVectorLayer(
-            "LineStringZ?crs=" + map_srid,
-            "RWY_TakeOffSurface_Contours",
-            "memory",
-        )
-        _clayer.dataProvider().addAttributes([
-            QgsField('ID', QVariant.Int),
-            QgsField('surface_elevation', QVariant.Double),
-        ])
-        _clayer.updateFields()
-
-        _cfeats = []
-        for _i, _spec in enumerate(_all_specs):
-            _ctr = pt_01D.project(_spec.distance_from_origin, bazimuth)
-            _l2d = _ctr.project(_spec.half_width, bazimuth + 90)
-            _r2d = _ctr.project(_spec.half_width, bazimuth - 90)
-            _lpt = QgsPoint(_l2d.x(), _l2d.y(), _spec.elevation)
-            _rpt = QgsPoint(_r2d.x(), _r2d.y(), _spec.elevation)
-            _feat = QgsFeature()
-            _feat.setGeometry(QgsGeometry(QgsLineString([_lpt, _rpt])))
-            _feat.setAttributes([_i + 1, _spec.elevation])
-            _cfeats.append(_feat)
-        _clayer.dataProvider().addFeatures(_cfeats)
-
-        _cu.apply_contour_style(_clayer, __file__)
-
+    _clayer = create_contour_layer(result, map_srid)
+    if _clayer is not None:
+        from qols.scripts._contour_utils import apply_contour_style
+        apply_contour_style(_clayer, __file__)
         QgsProject.instance().addMapLayers([_clayer])
         _clayer.triggerRepaint()
-        print(f"TakeOffSurface: Contour layer added — {len(_cfeats)} lines at {contour_interval_m} m interval")
+        print(f"TakeOffSurface: Contour layer added — {len(result.contours)} lines at {contour_interval_m} m interval")
     else:
         print(f"TakeOffSurface: No contour lines — no elevation levels in range for interval {contour_interval_m} m")
 
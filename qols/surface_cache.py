@@ -0,0 +1,386 @@
+"""qols/surface_cache.py — content-addressed memo of surface builds.
+
+Recalculating a surface with unchanged inputs — toggling the direction
+back, re-running after a project reload, Calculate All after a single
+Calculate — used to redo all the geometry work. A build is a pure
+function of its inputs, so :class:`SurfaceCache` keys each one on a
+SHA-256 of (:func:`surface_cache_key`):
+
+* the surface type and the builder's full parameter object (which holds
+  the active rule set's name and every value the rule set filled in),
+* the runway centerline / threshold / ARP coordinates and the CRS,
+* :data:`SURFACE_CACHE_VERSION` and a hash of the engine sources, so a
+  plugin update never serves geometry from older code.
+
+Results are kept in a small in-memory LRU (the objects themselves,
+``QgsGeometry`` included) and in an SQLite file in the QGIS profile,
+capped at :data:`MAX_DISK_BYTES` with least-recently-used eviction. On
+disk a result is stored as three NumPy arrays (``np.savez``, loaded with
+``allow_pickle=False``): every ring, cutout and contour vertex in one
+float array, the prepared geometries' WKB in one byte array, and JSON for
+attributes, info and offsets — a disk hit rebuilds the layer geometries
+straight from the WKB. A result's analytic patch table (cones and all)
+is stored alongside, coefficients and rings in the float array, so the
+evaluation index of a disk hit matches that of a fresh build.
+
+Lookups and stores run on the task-manager worker threads
+(:class:`~qols.surface_task.SurfaceBuildTask`), so the memory LRU is
+locked and each SQLite access opens its own connection.
+"""
+from __future__ import annotations
+
+import enum
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+import numpy as np
+
+from .engine import (
+    ContourLine, PatchTable, RunwayGeometry, SurfaceBuilder, SurfaceFeature, SurfaceParams, SurfaceResult,
+)
+from . import logger
+
+__all__ = [
+    "SURFACE_CACHE_VERSION",
+    "MAX_MEMORY_ENTRIES",
+    "MAX_DISK_BYTES",
+    "surface_cache_key",
+    "encode_result",
+    "decode_result",
+    "SurfaceCache",
+    "surface_cache",
+    "clear_surface_cache",
+]
+
+# Bump when the stored payload layout changes.
+SURFACE_CACHE_VERSION = 3
+MAX_MEMORY_ENTRIES = 32
+MAX_DISK_BYTES = 256 * 1024 * 1024
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+# Sources a build result depends on, relative to the package.
+_CODE_SOURCES = ("engine", os.path.join("scripts", "_contour_utils.py"), "geometry_difference.py")
+
+
+def _json_value(value: Any) -> Any:
+    """``json.dumps`` fallback for NumPy values and enums."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+@lru_cache(maxsize=None)
+def _code_version() -> str:
+    """SHA-256 over the engine sources (read once per session)."""
+    digest = hashlib.sha256(str(SURFACE_CACHE_VERSION).encode())
+    for source in _CODE_SOURCES:
+        path = os.path.join(_PACKAGE_DIR, source)
+        files = [path] if os.path.isfile(path) else sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.endswith(".py"))
+        for file_path in files:
+            digest.update(os.path.relpath(file_path, _PACKAGE_DIR).encode())
+            with open(file_path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def surface_cache_key(builder: SurfaceBuilder, params: SurfaceParams, runway: Any, crs: str = "") -> str:
+    """Stable hex key of one ``build_surface(builder, params, runway)``
+    call; ``runway`` is a :class:`~qols.engine.RunwayGeometry` or a
+    sequence of them (a single runway and a one-element list build alike)."""
+    runways = [runway] if isinstance(runway, RunwayGeometry) else list(runway)
+    document = {
+        "code": _code_version(),
+        "surface_type": builder.surface_type,
+        "params": params.as_dict(),
+        "runways": [[rw.centerline, rw.thresholds, rw.arp_points, rw.length] for rw in runways],
+        "crs": crs or "",
+    }
+    text = json.dumps(document, sort_keys=True, separators=(",", ":"), default=_json_value)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Payload
+# ---------------------------------------------------------------------------
+
+def encode_result(result: SurfaceResult) -> bytes:
+    """Serialise ``result`` (and its ``related`` parts) for the disk store:
+    every ring, cutout, contour and patch-table array packed into one float
+    array, every WKB into one byte array, the rest as JSON with the offsets.
+
+    Raises:
+        TypeError: if an attribute or info value is not JSON serialisable.
+    """
+    coords: list = []
+    wkbs: list = []
+    sizes = [0, 0]  # rows in coords, bytes in wkbs
+
+    def add(values) -> list:
+        array = np.asarray(values, dtype=float)
+        coords.append(array.reshape(-1))
+        offset = sizes[0]
+        sizes[0] += array.size
+        return [offset, *array.shape]
+
+    def add_wkb(geometry) -> list:
+        wkb = bytes(geometry.asWkb())
+        wkbs.append(wkb)
+        sizes[1] += len(wkb)
+        return [sizes[1] - len(wkb), len(wkb)]
+
+    def patches(table) -> Optional[dict]:
+        if table is None:
+            return None
+        return {
+            "kinds": table.kinds.tolist(),
+            "coeffs": add(table.coeffs),
+            "surfaces": table.surfaces.tolist(),
+            "bboxes": add(table.bboxes),
+            "rings": [[add(ring) for ring in rings] for rings in table.rings],
+        }
+
+    def part(r: SurfaceResult) -> dict:
+        geometries = r.geometries if r.geometries is not None and len(r.geometries) == len(r.features) else None
+        return {
+            "surface_type": r.surface_type,
+            "layer_name": r.layer_name,
+            "fields": [list(spec) for spec in r.fields],
+            "contour_layer_name": r.contour_layer_name,
+            "info": r.info,
+            "features": [{
+                "attributes": record.attributes,
+                "rings": [add(ring) for ring in record.rings],
+                "cutouts": [add(cutout) for cutout in record.cutouts],
+                "cutout_z": record.cutout_z,
+                "wkb": add_wkb(geometries[i]) if geometries is not None else None,
+            } for i, record in enumerate(r.features)],
+            "contours": [{"points": add(line.points), "elevation": line.elevation} for line in r.contours],
+            "patches": patches(r.patches),
+            "cache_key": r.cache_key,
+            "related": [part(related) for related in r.related],
+        }
+
+    meta = json.dumps(part(result), default=_json_value).encode("utf-8")
+    buffer = io.BytesIO()
+    np.savez(buffer,
+             meta=np.frombuffer(meta, dtype=np.uint8),
+             coords=np.concatenate(coords) if coords else np.empty(0),
+             wkb=np.frombuffer(b"".join(wkbs), dtype=np.uint8))
+    return buffer.getvalue()
+
+
+def decode_result(payload: bytes) -> SurfaceResult:
+    """Inverse of :func:`encode_result`; rings come back as NumPy arrays,
+    stored WKB as prepared ``QgsGeometry`` objects and stored patch tables
+    as :class:`~qols.engine.PatchTable` objects."""
+    with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+        meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+        coords = data["coords"]
+        wkb = data["wkb"].tobytes()
+
+    def array(spec: list) -> np.ndarray:
+        offset, *shape = spec
+        return coords[offset:offset + int(np.prod(shape))].reshape(shape)
+
+    def patches(m: Optional[dict]) -> Optional[PatchTable]:
+        if m is None:
+            return None
+        return PatchTable.from_arrays(m["kinds"], array(m["coeffs"]), m["surfaces"], array(m["bboxes"]),
+                                      [[array(spec) for spec in rings] for rings in m["rings"]])
+
+    def part(m: dict) -> SurfaceResult:
+        result = SurfaceResult(
+            surface_type=m["surface_type"],
+            layer_name=m["layer_name"],
+            fields=tuple(tuple(spec) for spec in m["fields"]),
+            features=[SurfaceFeature(
+                rings=[array(spec) for spec in f["rings"]],
+                attributes=f["attributes"],
+                cutouts=[array(spec) for spec in f["cutouts"]],
+                cutout_z=f["cutout_z"],
+            ) for f in m["features"]],
+            contours=[ContourLine(array(c["points"]), c["elevation"]) for c in m["contours"]],
+            contour_layer_name=m["contour_layer_name"],
+            info=m["info"],
+            related=tuple(part(related) for related in m["related"]),
+            patches=patches(m["patches"]),
+            cache_key=m["cache_key"],
+        )
+        spans = [f["wkb"] for f in m["features"]]
+        if spans and all(span is not None for span in spans):
+            from .engine.qgis_adapter import geometry_from_wkb
+
+            result.geometries = [geometry_from_wkb(wkb[offset:offset + size]) for offset, size in spans]
+        return result
+
+    return part(meta)
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class SurfaceCache:
+    """In-memory LRU of :class:`~qols.engine.SurfaceResult` objects in front
+    of an optional SQLite store at ``path``.
+
+    Cached results are shared, not copied: callers must not modify them.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = MAX_MEMORY_ENTRIES,
+                 max_bytes: int = MAX_DISK_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_failed = False
+
+    def key(self, builder: SurfaceBuilder, params: SurfaceParams, runway: Any, crs: str = "") -> Optional[str]:
+        """:func:`surface_cache_key`, or ``None`` (build uncached) when the
+        inputs cannot be hashed."""
+        try:
+            return surface_cache_key(builder, params, runway, crs)
+        except (TypeError, ValueError, OSError) as e:
+            logger.info(f"Surface {builder.surface_type} not cached: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[SurfaceResult]:
+        """The cached result for ``key``, from memory or disk, or ``None``."""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return result
+        payload = self._disk_get(key)
+        result = None
+        if payload is not None:
+            try:
+                result = decode_result(payload)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable cached surface {key[:12]}: {e}")
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: SurfaceResult) -> None:
+        """Cache ``result`` (geometries prepared, if it is to be stored
+        with its WKB) under ``key``."""
+        with self._lock:
+            self._remember(key, result)
+        if self.path is None or self._disk_failed:
+            return
+        try:
+            payload = encode_result(result)
+        except (TypeError, ValueError) as e:
+            logger.info(f"Surface {result.surface_type} not cached on disk: {e}")
+            return
+        self._disk_put(key, payload)
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the in-memory entries (and, with ``disk``, the store)."""
+        with self._lock:
+            self._memory.clear()
+        if disk and self.path is not None and os.path.exists(self.path):
+            try:
+                with self._connect() as db:
+                    db.execute("DELETE FROM surfaces")
+            except sqlite3.Error as e:
+                logger.warning(f"Could not clear the surface cache: {e}")
+
+    def _remember(self, key: str, result: SurfaceResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # -- SQLite ---------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5.0)
+        db.execute("CREATE TABLE IF NOT EXISTS surfaces ("
+                   "key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+        db.execute("CREATE INDEX IF NOT EXISTS surfaces_last_used ON surfaces (last_used)")
+        return db
+
+    def _disk_error(self, e: Exception) -> None:
+        # One warning, then the session carries on memory-only.
+        self._disk_failed = True
+        logger.warning(f"Surface cache store {self.path!r} unavailable, caching in memory only: {e}")
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if self.path is None or self._disk_failed or not os.path.exists(self.path):
+            return None
+        try:
+            db = self._connect()
+            try:
+                with db:
+                    row = db.execute("SELECT payload FROM surfaces WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        db.execute("UPDATE surfaces SET last_used = ? WHERE key = ?", (time.time(), key))
+            finally:
+                db.close()
+        except (sqlite3.Error, OSError) as e:
+            self._disk_error(e)
+            return None
+        return bytes(row[0]) if row is not None else None
+
+    def _disk_put(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes // 4:
+            return  # one huge surface would flush everything else
+        try:
+            db = self._connect()
+            try:
+                with db:
+                    db.execute("INSERT OR REPLACE INTO surfaces (key, payload, size, last_used) VALUES (?, ?, ?, ?)",
+                               (key, sqlite3.Binary(payload), len(payload), time.time()))
+                    # Evict least recently used entries beyond the size cap.
+                    db.execute(
+                        "DELETE FROM surfaces WHERE key IN (SELECT key FROM ("
+                        "SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running FROM surfaces"
+                        ") WHERE running > ?)", (self.max_bytes,))
+            finally:
+                db.close()
+        except (sqlite3.Error, OSError) as e:
+            self._disk_error(e)
+
+
+_cache: Optional[SurfaceCache] = None
+
+
+def surface_cache() -> SurfaceCache:
+    """The session cache, stored in ``qols/surface_cache.sqlite`` under the
+    QGIS profile directory."""
+    global _cache
+    if _cache is None:
+        from qgis.core import QgsApplication
+
+        _cache = SurfaceCache(os.path.join(QgsApplication.qgisSettingsDirPath(), "qols", "surface_cache.sqlite"))
+    return _cache
+
+
+def clear_surface_cache() -> None:
+    """Drop the in-memory entries of the session cache (plugin unload)."""
+    if _cache is not None:
+        _cache.clear()
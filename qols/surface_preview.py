@@ -0,0 +1,167 @@
+"""qols/surface_preview.py — live, layer-free preview of the active surface.
+
+Seeing what a parameter does used to take a Calculate click: a new memory
+layer, added to the project, zoomed and repainted, with the old layers
+piling up. With *Live Preview* ticked, each dock hands its parameter edits
+to a :class:`SurfacePreview`, which waits for the edits to settle (a short
+single-shot ``QTimer`` debounce), rebuilds the active surface on the
+geometry-only path and draws it on two ``QgsRubberBand`` overlays — one
+for the surface polygons, one for the contours. Nothing touches the
+project; only Calculate commits a surface.
+
+The build reuses what Calculate All already shares: the runway /
+threshold / ARP coordinates come from :func:`qols.pipeline.resolve_runways`
+(cached by :mod:`qols.runway_context` until the layers change), the
+parameters go through the builder's ``params_from_namespace`` exactly as
+the scripts' ``globals()`` would, and the geometries are parsed from packed
+WKB — all polygons without cutouts in one MultiPolygonZ, every contour
+ring in one MultiLineStringZ — so a preview costs one engine build plus a
+couple of ``fromWkb`` calls.
+"""
+import time
+from typing import Any, Callable, Mapping, Optional
+
+from qgis.PyQt.QtCore import QTimer
+from qgis.PyQt.QtGui import QColor
+from qgis.gui import QgsRubberBand
+
+from .compat import GEOM_TYPE_LINE, GEOM_TYPE_POLYGON
+from .engine import SurfaceResult, build_surface, get_builder
+from .engine.qgis_adapter import geometry_from_wkb, surface_geometry
+from .engine.wkb import multilinestring_z_wkb, multipolygon_z_wkb
+from .pipeline import resolve_runways
+from .rules import manager as rule_mgr
+from .surface_types import SurfaceType
+from . import logger
+
+__all__ = ["PREVIEW_DEBOUNCE_MS", "preview_namespace", "build_preview", "preview_geometries", "SurfacePreview"]
+
+# Quiet time after the last edit before the preview is rebuilt — long
+# enough to swallow a burst of keystrokes, short enough to feel live.
+PREVIEW_DEBOUNCE_MS = 150
+
+
+def preview_namespace(params: Mapping[str, Any]) -> dict:
+    """The flat namespace a script would see for the dock ``params``
+    (``params`` merged with ``specific_params``), as Calculate All builds
+    it."""
+    namespace = {'active_rule_set': rule_mgr.get_active_rule_set_name()}
+    namespace.update(params)
+    namespace.update(params.get('specific_params', {}))
+    return namespace
+
+
+def build_preview(params: Mapping[str, Any]) -> SurfaceResult:
+    """Build the surface of the dock ``params`` headless — no layer, no
+    project, no canvas. Raises like the scripts when an input is missing."""
+    surface_type = SurfaceType(params['surface_type'])
+    builder = get_builder(surface_type)
+    runways = resolve_runways(params, with_arps=surface_type == SurfaceType.OUTER_HORIZONTAL)
+    return build_surface(
+        builder, builder.params_from_namespace(preview_namespace(params)), runways.runway_for(surface_type))
+
+
+def preview_geometries(result: SurfaceResult) -> tuple[list, Optional[Any]]:
+    """``(polygons, contours)`` to draw for ``result`` and its related
+    parts: plain features packed into one MultiPolygonZ, features with
+    cutouts through :func:`~qols.engine.qgis_adapter.surface_geometry`,
+    and every contour as one MultiLineStringZ (``None`` if there are
+    none)."""
+    parts = (*result.related, result)
+    records = [record for part in parts for record in part.features]
+    polygons = []
+    plain = [record.rings for record in records if not record.cutouts]
+    if plain:
+        polygons.append(geometry_from_wkb(multipolygon_z_wkb(plain)))
+    polygons.extend(surface_geometry(record) for record in records if record.cutouts)
+    lines = [line.points for part in parts for line in part.contours]
+    contours = geometry_from_wkb(multilinestring_z_wkb(lines)) if lines else None
+    return polygons, contours
+
+
+class SurfacePreview:
+    """Debounced rubber-band preview of a dock's active surface.
+
+    ``params_provider()`` returns the dock's current parameters (or
+    ``None`` when they cannot be read). Call :meth:`schedule` from every
+    parameter, direction and tab change; it does nothing until the preview
+    is enabled. A build that fails (no selection yet, a half-typed value)
+    just clears the overlay and is kept in :attr:`last_error` — logged
+    once, not on every keystroke.
+    """
+
+    def __init__(self, canvas, params_provider: Callable[[], Optional[Mapping[str, Any]]],
+                 delay_ms: int = PREVIEW_DEBOUNCE_MS):
+        self.canvas = canvas
+        self.enabled = False
+        self.last_error: Optional[str] = None
+        self.last_build_ms: Optional[float] = None
+        self._params_provider = params_provider
+
+        self._surface_band = QgsRubberBand(canvas, GEOM_TYPE_POLYGON)
+        self._surface_band.setColor(QColor(255, 140, 0, 60))
+        self._surface_band.setStrokeColor(QColor(255, 140, 0, 230))
+        self._surface_band.setWidth(2)
+        self._contour_band = QgsRubberBand(canvas, GEOM_TYPE_LINE)
+        self._contour_band.setStrokeColor(QColor(220, 0, 0, 200))
+        self._contour_band.setWidth(1)
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.refresh)
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Turn the preview on (and draw it soon) or off (and clear it)."""
+        self.enabled = bool(enabled)
+        if self.enabled:
+            self.schedule()
+        else:
+            self.clear()
+
+    def schedule(self, *_args) -> None:
+        """(Re)start the debounce timer; any signal can connect here."""
+        if self.enabled:
+            self._timer.start()
+
+    def refresh(self) -> None:
+        """Rebuild and redraw the preview now."""
+        if not self.enabled:
+            return
+        t0 = time.perf_counter()
+        try:
+            params = self._params_provider()
+            if params is None:
+                raise ValueError("parameters could not be read")
+            polygons, contours = preview_geometries(build_preview(params))
+        except Exception as e:
+            message = str(e)
+            if message != self.last_error:
+                logger.info(f"Surface preview unavailable: {message}")
+            self.last_error = message
+            self._reset_bands()
+            return
+        self.last_error = None
+
+        self._surface_band.reset(GEOM_TYPE_POLYGON)
+        for geometry in polygons:
+            self._surface_band.addGeometry(geometry, None, False)
+        self._surface_band.updatePosition()
+        self._surface_band.update()
+        if contours is not None:
+            self._contour_band.setToGeometry(contours, None)
+        else:
+            self._contour_band.reset(GEOM_TYPE_LINE)
+        self.last_build_ms = (time.perf_counter() - t0) * 1000.0
+
+    def clear(self) -> None:
+        """Drop any pending rebuild and remove the overlay."""
+        self._timer.stop()
+        self._reset_bands()
+
+    def _reset_bands(self) -> None:
+        try:
+            self._surface_band.reset(GEOM_TYPE_POLYGON)
+            self._contour_band.reset(GEOM_TYPE_LINE)
+        except Exception as e:
+            logger.warning(f"Could not clear surface preview: {e}")
@@ -0,0 +1,225 @@
+"""qols/surface_task.py — Calculate without blocking the QGIS GUI.
+
+Every surface script reads its inputs, calls
+:func:`~qols.engine.build_surface` exactly once, then creates, fills and
+styles its layers. :class:`SurfaceCalculation` runs each script twice
+around that call: the first pass stops at ``build_surface`` (the hook
+raises :class:`_DeferBuild` carrying the builder, parameters and runway),
+the build itself — rings, contours and the ``QgsGeometry`` conversion —
+runs in a :class:`SurfaceBuildTask` on the QGIS task manager, and when
+the task finishes the script is executed again on the GUI thread with
+``build_surface`` handing back the finished result. Layer, project and
+style calls therefore all stay on the main thread, while the geometry
+work reports progress to the task manager and stops at the next ring or
+runway once canceled.
+
+Steps run strictly one after another; plain callables (the Inner
+Horizontal & Conical trim) run on the GUI thread between scripts.
+
+Given a :class:`~qols.surface_cache.SurfaceCache`, the task looks each
+build up before running it and stores what it built, so recalculating
+unchanged inputs skips straight to the layers; Inner Horizontal inside
+Inner + Conical goes through the same cache
+(:func:`~qols.engine.build_memo`).
+"""
+import traceback
+from typing import Any, Callable, Optional, Sequence
+
+from qgis.core import QgsApplication, QgsTask
+
+from .compat import TASK_CAN_CANCEL
+from .engine import BuildCanceled, build_feedback, build_hook, build_memo, build_surface, progress_span
+from .engine.qgis_adapter import prepare_geometries
+from . import logger
+
+__all__ = ["SurfaceBuildTask", "SurfaceCalculation"]
+
+
+class _DeferBuild(BaseException):
+    """Carries the captured ``build_surface`` call out of a script's first
+    pass. A ``BaseException`` so the scripts' own ``except Exception``
+    handlers let it through untouched."""
+
+    def __init__(self, builder, params, runway):
+        super().__init__(builder.surface_type)
+        self.builder = builder
+        self.params = params
+        self.runway = runway
+
+
+def _layer_crs(params: dict) -> str:
+    """Auth id of the runway layer's CRS in dock ``params`` ("" if unknown)."""
+    layer = params.get('runway_layer')
+    try:
+        return layer.crs().authid() if layer is not None else ""
+    except RuntimeError:  # layer deleted on the C++ side
+        return ""
+
+
+class SurfaceBuildTask(QgsTask):
+    """``build_surface`` calls on a worker thread, one after another.
+
+    ``builds`` is a sequence of ``(builder, params, runway)``; once the
+    task succeeded ``results`` holds their
+    :class:`~qols.engine.SurfaceResult` objects (geometries prepared) in
+    the same order, and ``error`` the exception if a build raised.
+    ``on_finished(task, ok)`` is called on the GUI thread.
+
+    With a ``cache`` each build is keyed on its inputs plus ``crs``; hits
+    are returned as cached (shared, not to be modified) and counted in
+    ``cache_hits``.
+    """
+
+    def __init__(self, description: str, builds: Sequence[tuple],
+                 on_finished: Callable[["SurfaceBuildTask", bool], None],
+                 cache=None, crs: str = ""):
+        super().__init__(description, TASK_CAN_CANCEL)
+        self.builds = list(builds)
+        self.results: list = []
+        self.error: Optional[BaseException] = None
+        self.error_traceback = ""
+        self.cache_hits = 0
+        self._on_finished = on_finished
+        self._cache = cache
+        self._crs = crs
+
+    def run(self) -> bool:
+        results = []
+        try:
+            with build_feedback(self), build_memo(self._memoized if self._cache is not None else None):
+                for i, (builder, params, runway) in enumerate(self.builds):
+                    with progress_span(i, len(self.builds)):
+                        result = self._build(builder, params, runway)
+                    results.append(result)
+                    self.setProgress(100.0 * (i + 1) / len(self.builds))
+        except BuildCanceled:
+            return False
+        except Exception as e:
+            self.error = e
+            self.error_traceback = traceback.format_exc()
+            return False
+        self.results = results
+        return True
+
+    def _build(self, builder, params, runway):
+        """One build with its geometries prepared, from the cache if it
+        holds it."""
+        key = self._cache.key(builder, params, runway, self._crs) if self._cache is not None else None
+        result = self._cache.get(key) if key is not None else None
+        if result is not None:
+            self.cache_hits += 1
+            prepare_geometries(result)  # only parts stored without WKB
+            return result
+        result = build_surface(builder, params, runway)
+        if self.isCanceled():
+            raise BuildCanceled()
+        prepare_geometries(result)
+        if key is not None:
+            result.cache_key = key
+            self._cache.put(key, result)
+        return result
+
+    def _memoized(self, builder, params, runway):
+        """:func:`~qols.engine.memoized_build` target: sub-surfaces are
+        cached like top-level builds."""
+        return self._build(builder, params, runway)
+
+    def finished(self, ok: bool) -> None:
+        self._on_finished(self, ok)
+
+
+class SurfaceCalculation:
+    """A queue of Calculate steps — ``(script_path, params)`` pairs added
+    with :meth:`add_script` and callables added with :meth:`add_step` —
+    each script's build running in a :class:`SurfaceBuildTask`.
+
+    ``execute_script(script_path, params)`` is the plugin's script runner.
+    ``on_done(error, canceled)`` is called on the GUI thread exactly once,
+    after the last step, the first failure or a cancellation. ``cache`` is
+    handed to every build task, keyed with the runway layer's CRS.
+    """
+
+    def __init__(self, description: str, execute_script: Callable[[str, dict], Any],
+                 on_done: Callable[[Optional[BaseException], bool], None], cache=None):
+        self.description = description
+        self._execute_script = execute_script
+        self._on_done = on_done
+        self._cache = cache
+        self._steps: list = []
+        self._current = None
+        self._task: Optional[SurfaceBuildTask] = None
+        self._canceled = False
+        self.running = False
+
+    def add_script(self, script_path: str, params: dict) -> None:
+        self._steps.append((script_path, params))
+
+    def add_step(self, callback: Callable[[], Any]) -> None:
+        self._steps.append(callback)
+
+    def start(self) -> None:
+        self.running = True
+        self._advance()
+
+    def cancel(self) -> None:
+        """Stop after the current step; a running build stops at its next
+        progress report and its layers are never created."""
+        self._canceled = True
+        if self._task is not None:
+            self._task.cancel()
+
+    def _advance(self) -> None:
+        try:
+            while self._steps and not self._canceled:
+                step = self._steps.pop(0)
+                if callable(step):
+                    step()
+                    continue
+                deferred = self._first_pass(*step)
+                if deferred is None:
+                    continue  # the script finished without building anything
+                self._current = step
+                self._task = SurfaceBuildTask(f"{self.description}: {deferred.builder.surface_type}",
+                                              [(deferred.builder, deferred.params, deferred.runway)],
+                                              self._task_finished, self._cache, _layer_crs(step[1]))
+                QgsApplication.taskManager().addTask(self._task)
+                return
+        except Exception as e:
+            self._finish(e)
+            return
+        self._finish(None)
+
+    def _first_pass(self, script_path: str, params: dict) -> Optional[_DeferBuild]:
+        def defer(builder, build_params, runway):
+            raise _DeferBuild(builder, build_params, runway)
+
+        try:
+            with build_hook(defer):
+                self._execute_script(script_path, params)
+        except _DeferBuild as deferred:
+            return deferred
+        return None
+
+    def _task_finished(self, task: SurfaceBuildTask, ok: bool) -> None:
+        self._task = None
+        script_path, params = self._current
+        if not ok:
+            if task.error is not None:
+                logger.error(f"Surface build failed: {task.error}\n{task.error_traceback}")
+                self._finish(task.error)
+            else:
+                self._canceled = True
+                self._finish(None)
+            return
+        try:
+            with build_hook(lambda *_args: task.results[0]):
+                self._execute_script(script_path, params)
+        except Exception as e:
+            self._finish(e)
+            return
+        self._advance()
+
+    def _finish(self, error: Optional[BaseException]) -> None:
+        self.running = False
+        self._steps.clear()
+        self._on_done(error, self._canceled)
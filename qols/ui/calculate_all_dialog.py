@@ -0,0 +1,36 @@
+"""qOLS Calculate All dialog.
+
+Provides :class:`CalculateAllDialog`, a checklist of the current-OLS
+surfaces the one-click pipeline (``qols/pipeline.py``) should build.
+"""
+from qgis.PyQt.QtWidgets import QCheckBox, QDialog, QDialogButtonBox, QLabel, QVBoxLayout
+
+from ..compat import BTN_OK, BTN_CANCEL
+from ..pipeline import CURRENT_OLS_SURFACES
+
+
+class CalculateAllDialog(QDialog):
+    """Pick the surfaces for one Calculate All run; all are checked by default."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Calculate All Surfaces")
+        self.setModal(True)
+        self._checks = {}
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Surfaces to calculate with each tab's current parameters:"))
+        for surface_type in CURRENT_OLS_SURFACES:
+            check = QCheckBox(surface_type.value)
+            check.setChecked(True)
+            self._checks[surface_type] = check
+            layout.addWidget(check)
+
+        self.buttons = QDialogButtonBox(BTN_OK | BTN_CANCEL)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+
+    def selected_surface_types(self):
+        """Checked surfaces, in :data:`~qols.pipeline.CURRENT_OLS_SURFACES` order."""
+        return [surface_type for surface_type, check in self._checks.items() if check.isChecked()]
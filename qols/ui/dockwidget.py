@@ -14,6 +14,7 @@ Business logic (ICAO table lookups, rule-set merging) lives in
 """
 import os
 import traceback
+from functools import partial
 from dataclasses import dataclass
 from ..surfaces.icao import (
     get_conical_defaults as icao_get_conical_defaults,
@@ -27,7 +28,8 @@ from ..surfaces.new_ols_transitional import get_new_ols_transitional_defaults
 from ..surface_types import SurfaceType
 from .. import logger  # CR-01
 from ..direction_marker import build_marker_geometry
-from ..parameters_inspector import show_project_parameters_table
+from ..layer_access import feature_count, in_project, selected_count
+from ..surface_preview import SurfacePreview
 from .tab_row_selector import TwoRowTabSelector
 from qgis.PyQt import uic
 from qgis.PyQt.QtCore import pyqtSignal, pyqtSlot, QRegularExpression
@@ -70,6 +72,8 @@ class _ApproachState:
 class QolsDockWidget(QDockWidget, FORM_CLASS):
     closingPlugin = pyqtSignal()
     calculateClicked = pyqtSignal()
+    calculateAllClicked = pyqtSignal()
+    cancelCalculationClicked = pyqtSignal()
     closeClicked = pyqtSignal()
 
     # Single source of truth for numeric widget defaults (CR-06).
@@ -110,6 +114,34 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
         'spin_ARP_elevation':        2548.0,
     }
 
+    # scriptTabStack pages. Each page's defaults are seeded on its first
+    # activation (TwoRowTabSelector page initializers), not all at once
+    # when the panel is built; spin_ARP_elevation sits above the tabs and
+    # is seeded with the panel.
+    _PAGE_APPROACH, _PAGE_INNER_CONICAL, _PAGE_OFZ, _PAGE_OUTER, _PAGE_TRANSITIONAL, _PAGE_TAKEOFF = range(6)
+    _PAGE_DEFAULT_WIDGETS: dict = {
+        _PAGE_APPROACH: ('spin_widthApp', 'spin_Z0', 'spin_ZE', 'spin_L1', 'spin_L2', 'spin_LH'),
+        _PAGE_INNER_CONICAL: ('spin_L_conical', 'spin_height_conical', 'spin_L_inner', 'spin_height_inner'),
+        _PAGE_OFZ: ('spin_width_ofz', 'spin_Z0_ofz', 'spin_ZE_ofz', 'spin_IHSlope_ofz'),
+        _PAGE_OUTER: ('spin_radius_outer', 'spin_height_outer'),
+        _PAGE_TRANSITIONAL: ('spin_widthApp_transitional', 'spin_Z0_transitional', 'spin_ZE_transitional',
+                             'spin_Tslope_transitional'),
+        _PAGE_TAKEOFF: ('spin_widthDep_takeoff', 'spin_maxWidthDep_takeoff', 'spin_CWYLength_takeoff',
+                        'spin_Z0_takeoff'),
+    }
+    # Page get_parameters() reads for each surface type (Calculate All
+    # reads tabs the user may never have opened).
+    _SURFACE_PAGES: dict = {
+        SurfaceType.APPROACH: _PAGE_APPROACH,
+        SurfaceType.INNER_HORIZONTAL: _PAGE_INNER_CONICAL,
+        SurfaceType.CONICAL: _PAGE_INNER_CONICAL,
+        SurfaceType.INNER_CONICAL: _PAGE_INNER_CONICAL,
+        SurfaceType.OFZ: _PAGE_OFZ,
+        SurfaceType.OUTER_HORIZONTAL: _PAGE_OUTER,
+        SurfaceType.TRANSITIONAL: _PAGE_TRANSITIONAL,
+        SurfaceType.TAKEOFF: _PAGE_TAKEOFF,
+    }
+
     # Widgets declared in qols_panel_base.ui, guaranteed available after setupUi() (R-04)
     spin_code_takeoff: QComboBox
     check_finalWidth1800_takeoff: QCheckBox
@@ -171,6 +203,10 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
         self._direction_marker_band.setStrokeColor(QColor(0, 120, 0, 220))
         self._direction_marker_band.setWidth(1)
 
+        # Live surface preview (rubber bands only, no layers) — off until
+        # the "Live Preview" box is ticked
+        self._surface_preview = SurfacePreview(iface.mapCanvas(), self._preview_parameters)
+
         try:
             self.setupUi(self)
 
@@ -234,8 +270,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             self.useSelectedThresholdCheckBox.setChecked(False)
             self.useSelectedArpCheckBox.setChecked(False)  # #131
 
-            self.initialize_all_numeric_defaults()
-            self.update_takeoff_final_width_controls()
+            self.set_numeric_value('spin_ARP_elevation', self._WIDGET_DEFAULTS['spin_ARP_elevation'])
 
             try:
                 self._connect(self.combo_rwyClassification.currentIndexChanged,
@@ -255,13 +290,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             except Exception as e:
                 logger.warning(f"Could not connect OFZ visibility handler: {e}")
 
-            try:
-                self.combo_rwyClassification_inner_conical.setCurrentText('Precision Approach CAT I')
-                self.set_code_value('spin_code_inner_conical', 4)
-                self._wire_combined_inner_conical_defaults()
-                self.apply_combined_inner_conical_defaults_from_selection()
-            except Exception as e:
-                logger.warning(f"Could not initialize RWY/Code defaults for Conical/Inner: {e}")
+            self._wire_combined_inner_conical_defaults()
 
             try:
                 self._connect(self.spin_conical_slope.editingFinished, self.recalculate_conical_radius)
@@ -278,10 +307,9 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             except Exception as e:
                 logger.warning(f"Could not connect Transitional defaults handlers: {e}")
 
-            try:
-                self._apply_all_defaults()
-            except Exception as e:
-                logger.warning(f"Could not apply initial defaults: {e}")
+            # Seed the visible page now, the others when first opened.
+            for page in self._PAGE_DEFAULT_WIDGETS:
+                self.scriptTabWidget.set_page_initializer(page, partial(self._init_page, page))
 
             # Connect signals for real-time feedback (tracked for clean closeEvent teardown)
             self._connect(self.useSelectedRunwayCheckBox.toggled, self.update_selection_info)
@@ -315,6 +343,25 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             self.buttonLayout.insertWidget(self.buttonLayout.indexOf(self.cancelButton), self.showTableButton)
             self._connect(self.showTableButton.clicked, self.show_parameters_table)
 
+            # "Calculate All" button — every current-OLS surface in one run
+            self.calculateAllButton = QPushButton("Calculate All")
+            self.calculateAllButton.setMinimumHeight(30)
+            self.calculateAllButton.setMaximumHeight(32)
+            self.calculateAllButton.setToolTip(
+                "Calculate several current-OLS surfaces at once from a single runway/threshold resolution")
+            self.buttonLayout.insertWidget(
+                self.buttonLayout.indexOf(self.calculateButton) + 1, self.calculateAllButton)
+            self._connect(self.calculateAllButton.clicked, self.on_calculate_all_clicked)
+
+            # "Cancel" button — stops a background calculation; enabled only while one runs
+            self.cancelCalculationButton = QPushButton("Cancel")
+            self.cancelCalculationButton.setMinimumHeight(30)
+            self.cancelCalculationButton.setMaximumHeight(32)
+            self.cancelCalculationButton.setToolTip("Cancel the running surface calculation")
+            self.cancelCalculationButton.setEnabled(False)
+            self.buttonLayout.insertWidget(self.buttonLayout.indexOf(self.cancelButton), self.cancelCalculationButton)
+            self._connect(self.cancelCalculationButton.clicked, self.on_cancel_calculation_clicked)
+
             # Connect tab change to reinitialize defaults (helpful for widget visibility)
             self._connect(self.scriptTabWidget.currentChanged, self.on_tab_changed)
 
@@ -323,6 +370,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             self._connect(self.thresholdLayerCombo.layerChanged, self._update_direction_marker)
             self._connect(self.iface.mapCanvas().scaleChanged, self._update_direction_marker)
 
+            self._setup_surface_preview()
+
             # Set initial direction
             self.direction_start_to_end = True
             self.transitional_direction_normal = True  # True = normal (s=0), False = rotated (s=-1)
@@ -333,12 +382,6 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             self.update_selection_info()
             self._update_direction_marker()
 
-            # Apply initial OFZ visibility state after UI setup
-            try:
-                self.update_ofz_visibility()
-            except Exception as e:
-                logger.warning(f"Unhandled error: {e}")
-
             # Initialize selection signal connections (Issue #59)
             try:
                 self.connect_layer_selection_signals()
@@ -392,9 +435,6 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                     lineedit = getattr(self, name, None)
                     if lineedit and hasattr(lineedit, 'setText'):
                         lineedit.setValidator(validator)
-                        v = self._WIDGET_DEFAULTS.get(name, 0.0)
-                        text = f"{int(round(v))}.00" if abs(v - round(v)) < 1e-6 else f"{v:.2f}"
-                        lineedit.setText(text)
                         self._configure_smart_formatting(lineedit)
                 except Exception as e:
                     logger.warning(f"Unhandled error: {e}")
@@ -422,72 +462,65 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
         except Exception as e:
             logger.warning(f"Smart formatting setup failed for {lineedit.objectName()}: {e}")
 
-    def initialize_all_numeric_defaults(self):
-        """Initialize default values for all numeric surface widgets from _WIDGET_DEFAULTS."""
+    def _init_page(self, page: int) -> None:
+        """Seed scriptTabStack ``page`` on its first activation: its numeric
+        defaults from _WIDGET_DEFAULTS, RWY classification / code, then the
+        ICAO / rule-set defaults those select."""
         try:
-            for widget_name, default_value in self._WIDGET_DEFAULTS.items():
-                self.set_numeric_value(widget_name, default_value)
-            # Default checkbox checked
-            self.check_finalWidth1800_takeoff.setChecked(True)
-        except Exception as e:
-            logger.warning(f"Unhandled error: {e}")
+            for widget_name in self._PAGE_DEFAULT_WIDGETS[page]:
+                self.set_numeric_value(widget_name, self._WIDGET_DEFAULTS[widget_name])
 
-        # Non-numeric widget initialisation
-        try:
-            self.set_code_value('spin_code_transitional', 4)
-            try:
-                self.combo_rwyClassification_transitional.setCurrentText('Precision Approach CAT I')
-            except AttributeError:
-                pass
-        except Exception as e:
-            logger.warning(f"Unhandled error: {e}")
-
-        # Code dropdowns
-        try:
-            # Initialize code dropdowns
-            self.set_code_value('spin_code', 4)
-            self.set_code_value('spin_code_ofz', 4)
-            self.set_code_value('spin_code_takeoff', 4)
-            self.set_code_value('spin_code_outer', 4)
-            # Apply defaults from table for initial Take-Off code
-            try:
-                self.update_takeoff_defaults_from_code()
-            except Exception as e:
-                logger.warning(f"Unhandled error: {e}")
-
-            # Initialize RWY Classification dropdowns
-            try:
+            if page == self._PAGE_APPROACH:
+                self.set_code_value('spin_code', 4)
                 self.combo_rwyClassification.setCurrentText('Precision Approach CAT I')
-            except AttributeError:
-                pass
-
-            try:
+                self.apply_approach_defaults_from_selection()
+            elif page == self._PAGE_INNER_CONICAL:
+                self.combo_rwyClassification_inner_conical.setCurrentText('Precision Approach CAT I')
+                self.set_code_value('spin_code_inner_conical', 4)
+                self.apply_combined_inner_conical_defaults_from_selection()
+            elif page == self._PAGE_OFZ:
+                self.set_code_value('spin_code_ofz', 4)
                 self.combo_rwyClassification_ofz.setCurrentText('Precision Approach CAT I')
-            except AttributeError:
-                pass
-
+                self.apply_ofz_defaults_from_selection()
+                self.update_ofz_visibility()
+            elif page == self._PAGE_OUTER:
+                self.set_code_value('spin_code_outer', 4)
+            elif page == self._PAGE_TRANSITIONAL:
+                self.set_code_value('spin_code_transitional', 4)
+                self.combo_rwyClassification_transitional.setCurrentText('Precision Approach CAT I')
+                self.apply_transitional_defaults_from_selection()
+            elif page == self._PAGE_TAKEOFF:
+                self.check_finalWidth1800_takeoff.setChecked(True)
+                self.set_code_value('spin_code_takeoff', 4)
+                self.update_takeoff_defaults_from_code()
+                self.update_takeoff_final_width_controls()
         except Exception as e:
-            logger.warning(f"Unhandled error: {e}")
+            logger.warning(f"Could not initialise defaults for tab {self.scriptTabWidget.tabText(page)!r}: {e}")
 
     def refresh_defaults(self) -> None:
         """Public hook for plugin.py to call after a rule-set change (CR-07)."""
         self._apply_all_defaults()
 
     def _apply_all_defaults(self) -> None:
-        """Unified defaults initialisation (M-04).
+        """Unified defaults re-application (M-04).
 
-        Called once from ``__init__`` after ``setupUi()`` has run so that
-        *all* surface tabs are seeded with consistent ICAO / rule-set values in
-        a single, predictable pass.
+        Re-seeds every page that has already been initialised with the
+        ICAO / rule-set values; pages not opened yet pick up the active
+        rule set when :meth:`_init_page` runs for them.
 
         Order matters: combined Inner+Conical must be applied *after* the
         individual Approach/OFZ/Transitional passes so the computed conical
         radius is based on the already-populated inner-horizontal value.
         """
-        self.apply_approach_defaults_from_selection()
-        self.apply_ofz_defaults_from_selection()
-        self.apply_transitional_defaults_from_selection()
-        self.apply_combined_inner_conical_defaults_from_selection()
+        ready = self.scriptTabWidget.is_page_ready
+        if ready(self._PAGE_APPROACH):
+            self.apply_approach_defaults_from_selection()
+        if ready(self._PAGE_OFZ):
+            self.apply_ofz_defaults_from_selection()
+        if ready(self._PAGE_TRANSITIONAL):
+            self.apply_transitional_defaults_from_selection()
+        if ready(self._PAGE_INNER_CONICAL):
+            self.apply_combined_inner_conical_defaults_from_selection()
 
     def _wire_combined_inner_conical_defaults(self):
         """Connect change signals to apply defaults when RWY/Code change in combined tab."""
@@ -1112,8 +1145,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                     layer = self.runwayLayerCombo.layer(i)
                     if layer:
                         geom_type = self.get_geometry_type_name(layer)
-                        feature_count = layer.featureCount()
-                        tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {feature_count}"
+                        n_features = feature_count(layer)
+                        tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {n_features}"
 
                         # Method 1: Set via model data (most reliable for QgsMapLayerComboBox)
                         index = runway_model.index(i, 0)
@@ -1131,8 +1164,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                     layer = self.thresholdLayerCombo.layer(i)
                     if layer:
                         geom_type = self.get_geometry_type_name(layer)
-                        feature_count = layer.featureCount()
-                        tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {feature_count}"
+                        n_features = feature_count(layer)
+                        tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {n_features}"
 
                         # Method 1: Set via model data (most reliable for QgsMapLayerComboBox)
                         index = threshold_model.index(i, 0)
@@ -1150,8 +1183,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                     layer = self.arpLayerCombo.layer(i)
                     if layer:
                         geom_type = self.get_geometry_type_name(layer)
-                        feature_count = layer.featureCount()
-                        tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {feature_count}"
+                        n_features = feature_count(layer)
+                        tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {n_features}"
 
                         index = arp_model.index(i, 0)
                         arp_model.setData(index, tooltip, TOOLTIP_ROLE)
@@ -1210,8 +1243,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                         layer = combo.layer(index.row())
                         if layer:
                             geom_type = self.get_geometry_type_name(layer)
-                            feature_count = layer.featureCount()
-                            tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {feature_count}"
+                            n_features = feature_count(layer)
+                            tooltip = f"Layer: {layer.name()}\nType: {geom_type}\nFeatures: {n_features}"
 
                             # Method 1: Set tooltip on the view (native QGIS style)
                             obj.setToolTip(tooltip)
@@ -1259,8 +1292,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
 
             # Update runway info
             if runway_layer:
-                runway_selected = len(runway_layer.selectedFeatures())
-                runway_total = runway_layer.featureCount()
+                runway_selected = selected_count(runway_layer)
+                runway_total = feature_count(runway_layer)
 
                 if use_runway_selected:
                     if runway_selected > 0:
@@ -1274,8 +1307,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
 
             # Update threshold info
             if threshold_layer:
-                threshold_selected = len(threshold_layer.selectedFeatures())
-                threshold_total = threshold_layer.featureCount()
+                threshold_selected = selected_count(threshold_layer)
+                threshold_total = feature_count(threshold_layer)
 
                 if use_threshold_selected:
                     if threshold_selected > 0:
@@ -1289,8 +1322,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
 
             # Update ARP info (#131) — optional, so "No layer" isn't an error
             if arp_layer:
-                arp_selected = len(arp_layer.selectedFeatures())
-                arp_total = arp_layer.featureCount()
+                arp_selected = selected_count(arp_layer)
+                arp_total = feature_count(arp_layer)
 
                 if use_arp_selected:
                     if arp_selected > 0:
@@ -1354,6 +1387,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             # Update dropdown tooltips with current layer info
             self.update_dropdown_item_tooltips()
 
+            self._surface_preview.schedule()
+
         except Exception as e:
             logger.error(f"update_selection_info failed: {e}\n{traceback.format_exc()}")
 
@@ -1517,7 +1552,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
 
             for layer in vector_layers:
                 geom_info = self.get_layer_geometry_info(layer)
-                layer_info = f"'{layer.name()}' ({geom_info}, {layer.featureCount()} features)"
+                layer_info = f"'{layer.name()}' ({geom_info}, {feature_count(layer)} features)"
 
                 if layer.geometryType() == GEOM_TYPE_LINE:
                     line_layers.append(layer_info)
@@ -1556,6 +1591,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
         table (#118) — lets a user review what inputs produced a surface
         without re-running Calculate."""
         try:
+            from ..parameters_inspector import show_project_parameters_table
+
             show_project_parameters_table()
         except Exception as e:
             logger.warning(f"Could not show parameters table: {e}")
@@ -1684,7 +1721,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             # Show friendly message
             self.show_info_message("Starting calculation...")
 
-            # Emit signal
+            # Emit signal; the committed layer replaces the preview
+            self._surface_preview.clear()
             self.calculateClicked.emit()
 
         except Exception as e:
@@ -1753,8 +1791,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                 return False
 
             # CRITICAL CHECK 3: Ensure layers are still in project
-            project_layers = list(QgsProject.instance().mapLayers().values())
-            if runway_layer not in project_layers:
+            if not in_project(runway_layer):
                 self.show_error_message(
                     f"Runway Layer Centerline Not Found!\n\n"
                     f"Layer '{runway_layer.name()}' is no longer in the project.\n"
@@ -1762,7 +1799,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                 )
                 return False
 
-            if threshold_layer not in project_layers:
+            if not in_project(threshold_layer):
                 self.show_error_message(
                     f"Threshold Layer Not Found!\n\n"
                     f"Layer '{threshold_layer.name()}' is no longer in the project.\n"
@@ -1812,8 +1849,8 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
                 return False
 
             # CRITICAL CHECK 7: Ensure layers contain features
-            runway_total = runway_layer.featureCount()
-            threshold_total = threshold_layer.featureCount()
+            runway_total = feature_count(runway_layer)
+            threshold_total = feature_count(threshold_layer)
 
             if runway_total == 0:
                 self.show_error_message(
@@ -1837,7 +1874,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
 
             # Validate runway selection
             if use_runway_selected:
-                runway_selected = len(runway_layer.selectedFeatures())
+                runway_selected = selected_count(runway_layer)
                 if runway_selected == 0:
                     self.show_error_message(
                         f"No Runway Features Selected!\n\n"
@@ -1850,7 +1887,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
 
             # Validate threshold selection
             if use_threshold_selected:
-                threshold_selected = len(threshold_layer.selectedFeatures())
+                threshold_selected = selected_count(threshold_layer)
                 if threshold_selected == 0:
                     self.show_error_message(
                         f"No Threshold Features Selected!\n\n"
@@ -1880,6 +1917,31 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
         """Show friendly error message to user."""
         self.iface.messageBar().pushMessage("QOLS Error", message, level=MSG_CRITICAL, duration=5)
 
+    def set_calculation_running(self, running: bool) -> None:
+        """Lock Calculate and enable Cancel while a background calculation runs."""
+        self.calculateButton.setEnabled(not running)
+        self.calculateAllButton.setEnabled(not running)
+        self.cancelCalculationButton.setEnabled(running)
+
+    @pyqtSlot()
+    def on_calculate_all_clicked(self):
+        """Handle Calculate All button click with validation."""
+        try:
+            if not self.validate_layers():
+                return
+            self._surface_preview.clear()
+            self.calculateAllClicked.emit()
+        except Exception as e:
+            self.show_error_message(f"Error starting calculation: {str(e)}")
+
+    @pyqtSlot()
+    def on_cancel_calculation_clicked(self):
+        """Handle Cancel button click."""
+        try:
+            self.cancelCalculationClicked.emit()
+        except Exception as e:
+            logger.warning(f"Unhandled error: {e}")
+
     @pyqtSlot()
     def on_close_clicked(self):
         """Handle close button click."""
@@ -1888,8 +1950,11 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
         except Exception as e:
             logger.warning(f"Unhandled error: {e}")
 
-    def get_parameters(self):
-        """Collect and return all UI parameters for the currently active surface tab.
+    def get_parameters(self, surface_type=None, quiet=False):
+        """Collect and return all UI parameters for the currently active surface tab,
+        or for ``surface_type``'s tab when given (the Calculate All pipeline).
+        ``quiet`` skips the message-bar error (the live preview polls this on
+        every edit).
 
         Returns a dict suitable for direct injection into the corresponding
         ``scripts/`` entry-point as ``globals()``.
@@ -1929,12 +1994,14 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             direction = 0 if self.direction_start_to_end else -1
 
             # Determine surface type from active tab
-            current_tab_index = self.scriptTabWidget.currentIndex()
-            _tab_text = self.scriptTabWidget.tabText(current_tab_index)
-            try:
-                surface_type = SurfaceType.from_tab_text(_tab_text)
-            except ValueError:
-                raise Exception(f"Unknown surface type tab: {_tab_text!r}")
+            if surface_type is None:
+                current_tab_index = self.scriptTabWidget.currentIndex()
+                _tab_text = self.scriptTabWidget.tabText(current_tab_index)
+                try:
+                    surface_type = SurfaceType.from_tab_text(_tab_text)
+                except ValueError:
+                    raise Exception(f"Unknown surface type tab: {_tab_text!r}")
+            self.scriptTabWidget.ensure_page(self._SURFACE_PAGES.get(surface_type, -1))
 
             # Get parameters based on current tab
             if surface_type == SurfaceType.APPROACH:
@@ -2162,11 +2229,42 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             return params
 
         except Exception as e:
-            self.show_error_message(f"Error collecting parameters: {str(e)}")
+            if not quiet:
+                self.show_error_message(f"Error collecting parameters: {str(e)}")
             return None
 
+    def _preview_parameters(self):
+        return self.get_parameters(quiet=True)
+
+    def _setup_surface_preview(self):
+        """Add the "Live Preview" check box and route every parameter,
+        direction and tab change to the preview's debounce timer."""
+        self.livePreviewCheckBox = QCheckBox("Live Preview")
+        self.livePreviewCheckBox.setToolTip(
+            "Draw the active surface on the map while you edit its parameters, without creating layers;"
+            " Calculate still creates the layer")
+        self.buttonLayout.insertWidget(0, self.livePreviewCheckBox)
+        self._connect(self.livePreviewCheckBox.toggled, self._surface_preview.set_enabled)
+
+        schedule = self._surface_preview.schedule
+        for widget in self.findChildren(QLineEdit):
+            self._connect(widget.textChanged, schedule)
+        for widget in self.findChildren(QComboBox):
+            self._connect(widget.currentIndexChanged, schedule)
+        for widget in self.findChildren(QCheckBox):
+            if widget is not self.livePreviewCheckBox:
+                self._connect(widget.toggled, schedule)
+        self._connect(self.directionButton.clicked, schedule)
+        self._connect(self.button_rotate_transitional.clicked, schedule)
+        self._connect(self.scriptTabWidget.currentChanged, schedule)
+
     def showEvent(self, event):
         super().showEvent(event)
+        self._surface_preview.schedule()
+
+    def hideEvent(self, event):
+        self._surface_preview.clear()
+        super().hideEvent(event)
 
     def _connect(self, signal, slot):
         """Connect signal to slot and register the pair for teardown in closeEvent."""
@@ -2186,6 +2284,7 @@ class QolsDockWidget(QDockWidget, FORM_CLASS):
             self._connections.clear()
             self.disconnect_layer_selection_signals()
             self._clear_direction_marker()
+            self._surface_preview.clear()
 
             self.closingPlugin.emit()
             event.accept()
@@ -6,18 +6,20 @@ Runs as an independent dock widget with its own toolbar button.
 """
 import os
 import traceback
+from functools import partial
 from ..surfaces.new_ols_approach import get_new_ols_approach_defaults
 from ..surfaces.new_ols_takeoff_climb import get_valid_adg_groups, get_takeoff_climb_surface_dimensions
 from ..surface_types import SurfaceType
 from .. import logger
 from ..direction_marker import build_marker_geometry
-from ..parameters_inspector import show_project_parameters_table
+from ..layer_access import feature_count, in_project, selected_count
+from ..surface_preview import SurfacePreview
 from .tab_row_selector import TwoRowTabSelector
 from qgis.PyQt import uic
 from qgis.PyQt.QtCore import pyqtSignal, pyqtSlot, QRegularExpression
 from qgis.PyQt.QtGui import QColor, QRegularExpressionValidator
 from qgis.PyQt.QtWidgets import (
-    QApplication, QComboBox, QDialog, QDockWidget, QHBoxLayout, QStackedWidget, QTabBar,
+    QApplication, QCheckBox, QComboBox, QDialog, QDockWidget, QHBoxLayout, QStackedWidget, QTabBar,
     QLabel, QLineEdit, QMessageBox, QPushButton, QTextBrowser, QToolTip, QVBoxLayout,
 )
 from ..compat import (
@@ -40,6 +42,7 @@ _DIRECTION_MARKER_HALF_WIDTH_PX = 12
 class NewOlsDockWidget(QDockWidget, FORM_CLASS):
     closingPlugin = pyqtSignal()
     calculateClicked = pyqtSignal()
+    cancelCalculationClicked = pyqtSignal()
     closeClicked = pyqtSignal()
 
     _WIDGET_DEFAULTS: dict = {
@@ -70,6 +73,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
         'spin_s1Div_oes_departure':           26.8,
         'spin_s2Len_oes_departure':         8300.0,
         'spin_s2Div_oes_departure':           57.8,
+        'spin_contour_interval_oes_departure': 10.0,
         # OES Surface for Precision Approaches (#135/#159) — Table 4-12.
         'spin_Z0_oes_precision':            2548.0,
         'spin_apprDistThr_oes_precision':     60.0,
@@ -87,6 +91,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
         'spin_missedS2Div_oes_precision':     25.0,
         'spin_missedS2Slope_oes_precision':    2.5,
         'spin_transSlope_oes_precision':      14.3,
+        'spin_contour_interval_oes_precision': 10.0,
         # OES Surface for Straight-in Instrument Approaches (#137) —
         # Table 4-11. lowerLength defaults to the Horizontal OES ADG-I
         # ring radius (Table 4-10's own tier1_radius default above).
@@ -105,11 +110,19 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
         'spin_finalWidth_oes_takeoff':        380.0,
         'spin_length_oes_takeoff':           1600.0,
         'spin_slope_oes_takeoff':               5.0,
+        'spin_contour_interval_oes_takeoff':   10.0,
         # ARP (Aerodrome Reference Point) — shared by both tabs, moved to
         # a single top-level field (#131).
         'spin_ARP_elevation':     2548.0,
     }
 
+    # oesSubTabStack pages, in stack order, by the name suffix of their
+    # _WIDGET_DEFAULTS entries (spin_Z0_oes, older than the convention, is
+    # the departure page's). These are seeded on each page's first
+    # activation; the OFS tab and spin_ARP_elevation with the panel.
+    _OES_PAGE_SUFFIXES = ('_oes_horizontal', '_oes_departure', '_oes_precision', '_oes_straightin', '_oes_takeoff')
+    _OES_PAGE_TAKEOFF = 4
+
     combo_rwyType_ofs: QComboBox
     combo_adg_ofs: QComboBox
     spin_rwyWidth_ofs: QLineEdit
@@ -147,6 +160,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
     spin_s1Div_oes_departure: QLineEdit
     spin_s2Len_oes_departure: QLineEdit
     spin_s2Div_oes_departure: QLineEdit
+    spin_contour_interval_oes_departure: QLineEdit
     spin_Z0_oes_precision: QLineEdit
     spin_apprDistThr_oes_precision: QLineEdit
     spin_apprInnerEdge_oes_precision: QLineEdit
@@ -163,6 +177,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
     spin_missedS2Div_oes_precision: QLineEdit
     spin_missedS2Slope_oes_precision: QLineEdit
     spin_transSlope_oes_precision: QLineEdit
+    spin_contour_interval_oes_precision: QLineEdit
     spin_lowerHeight_oes_straightin: QLineEdit
     spin_lowerLength_oes_straightin: QLineEdit
     spin_upperHeight_oes_straightin: QLineEdit
@@ -178,6 +193,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
     spin_finalWidth_oes_takeoff: QLineEdit
     spin_length_oes_takeoff: QLineEdit
     spin_slope_oes_takeoff: QLineEdit
+    spin_contour_interval_oes_takeoff: QLineEdit
     calculateButton_oes_horizontal: QPushButton
     calculateButton_oes_departure: QPushButton
     calculateButton_oes_precision_approach: QPushButton
@@ -208,6 +224,9 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
         self._direction_marker_band.setStrokeColor(QColor(0, 120, 0, 220))
         self._direction_marker_band.setWidth(1)
 
+        # Live surface preview (rubber bands only, no layers)
+        self._surface_preview = SurfacePreview(iface.mapCanvas(), self._preview_parameters)
+
         try:
             self.setupUi(self)
 
@@ -253,6 +272,9 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             )
 
             self.setup_numeric_lineedit_validation()
+            for name in self._WIDGET_DEFAULTS:
+                if self._oes_page_of(name) is None:
+                    self._seed_default(name)
             self.setup_layer_filters()
             self.setup_enhanced_combos()
             self.setup_dropdown_tooltips()
@@ -282,9 +304,12 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                               self._refresh_adg_options_for_takeoff)
                 self._connect(self.combo_adg_oes_takeoff.currentIndexChanged,
                               self.apply_takeoff_climb_defaults)
-                self._refresh_adg_options_for_takeoff()
             except Exception as e:
-                logger.warning(f"Could not apply initial Take-off Climb defaults: {e}")
+                logger.warning(f"Could not connect Take-off Climb defaults handlers: {e}")
+
+            # Seed the visible OES page now, the others when first opened.
+            for page in range(len(self._OES_PAGE_SUFFIXES)):
+                self.oesSubTabWidget.set_page_initializer(page, partial(self._init_oes_page, page))
 
             self._connect(self.useSelectedRunwayCheckBox.toggled, self.update_selection_info)
             self._connect(self.useSelectedThresholdCheckBox.toggled, self.update_selection_info)
@@ -312,6 +337,15 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             self._connect(self.cancelButton.clicked, self.on_close_clicked)
             self._connect(self.directionButton.clicked, self.toggle_direction)
 
+            # "Cancel" button — stops a background calculation; enabled only while one runs
+            self.cancelCalculationButton = QPushButton("Cancel")
+            self.cancelCalculationButton.setMinimumHeight(30)
+            self.cancelCalculationButton.setMaximumHeight(32)
+            self.cancelCalculationButton.setToolTip("Cancel the running surface calculation")
+            self.cancelCalculationButton.setEnabled(False)
+            self.buttonLayout.insertWidget(self.buttonLayout.indexOf(self.cancelButton), self.cancelCalculationButton)
+            self._connect(self.cancelCalculationButton.clicked, self.on_cancel_calculation_clicked)
+
             # #159 — the shared Calculate button only applies to the OFS
             # tab now; OES surfaces are triggered individually from their
             # own subtab buttons.
@@ -323,6 +357,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             self._connect(self.thresholdLayerCombo.layerChanged, self._update_direction_marker)
             self._connect(self.iface.mapCanvas().scaleChanged, self._update_direction_marker)
 
+            self._setup_surface_preview()
+
             self.direction_start_to_end = True
             self.update_direction_button()
             self.update_selection_info()
@@ -349,7 +385,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             'spin_initHeight_oes_departure', 'spin_innerEdge_oes_departure',
             'spin_slope_oes_departure', 'spin_s1Len_oes_departure',
             'spin_s1Div_oes_departure', 'spin_s2Len_oes_departure',
-            'spin_s2Div_oes_departure',
+            'spin_s2Div_oes_departure', 'spin_contour_interval_oes_departure',
             'spin_Z0_oes_precision',
             'spin_apprDistThr_oes_precision', 'spin_apprInnerEdge_oes_precision',
             'spin_apprS1Len_oes_precision', 'spin_apprS1Div_oes_precision',
@@ -358,14 +394,14 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             'spin_missedDistThr_oes_precision', 'spin_missedS1Len_oes_precision',
             'spin_missedS1Slope_oes_precision', 'spin_missedS2Len_oes_precision',
             'spin_missedS2Div_oes_precision', 'spin_missedS2Slope_oes_precision',
-            'spin_transSlope_oes_precision',
+            'spin_transSlope_oes_precision', 'spin_contour_interval_oes_precision',
             'spin_lowerHeight_oes_straightin', 'spin_lowerLength_oes_straightin',
             'spin_upperHeight_oes_straightin', 'spin_upperShorterSide_oes_straightin',
             'spin_upperLongerSideFromThreshold_oes_straightin',
             'spin_Z0_oes_takeoff', 'spin_CWYLength_oes_takeoff',
             'spin_distFromRwyEnd_oes_takeoff', 'spin_innerEdge_oes_takeoff',
             'spin_divergence_oes_takeoff', 'spin_finalWidth_oes_takeoff',
-            'spin_length_oes_takeoff', 'spin_slope_oes_takeoff',
+            'spin_length_oes_takeoff', 'spin_slope_oes_takeoff', 'spin_contour_interval_oes_takeoff',
             'spin_ARP_elevation',  # #131 — shared ARP elevation field
         ]
         decimal_pattern = r'^-?\d*(?:\.\d*)?$'
@@ -375,13 +411,38 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                 lineedit = getattr(self, name, None)
                 if lineedit and hasattr(lineedit, 'setText'):
                     lineedit.setValidator(validator)
-                    v = self._WIDGET_DEFAULTS.get(name, 0.0)
-                    text = f"{int(round(v))}.00" if abs(v - round(v)) < 1e-6 else f"{v:.2f}"
-                    lineedit.setText(text)
                     self._configure_smart_formatting(lineedit)
             except Exception as e:
                 logger.warning(f"Unhandled error: {e}")
 
+    @classmethod
+    def _oes_page_of(cls, widget_name):
+        """oesSubTabStack page holding ``widget_name``, or None (OFS tab / ARP)."""
+        if widget_name == 'spin_Z0_oes':
+            return cls._OES_PAGE_SUFFIXES.index('_oes_departure')
+        for page, suffix in enumerate(cls._OES_PAGE_SUFFIXES):
+            if widget_name.endswith(suffix):
+                return page
+        return None
+
+    def _seed_default(self, widget_name):
+        lineedit = getattr(self, widget_name, None)
+        if lineedit is not None:
+            v = self._WIDGET_DEFAULTS[widget_name]
+            lineedit.setText(f"{int(round(v))}.00" if abs(v - round(v)) < 1e-6 else f"{v:.2f}")
+
+    def _init_oes_page(self, page):
+        """Seed OES ``page`` on its first activation from _WIDGET_DEFAULTS
+        (and, for Take-off Climb, the Table 4-14/4-15 ADG options)."""
+        try:
+            for name in self._WIDGET_DEFAULTS:
+                if self._oes_page_of(name) == page:
+                    self._seed_default(name)
+            if page == self._OES_PAGE_TAKEOFF:
+                self._refresh_adg_options_for_takeoff()
+        except Exception as e:
+            logger.warning(f"Could not initialise defaults for OES tab {self.oesSubTabWidget.tabText(page)!r}: {e}")
+
     def _configure_smart_formatting(self, lineedit):
         def format_on_focus_out():
             text = lineedit.text().strip()
@@ -487,7 +548,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                     if layer:
                         tooltip = (f"Layer: {layer.name()}\n"
                                    f"Type: {self.get_geometry_type_name(layer)}\n"
-                                   f"Features: {layer.featureCount()}")
+                                   f"Features: {feature_count(layer)}")
                         runway_model.setData(runway_model.index(i, 0), tooltip, TOOLTIP_ROLE)
                         try:
                             self.runwayLayerCombo.setItemData(i, tooltip, TOOLTIP_ROLE)
@@ -499,7 +560,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                     if layer:
                         tooltip = (f"Layer: {layer.name()}\n"
                                    f"Type: {self.get_geometry_type_name(layer)}\n"
-                                   f"Features: {layer.featureCount()}")
+                                   f"Features: {feature_count(layer)}")
                         threshold_model.setData(threshold_model.index(i, 0), tooltip, TOOLTIP_ROLE)
                         try:
                             self.thresholdLayerCombo.setItemData(i, tooltip, TOOLTIP_ROLE)
@@ -511,7 +572,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                     if layer:
                         tooltip = (f"Layer: {layer.name()}\n"
                                    f"Type: {self.get_geometry_type_name(layer)}\n"
-                                   f"Features: {layer.featureCount()}")
+                                   f"Features: {feature_count(layer)}")
                         arp_model.setData(arp_model.index(i, 0), tooltip, TOOLTIP_ROLE)
                         try:
                             self.arpLayerCombo.setItemData(i, tooltip, TOOLTIP_ROLE)
@@ -572,7 +633,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                         if layer:
                             tooltip = (f"Layer: {layer.name()}\n"
                                        f"Type: {self.get_geometry_type_name(layer)}\n"
-                                       f"Features: {layer.featureCount()}")
+                                       f"Features: {feature_count(layer)}")
                             obj.setToolTip(tooltip)
                             try:
                                 _gpos = event.globalPosition().toPoint()
@@ -783,15 +844,14 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                 )
                 return False
 
-            project_layers = list(QgsProject.instance().mapLayers().values())
-            if runway_layer not in project_layers:
+            if not in_project(runway_layer):
                 self.show_error_message(
                     f"Runway Layer Centerline Not Found!\n\n"
                     f"Layer '{runway_layer.name()}' is no longer in the project."
                 )
                 return False
 
-            if threshold_layer not in project_layers:
+            if not in_project(threshold_layer):
                 self.show_error_message(
                     f"Threshold Layer Not Found!\n\n"
                     f"Layer '{threshold_layer.name()}' is no longer in the project."
@@ -830,14 +890,14 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                 )
                 return False
 
-            if runway_layer.featureCount() == 0:
+            if feature_count(runway_layer) == 0:
                 self.show_error_message(
                     f"Empty Runway Layer Centerline!\n\n"
                     f"Layer '{runway_layer.name()}' contains no features."
                 )
                 return False
 
-            if threshold_layer.featureCount() == 0:
+            if feature_count(threshold_layer) == 0:
                 self.show_error_message(
                     f"Empty Threshold Layer!\n\n"
                     f"Layer '{threshold_layer.name()}' contains no features."
@@ -845,7 +905,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                 return False
 
             if self.useSelectedRunwayCheckBox.isChecked():
-                if len(runway_layer.selectedFeatures()) == 0:
+                if selected_count(runway_layer) == 0:
                     self.show_error_message(
                         "No Runway Features Selected!\n\n"
                         "'Use Selected Runway Features' is checked but no features are selected."
@@ -853,7 +913,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                     return False
 
             if self.useSelectedThresholdCheckBox.isChecked():
-                if len(threshold_layer.selectedFeatures()) == 0:
+                if selected_count(threshold_layer) == 0:
                     self.show_error_message(
                         "No Threshold Features Selected!\n\n"
                         "'Use Selected Threshold Features' is checked but no features are selected."
@@ -876,10 +936,32 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             if not self.validate_layers():
                 return
             self.show_info_message("Starting calculation...")
+            self._surface_preview.clear()
             self.calculateClicked.emit()
         except Exception as e:
             self.show_error_message(f"Error starting calculation: {str(e)}")
 
+    def set_calculation_running(self, running: bool) -> None:
+        """Lock every Calculate button and enable Cancel while a background
+        calculation runs."""
+        for button in (
+            self.calculateButton,
+            self.calculateButton_oes_horizontal,
+            self.calculateButton_oes_departure,
+            self.calculateButton_oes_precision_approach,
+            self.calculateButton_oes_straightin,
+            self.calculateButton_oes_takeoff,
+        ):
+            button.setEnabled(not running)
+        self.cancelCalculationButton.setEnabled(running)
+
+    @pyqtSlot()
+    def on_cancel_calculation_clicked(self):
+        try:
+            self.cancelCalculationClicked.emit()
+        except Exception as e:
+            logger.warning(f"Unhandled error: {e}")
+
     @pyqtSlot()
     def on_close_clicked(self):
         try:
@@ -887,8 +969,9 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
         except Exception as e:
             logger.warning(f"Unhandled error: {e}")
 
-    def get_parameters(self):
-        """Collect and return all UI parameters for the currently active OFS/OES tab."""
+    def get_parameters(self, quiet=False):
+        """Collect and return all UI parameters for the currently active OFS/OES tab;
+        ``quiet`` skips the message-bar error (live preview)."""
         try:
             runway_layer = self.runwayLayerCombo.currentLayer()
             threshold_layer = self.thresholdLayerCombo.currentLayer()
@@ -955,6 +1038,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                         's1_divergence_pct': self.get_numeric_value('spin_s1Div_oes_departure'),
                         's2_length_m': self.get_numeric_value('spin_s2Len_oes_departure'),
                         's2_divergence_pct': self.get_numeric_value('spin_s2Div_oes_departure'),
+                        'contour_interval_m':
+                            int(round(self.get_numeric_value('spin_contour_interval_oes_departure'))),
                     }
                 elif oes_sub_index == 2:
                     surface_type = SurfaceType.NEW_OLS_OES_PRECISION_APPROACH
@@ -977,6 +1062,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                         'missed_s2_divergence_pct': self.get_numeric_value('spin_missedS2Div_oes_precision'),
                         'missed_s2_slope_pct': self.get_numeric_value('spin_missedS2Slope_oes_precision'),
                         'trans_slope_pct': self.get_numeric_value('spin_transSlope_oes_precision'),
+                        'contour_interval_m':
+                            int(round(self.get_numeric_value('spin_contour_interval_oes_precision'))),
                     }
                 elif oes_sub_index == 3:
                     surface_type = SurfaceType.NEW_OLS_OES_STRAIGHT_IN_APPROACH
@@ -1002,6 +1089,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                         'final_width_m': self.get_numeric_value('spin_finalWidth_oes_takeoff'),
                         'length_m': self.get_numeric_value('spin_length_oes_takeoff'),
                         'slope_pct': self.get_numeric_value('spin_slope_oes_takeoff'),
+                        'contour_interval_m':
+                            int(round(self.get_numeric_value('spin_contour_interval_oes_takeoff'))),
                     }
 
             return {
@@ -1018,14 +1107,42 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             }
 
         except Exception as e:
-            self.show_error_message(f"Error collecting parameters: {str(e)}")
+            if not quiet:
+                self.show_error_message(f"Error collecting parameters: {str(e)}")
             return None
 
+    def _preview_parameters(self):
+        return self.get_parameters(quiet=True)
+
+    def _setup_surface_preview(self):
+        """Add the "Live Preview" check box and route every parameter,
+        direction and tab change to the preview's debounce timer."""
+        self.livePreviewCheckBox = QCheckBox("Live Preview")
+        self.livePreviewCheckBox.setToolTip(
+            "Draw the active surface on the map while you edit its parameters, without creating layers;"
+            " Calculate still creates the layer")
+        self.buttonLayout.insertWidget(0, self.livePreviewCheckBox)
+        self._connect(self.livePreviewCheckBox.toggled, self._surface_preview.set_enabled)
+
+        schedule = self._surface_preview.schedule
+        for widget in self.findChildren(QLineEdit):
+            self._connect(widget.textChanged, schedule)
+        for widget in self.findChildren(QComboBox):
+            self._connect(widget.currentIndexChanged, schedule)
+        for widget in self.findChildren(QCheckBox):
+            if widget is not self.livePreviewCheckBox:
+                self._connect(widget.toggled, schedule)
+        self._connect(self.directionButton.clicked, schedule)
+        self._connect(self.newOlsTabWidget.currentChanged, schedule)
+        self._connect(self.oesSubTabWidget.currentChanged, schedule)
+
     def show_parameters_table(self):
         """Show every calculated surface's stored parameters as an HTML
         table (#118) — lets a user review what inputs produced a surface
         without re-running Calculate."""
         try:
+            from ..parameters_inspector import show_project_parameters_table
+
             show_project_parameters_table()
         except Exception as e:
             logger.warning(f"Could not show parameters table: {e}")
@@ -1084,8 +1201,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             use_arp_selected = self.useSelectedArpCheckBox.isChecked()  # #131
 
             if runway_layer:
-                runway_selected = len(runway_layer.selectedFeatures())
-                runway_total = runway_layer.featureCount()
+                runway_selected = selected_count(runway_layer)
+                runway_total = feature_count(runway_layer)
                 if use_runway_selected:
                     runway_status = f"Selected ({runway_selected})" if runway_selected > 0 else "No selection"
                 else:
@@ -1094,8 +1211,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
                 runway_status = "No layer"
 
             if threshold_layer:
-                threshold_selected = len(threshold_layer.selectedFeatures())
-                threshold_total = threshold_layer.featureCount()
+                threshold_selected = selected_count(threshold_layer)
+                threshold_total = feature_count(threshold_layer)
                 if use_threshold_selected:
                     threshold_status = f"Selected ({threshold_selected})" if threshold_selected > 0 else "No selection"
                 else:
@@ -1105,8 +1222,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
 
             # ARP is optional (#131) — "No layer" is a neutral state, not an error
             if arp_layer:
-                arp_selected = len(arp_layer.selectedFeatures())
-                arp_total = arp_layer.featureCount()
+                arp_selected = selected_count(arp_layer)
+                arp_total = feature_count(arp_layer)
                 if use_arp_selected:
                     arp_status = f"Selected ({arp_selected})" if arp_selected > 0 else "No selection"
                 else:
@@ -1153,6 +1270,8 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
 
             self.update_dropdown_item_tooltips()
 
+            self._surface_preview.schedule()
+
         except Exception as e:
             logger.error(f"update_selection_info failed: {e}\n{traceback.format_exc()}")
             try:
@@ -1256,6 +1375,14 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
     def show_error_message(self, message):
         self.iface.messageBar().pushMessage("New OLS Error", message, level=MSG_CRITICAL, duration=5)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._surface_preview.schedule()
+
+    def hideEvent(self, event):
+        self._surface_preview.clear()
+        super().hideEvent(event)
+
     def _connect(self, signal, slot):
         signal.connect(slot)
         self._connections.append((signal, slot))
@@ -1270,6 +1397,7 @@ class NewOlsDockWidget(QDockWidget, FORM_CLASS):
             self._connections.clear()
             self.disconnect_layer_selection_signals()
             self._clear_direction_marker()
+            self._surface_preview.clear()
             self.closingPlugin.emit()
             event.accept()
         except Exception:
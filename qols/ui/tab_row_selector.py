@@ -35,10 +35,16 @@ physical click regardless of whether the bar's index changes, and routes
 it through the same handler — activation is decided from the shim's own
 ``_current_index``, not the bar's, so a click always does the right
 thing even when the bar's internal state didn't actually change.
+
+Pages can register a one-shot initializer (:meth:`set_page_initializer`)
+that runs on the page's first activation, just before ``currentChanged``
+fires for it — the panels use this to seed a tab's defaults only once
+the tab is opened, instead of for all tabs when the panel is built.
+Code that reads a page without showing it calls :meth:`ensure_page`.
 """
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Callable, Sequence
 
 from qgis.PyQt.QtCore import QObject, pyqtSignal
 
@@ -84,6 +90,7 @@ class TwoRowTabSelector(QObject):
         self._stack = stack
         self._current_index = -1
         self._syncing = False
+        self._page_initializers: dict[int, Callable[[], None]] = {}
         for bar_index, bar in enumerate(self._bars):
             bar.currentChanged.connect(lambda tab_index, bi=bar_index: self._on_bar_changed(bi, tab_index))
             bar.tabBarClicked.connect(lambda tab_index, bi=bar_index: self._on_bar_changed(bi, tab_index))
@@ -105,6 +112,7 @@ class TwoRowTabSelector(QObject):
             self._syncing = False
         self._current_index = stack_index
         self._stack.setCurrentIndex(stack_index)
+        self.ensure_page(stack_index)
         if emit:
             self.currentChanged.emit(stack_index)
 
@@ -116,11 +124,33 @@ class TwoRowTabSelector(QObject):
             return
         self._activate(stack_index, emit=True)
 
+    # -- lazy page initialisation ---------------------------------------
+
+    def set_page_initializer(self, index: int, initializer: Callable[[], None]) -> None:
+        """Run ``initializer()`` once, on the first activation of page
+        ``index`` — immediately if that page is already current."""
+        self._page_initializers[index] = initializer
+        if index == self._current_index:
+            self.ensure_page(index)
+
+    def ensure_page(self, index: int) -> None:
+        """Run page ``index``'s pending initializer, if it has one."""
+        initializer = self._page_initializers.pop(index, None)
+        if initializer is not None:
+            initializer()
+
+    def is_page_ready(self, index: int) -> bool:
+        """Whether page ``index`` has no initializer left to run."""
+        return index not in self._page_initializers
+
     # -- QTabWidget-compatible read API --------------------------------
 
     def currentIndex(self) -> int:
         return self._current_index
 
+    def count(self) -> int:
+        return len(self._tab_texts)
+
     def widget(self, index: int):
         if 0 <= index < len(self._tab_texts):
             return self._stack.widget(index)
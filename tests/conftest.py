@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the ``qols`` package importable from the
+repository root, the way the benchmarks do."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,109 @@
+"""``slice_segments`` / ``chain_segments`` on small hand-built patches
+(NumPy only, no QGIS)."""
+import numpy as np
+
+from qols.scripts._contour_utils import chain_segments, slice_patches, slice_segments
+
+
+def _square(x0, y0, x1, y1, z):
+    """Closed ring of an axis-aligned rectangle with ``z(x, y)`` vertices."""
+    corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+    return [(x, y, z(x, y)) for x, y in corners]
+
+
+def _segments(starts, ends):
+    """Segments as sorted end-point pairs, for order-free comparison."""
+    return sorted(tuple(sorted((tuple(np.round(a, 9)), tuple(np.round(b, 9))))) for a, b in zip(starts, ends))
+
+
+def test_hole_splits_the_level_line():
+    def z(x, y):
+        return x
+
+    exterior = _square(0.0, 0.0, 10.0, 10.0, z)
+    hole = _square(4.0, 4.0, 6.0, 6.0, z)[::-1]
+    levels, starts, ends = slice_segments([[exterior, hole]], [5.0])
+
+    assert levels.tolist() == [0, 0]
+    assert _segments(starts, ends) == [((5.0, 0.0), (5.0, 4.0)), ((5.0, 6.0), (5.0, 10.0))]
+
+
+def test_level_at_a_vertex_is_reported_once():
+    # z = x + y: level 10 runs through the (10, 0) and (0, 10) corners.
+    ring = _square(0.0, 0.0, 10.0, 10.0, lambda x, y: x + y)
+    levels, starts, ends = slice_segments([[ring]], [10.0])
+
+    assert levels.tolist() == [0]
+    assert _segments(starts, ends) == [((0.0, 10.0), (10.0, 0.0))]
+
+
+def test_horizontal_patch_has_no_contours():
+    flat = _square(0.0, 0.0, 10.0, 10.0, lambda x, y: 5.0)
+    sloped = _square(20.0, 0.0, 30.0, 10.0, lambda x, y: y)
+
+    levels, starts, ends = slice_segments([[flat]], [5.0])
+    assert len(levels) == len(starts) == len(ends) == 0
+
+    # Next to a sloped patch only the sloped one is sliced.
+    levels, starts, ends = slice_segments([[flat], [sloped]], [5.0])
+    assert _segments(starts, ends) == [((20.0, 5.0), (30.0, 5.0))]
+
+
+def test_levels_outside_every_patch_are_skipped():
+    ring = _square(0.0, 0.0, 10.0, 10.0, lambda x, y: y)
+    levels, starts, _ends = slice_segments([[ring]], [-1.0, 2.5, 11.0, 7.5])
+
+    assert sorted(levels.tolist()) == [1, 3]
+    assert sorted(starts[:, 1].tolist()) == [2.5, 7.5]
+
+
+def test_neighbouring_patches_chain_into_one_line():
+    # Two squares sharing the x = 10 edge, both on the plane z = y.
+    left = _square(0.0, 0.0, 10.0, 10.0, lambda x, y: y)
+    right = _square(10.0, 0.0, 20.0, 10.0, lambda x, y: y)
+    _levels, starts, ends = slice_segments([[left], [right]], [5.0])
+    assert len(starts) == 2
+
+    lines = chain_segments(starts, ends)
+    assert len(lines) == 1
+    line = lines[0]
+    assert line.shape == (3, 2)
+    assert sorted(line[:, 0].tolist()) == [0.0, 10.0, 20.0]
+    np.testing.assert_allclose(line[:, 1], 5.0)
+
+
+def test_pyramid_faces_chain_into_a_closed_ring():
+    apex = (0.0, 0.0, 10.0)
+    base = [(-10.0, -10.0, 0.0), (10.0, -10.0, 0.0), (10.0, 10.0, 0.0), (-10.0, 10.0, 0.0)]
+    faces = [[[base[i], base[(i + 1) % 4], apex, base[i]]] for i in range(4)]
+
+    contours = slice_patches(faces, [5.0])
+    assert len(contours) == 1
+    elevation, ring = contours[0]
+    assert elevation == 5.0
+    assert ring.shape == (5, 2)
+    np.testing.assert_allclose(ring[0], ring[-1])
+    np.testing.assert_allclose(np.abs(ring), 5.0)
+
+
+def test_chain_segments_joins_reversed_and_shuffled_segments():
+    points = np.array([(0.0, 0.0), (1.0, 0.0), (2.0, 1.0), (3.0, 1.0)])
+    # Middle segment reversed, order shuffled, end points off by less
+    # than the snapping tolerance.
+    starts = np.array([points[2], points[0], points[2] + 1e-7])
+    ends = np.array([points[1], points[1] + 1e-7, points[3]])
+
+    lines = chain_segments(starts, ends)
+    assert len(lines) == 1
+    line = lines[0]
+    if line[0, 0] > line[-1, 0]:
+        line = line[::-1]
+    np.testing.assert_allclose(line, points, atol=1e-6)
+
+
+def test_chain_segments_keeps_separate_lines_apart():
+    starts = np.array([(0.0, 0.0), (5.0, 5.0)])
+    ends = np.array([(1.0, 0.0), (6.0, 5.0)])
+
+    assert len(chain_segments(starts, ends)) == 2
+    assert chain_segments(np.empty((0, 2)), np.empty((0, 2))) == []
@@ -0,0 +1,92 @@
+"""``recover_ring_z`` (grid-indexed ``_SourceIndex``) against the original
+scan over every source vertex and edge, on small randomized input."""
+import math
+import random
+
+import pytest
+
+from qols.geometry_merge import (
+    _interpolate_nearest_edge_z,
+    _iter_edges,
+    _match_exact_vertex_z,
+    recover_ring_z,
+)
+
+
+def brute_force_recover_ring_z(merged_xy, source_rings_xyz, exact_match_tol=1e-6):
+    """The pre-index implementation: every vertex, then every edge."""
+    all_vertices = [v for ring in source_rings_xyz for v in ring]
+    all_edges = [e for ring in source_rings_xyz for e in _iter_edges(ring)]
+    result = []
+    for pt in merged_xy:
+        z = _match_exact_vertex_z(pt, all_vertices, exact_match_tol)
+        if z is None:
+            z = _interpolate_nearest_edge_z(pt, all_edges)
+        result.append((pt[0], pt[1], z))
+    return result
+
+
+def _random_ring(rng, cx, cy, radius, vertices):
+    """Star-shaped sloped ring with irregular vertex spacing."""
+    angles = sorted(rng.uniform(0.0, 2 * math.pi) for _ in range(vertices))
+    ring = []
+    for a in angles:
+        r = radius * rng.uniform(0.6, 1.0)
+        ring.append((cx + r * math.sin(a), cy + r * math.cos(a), rng.uniform(2500.0, 2650.0)))
+    return ring
+
+
+def _make_inputs(seed):
+    rng = random.Random(seed)
+    source = [
+        _random_ring(rng, 500000.0 + rng.uniform(-200, 200), 4000000.0 + rng.uniform(-200, 200),
+                     rng.uniform(300.0, 1500.0), rng.randint(3, 40))
+        for _ in range(rng.randint(1, 6))
+    ]
+    # A copy of one ring at other elevations: its vertices coincide with
+    # the original's, so the first ring in source order must win.
+    source.append([(x, y, z + 10.0) for x, y, z in source[0]])
+
+    vertices = [v for ring in source for v in ring]
+    edges = [e for ring in source for e in _iter_edges(ring)]
+    xs = [v[0] for v in vertices]
+    ys = [v[1] for v in vertices]
+
+    merged = []
+    for _ in range(60):
+        kind = rng.randrange(5)
+        if kind == 0:  # an exact source vertex
+            x, y, _z = rng.choice(vertices)
+        elif kind == 1:  # within the exact-match tolerance of one
+            x, y, _z = rng.choice(vertices)
+            x, y = x + rng.uniform(-5e-7, 5e-7), y + rng.uniform(-5e-7, 5e-7)
+        elif kind == 2:  # part-way along a source edge
+            a, b = rng.choice(edges)
+            t = rng.random()
+            x, y = a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1])
+        elif kind == 3:  # anywhere in the extent
+            x, y = rng.uniform(min(xs), max(xs)), rng.uniform(min(ys), max(ys))
+        else:  # well outside it
+            x = rng.choice((min(xs) - rng.uniform(10, 3000), max(xs) + rng.uniform(10, 3000)))
+            y = rng.uniform(min(ys) - 3000, max(ys) + 3000)
+        merged.append((x, y))
+    return merged, source
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_matches_brute_force_scan(seed):
+    merged, source = _make_inputs(seed)
+    assert recover_ring_z(merged, source) == brute_force_recover_ring_z(merged, source)
+
+
+def test_first_ring_wins_on_shared_vertices():
+    lower = [(0.0, 0.0, 1.0), (10.0, 0.0, 2.0), (10.0, 10.0, 3.0)]
+    upper = [(x, y, z + 100.0) for x, y, z in lower]
+    merged = [(x, y) for x, y, _z in lower]
+
+    assert [z for _x, _y, z in recover_ring_z(merged, [lower, upper])] == [1.0, 2.0, 3.0]
+    assert [z for _x, _y, z in recover_ring_z(merged, [upper, lower])] == [101.0, 102.0, 103.0]
+
+
+def test_empty_boundary():
+    assert recover_ring_z([], [[(0.0, 0.0, 1.0), (1.0, 0.0, 1.0), (0.0, 1.0, 1.0)]]) == []
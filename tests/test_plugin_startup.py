@@ -0,0 +1,89 @@
+"""Startup budget of ``classFactory`` + ``initGui`` (see
+benchmarks/bench_plugin_startup.py for the detailed measurement).
+
+Each check runs in a fresh interpreter, so modules imported by other
+tests do not hide what startup imports. Skipped without QGIS.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("qgis.core")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+BUDGET_MS = 150.0
+MAX_QOLS_MODULES = 12
+MAX_NEW_MODULES = 40
+
+# Modules only a panel, the KML export or a calculation needs.
+DEFERRED = (
+    "qols.ui.dockwidget",
+    "qols.ui.new_ols_dockwidget",
+    "qols.ui.settings_dialog",
+    "qols.parameters_inspector",
+    "qols.kml_export",
+    "qols.surface_cache",
+    "qols.surface_task",
+    "qols.pipeline",
+    "qols.engine",
+    "processing",
+    "qgis.PyQt.QtWebEngineWidgets",
+)
+
+_STARTUP = """
+import json, sys, time
+from qgis.testing import start_app
+from qgis.testing.mocked import get_iface
+
+start_app()
+iface = get_iface()
+before = set(sys.modules)
+t0 = time.perf_counter()
+import qols
+
+plugin = qols.classFactory(iface)
+plugin.initGui()
+elapsed_ms = (time.perf_counter() - t0) * 1000.0
+loaded = sorted(set(sys.modules) - before)
+plugin.unload()
+print(json.dumps({"elapsed_ms": elapsed_ms, "loaded": loaded}))
+"""
+
+_IMPORT_PLUGIN = """
+import json, sys
+import qols.plugin
+
+print(json.dumps({"loaded": sorted(sys.modules)}))
+"""
+
+
+def _run(code: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(ROOT), capture_output=True, text=True, check=True, timeout=120)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _deferred(loaded) -> list:
+    prefixes = tuple(f"{name}." for name in DEFERRED)
+    return [name for name in loaded if name in DEFERRED or name.startswith(prefixes)]
+
+
+def test_importing_plugin_skips_panel_modules():
+    loaded = set(_run(_IMPORT_PLUGIN)["loaded"])
+    for name in ("qols.ui.dockwidget", "qols.ui.new_ols_dockwidget", "qols.parameters_inspector", "processing"):
+        assert name not in loaded
+
+
+def test_startup_within_budget():
+    measured = _run(_STARTUP)
+    loaded = measured["loaded"]
+    qols_modules = [name for name in loaded if name == "qols" or name.startswith("qols.")]
+
+    assert measured["elapsed_ms"] <= BUDGET_MS
+    assert len(qols_modules) <= MAX_QOLS_MODULES, qols_modules
+    assert len(loaded) <= MAX_NEW_MODULES, loaded
+    assert _deferred(loaded) == []